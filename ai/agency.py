@@ -8,10 +8,11 @@ from ai.agents.QA import QA
 from ai.agents.Reviewer import Reviewer
 from ai.agents.Father import Father
 
-# Initialize memory store: prefer Intelligent > Firestore > InMemory
+# Initialize memory store: prefer Sqlite (if configured) > Intelligent > Firestore > InMemory
 import os  # noqa: E402
 from ai.memory.store import set_memory_store, InMemoryMemoryStore  # noqa: E402
 from ai.memory.intelligent_store import IntelligentMemoryStore  # noqa: E402
+from ai.memory.sqlite_store import SqliteMemoryStore  # noqa: E402
 try:
     from ai.memory.firestore import FirestoreMemoryStore  # type: ignore
 except Exception:  # pragma: no cover
@@ -23,11 +24,16 @@ use_firestore = (
     and os.getenv("FIREBASE_PRIVATE_KEY")
 )
 
-# Priority order: Intelligent Memory (local) > Firestore (staging) > InMemory (fallback)
+# Priority order: Sqlite (persistent local, opt-in) > Intelligent Memory (local) > Firestore (staging) > InMemory (fallback)
 try:
-    # Use intelligent memory store as the primary choice
-    set_memory_store(IntelligentMemoryStore())
-    print("🧠 Using Intelligent Memory Store with semantic search and auto-classification")
+    memory_db = os.getenv("FRESH_MEMORY_DB")
+    if memory_db:
+        set_memory_store(SqliteMemoryStore(memory_db))
+        print(f"🗄️  Using SQLite Memory Store at {memory_db}")
+    else:
+        # Use intelligent memory store as the primary choice
+        set_memory_store(IntelligentMemoryStore())
+        print("🧠 Using Intelligent Memory Store with semantic search and auto-classification")
 except Exception:
     if use_firestore and FirestoreMemoryStore is not None:
         try:
@@ -0,0 +1,160 @@
+"""
+Working-tree snapshots for Safety Controller checkpoints
+
+A checkpoint snapshots the whole working tree (tracked changes and
+untracked, non-ignored files) plus the index as git objects, without
+touching either:
+
+- The working tree is staged into a temporary index (seeded from the real
+  one, so unchanged files are not re-hashed) and written as a tree; the
+  real index is written as a second tree
+- Both are wrapped in commits shaped like ``git stash create`` (worktree
+  commit with parents HEAD and the index commit) and kept reachable by
+  ``refs/fresh/checkpoints/<id>``, so they survive restarts and gc
+- Restoring diffs the snapshot against a snapshot of the current tree and
+  rewrites only the files that differ (deleting files created since);
+  unchanged files keep their mtime, so caches keyed on them stay valid
+
+Paths such as ``.fresh`` (our own caches and the checkpoint list) and the
+emergency stop file are excluded from snapshots and never restored.
+
+Cross-references:
+    - ai/autonomous/safety.py: SafetyController (create_checkpoint,
+      rollback_to_checkpoint)
+"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from ai.autonomous.health import find_git_dir
+
+REF_PREFIX = "refs/fresh/checkpoints/"
+
+# Identity for snapshot commits when the repository has none configured
+_SNAPSHOT_IDENTITY = {
+    "GIT_AUTHOR_NAME": "fresh", "GIT_AUTHOR_EMAIL": "fresh@localhost",
+    "GIT_COMMITTER_NAME": "fresh", "GIT_COMMITTER_EMAIL": "fresh@localhost",
+}
+
+
+class Snapshot(NamedTuple):
+    commit: str          # worktree commit (parents: HEAD, index commit)
+    index_tree: str
+    worktree_tree: str
+
+
+class WorktreeSnapshots:
+    """Creates and restores working-tree snapshots of one repository."""
+
+    def __init__(self, repo_path: Path, exclude: Sequence[str] = (".fresh", ".emergency_stop")) -> None:
+        self.repo_path = Path(repo_path)
+        self.exclude = tuple(exclude)
+
+    def _git(self, *args: str, env: Optional[Dict[str, str]] = None, input: Optional[str] = None) -> str:
+        result = subprocess.run(
+            ["git", *args],
+            cwd=self.repo_path,
+            capture_output=True,
+            text=True,
+            check=True,
+            input=input,
+            env={**os.environ, **env} if env else None
+        )
+        return result.stdout
+
+    def _pathspecs(self) -> List[str]:
+        return ["."] + [f":(exclude){path}" for path in self.exclude]
+
+    def _worktree_tree(self) -> str:
+        """Tree of the working tree as `git add -A` would stage it; the real index is untouched."""
+        git_dir = find_git_dir(self.repo_path)
+        if git_dir is None:
+            raise RuntimeError(f"Not a git repository: {self.repo_path}")
+        temp_index = git_dir / f"fresh-snapshot-{os.getpid()}.index"
+        try:
+            if (git_dir / "index").exists():
+                shutil.copyfile(git_dir / "index", temp_index)
+            env = {"GIT_INDEX_FILE": str(temp_index)}
+            self._git("add", "-A", "--", *self._pathspecs(), env=env)
+            return self._git("write-tree", env=env).strip()
+        finally:
+            try:
+                temp_index.unlink()
+            except OSError:
+                pass
+
+    def create(self, name: str, head: str, message: str) -> Snapshot:
+        """Snapshot the index and working tree and keep it under ``REF_PREFIX + name``."""
+        identity = {key: value for key, value in _SNAPSHOT_IDENTITY.items() if key not in os.environ}
+        index_tree = self._git("write-tree").strip()
+        worktree_tree = self._worktree_tree()
+        index_commit = self._git("commit-tree", index_tree, "-p", head,
+                                 "-m", f"index on {head[:12]}: {message}", env=identity).strip()
+        commit = self._git("commit-tree", worktree_tree, "-p", head, "-p", index_commit,
+                           "-m", f"checkpoint on {head[:12]}: {message}", env=identity).strip()
+        self._git("update-ref", REF_PREFIX + name, commit)
+        return Snapshot(commit, index_tree, worktree_tree)
+
+    def drop(self, name: str) -> None:
+        """Release a snapshot's objects for gc."""
+        try:
+            self._git("update-ref", "-d", REF_PREFIX + name)
+        except subprocess.CalledProcessError:
+            pass
+
+    def _changes(self, old_tree: str, new_tree: str) -> List[tuple]:
+        """(status, path) pairs for files that differ between two trees."""
+        output = self._git("diff-tree", "-r", "-z", "--no-renames", "--name-status", old_tree, new_tree)
+        fields = output.split("\0")
+        return [(fields[i], fields[i + 1]) for i in range(0, len(fields) - 1, 2)]
+
+    def _restore(self, source: str, paths: Iterable[str], *where: str) -> None:
+        paths = list(paths)
+        if paths:
+            self._git("restore", f"--source={source}", *where, "--pathspec-from-file=-",
+                      "--pathspec-file-nul", input="\0".join(paths),
+                      env={"GIT_LITERAL_PATHSPECS": "1"})
+
+    def restore(self, snapshot: Snapshot, head: str) -> List[str]:
+        """Bring HEAD, the index and the working tree back to a snapshot.
+
+        Args:
+            snapshot: Snapshot to restore
+            head: Commit HEAD pointed to when the snapshot was taken
+
+        Returns:
+            Working-tree paths that were rewritten or deleted
+        """
+        current_head = self._git("rev-parse", "HEAD").strip()
+        if current_head != head:
+            self._git("reset", "--quiet", "--soft", head)
+
+        index_tree = self._git("write-tree").strip()
+        if index_tree != snapshot.index_tree:
+            self._restore(snapshot.index_tree, [path for _, path in self._changes(snapshot.index_tree, index_tree)],
+                          "--staged")
+
+        touched = []
+        restore, created = [], []
+        for status, path in self._changes(snapshot.worktree_tree, self._worktree_tree()):
+            (created if status == "A" else restore).append(path)
+            touched.append(path)
+        self._restore(snapshot.worktree_tree, restore, "--worktree")
+        for path in created:
+            file_path = self.repo_path / path
+            try:
+                file_path.unlink()
+            except OSError:
+                continue
+            # Remove directories left empty (as git clean would)
+            parent = file_path.parent
+            while parent != self.repo_path:
+                try:
+                    parent.rmdir()
+                except OSError:
+                    break
+                parent = parent.parent
+        return touched
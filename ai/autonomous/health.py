@@ -0,0 +1,257 @@
+"""
+Health probes for the Safety Controller
+
+Every health check (repository cleanliness, test suite, disk space, memory
+usage) is a HealthProbe with its own time-to-live, so polling health or
+status does not fork git or rerun the test suite each time.
+
+- Within a probe's ``ttl`` the cached result is returned without any check
+- After that (or at once for ``fresh`` reads), a ``keyed`` probe reruns
+  only if the repository state changed:
+  HEAD, the git index (mtime and size) and a fingerprint of the working
+  tree (path, mtime and size of every file the walk does not ignore), all
+  read from the filesystem without starting git
+- Results are persisted (``.fresh/health_probes.json``), so separate
+  processes such as successive ``fresh autonomous status`` calls share them
+- Stale probes run concurrently: in threads for collect(), as asyncio
+  tasks for collect_async(); concurrent requests for one probe run it once
+
+Cross-references:
+    - ai/autonomous/safety.py: SafetyController (monitor_health, validation)
+    - ai/loop/file_walker.py: walk_files (working-tree fingerprint)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from ai.loop.file_walker import IgnoreMatcher, walk_files
+
+PROBE_CACHE_VERSION = 1
+
+# Never part of the working-tree fingerprint (our own caches included)
+STATE_IGNORE_PATTERNS = (
+    ".git", ".fresh", "__pycache__", ".pytest_cache", ".mypy_cache",
+    ".ruff_cache", "node_modules", ".venv", "venv",
+)
+
+
+@dataclass(frozen=True)
+class HealthProbe:
+    """One health check and how long its result may be reused."""
+    name: str
+    check: Callable[[], Any]  # returns a JSON-serialisable result
+    ttl: float                # seconds a result is served without any check
+    keyed: bool = False       # after the ttl, rerun only if the repository state changed
+
+
+def find_git_dir(path: Path) -> Optional[Path]:
+    """The git directory of the repository containing ``path`` (worktrees included)."""
+    path = Path(path).resolve()
+    for directory in (path, *path.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                git_dir = Path(content[len("gitdir:"):].strip())
+                return git_dir if git_dir.is_absolute() else (directory / git_dir).resolve()
+            return None
+    return None
+
+
+def read_head(git_dir: Path) -> Optional[str]:
+    """Commit HEAD points to, read from the ref files (the ref name if unborn)."""
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+    except OSError:
+        return None
+    if not head.startswith("ref:"):
+        return head  # detached
+    ref = head[len("ref:"):].strip()
+    common_dir = git_dir
+    try:
+        common_dir = (git_dir / (git_dir / "commondir").read_text().strip()).resolve()
+    except OSError:
+        pass
+    for base in (git_dir, common_dir):
+        try:
+            return (base / ref).read_text().strip()
+        except OSError:
+            continue
+    try:
+        with open(common_dir / "packed-refs", "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[1] == ref:
+                    return parts[0]
+    except OSError:
+        pass
+    return ref
+
+
+class HealthProbes:
+    """Registered probes with their cached results."""
+
+    def __init__(self, repo_path: Path, cache_path: Optional[Path] = None,
+                 persist: bool = True, ignore_patterns: Iterable[str] = STATE_IGNORE_PATTERNS) -> None:
+        """Probe registry for one repository.
+
+        Args:
+            repo_path: Repository whose state keys the results
+            cache_path: Where results are persisted
+                (default: <repo_path>/.fresh/health_probes.json)
+            persist: Load and save results across processes
+            ignore_patterns: Names left out of the working-tree fingerprint
+        """
+        self.repo_path = Path(repo_path)
+        self.cache_path: Optional[Path] = None
+        if persist:
+            self.cache_path = Path(cache_path) if cache_path else self.repo_path / ".fresh" / "health_probes.json"
+        self._matcher = IgnoreMatcher(list(ignore_patterns))
+        self._probes: Dict[str, HealthProbe] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._save_lock = threading.Lock()
+        self.stats = {"runs": 0, "hits": 0}
+        self._load()
+
+    def register(self, probe: HealthProbe) -> None:
+        self._probes[probe.name] = probe
+        self._locks.setdefault(probe.name, threading.Lock())
+
+    def tree_state(self) -> str:
+        """Digest of HEAD, the index and the working tree, without forking git."""
+        digest = hashlib.blake2b(digest_size=16)
+        git_dir = find_git_dir(self.repo_path)
+        if git_dir is not None:
+            digest.update(f"HEAD {read_head(git_dir)}\n".encode())
+            try:
+                index = os.stat(git_dir / "index")
+                digest.update(f"index {index.st_mtime_ns} {index.st_size}\n".encode())
+            except OSError:
+                pass
+        for file_path in walk_files(self.repo_path, None, self._matcher):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            rel_path = file_path.relative_to(self.repo_path).as_posix()
+            digest.update(f"{rel_path}\0{stat.st_mtime_ns}\0{stat.st_size}\n".encode())
+        return digest.hexdigest()
+
+    def get(self, name: str, state: Optional[Callable[[], str]] = None, fresh: bool = False) -> Any:
+        """Result of one probe, from the cache when still valid.
+
+        Args:
+            name: Registered probe name
+            state: Shared tree_state() for several probes (computed at most once)
+            fresh: Ignore the ttl; a keyed result is reused only while the
+                repository state is unchanged, any other probe reruns
+        """
+        probe = self._probes[name]
+        state = state or self._state_once()
+        with self._locks[name]:
+            entry = self._results.get(name)
+            now = time.time()
+            if entry is not None:
+                if not fresh and now - entry["checked_at"] < probe.ttl:
+                    self.stats["hits"] += 1
+                    return entry["value"]
+                if probe.keyed and entry["key"] == state():
+                    self.stats["hits"] += 1
+                    entry["checked_at"] = now
+                    self._save()
+                    return entry["value"]
+            key = state() if probe.keyed else None
+            value = probe.check()
+            self.stats["runs"] += 1
+            self._results[name] = {"value": value, "checked_at": time.time(), "key": key}
+            self._save()
+            return value
+
+    def collect(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """Results of several probes; stale ones run concurrently in threads."""
+        names = list(names) if names is not None else list(self._probes)
+        state = self._state_once()
+        stale = [name for name in names if not self._within_ttl(name)]
+        results: Dict[str, Any] = {}
+        if len(stale) > 1:
+            with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+                futures = {name: pool.submit(self.get, name, state) for name in stale}
+                results = {name: future.result() for name, future in futures.items()}
+        return {name: results[name] if name in results else self.get(name, state) for name in names}
+
+    async def collect_async(self, names: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """collect() for async callers; the event loop is never blocked."""
+        names = list(names) if names is not None else list(self._probes)
+        state = self._state_once()
+        stale = [name for name in names if not self._within_ttl(name)]
+        values = await asyncio.gather(*(asyncio.to_thread(self.get, name, state) for name in stale))
+        results = dict(zip(stale, values))
+        return {name: results[name] if name in results else self.get(name, state) for name in names}
+
+    def age(self, name: str) -> Optional[float]:
+        """Seconds since the probe's result was last confirmed, or None."""
+        entry = self._results.get(name)
+        return time.time() - entry["checked_at"] if entry is not None else None
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop the cached result of one probe (default: all)."""
+        if name is None:
+            self._results.clear()
+        else:
+            self._results.pop(name, None)
+        self._save()
+
+    def _within_ttl(self, name: str) -> bool:
+        entry = self._results.get(name)
+        return entry is not None and time.time() - entry["checked_at"] < self._probes[name].ttl
+
+    def _state_once(self) -> Callable[[], str]:
+        lock = threading.Lock()
+        computed: list = []
+
+        def state() -> str:
+            with lock:
+                if not computed:
+                    computed.append(self.tree_state())
+                return computed[0]
+
+        return state
+
+    def _load(self) -> None:
+        if self.cache_path is None:
+            return
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == PROBE_CACHE_VERSION:
+            self._results = data.get("probes", {})
+
+    def _save(self) -> None:
+        if self.cache_path is None:
+            return
+        with self._save_lock:
+            tmp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+            try:
+                self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"version": PROBE_CACHE_VERSION, "probes": dict(self._results)},
+                              f, separators=(",", ":"))
+                os.replace(tmp_path, self.cache_path)
+            except (OSError, TypeError, ValueError):
+                pass
@@ -7,7 +7,7 @@ import time
 import asyncio
 import threading
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, Iterable, List, Any, Optional, Callable
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 import logging
@@ -74,6 +74,10 @@ class AutonomousLoop:
             "safety_level": "high",
             "enabled": True,
             "continuous_mode": False,
+            # Continuous mode: rescan only changed files, as soon as they change
+            "watch_mode": False,
+            "debounce_seconds": 2.0,
+            "poll_interval": 2.0,  # seconds, when watchdog is not installed
         }
         self.config = {**default_config, **(config or {})}
         
@@ -160,10 +164,14 @@ class AutonomousLoop:
             if self._loop_thread.is_alive():
                 self.logger.warning("Loop thread did not stop cleanly")
     
-    def run_single_cycle(self) -> CycleResult:
+    def run_single_cycle(self, changed_paths: Optional[Iterable[str]] = None) -> CycleResult:
         """
         Run a single autonomous improvement cycle.
         
+        Args:
+            changed_paths: Only discover opportunities in these files
+                (relative to the working directory); None scans everything
+        
         Returns:
             CycleResult with details about the cycle execution
         """
@@ -189,7 +197,7 @@ class AutonomousLoop:
         try:
             # Phase A: Discovery & Monitoring
             self.logger.info("Phase A: Discovery & Monitoring")
-            opportunities = self._discovery_phase()
+            opportunities = self._discovery_phase(changed_paths)
             result.opportunities_found = len(opportunities)
             
             # Phase B: Planning & Validation  
@@ -253,49 +261,75 @@ class AutonomousLoop:
         }
     
     def _continuous_loop_worker(self, callback: Optional[Callable[[CycleResult], None]]):
-        """Worker function for continuous loop execution."""
-        while self.running and not self._stop_event.is_set():
-            try:
-                # Check if emergency stop is active
-                if self.safety_controller.is_emergency_stopped():
-                    self.logger.warning("Emergency stop detected, pausing autonomous loop")
-                    self._stop_event.wait(60)  # Wait 1 minute before checking again
-                    continue
-                
-                # Run a cycle
-                result = self.run_single_cycle()
-                
-                # Call callback if provided
-                if callback:
-                    try:
-                        callback(result)
-                    except Exception as e:
-                        self.logger.error(f"Callback error: {e}")
-                
-                # Wait for next cycle
-                scan_interval = self.config["scan_interval"]
-                self.logger.info(f"Waiting {scan_interval}s until next cycle")
-                
-                if self._stop_event.wait(scan_interval):
-                    break
+        """Worker function for continuous loop execution.
+        
+        In watch mode the first cycle scans everything; after that the
+        worker sleeps until files change and discovers only in those.
+        """
+        watcher = None
+        if self.config["watch_mode"]:
+            watcher = self.codebase_monitor.watch(
+                debounce=self.config["debounce_seconds"],
+                poll_interval=self.config["poll_interval"]
+            ).start()
+            self.logger.info(f"Watching {self.working_directory} for changes ({watcher.backend})")
+        changed_paths = None
+        
+        try:
+            while self.running and not self._stop_event.is_set():
+                try:
+                    # Check if emergency stop is active
+                    if self.safety_controller.is_emergency_stopped():
+                        self.logger.warning("Emergency stop detected, pausing autonomous loop")
+                        self._stop_event.wait(60)  # Wait 1 minute before checking again
+                        continue
                     
-            except Exception as e:
-                self.logger.error(f"Error in continuous loop: {e}")
-                # Wait before retrying
-                self._stop_event.wait(60)
+                    # Run a cycle
+                    result = self.run_single_cycle(changed_paths)
+                    
+                    # Call callback if provided
+                    if callback:
+                        try:
+                            callback(result)
+                        except Exception as e:
+                            self.logger.error(f"Callback error: {e}")
+                    
+                    if watcher is not None:
+                        self.logger.info("Waiting for file changes")
+                        changed_paths = watcher.wait_for_changes(stop_event=self._stop_event)
+                        if not changed_paths:
+                            break  # Stopped
+                        self.logger.info(f"{len(changed_paths)} changed files, starting cycle")
+                        continue
+                    
+                    # Wait for next cycle
+                    scan_interval = self.config["scan_interval"]
+                    self.logger.info(f"Waiting {scan_interval}s until next cycle")
+                    
+                    if self._stop_event.wait(scan_interval):
+                        break
+                        
+                except Exception as e:
+                    self.logger.error(f"Error in continuous loop: {e}")
+                    # Wait before retrying
+                    self._stop_event.wait(60)
+        finally:
+            if watcher is not None:
+                watcher.stop()
         
         self.logger.info("Continuous loop worker stopped")
     
-    def _discovery_phase(self) -> List[ImprovementOpportunity]:
+    def _discovery_phase(self, changed_paths: Optional[Iterable[str]] = None) -> List[ImprovementOpportunity]:
         """
         Phase A: Discovery & Monitoring
-        Identify improvement opportunities in the codebase.
+        Identify improvement opportunities in the codebase (or only in
+        ``changed_paths``).
         """
         opportunities = []
         
         try:
             # Scan for issues and opportunities
-            scan_results = self.codebase_monitor.comprehensive_scan()
+            scan_results = self.codebase_monitor.comprehensive_scan(paths=changed_paths)
             
             # Convert scan results to opportunities
             for issue in scan_results.get("issues", []):
@@ -310,9 +344,9 @@ class AutonomousLoop:
                 )
                 opportunities.append(opportunity)
             
-            # Track metrics and patterns
-            metrics = self.codebase_monitor.collect_metrics()
-            patterns = self.codebase_monitor.analyze_patterns()
+            # Metrics and patterns come from the same scan (already in metrics_history)
+            metrics = scan_results.get("metrics")
+            patterns = scan_results.get("patterns", [])
             
             self.logger.info(f"Discovery phase found {len(opportunities)} opportunities")
             
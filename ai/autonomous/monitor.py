@@ -1,18 +1,28 @@
 """
 Codebase Monitor for Autonomous Loop
 Continuously monitors codebase health and quality metrics.
+
+A comprehensive scan reads the codebase once through the rule engine in
+ai/autonomous/scan_engine.py; metrics, issues and patterns are all derived
+from that single CodebaseScan. Complexity and structural issues come from
+the AST analysis cache shared with RepoScanner (ai/loop/ast_analysis.py).
+An incremental scan (comprehensive_scan(paths=...)) reads only the files a
+ChangeWatcher (see watch()) reported as changed.
 """
 
 import os
 import subprocess
 import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterable, List, Any, Optional
 from dataclasses import dataclass
 from datetime import datetime
 import json
-import re
 
+from ai.autonomous.scan_engine import CodebaseScan, RuleEngine, RuleMatch, ScanRule
+from ai.loop.ast_analysis import AstAnalyzer
+from ai.loop.file_walker import IgnoreMatcher
+from ai.loop.fs_watch import ChangeWatcher
 from ai.memory.intelligent_store import IntelligentMemoryStore
 
 
@@ -80,16 +90,75 @@ class CodebaseMonitor:
                 ".venv/", "venv/", "build/", "dist/"
             ],
             "max_complexity": 10,
+            "max_function_length": 100,
+            "max_nesting_depth": 4,
             "min_test_coverage": 80.0
         }
         
         # Track historical metrics
         self.metrics_history: List[CodeMetrics] = []
         
-    def comprehensive_scan(self) -> Dict[str, Any]:
+        # Line rules for the issue scans (see register_rule)
+        self.rule_engine = RuleEngine()
+        # Per-file AST facts, cached on disk across scans
+        self.ast_analyzer = AstAnalyzer(self.working_directory)
+        # Shared by every step of a comprehensive scan
+        self._active_scan: Optional[CodebaseScan] = None
+    
+    def register_rule(self, rule: ScanRule) -> None:
+        """Add a line rule; its matches are reported as issues of rule.category."""
+        self.rule_engine.register(rule)
+    
+    def _ignore_matcher(self) -> IgnoreMatcher:
+        return IgnoreMatcher([p.rstrip("/") for p in self.config["ignore_patterns"]], use_gitignore=False)
+    
+    def scan_codebase(self, paths: Optional[Iterable[str]] = None) -> CodebaseScan:
+        """Read the codebase once and return every per-file result.
+        
+        Args:
+            paths: Only read these files (relative to the working directory)
+        """
+        if self._active_scan is not None:
+            return self._active_scan
+        scan = self.rule_engine.scan(self.working_directory, self.config["file_extensions"],
+                                     self._ignore_matcher(), analyzer=self.ast_analyzer, paths=paths)
+        self.ast_analyzer.save()
+        return scan
+    
+    def watch(self, debounce: float = 2.0, poll_interval: float = 2.0,
+              use_watchdog: Optional[bool] = None) -> ChangeWatcher:
+        """Watcher for the files this monitor scans (same extensions and ignore patterns).
+        
+        Pass the paths it reports to comprehensive_scan(paths=...).
+        """
+        return ChangeWatcher(self.working_directory, self.config["file_extensions"], self._ignore_matcher(),
+                             debounce=debounce, poll_interval=poll_interval, use_watchdog=use_watchdog)
+    
+    def _rule_issues(self, category: str) -> List[IssueReport]:
+        """Issues for one rule category, in file and line order."""
+        return [self._issue_from_match(match) for match in self.scan_codebase().issues(category)]
+    
+    @staticmethod
+    def _issue_from_match(match: RuleMatch) -> IssueReport:
+        return IssueReport(
+            type=match.rule.category,
+            severity=match.rule.severity,
+            file=match.file,
+            line=match.line,
+            description=match.description,
+            details=match.details
+        )
+        
+    def comprehensive_scan(self, paths: Optional[Iterable[str]] = None) -> Dict[str, Any]:
         """
         Perform comprehensive codebase scan.
         
+        Args:
+            paths: Incremental scan of only these files (relative to the
+                working directory), e.g. the changes reported by watch().
+                Repository-wide results (metrics, test coverage issues and
+                patterns) are skipped; "scope" lists the scanned paths.
+        
         Returns:
             Dictionary containing scan results including issues and metrics
         """
@@ -100,10 +169,17 @@ class CodebaseMonitor:
             "patterns": [],
             "health_score": 0.0
         }
+        incremental = paths is not None
+        if incremental:
+            paths = sorted(set(paths))
+            scan_results["scope"] = paths
         
         try:
+            # Read the codebase (or the changed files) once for every step below
+            self._active_scan = self.scan_codebase(paths)
+            
             # Collect current metrics
-            metrics = self.collect_metrics()
+            metrics = None if incremental else self.collect_metrics()
             scan_results["metrics"] = metrics.to_dict() if metrics else None
             
             # Scan for various types of issues
@@ -122,18 +198,25 @@ class CodebaseMonitor:
             issues.extend(performance_issues)
             
             # Test coverage issues
-            test_issues = self._scan_test_issues()
-            issues.extend(test_issues)
+            if not incremental:
+                test_issues = self._scan_test_issues()
+                issues.extend(test_issues)
             
             # TODO items
             todo_issues = self._scan_todo_items()
             issues.extend(todo_issues)
             
+            # Registered rules in other categories
+            for category in self._active_scan.matches:
+                if category not in ("security", "quality", "performance", "todo"):
+                    issues.extend(self._rule_issues(category))
+            
             scan_results["issues"] = [issue.to_dict() for issue in issues]
             
             # Analyze patterns
-            patterns = self.analyze_patterns()
-            scan_results["patterns"] = patterns
+            if not incremental:
+                patterns = self.analyze_patterns()
+                scan_results["patterns"] = patterns
             
             # Calculate health score
             health_score = self._calculate_health_score(issues, metrics)
@@ -141,54 +224,30 @@ class CodebaseMonitor:
             
         except Exception as e:
             scan_results["error"] = str(e)
+        finally:
+            self._active_scan = None
         
         return scan_results
     
     def collect_metrics(self) -> Optional[CodeMetrics]:
         """Collect current code metrics."""
         try:
-            total_lines = 0
-            code_lines = 0
-            comment_lines = 0
-            blank_lines = 0
-            files_count = 0
-            
-            # Count lines in source files
-            for ext in self.config["file_extensions"]:
-                for file_path in self.working_directory.rglob(f"*{ext}"):
-                    if self._should_ignore_file(file_path):
-                        continue
-                    
-                    try:
-                        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            lines = f.readlines()
-                            
-                        files_count += 1
-                        total_lines += len(lines)
-                        
-                        for line in lines:
-                            stripped = line.strip()
-                            if not stripped:
-                                blank_lines += 1
-                            elif stripped.startswith('#') or stripped.startswith('//'):
-                                comment_lines += 1
-                            else:
-                                code_lines += 1
-                    except:
-                        continue
+            scan = self.scan_codebase()
+            total_lines = scan.total_lines
+            files_count = scan.files_count
             
             # Get test coverage if available
             test_coverage = self._get_test_coverage()
             
             # Calculate average complexity (simplified)
-            complexity_average = self._calculate_average_complexity()
+            complexity_average = self._calculate_average_complexity(scan)
             
             metrics = CodeMetrics(
                 timestamp=datetime.now(),
                 total_lines=total_lines,
-                code_lines=code_lines,
-                comment_lines=comment_lines,
-                blank_lines=blank_lines,
+                code_lines=scan.code_lines,
+                comment_lines=scan.comment_lines,
+                blank_lines=scan.blank_lines,
                 files_count=files_count,
                 test_coverage=test_coverage,
                 complexity_average=complexity_average
@@ -215,8 +274,13 @@ class CodebaseMonitor:
     def analyze_patterns(self) -> List[Dict[str, Any]]:
         """Analyze code patterns and anti-patterns."""
         patterns = []
+        # Reuse the comprehensive scan's read, or read once for both detectors
+        owns_scan = self._active_scan is None
         
         try:
+            if owns_scan:
+                self._active_scan = self.scan_codebase()
+            
             # Detect recurring issues
             recurring_patterns = self._detect_recurring_issues()
             patterns.extend(recurring_patterns)
@@ -234,6 +298,9 @@ class CodebaseMonitor:
                 "type": "error",
                 "description": f"Pattern analysis failed: {e}"
             })
+        finally:
+            if owns_scan:
+                self._active_scan = None
         
         return patterns
     
@@ -278,135 +345,75 @@ class CodebaseMonitor:
     
     def _scan_security_issues(self) -> List[IssueReport]:
         """Scan for security issues."""
-        issues = []
-        
         try:
-            # Common security patterns to check
-            security_patterns = [
-                (r'hashlib\.md5|hashlib\.sha1', "Weak cryptographic hash function"),
-                (r'random\.random\(\)', "Insecure random number generation"),
-                (r'eval\(|exec\(', "Dangerous code execution"),
-                (r'pickle\.loads?', "Insecure deserialization"),
-                (r'subprocess\..*shell=True', "Shell injection risk"),
-            ]
-            
-            for file_path in self.working_directory.rglob("*.py"):
-                if self._should_ignore_file(file_path):
-                    continue
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read()
-                        lines = content.split('\n')
-                    
-                    for i, line in enumerate(lines, 1):
-                        for pattern, description in security_patterns:
-                            if re.search(pattern, line):
-                                issues.append(IssueReport(
-                                    type="security",
-                                    severity="high",
-                                    file=str(file_path.relative_to(self.working_directory)),
-                                    line=i,
-                                    description=description,
-                                    details={"pattern": pattern, "code": line.strip()}
-                                ))
-                                
-                except:
-                    continue
-                    
+            return self._rule_issues("security")
         except Exception as e:
-            issues.append(IssueReport(
+            return [IssueReport(
                 type="security",
                 severity="low",
                 file="",
                 line=None,
                 description=f"Security scan failed: {e}",
                 details={}
-            ))
-        
-        return issues
+            )]
     
     def _scan_quality_issues(self) -> List[IssueReport]:
         """Scan for code quality issues."""
-        issues = []
-        
         try:
-            # Quality patterns to check
-            quality_patterns = [
-                (r'^.{120,}', "Line too long (>120 characters)"),
-                (r'\t', "Tab character used instead of spaces"),
-                (r'print\(|console\.log\(', "Debug print statement left in code"),
-                (r'# TODO:?\s*$', "Empty TODO comment"),
-                (r'def\s+\w+\([^)]*\):\s*$', "Empty function definition"),
-            ]
-            
-            for file_path in self.working_directory.rglob("*.py"):
-                if self._should_ignore_file(file_path):
-                    continue
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                    
-                    for i, line in enumerate(lines, 1):
-                        for pattern, description in quality_patterns:
-                            if re.search(pattern, line):
-                                issues.append(IssueReport(
-                                    type="quality",
-                                    severity="medium",
-                                    file=str(file_path.relative_to(self.working_directory)),
-                                    line=i,
-                                    description=description,
-                                    details={"pattern": pattern, "code": line.strip()}
-                                ))
-                                
-                except:
-                    continue
-                    
-        except Exception as e:
-            pass
-        
+            return self._rule_issues("quality") + self._structure_issues()
+        except Exception:
+            return []
+    
+    def _structure_issues(self) -> List[IssueReport]:
+        """Empty functions and functions over the complexity, length or nesting limits (from the AST)."""
+        limits = [
+            ("complexity", self.config["max_complexity"], "High cyclomatic complexity ({value})"),
+            ("length", self.config["max_function_length"], "Function too long ({value} lines)"),
+            ("nesting", self.config["max_nesting_depth"], "Deeply nested code ({value} levels)"),
+        ]
+        issues = []
+        for rel_path, analysis in self.scan_codebase().analyses.items():
+            for function in sorted(analysis["functions"], key=lambda f: f["line"]):
+                if function["empty"]:
+                    issues.append(IssueReport(
+                        type="quality",
+                        severity="medium",
+                        file=rel_path,
+                        line=function["line"],
+                        description="Empty function definition",
+                        details={"function": function["qualname"]}
+                    ))
+                for key, limit, description in limits:
+                    if function[key] > limit:
+                        issues.append(IssueReport(
+                            type="quality",
+                            severity="medium",
+                            file=rel_path,
+                            line=function["line"],
+                            description=f"{description.format(value=function[key])}: {function['qualname']}",
+                            details={"function": function["qualname"], key: function[key], "limit": limit}
+                        ))
         return issues
     
     def _scan_performance_issues(self) -> List[IssueReport]:
         """Scan for performance issues."""
-        issues = []
-        
         try:
-            # Performance patterns to check
-            perf_patterns = [
-                (r'for\s+\w+\s+in\s+range\(len\(', "Inefficient loop pattern"),
-                (r'\.append\(.*\)\s*$', "List append in loop (potential performance issue)"),
-                (r'time\.sleep\(\d+\)', "Long sleep call"),
-            ]
-            
-            for file_path in self.working_directory.rglob("*.py"):
-                if self._should_ignore_file(file_path):
-                    continue
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                    
-                    for i, line in enumerate(lines, 1):
-                        for pattern, description in perf_patterns:
-                            if re.search(pattern, line):
-                                issues.append(IssueReport(
-                                    type="performance",
-                                    severity="medium",
-                                    file=str(file_path.relative_to(self.working_directory)),
-                                    line=i,
-                                    description=description,
-                                    details={"pattern": pattern, "code": line.strip()}
-                                ))
-                                
-                except:
-                    continue
-                    
-        except Exception as e:
-            pass
-        
-        return issues
+            issues = self._rule_issues("performance")
+            # List appends inside loops (from the AST's call sites)
+            for rel_path, analysis in self.scan_codebase().analyses.items():
+                for call in analysis["calls"]:
+                    if call["in_loop"] and call["name"].endswith(".append"):
+                        issues.append(IssueReport(
+                            type="performance",
+                            severity="medium",
+                            file=rel_path,
+                            line=call["line"],
+                            description="List append in loop (potential performance issue)",
+                            details={"call": call["name"], "function": call["function"]}
+                        ))
+            return issues
+        except Exception:
+            return []
     
     def _scan_test_issues(self) -> List[IssueReport]:
         """Scan for testing issues."""
@@ -414,17 +421,9 @@ class CodebaseMonitor:
         
         try:
             # Count test files vs source files
-            source_files = 0
-            test_files = 0
-            
-            for file_path in self.working_directory.rglob("*.py"):
-                if self._should_ignore_file(file_path):
-                    continue
-                
-                if "test" in file_path.name.lower():
-                    test_files += 1
-                else:
-                    source_files += 1
+            scan = self.scan_codebase()
+            source_files = scan.source_files
+            test_files = scan.test_files
             
             # Check test-to-source ratio
             if source_files > 0:
@@ -446,49 +445,19 @@ class CodebaseMonitor:
     
     def _scan_todo_items(self) -> List[IssueReport]:
         """Scan for TODO items."""
-        issues = []
-        
         try:
-            todo_pattern = r'#\s*TODO:?\s*(.+)'
-            
-            for file_path in self.working_directory.rglob("*.py"):
-                if self._should_ignore_file(file_path):
-                    continue
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        lines = f.readlines()
-                    
-                    for i, line in enumerate(lines, 1):
-                        match = re.search(todo_pattern, line)
-                        if match:
-                            todo_text = match.group(1).strip()
-                            issues.append(IssueReport(
-                                type="todo",
-                                severity="low",
-                                file=str(file_path.relative_to(self.working_directory)),
-                                line=i,
-                                description=f"TODO: {todo_text}",
-                                details={"todo_text": todo_text}
-                            ))
-                            
-                except:
-                    continue
-                    
-        except Exception as e:
-            pass
-        
-        return issues
+            return self._rule_issues("todo")
+        except Exception:
+            return []
     
     def _should_ignore_file(self, file_path: Path) -> bool:
-        """Check if file should be ignored."""
-        file_str = str(file_path)
-        
-        for pattern in self.config["ignore_patterns"]:
-            if pattern in file_str:
-                return True
-        
-        return False
+        """Check if file should be ignored (any path component matches an ignore pattern)."""
+        try:
+            parts = file_path.relative_to(self.working_directory).parts
+        except ValueError:
+            parts = file_path.parts
+        matcher = IgnoreMatcher([p.rstrip("/") for p in self.config["ignore_patterns"]], use_gitignore=False)
+        return matcher.matches_path(parts)
     
     def _get_test_coverage(self) -> float:
         """Get test coverage if available."""
@@ -513,38 +482,13 @@ class CodebaseMonitor:
         
         return 0.0
     
-    def _calculate_average_complexity(self) -> float:
-        """Calculate average cyclomatic complexity (simplified)."""
-        # Simple heuristic based on control flow keywords
-        complexity_keywords = ['if', 'elif', 'else', 'for', 'while', 'try', 'except', 'finally']
-        
-        total_complexity = 0
-        file_count = 0
-        
+    def _calculate_average_complexity(self, scan: Optional[CodebaseScan] = None) -> float:
+        """Calculate average cyclomatic complexity per function."""
+        # Mean McCabe complexity per function (ai/loop/ast_analysis.py)
         try:
-            for file_path in self.working_directory.rglob("*.py"):
-                if self._should_ignore_file(file_path):
-                    continue
-                
-                try:
-                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = f.read().lower()
-                    
-                    file_complexity = 1  # Base complexity
-                    for keyword in complexity_keywords:
-                        file_complexity += content.count(f' {keyword} ')
-                        file_complexity += content.count(f'\t{keyword} ')
-                        file_complexity += content.count(f'\n{keyword} ')
-                    
-                    total_complexity += file_complexity
-                    file_count += 1
-                    
-                except:
-                    continue
-        except:
-            pass
-        
-        return total_complexity / file_count if file_count > 0 else 0.0
+            return (scan or self.scan_codebase()).complexity_average
+        except Exception:
+            return 0.0
     
     def _calculate_health_score(self, issues: List[IssueReport], metrics: Optional[CodeMetrics]) -> float:
         """Calculate overall codebase health score (0.0 to 1.0)."""
@@ -595,10 +539,7 @@ class CodebaseMonitor:
         try:
             # Analyze directory structure and imports
             # This is a simplified implementation
-            directories = set()
-            for file_path in self.working_directory.rglob("*.py"):
-                if not self._should_ignore_file(file_path):
-                    directories.add(file_path.parent.name)
+            directories = self.scan_codebase().directories
             
             if len(directories) > 5:
                 patterns.append({
@@ -617,18 +558,9 @@ class CodebaseMonitor:
         
         try:
             # Simple naming convention checks
-            snake_case_files = 0
-            camel_case_files = 0
-            
-            for file_path in self.working_directory.rglob("*.py"):
-                if self._should_ignore_file(file_path):
-                    continue
-                
-                filename = file_path.stem
-                if '_' in filename:
-                    snake_case_files += 1
-                elif any(c.isupper() for c in filename[1:]):
-                    camel_case_files += 1
+            scan = self.scan_codebase()
+            snake_case_files = scan.snake_case_files
+            camel_case_files = scan.camel_case_files
             
             if snake_case_files > 0 and camel_case_files > 0:
                 patterns.append({
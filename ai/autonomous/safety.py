@@ -1,6 +1,17 @@
 """
 Safety Controller for Autonomous Loop
 Ensures all autonomous operations are safe and reversible.
+
+Health checks (git status, test suite, disk, memory) are cached health
+probes (ai/autonomous/health.py): health and status polls reuse results
+within their ttl and while the repository is unchanged instead of forking
+git or rerunning the tests. Safety validation skips the ttl and reuses a
+result only if the repository state is unchanged.
+
+Checkpoints snapshot the working tree as git objects
+(ai/autonomous/checkpoints.py) and are persisted in
+.fresh/checkpoints.json; a rollback rewrites only the files that changed
+since, keeping uncommitted work from before the checkpoint.
 """
 
 import os
@@ -14,6 +25,8 @@ from datetime import datetime, timedelta
 import json
 import logging
 
+from ai.autonomous.checkpoints import Snapshot, WorktreeSnapshots
+from ai.autonomous.health import HealthProbe, HealthProbes
 from ai.memory.intelligent_store import IntelligentMemoryStore
 
 
@@ -25,6 +38,7 @@ class SafetyCheckpoint:
     git_commit: str
     description: str
     metadata: Dict[str, Any]
+    snapshot: Optional[Snapshot] = None  # working tree and index at the checkpoint
     
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -32,8 +46,20 @@ class SafetyCheckpoint:
             "timestamp": self.timestamp.isoformat(),
             "git_commit": self.git_commit,
             "description": self.description,
-            "metadata": self.metadata
+            "metadata": self.metadata,
+            "snapshot": self.snapshot._asdict() if self.snapshot else None
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SafetyCheckpoint":
+        return cls(
+            id=data["id"],
+            timestamp=datetime.fromisoformat(data["timestamp"]),
+            git_commit=data["git_commit"],
+            description=data["description"],
+            metadata=data.get("metadata", {}),
+            snapshot=Snapshot(**data["snapshot"]) if data.get("snapshot") else None
+        )
 
 
 @dataclass
@@ -61,15 +87,30 @@ class SafetyController:
             "require_tests": True,   # Require tests to pass before changes
             "rollback_threshold": 0.95,  # Success rate threshold
             "max_operations_per_hour": 10,  # Rate limiting
-            "emergency_stop_file": self.working_directory / ".emergency_stop"
+            "emergency_stop_file": self.working_directory / ".emergency_stop",
+            "checkpoints_file": self.working_directory / ".fresh" / "checkpoints.json",
+            "max_checkpoints": 50,  # Oldest are dropped (with their snapshot objects)
+            # Seconds a health/status poll reuses a probe result without any check;
+            # git status and tests are then reused while the repository is unchanged.
+            # Validation ignores the ttl.
+            "probe_ttl": {"repository_clean": 5.0, "tests": 0.0, "disk_space": 30.0, "memory_usage": 10.0}
         }
         
+        # Cached health probes
+        ttl = self.config["probe_ttl"]
+        self.health = HealthProbes(self.working_directory)
+        self.health.register(HealthProbe("repository_clean", self._git_status_clean, ttl["repository_clean"], keyed=True))
+        self.health.register(HealthProbe("tests", self._test_suite_passes, ttl["tests"], keyed=True))
+        self.health.register(HealthProbe("disk_space", self._measure_disk_space, ttl["disk_space"]))
+        self.health.register(HealthProbe("memory_usage", self._measure_memory_usage, ttl["memory_usage"]))
+        
         # Initialize logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
-        # Track checkpoints and operations
-        self.checkpoints: List[SafetyCheckpoint] = []
+        # Track checkpoints (persisted, so rollbacks survive restarts) and operations
+        self.snapshots = WorktreeSnapshots(self.working_directory)
+        self.checkpoints: List[SafetyCheckpoint] = self._load_checkpoints()
         self.operation_history: List[Dict[str, Any]] = []
         
         # Emergency stop flag
@@ -143,15 +184,24 @@ class SafetyController:
         
         # Create checkpoint
         checkpoint_id = hashlib.md5(f"{git_commit}_{time.time()}".encode()).hexdigest()[:8]
+        try:
+            snapshot = self.snapshots.create(checkpoint_id, git_commit, description)
+        except (subprocess.CalledProcessError, OSError, RuntimeError) as e:
+            raise RuntimeError(f"Failed to snapshot working tree: {e}")
         checkpoint = SafetyCheckpoint(
             id=checkpoint_id,
             timestamp=datetime.now(),
             git_commit=git_commit,
             description=description,
-            metadata=metadata
+            metadata=metadata,
+            snapshot=snapshot
         )
         
         self.checkpoints.append(checkpoint)
+        for dropped in self.checkpoints[:-self.config["max_checkpoints"]]:
+            self.snapshots.drop(dropped.id)
+        self.checkpoints = self.checkpoints[-self.config["max_checkpoints"]:]
+        self._save_checkpoints()
         
         # Store in memory for persistence
         try:
@@ -168,6 +218,10 @@ class SafetyController:
     def rollback_to_checkpoint(self, checkpoint_id: str) -> bool:
         """
         Rollback to a specific checkpoint.
+        
+        HEAD, the index and the working tree return to their state at the
+        checkpoint; only files that differ are rewritten (files created
+        since are deleted), and ignored files are left alone.
         """
         # Find checkpoint
         checkpoint = None
@@ -180,53 +234,74 @@ class SafetyController:
             self.logger.error(f"Checkpoint not found: {checkpoint_id}")
             return False
         
+        if checkpoint.snapshot is None:
+            self.logger.error(f"Checkpoint has no snapshot: {checkpoint_id}")
+            return False
+        
         try:
-            # Reset to checkpoint commit
-            subprocess.run(
-                ["git", "reset", "--hard", checkpoint.git_commit],
-                cwd=self.working_directory,
-                check=True,
-                capture_output=True
-            )
-            
-            # Clean untracked files
-            subprocess.run(
-                ["git", "clean", "-fd"],
-                cwd=self.working_directory,
-                check=True,
-                capture_output=True
-            )
+            # Restore only the files that changed since the checkpoint
+            restored = self.snapshots.restore(checkpoint.snapshot, checkpoint.git_commit)
             
             # Record rollback
             self.operation_history.append({
                 "type": "rollback",
                 "timestamp": datetime.now().isoformat(),
                 "checkpoint_id": checkpoint_id,
+                "restored_files": restored,
                 "success": True
             })
             
-            self.logger.info(f"Successfully rolled back to checkpoint: {checkpoint_id}")
+            self.logger.info(f"Successfully rolled back to checkpoint: {checkpoint_id} ({len(restored)} files restored)")
             return True
             
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             self.logger.error(f"Rollback failed: {e}")
             return False
     
+    def _load_checkpoints(self) -> List[SafetyCheckpoint]:
+        try:
+            with open(self.config["checkpoints_file"]) as f:
+                return [SafetyCheckpoint.from_dict(cp) for cp in json.load(f).get("checkpoints", [])]
+        except (OSError, ValueError, KeyError, TypeError):
+            return []
+    
+    def _save_checkpoints(self):
+        checkpoints_file = self.config["checkpoints_file"]
+        tmp_file = checkpoints_file.with_name(checkpoints_file.name + ".tmp")
+        try:
+            checkpoints_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_file, 'w') as f:
+                json.dump({"checkpoints": [cp.to_dict() for cp in self.checkpoints]}, f, indent=2)
+            os.replace(tmp_file, checkpoints_file)
+        except OSError:
+            self.logger.warning("Failed to persist checkpoints")
+    
+    HEALTH_PROBES = ("repository_clean", "disk_space", "memory_usage")
+    
     def monitor_health(self) -> Dict[str, Any]:
         """
         Monitor system health and return status.
+        
+        Probe results are cached (see config["probe_ttl"]); stale ones run
+        concurrently.
         """
-        health_status = {
+        return self._health_status(self.health.collect(self.HEALTH_PROBES))
+    
+    async def monitor_health_async(self) -> Dict[str, Any]:
+        """monitor_health() for async callers (dashboards); never blocks the event loop."""
+        return self._health_status(await self.health.collect_async(self.HEALTH_PROBES))
+    
+    def _health_status(self, probes: Dict[str, Any]) -> Dict[str, Any]:
+        return {
             "timestamp": datetime.now().isoformat(),
             "emergency_stopped": self.is_emergency_stopped(),
             "checkpoints_count": len(self.checkpoints),
             "operations_last_hour": self._count_recent_operations(),
-            "repository_clean": self._is_repository_clean(),
-            "disk_space": self._check_disk_space(),
-            "memory_usage": self._check_memory_usage()
+            "repository_clean": bool(probes["repository_clean"]),
+            "disk_space": probes["disk_space"],
+            "memory_usage": probes["memory_usage"],
+            "probe_age": {name: self.health.age(name) for name in probes}
         }
-        
-        return health_status
     
     def emergency_stop(self, reason: str = "Manual emergency stop"):
         """
@@ -428,7 +503,23 @@ class SafetyController:
         return count
     
     def _is_repository_clean(self) -> bool:
-        """Check if repository has no uncommitted changes."""
+        """Check if repository has no uncommitted changes (reused only while the tree is unchanged)."""
+        return bool(self.health.get("repository_clean", fresh=True))
+    
+    def _run_tests(self) -> bool:
+        """Run tests and return success status (reruns only when the tree changed)."""
+        return bool(self.health.get("tests", fresh=True))
+    
+    def _check_disk_space(self) -> Dict[str, Any]:
+        """Check available disk space (cached probe)."""
+        return self.health.get("disk_space")
+    
+    def _check_memory_usage(self) -> Dict[str, Any]:
+        """Check memory usage (cached probe)."""
+        return self.health.get("memory_usage")
+    
+    def _git_status_clean(self) -> bool:
+        """Probe: git status reports no uncommitted changes."""
         try:
             result = subprocess.run(
                 ["git", "status", "--porcelain"],
@@ -441,8 +532,8 @@ class SafetyController:
         except:
             return False
     
-    def _run_tests(self) -> bool:
-        """Run tests and return success status."""
+    def _test_suite_passes(self) -> bool:
+        """Probe: the test suite passes."""
         try:
             result = subprocess.run(
                 ["poetry", "run", "pytest", "-x", "-q"],
@@ -454,8 +545,8 @@ class SafetyController:
         except:
             return False
     
-    def _check_disk_space(self) -> Dict[str, Any]:
-        """Check available disk space."""
+    def _measure_disk_space(self) -> Dict[str, Any]:
+        """Probe: available disk space."""
         try:
             stat = os.statvfs(self.working_directory)
             free_bytes = stat.f_frsize * stat.f_available
@@ -469,8 +560,8 @@ class SafetyController:
         except:
             return {"error": "Could not check disk space"}
     
-    def _check_memory_usage(self) -> Dict[str, Any]:
-        """Check memory usage."""
+    def _measure_memory_usage(self) -> Dict[str, Any]:
+        """Probe: memory usage."""
         try:
             import psutil
             memory = psutil.virtual_memory()
@@ -0,0 +1,248 @@
+"""
+Single-pass rule engine for CodebaseMonitor
+
+Reads every source file once and derives everything a comprehensive scan
+needs from that one read: line metrics, rule matches for every issue
+category, the AST analysis of Python files (complexity, function sizes,
+call sites) and the file facts used by pattern analysis.
+
+Features:
+- Declarative rules: a ScanRule names its category, severity, pattern and
+  description; DEFAULT_RULES holds the built-in security, quality,
+  performance and TODO checks, and more can be registered at runtime
+- Combined matcher: the patterns of all rules for a file type are joined
+  into one compiled alternation that is tried once per line; only lines
+  it matches are checked against the individual (compiled) rules
+- One pruned tree walk (ai/loop/file_walker.py) instead of an rglob per
+  extension and per category, or only an explicit list of changed files
+- Matches are reported per category in file, line and rule order, exactly
+  as the former per-category scans produced them
+- Structural checks (complexity, function length, nesting, empty
+  functions, calls inside loops) use the cached AST analysis instead of
+  line patterns
+
+Cross-references:
+    - ai/autonomous/monitor.py: CodebaseMonitor (turns a CodebaseScan into
+      metrics, issues and patterns)
+    - ai/loop/file_walker.py: walk_files(), IgnoreMatcher
+    - ai/loop/ast_analysis.py: AstAnalyzer (per-file AST facts, cached)
+"""
+from __future__ import annotations
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Pattern, Sequence, Set, Tuple
+
+from ai.loop.ast_analysis import AstAnalyzer
+from ai.loop.file_walker import IgnoreMatcher, select_files, walk_files
+
+
+@dataclass(frozen=True)
+class ScanRule:
+    """A line-level check reported as an issue of ``category``.
+
+    ``description`` may reference ``{capture}``; when ``capture`` is set,
+    the first group of the match (stripped) is reported under that name
+    in the issue details instead of the pattern and code.
+    """
+    category: str
+    severity: str
+    pattern: str
+    description: str
+    capture: Optional[str] = None
+    extensions: Tuple[str, ...] = (".py",)
+
+
+DEFAULT_RULES: Tuple[ScanRule, ...] = (
+    # Security
+    ScanRule("security", "high", r'hashlib\.md5|hashlib\.sha1', "Weak cryptographic hash function"),
+    ScanRule("security", "high", r'random\.random\(\)', "Insecure random number generation"),
+    ScanRule("security", "high", r'eval\(|exec\(', "Dangerous code execution"),
+    ScanRule("security", "high", r'pickle\.loads?', "Insecure deserialization"),
+    ScanRule("security", "high", r'subprocess\..*shell=True', "Shell injection risk"),
+    # Quality
+    ScanRule("quality", "medium", r'^.{120,}', "Line too long (>120 characters)"),
+    ScanRule("quality", "medium", r'\t', "Tab character used instead of spaces"),
+    ScanRule("quality", "medium", r'print\(|console\.log\(', "Debug print statement left in code"),
+    ScanRule("quality", "medium", r'# TODO:?\s*$', "Empty TODO comment"),
+    # Performance
+    ScanRule("performance", "medium", r'for\s+\w+\s+in\s+range\(len\(', "Inefficient loop pattern"),
+    ScanRule("performance", "medium", r'time\.sleep\(\d+\)', "Long sleep call"),
+    # TODO items
+    ScanRule("todo", "low", r'#\s*TODO:?\s*(.+)', "TODO: {todo_text}", capture="todo_text"),
+)
+
+
+class RuleMatch(NamedTuple):
+    rule: ScanRule
+    file: str          # relative to the scanned root
+    line: int          # 1-based
+    code: str          # the stripped source line
+    captured: Optional[str]
+
+    @property
+    def description(self) -> str:
+        if self.rule.capture is None:
+            return self.rule.description
+        return self.rule.description.format(**{self.rule.capture: self.captured})
+
+    @property
+    def details(self) -> Dict[str, str]:
+        if self.rule.capture is None:
+            return {"pattern": self.rule.pattern, "code": self.code}
+        return {self.rule.capture: self.captured or ""}
+
+
+@dataclass
+class CodebaseScan:
+    """Everything one pass over the tree produced."""
+    files_count: int = 0
+    total_lines: int = 0
+    code_lines: int = 0
+    comment_lines: int = 0
+    blank_lines: int = 0
+    matches: Dict[str, List[RuleMatch]] = field(default_factory=dict)
+    # Python files only (complexity, test ratio and pattern analysis)
+    python_files: int = 0
+    analyses: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    functions: int = 0
+    complexity_total: int = 0
+    test_files: int = 0
+    directories: Set[str] = field(default_factory=set)
+    snake_case_files: int = 0
+    camel_case_files: int = 0
+
+    @property
+    def source_files(self) -> int:
+        return self.python_files - self.test_files
+
+    @property
+    def complexity_average(self) -> float:
+        """Mean cyclomatic complexity per function."""
+        return self.complexity_total / self.functions if self.functions > 0 else 0.0
+
+    def issues(self, category: str) -> List[RuleMatch]:
+        return self.matches.get(category, [])
+
+
+class _CompiledRules(NamedTuple):
+    combined: Pattern[str]
+    rules: Tuple[Tuple[ScanRule, Pattern[str]], ...]
+
+
+class RuleEngine:
+    """Registered rules, compiled once per file type."""
+
+    def __init__(self, rules: Iterable[ScanRule] = DEFAULT_RULES) -> None:
+        self._rules: List[ScanRule] = []
+        self._compiled: Dict[str, Optional[_CompiledRules]] = {}
+        for rule in rules:
+            self.register(rule)
+
+    @property
+    def rules(self) -> Tuple[ScanRule, ...]:
+        return tuple(self._rules)
+
+    def register(self, rule: ScanRule) -> None:
+        """Add a rule; it applies from the next scan on."""
+        re.compile(rule.pattern)  # Fail early on an invalid pattern
+        self._rules.append(rule)
+        self._compiled.clear()
+
+    def _rules_for(self, suffix: str) -> Optional[_CompiledRules]:
+        if suffix not in self._compiled:
+            rules = [rule for rule in self._rules if suffix in rule.extensions]
+            if rules:
+                self._compiled[suffix] = _CompiledRules(
+                    combined=re.compile("|".join(f"(?:{rule.pattern})" for rule in rules)),
+                    rules=tuple((rule, re.compile(rule.pattern)) for rule in rules),
+                )
+            else:
+                self._compiled[suffix] = None
+        return self._compiled[suffix]
+
+    def match_lines(self, rel_path: str, lines: Sequence[str], suffix: str = ".py") -> Iterator[RuleMatch]:
+        """Rule matches in ``lines``, in line order and then rule order."""
+        compiled = self._rules_for(suffix)
+        if compiled is None:
+            return
+        prefilter = compiled.combined.search
+        for i, line in enumerate(lines, 1):
+            if prefilter(line) is None:
+                continue
+            for rule, pattern in compiled.rules:
+                match = pattern.search(line)
+                if match is None:
+                    continue
+                captured = None
+                if rule.capture is not None:
+                    captured = (match.group(1) if pattern.groups else match.group(0)).strip()
+                yield RuleMatch(rule, rel_path, i, line.strip(), captured)
+
+    def scan(self, root: Path, extensions: Iterable[str],
+             matcher: Optional[IgnoreMatcher] = None,
+             analyzer: Optional[AstAnalyzer] = None,
+             paths: Optional[Iterable[str]] = None) -> CodebaseScan:
+        """Read every source file under ``root`` once and collect all results.
+
+        Args:
+            root: Directory to scan
+            extensions: Source file suffixes (line metrics cover all of them)
+            matcher: Ignore rules for the walk
+            analyzer: AST analysis cache for Python files (default: uncached)
+            paths: Scan only these files (relative to ``root``) instead of
+                walking the tree; missing and ignored ones are skipped
+
+        Returns:
+            CodebaseScan with metrics, matches per category and file facts
+        """
+        root = Path(root)
+        analyzer = analyzer or AstAnalyzer(root, use_cache=False)
+        result = CodebaseScan(matches={rule.category: [] for rule in self._rules})
+        if paths is None:
+            files = walk_files(root, extensions, matcher)
+        else:
+            files = select_files(root, paths, extensions, matcher)
+        for file_path in files:
+            try:
+                with open(file_path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                continue
+            rel_path = file_path.relative_to(root).as_posix()
+            # Same text as reading in text mode (universal newlines)
+            content = data.decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+            lines = content.split('\n')
+            # A trailing newline does not start another line
+            counted = lines[:-1] if lines[-1] == '' else lines
+
+            result.files_count += 1
+            result.total_lines += len(counted)
+            for line in counted:
+                stripped = line.strip()
+                if not stripped:
+                    result.blank_lines += 1
+                elif stripped.startswith('#') or stripped.startswith('//'):
+                    result.comment_lines += 1
+                else:
+                    result.code_lines += 1
+
+            for match in self.match_lines(rel_path, lines, file_path.suffix):
+                result.matches[match.rule.category].append(match)
+
+            if file_path.suffix == ".py":
+                result.python_files += 1
+                analysis = analyzer.analyze(file_path, data)
+                if analysis is not None:
+                    result.analyses[rel_path] = analysis
+                    result.functions += len(analysis["functions"])
+                    result.complexity_total += sum(f["complexity"] for f in analysis["functions"])
+                result.directories.add(file_path.parent.name)
+                if "test" in file_path.name.lower():
+                    result.test_files += 1
+                stem = file_path.stem
+                if '_' in stem:
+                    result.snake_case_files += 1
+                elif any(c.isupper() for c in stem[1:]):
+                    result.camel_case_files += 1
+        return result
@@ -59,7 +59,7 @@ def cmd_scan(args):
     Args:
         args: Parsed command-line arguments
     """
-    tasks = scan_repository(args.path)
+    tasks = scan_repository(args.path, jobs=getattr(args, 'jobs', 1))
     
     if args.json:
         # Output as JSON for scripting
@@ -277,35 +277,55 @@ def cmd_run(args):
 
     if args.watch:
         print("👁️ Starting continuous monitoring mode...")
-        print(f"   Scanning every {args.interval} seconds")
+        on_change = getattr(args, 'on_change', False)
+        if on_change:
+            print("   Scanning when source files change")
+        else:
+            print(f"   Scanning every {args.interval} seconds")
         print(f"   Max {args.max_tasks} tasks per cycle")
         if args.stop_after > 0:
             print(f"   Will stop after {args.stop_after} cycles")
         print("   Press Ctrl+C to stop\n")
         
         async def watch():
-            from ai.loop.dev_loop import DevLoop
+            from ai.loop.dev_loop import DevLoop, wait_for_changes
             loop = DevLoop(
                 max_tasks=args.max_tasks,
                 use_dashboard=args.dashboard,
                 state_file=Path(".fresh/dev_loop_state.json")
             )
+            watcher = None
+            if on_change:
+                watcher = loop.scanner.watch(debounce=getattr(args, 'debounce', 2.0)).start()
             
             cycles = 0
-            while True:
-                try:
-                    results = await loop.run_cycle()
-                    print(f"\n✅ Cycle completed: {len(results)} tasks processed")
-                except Exception as e:
-                    print(f"\n❌ Cycle failed: {e}")
-                
-                cycles += 1
-                if args.stop_after and cycles >= args.stop_after:
-                    print(f"\n⏹️ Reached stop-after limit ({args.stop_after} cycles)")
-                    break
-
-                print(f"Waiting {args.interval} seconds...")
-                await asyncio.sleep(args.interval)
+            try:
+                while True:
+                    try:
+                        results = await loop.run_cycle()
+                        print(f"\n✅ Cycle completed: {len(results)} tasks processed")
+                    except Exception as e:
+                        print(f"\n❌ Cycle failed: {e}")
+                    
+                    cycles += 1
+                    if args.stop_after and cycles >= args.stop_after:
+                        print(f"\n⏹️ Reached stop-after limit ({args.stop_after} cycles)")
+                        break
+
+                    if watcher is not None:
+                        print("Waiting for file changes...")
+                        changed = await wait_for_changes(watcher)
+                        if not changed:
+                            break
+                        print(f"📝 {len(changed)} files changed")
+                        continue
+
+                    print(f"Waiting {args.interval} seconds...")
+                    await asyncio.sleep(args.interval)
+            finally:
+                if watcher is not None:
+                    watcher.stop()
+                loop.close()
         
         try:
             asyncio.run(watch())
@@ -659,6 +679,10 @@ def cmd_autonomous_status(args):
             except:
                 print("Emergency Reason: Unknown")
         
+        # Cached health probes: repeated polls do not fork git while the tree is unchanged
+        health = autonomous_loop.safety_controller.monitor_health()
+        print(f"Repository Clean: {'✅ Yes' if health.get('repository_clean') else '⚠️ No'}")
+        
         return 0
         
     except Exception as e:
@@ -726,7 +750,11 @@ def cmd_autonomous_start(args):
     working_dir = getattr(args, 'path', Path.cwd())
     
     print(f"🚀 Starting continuous autonomous loop in {working_dir}")
-    print(f"   Scan interval: {getattr(args, 'interval', 60)}s")
+    watch = getattr(args, 'watch', False)
+    if watch:
+        print(f"   Watching for file changes (debounce {getattr(args, 'debounce', 2.0)}s)")
+    else:
+        print(f"   Scan interval: {getattr(args, 'interval', 60)}s")
     print(f"   Max improvements per cycle: {getattr(args, 'max_improvements', 5)}")
     print(f"   Safety level: {getattr(args, 'safety_level', 'medium')}")
     print(f"   Press Ctrl+C to stop\n")
@@ -737,7 +765,9 @@ def cmd_autonomous_start(args):
         config = {
             "scan_interval": getattr(args, 'interval', 60),
             "max_improvements_per_cycle": getattr(args, 'max_improvements', 5),
-            "safety_level": getattr(args, 'safety_level', 'medium')
+            "safety_level": getattr(args, 'safety_level', 'medium'),
+            "watch_mode": watch,
+            "debounce_seconds": getattr(args, 'debounce', 2.0)
         }
         
         _autonomous_loop_instance = AutonomousLoop(
@@ -1021,6 +1051,8 @@ def main():
     scan_parser.add_argument('path', nargs='?', default='.', help='Repository path (default: current directory)')
     scan_parser.add_argument('--json', action='store_true', help='Output as JSON')
     scan_parser.add_argument('--limit', type=int, default=10, help='Max items per type to show')
+    scan_parser.add_argument('--jobs', '-j', type=int, default=1,
+                             help='Parallel scan workers (0 = one per CPU, default: 1)')
     scan_parser.set_defaults(func=cmd_scan)
     
     # Spawn command
@@ -1064,6 +1096,8 @@ def main():
     autonomous_start.add_argument('--interval', type=int, default=3600, help='Scan interval in seconds')
     autonomous_start.add_argument('--max-improvements', type=int, default=5, help='Max improvements per cycle')
     autonomous_start.add_argument('--safety-level', choices=['low', 'medium', 'high'], default='high', help='Safety level')
+    autonomous_start.add_argument('--watch', action='store_true', help='Rescan changed files as soon as they change instead of every interval')
+    autonomous_start.add_argument('--debounce', type=float, default=2.0, help='Seconds of quiet before changes start a cycle (--watch)')
     autonomous_start.set_defaults(func=cmd_autonomous_start)
     
     # Stop continuous mode
@@ -1102,6 +1136,8 @@ def main():
     run_parser.add_argument('--max-tasks', type=int, default=5, help='Max tasks per cycle')
     run_parser.add_argument('--interval', type=int, default=300, help='Seconds between cycles (watch mode)')
     run_parser.add_argument('--stop-after', type=int, default=0, help='Stop after N cycles (watch mode)')
+    run_parser.add_argument('--on-change', action='store_true', help='Start the next cycle when source files change instead of every interval (watch mode)')
+    run_parser.add_argument('--debounce', type=float, default=2.0, help='Seconds of quiet before changes start a cycle (--on-change)')
     run_parser.add_argument('--dry-run', action='store_true', help='Scan but don\'t execute agents')
     run_parser.add_argument('--dashboard', action='store_true', help='Show real-time dashboard')
     run_parser.add_argument('--offline', action='store_true', help='Run in offline mode (skip network calls)')
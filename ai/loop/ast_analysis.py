@@ -0,0 +1,246 @@
+"""AST analysis of Python files, cached per file version.
+
+One ``ast.parse`` per file version yields everything the code-quality
+tools need, as plain JSON-serialisable data:
+
+    - functions: cyclomatic complexity, length, block nesting depth, and
+      whether the body is empty (only ``pass``, ``...`` or a docstring)
+    - classes, imports and call sites (with enclosing function and whether
+      the call runs inside a loop)
+    - syntax errors
+
+Results are stored in a ScanCache (``.fresh/ast_analysis.json`` by
+default) keyed by path with the file's mtime, size and content hash, so a
+file is re-parsed only when its content changes. Every tool analysing the
+same repository shares that cache.
+
+Cyclomatic complexity follows McCabe: 1 plus one per ``if``/``elif``,
+loop, ``except`` handler, conditional expression, comprehension ``for``
+and ``if``, ``match`` case and extra boolean operand. Nested functions and
+classes are measured on their own and do not add to the enclosing scope.
+
+Cross-references:
+    - Codebase Monitor: ai/autonomous/monitor.py (complexity, structural issues)
+    - Repository Scanner: ai/loop/repo_scanner.py (find_syntax_errors)
+    - scripts/feature_inventory.py, scripts/diagnostic_scan.py
+    - Scan Cache: ai/loop/scan_cache.py
+"""
+from __future__ import annotations
+import ast
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from ai.loop.scan_cache import ScanCache, content_hash
+
+ANALYSIS_SIGNATURE = "ast-v1"
+
+_SCOPES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+_LOOPS = (ast.For, ast.AsyncFor, ast.While)
+_BLOCKS = (ast.If, ast.For, ast.AsyncFor, ast.While, ast.With, ast.AsyncWith, ast.Try, ast.Match) + (
+    (ast.TryStar,) if hasattr(ast, "TryStar") else ())
+_COMPREHENSIONS = (ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+
+
+def _decision_points(node: ast.AST) -> int:
+    if isinstance(node, (ast.If, ast.IfExp, ast.For, ast.AsyncFor, ast.While,
+                         ast.ExceptHandler, ast.match_case)):
+        return 1
+    if isinstance(node, ast.comprehension):
+        return 1 + len(node.ifs)
+    if isinstance(node, ast.BoolOp):
+        return len(node.values) - 1
+    return 0
+
+
+def measure(node: ast.AST) -> Tuple[int, int]:
+    """(cyclomatic complexity, deepest block nesting) of one scope's own code."""
+    complexity, deepest = 1, 0
+    stack = [(child, 0) for child in ast.iter_child_nodes(node)]
+    while stack:
+        item, depth = stack.pop()
+        if isinstance(item, _SCOPES):
+            continue
+        complexity += _decision_points(item)
+        inner = depth
+        if isinstance(item, _BLOCKS):
+            inner = depth + 1
+            deepest = max(deepest, inner)
+        for child in ast.iter_child_nodes(item):
+            # "elif" continues the chain at the same depth
+            elif_branch = isinstance(item, ast.If) and isinstance(child, ast.If) and item.orelse == [child]
+            stack.append((child, depth if elif_branch else inner))
+    return complexity, deepest
+
+
+def call_name(func: ast.expr) -> str:
+    """Dotted name of a call target; other bases keep only the attribute chain (``.append``)."""
+    if isinstance(func, ast.Name):
+        return func.id
+    if isinstance(func, ast.Attribute):
+        return f"{call_name(func.value)}.{func.attr}"
+    return ""
+
+
+def _is_empty_body(body: List[ast.stmt]) -> bool:
+    return all(
+        isinstance(stmt, ast.Pass)
+        or (isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Constant)
+            and (stmt.value.value is Ellipsis or isinstance(stmt.value.value, str)))
+        for stmt in body
+    )
+
+
+def _first_doc_line(node: ast.AST) -> Optional[str]:
+    doc = ast.get_docstring(node)
+    return doc.split('\n')[0] if doc else None
+
+
+def _scopes_and_calls(tree: ast.Module) -> Tuple[Dict[int, str], List[Dict[str, Any]]]:
+    """Qualified names of functions/classes (by node id) and every call site."""
+    qualnames: Dict[int, str] = {}
+    calls: List[Tuple[int, int, Dict[str, Any]]] = []
+    stack: List[Tuple[ast.AST, Optional[str], Optional[str], bool]] = [(tree, None, None, False)]
+    while stack:
+        node, prefix, function, in_loop = stack.pop()
+        if isinstance(node, ast.Call):
+            calls.append((node.lineno, node.col_offset, {
+                "name": call_name(node.func), "line": node.lineno,
+                "function": function, "in_loop": in_loop,
+            }))
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, _SCOPES):
+                qualname = f"{prefix}.{child.name}" if prefix else child.name
+                qualnames[id(child)] = qualname
+                is_function = isinstance(child, _FUNCTIONS)
+                stack.append((child, qualname, qualname if is_function else function,
+                              False if is_function else in_loop))
+                continue
+            looped = in_loop
+            if isinstance(node, _LOOPS) and (child in node.body or child in node.orelse
+                                             or (isinstance(node, ast.While) and child is node.test)):
+                looped = True
+            elif isinstance(node, _COMPREHENSIONS) and not (node.generators and child is node.generators[0]):
+                looped = True
+            elif isinstance(node, ast.comprehension) and child is not node.iter:
+                looped = True
+            stack.append((child, prefix, function, looped))
+    calls.sort(key=lambda item: (item[0], item[1]))
+    return qualnames, [call for _, _, call in calls]
+
+
+def analyze_source(source: Union[str, bytes], rel_path: str = "<unknown>") -> Dict[str, Any]:
+    """Analyse one file's source.
+
+    Returns:
+        Dict with ``error`` (None, or line and message of a syntax error),
+        ``module_complexity``, and ``functions``, ``classes`` and
+        ``imports`` in ``ast.walk`` order and ``calls`` in source order
+    """
+    analysis: Dict[str, Any] = {
+        "error": None, "module_complexity": 1,
+        "functions": [], "classes": [], "imports": [], "calls": [],
+    }
+    try:
+        tree = ast.parse(source, filename=rel_path)
+    except SyntaxError as e:
+        analysis["error"] = {"line": e.lineno or 0, "message": e.msg}
+        return analysis
+    except ValueError as e:  # e.g. null bytes
+        analysis["error"] = {"line": 0, "message": str(e)}
+        return analysis
+
+    qualnames, analysis["calls"] = _scopes_and_calls(tree)
+    analysis["module_complexity"] = measure(tree)[0]
+    for node in ast.walk(tree):
+        if isinstance(node, _FUNCTIONS):
+            complexity, nesting = measure(node)
+            end_line = getattr(node, "end_lineno", None) or node.lineno
+            analysis["functions"].append({
+                "name": node.name,
+                "qualname": qualnames[id(node)],
+                "line": node.lineno,
+                "length": end_line - node.lineno + 1,
+                "complexity": complexity,
+                "nesting": nesting,
+                "is_async": isinstance(node, ast.AsyncFunctionDef),
+                "statements": len(node.body),
+                "empty": _is_empty_body(node.body),
+                "doc": _first_doc_line(node),
+            })
+        elif isinstance(node, ast.ClassDef):
+            analysis["classes"].append({
+                "name": node.name,
+                "qualname": qualnames[id(node)],
+                "line": node.lineno,
+                "methods": [n.name for n in node.body if isinstance(n, ast.FunctionDef)],
+                "async_methods": [n.name for n in node.body if isinstance(n, ast.AsyncFunctionDef)],
+                "doc": _first_doc_line(node),
+            })
+        elif isinstance(node, ast.Import):
+            analysis["imports"].append({
+                "from": False, "module": None, "level": 0,
+                "names": [alias.name for alias in node.names],
+            })
+        elif isinstance(node, ast.ImportFrom):
+            analysis["imports"].append({
+                "from": True, "module": node.module, "level": node.level,
+                "names": [alias.name for alias in node.names],
+            })
+    return analysis
+
+
+class AstAnalyzer:
+    """Analyses of one repository's Python files, cached by file version."""
+
+    def __init__(self, repo_path: Path, cache_path: Optional[Path] = None,
+                 use_cache: bool = True) -> None:
+        self.repo_path = Path(repo_path)
+        self.cache: Optional[ScanCache] = None
+        if use_cache:
+            self.cache = ScanCache(
+                Path(cache_path) if cache_path else self.repo_path / ".fresh" / "ast_analysis.json",
+                signature=ANALYSIS_SIGNATURE,
+            )
+
+    def _key(self, file_path: Path) -> str:
+        try:
+            return file_path.relative_to(self.repo_path).as_posix()
+        except ValueError:
+            return file_path.as_posix()
+
+    def analyze(self, file_path: Path, data: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """Analysis of one file (see analyze_source), or None if it cannot be read.
+
+        Args:
+            file_path: File to analyse
+            data: The file's content, if the caller already read it
+        """
+        file_path = Path(file_path)
+        key = self._key(file_path)
+        try:
+            stat = file_path.stat()
+            if self.cache is not None:
+                cached = self.cache.lookup(key, stat)
+                if cached is not None:
+                    return cached
+            if data is None:
+                data = file_path.read_bytes()
+        except OSError:
+            return None
+        if self.cache is None:
+            return analyze_source(data, key)
+        digest = content_hash(data)
+        cached = self.cache.lookup_hash(key, stat, digest)
+        if cached is not None:
+            return cached
+        analysis = analyze_source(data, key)
+        self.cache.store(key, stat, digest, analysis)
+        return analysis
+
+    def save(self) -> bool:
+        """Drop entries for deleted files and write the cache if it changed."""
+        if self.cache is None:
+            return True
+        self.cache.retain(path for path in self.cache.paths() if (self.repo_path / path).is_file())
+        return self.cache.save()
@@ -8,6 +8,7 @@ This module implements the main development loop that:
 Cross-references:
     - ADR-008: Autonomous Development Loop Architecture
     - Repository Scanner: ai/loop/repo_scanner.py
+    - File Watcher: ai/loop/fs_watch.py (run_continuous_loop(watch=True))
     - Mother Agent: ai/agents/mother.py
     - GitHub Integration: ai/integration/github.py
 """
@@ -16,9 +17,10 @@ import asyncio
 import json
 import logging
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 from datetime import datetime
 
+from ai.loop.fs_watch import ChangeWatcher
 from ai.loop.repo_scanner import RepoScanner, Task, TaskType
 from ai.agents.mother import MotherAgent, AgentResult
 from ai.memory.store import get_store
@@ -42,7 +44,8 @@ class DevLoop:
         task_types: Optional[List[TaskType]] = None,
         state_file: Optional[Path] = None,
         dry_run: bool = False,
-        use_dashboard: bool = False
+        use_dashboard: bool = False,
+        type_daemon: bool = True
     ):
         """Initialize development loop.
         
@@ -52,6 +55,7 @@ class DevLoop:
             task_types: Types of tasks to process (None = all)
             state_file: File to persist processed tasks state
             dry_run: If True, scan but don't execute agents
+            type_daemon: Keep a mypy daemon across cycles (stopped by close())
         """
         self.repo_path = repo_path
         self.max_tasks = max_tasks
@@ -61,7 +65,7 @@ class DevLoop:
         self.use_dashboard = use_dashboard
         
         # Initialize components
-        self.scanner = RepoScanner(repo_path)
+        self.scanner = RepoScanner(repo_path, type_daemon=type_daemon)
         self.mother_agent = MotherAgent()
         self.processed_tasks: List[Task] = []
         
@@ -69,6 +73,10 @@ class DevLoop:
         if self.state_file:
             self.load_state()
     
+    def close(self) -> None:
+        """Release background resources (the scanner's mypy daemon)."""
+        self.scanner.close()
+    
     async def run_cycle(self) -> List[AgentResult]:
         """Run a single development cycle.
         
@@ -85,9 +93,12 @@ class DevLoop:
             except ImportError:
                 pass
         
-        # Scan repository
-        tasks = self.scanner.scan()
+        # Scan repository (external checkers run concurrently)
+        tasks = await self.scanner.scan_async()
         logger.info(f"Found {len(tasks)} tasks in repository")
+        skipped = {name: status for name, status in self.scanner.checker_status.items() if status != "ok"}
+        if skipped:
+            logger.warning(f"Partial scan results; checkers skipped: {skipped}")
         
         # Update dashboard with results
         if self.use_dashboard:
@@ -313,14 +324,19 @@ async def run_development_cycle(
         List of agent results
     """
     loop = DevLoop(repo_path, max_tasks, task_types)
-    return await loop.run_cycle()
+    try:
+        return await loop.run_cycle()
+    finally:
+        loop.close()
 
 
 async def run_continuous_loop(
     interval: int = 300,
     repo_path: str = ".",
     max_tasks: int = 10,
-    stop_after: Optional[int] = None
+    stop_after: Optional[int] = None,
+    watch: bool = False,
+    debounce: float = 2.0
 ) -> None:
     """Run continuous development loop.
     
@@ -329,31 +345,63 @@ async def run_continuous_loop(
         repo_path: Repository path to scan
         max_tasks: Maximum tasks per cycle
         stop_after: Stop after N cycles (None = infinite)
+        watch: Instead of waiting ``interval`` seconds, start the next cycle
+            as soon as source files change (the scanner's caches limit the
+            rescan to the changed files)
+        debounce: Seconds of quiet before changes start a cycle (watch mode)
     """
     loop = DevLoop(
         repo_path=repo_path,
         max_tasks=max_tasks,
         state_file=Path(".fresh/dev_loop_state.json")
     )
+    watcher = loop.scanner.watch(debounce=debounce).start() if watch else None
     
     cycles = 0
-    while True:
-        logger.info(f"Starting cycle {cycles + 1}")
-        
-        try:
-            results = await loop.run_cycle()
-            logger.info(f"Cycle completed with {len(results)} tasks processed")
-        except Exception as e:
-            logger.error(f"Cycle failed: {e}")
-        
-        cycles += 1
-        
-        if stop_after and cycles >= stop_after:
-            logger.info(f"Stopping after {cycles} cycles")
-            break
+    try:
+        while True:
+            logger.info(f"Starting cycle {cycles + 1}")
+            
+            try:
+                results = await loop.run_cycle()
+                logger.info(f"Cycle completed with {len(results)} tasks processed")
+            except Exception as e:
+                logger.error(f"Cycle failed: {e}")
             
-        logger.info(f"Waiting {interval} seconds until next cycle...")
-        await asyncio.sleep(interval)
+            cycles += 1
+            
+            if stop_after and cycles >= stop_after:
+                logger.info(f"Stopping after {cycles} cycles")
+                break
+                
+            if watcher is not None:
+                logger.info("Waiting for file changes...")
+                changed = await wait_for_changes(watcher)
+                if not changed:
+                    break
+                logger.info(f"{len(changed)} files changed: {sorted(changed)[:5]}")
+                continue
+            
+            logger.info(f"Waiting {interval} seconds until next cycle...")
+            await asyncio.sleep(interval)
+    finally:
+        if watcher is not None:
+            watcher.stop()
+        loop.close()
+
+
+async def wait_for_changes(watcher: ChangeWatcher) -> Set[str]:
+    """Wait in a worker thread for the watcher's next batch of changes.
+    
+    Stopping the watcher (e.g. in a ``finally`` after cancellation) ends the wait.
+    
+    Args:
+        watcher: Started ChangeWatcher
+        
+    Returns:
+        Changed paths relative to the watched root (empty once stopped)
+    """
+    return await asyncio.to_thread(watcher.wait_for_changes)
 
 
 def process_task(
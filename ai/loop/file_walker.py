@@ -0,0 +1,228 @@
+"""Pruned, single-pass file walker for repository scans.
+
+Walks a tree once with ``os.scandir`` and decides for every directory
+whether to descend *before* entering it, so ignored trees such as
+``node_modules``, ``.git`` or ``.venv`` are never listed. Files are yielded
+lazily in a deterministic (name-sorted, depth-first) order.
+
+Ignore rules:
+    - Name patterns (RepoScanner.ignore_patterns): exact names or globs
+      matched against each path component, compiled into one regex
+    - ``.gitignore`` files at any level, with git's semantics for comments,
+      negation (``!``), directory-only (trailing ``/``), anchoring (a ``/``
+      inside the pattern) and ``**``; the last matching rule wins
+
+select_files() applies the same name patterns to an explicit list of
+paths (e.g. the files a ChangeWatcher reported) instead of walking.
+
+Cross-references:
+    - Repository Scanner: ai/loop/repo_scanner.py (_find_source_files)
+    - File Watcher: ai/loop/fs_watch.py
+    - Scan Cache: ai/loop/scan_cache.py
+"""
+from __future__ import annotations
+import fnmatch
+import os
+import re
+from pathlib import Path, PurePosixPath
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+
+class GitIgnoreRule(NamedTuple):
+    base: str          # directory holding the .gitignore, relative posix ("" = root)
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+    anchored: bool     # match the path relative to base, not just the name
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a gitignore glob into a regex body (``/`` is a separator)."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == n:
+            out.append("(?:/.*)?")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif c == "*":
+            out.append("[^/]*")
+            i += 1
+        elif c == "?":
+            out.append("[^/]")
+            i += 1
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\") + "]")
+                i = end + 1
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+    return "".join(out)
+
+
+def parse_gitignore(lines: Iterable[str], base: str = "") -> List[GitIgnoreRule]:
+    """Parse .gitignore lines into rules relative to ``base``."""
+    rules = []
+    for raw in lines:
+        line = raw.rstrip("\n").rstrip("\r")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\"):
+            line = line[1:]  # escaped leading "#" or "!"
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+        anchored = "/" in line
+        line = line.lstrip("/")
+        rules.append(GitIgnoreRule(
+            base=base,
+            regex=re.compile(_glob_to_regex(line) + r"\Z"),
+            negate=negate,
+            dir_only=dir_only,
+            anchored=anchored,
+        ))
+    return rules
+
+
+class IgnoreMatcher:
+    """Precompiled name patterns plus optional .gitignore rules."""
+
+    GITIGNORE = ".gitignore"
+
+    def __init__(self, patterns: Sequence[str] = (), use_gitignore: bool = True) -> None:
+        self.use_gitignore = use_gitignore
+        self._names = frozenset(p for p in patterns if not any(ch in p for ch in "*?["))
+        globs = [fnmatch.translate(p) for p in patterns if p not in self._names]
+        self._globs: Optional[Pattern[str]] = re.compile("|".join(globs)) if globs else None
+
+    def matches_name(self, name: str) -> bool:
+        """True if a single path component matches an ignore pattern."""
+        if name in self._names:
+            return True
+        return self._globs is not None and self._globs.match(name) is not None
+
+    def matches_path(self, rel_parts: Sequence[str]) -> bool:
+        """True if any component of a relative path matches an ignore pattern."""
+        return any(self.matches_name(part) for part in rel_parts)
+
+    @staticmethod
+    def gitignored(rules: Sequence[GitIgnoreRule], rel_path: str, name: str, is_dir: bool) -> bool:
+        """Apply gitignore rules (last match wins) to one entry."""
+        ignored = False
+        for rule in rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.anchored:
+                if rule.base:
+                    if not rel_path.startswith(rule.base + "/"):
+                        continue
+                    subject = rel_path[len(rule.base) + 1:]
+                else:
+                    subject = rel_path
+            else:
+                subject = name
+            if rule.regex.match(subject):
+                ignored = not rule.negate
+        return ignored
+
+    def load_gitignore(self, directory: str, rel_dir: str) -> List[GitIgnoreRule]:
+        if not self.use_gitignore:
+            return []
+        try:
+            with open(os.path.join(directory, self.GITIGNORE), "r", encoding="utf-8", errors="replace") as f:
+                return parse_gitignore(f, rel_dir)
+        except OSError:
+            return []
+
+
+def walk_files(root: Path, extensions: Optional[Iterable[str]] = None,
+               matcher: Optional[IgnoreMatcher] = None) -> Iterator[Path]:
+    """Yield files under ``root`` lazily, pruning ignored directories.
+
+    Args:
+        root: Directory to walk
+        extensions: File suffixes to yield (e.g. ".py"); None yields every file
+        matcher: Ignore rules (default: none, but .gitignore files apply)
+
+    Symlinked directories are not followed; unreadable directories are skipped.
+    """
+    matcher = matcher or IgnoreMatcher()
+    suffixes = tuple(extensions) if extensions is not None else None
+    root = Path(root)
+    stack: List[Tuple[str, str, Tuple[GitIgnoreRule, ...]]] = [(str(root), "", ())]
+
+    while stack:
+        directory, rel_dir, inherited = stack.pop()
+        rules = inherited + tuple(matcher.load_gitignore(directory, rel_dir))
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if matcher.matches_name(name):
+                continue
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if rules and matcher.gitignored(rules, rel_path, name, is_dir):
+                continue
+            if is_dir:
+                subdirs.append((entry.path, rel_path, rules))
+            elif suffixes is None or name.endswith(suffixes):
+                yield root / rel_path
+        # Depth-first in name order: push in reverse so the first name pops first
+        stack.extend(reversed(subdirs))
+
+
+def select_files(root: Path, rel_paths: Iterable[str], extensions: Optional[Iterable[str]] = None,
+                 matcher: Optional[IgnoreMatcher] = None) -> Iterator[Path]:
+    """Yield the listed files that a walk would yield, in sorted order.
+
+    Args:
+        root: Directory the paths are relative to (posix separators)
+        rel_paths: Candidate files; duplicates are reported once
+        extensions: File suffixes to yield; None yields every file
+        matcher: Name patterns to apply (.gitignore files are not consulted)
+
+    Paths that do not exist (e.g. deleted files) are skipped.
+    """
+    matcher = matcher or IgnoreMatcher()
+    suffixes = tuple(extensions) if extensions is not None else None
+    root = Path(root)
+    for rel_path in sorted(set(rel_paths)):
+        if suffixes is not None and not rel_path.endswith(suffixes):
+            continue
+        if matcher.matches_path(PurePosixPath(rel_path).parts):
+            continue
+        file_path = root / rel_path
+        if file_path.is_file():
+            yield file_path
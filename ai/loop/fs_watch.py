@@ -0,0 +1,210 @@
+"""Filesystem watcher reporting which source files changed.
+
+Continuous loops use a ChangeWatcher instead of sleeping a fixed interval
+and rescanning the whole tree: wait_for_changes() blocks until source files
+change, lets a burst of writes settle (debounce) and returns the changed
+paths, so discovery only has to look at the dirty set. An idle repository
+costs no scan at all, and a change is picked up within seconds.
+
+Backends:
+    - watchdog (inotify, FSEvents, ReadDirectoryChangesW) when installed;
+      ignore name patterns are applied to each event path
+    - Polling fallback: the pruned walk of walk_files() (name patterns and
+      .gitignore) comparing mtime and size every ``poll_interval``
+      seconds; no file is read
+
+Cross-references:
+    - Autonomous Loop: ai/autonomous/loop.py (``watch_mode``)
+    - Codebase Monitor: ai/autonomous/monitor.py (watch, comprehensive_scan(paths))
+    - Development Loop: ai/loop/dev_loop.py (run_continuous_loop(watch=True))
+    - File Walker: ai/loop/file_walker.py
+"""
+from __future__ import annotations
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from ai.loop.file_walker import IgnoreMatcher, walk_files
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+# Longest a waiter sleeps before re-checking its stop event
+STOP_CHECK_SECONDS = 0.5
+
+
+class _EventHandler(FileSystemEventHandler):
+    """Forwards watchdog file events to the watcher."""
+
+    def __init__(self, watcher: "ChangeWatcher") -> None:
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event) -> None:
+        if event.is_directory:
+            return
+        paths = [event.src_path, getattr(event, "dest_path", None)]
+        self.watcher._record(filter(None, (self.watcher._relative(p) for p in paths if p)))
+
+
+class ChangeWatcher:
+    """Collects changed source files under one directory tree."""
+
+    def __init__(self, root: Path, extensions: Optional[Iterable[str]] = None,
+                 matcher: Optional[IgnoreMatcher] = None, debounce: float = 2.0,
+                 poll_interval: float = 2.0, use_watchdog: Optional[bool] = None) -> None:
+        """Configure a watcher; nothing is watched until start().
+
+        Args:
+            root: Directory to watch
+            extensions: File suffixes to report (None reports every file)
+            matcher: Ignore rules (default: none, but .gitignore files apply
+                when polling)
+            debounce: Seconds without further changes before a batch is returned
+            poll_interval: Seconds between polls of the fallback backend
+            use_watchdog: Force (True) or disable (False) the watchdog
+                backend; None uses it when installed
+        """
+        self.root = Path(os.path.abspath(root))
+        self.extensions = tuple(extensions) if extensions is not None else None
+        self.matcher = matcher or IgnoreMatcher()
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        if use_watchdog and not WATCHDOG_AVAILABLE:
+            raise RuntimeError("watchdog is not installed")
+        self.use_watchdog = WATCHDOG_AVAILABLE if use_watchdog is None else use_watchdog
+        self._observer = None
+        self._snapshot: Optional[Dict[str, Tuple[int, int]]] = None
+        self._pending: Set[str] = set()
+        self._last_change = 0.0
+        self._lock = threading.Lock()
+        self._signal = threading.Event()
+        self._running = False
+
+    @property
+    def backend(self) -> str:
+        return "watchdog" if self.use_watchdog else "polling"
+
+    def start(self) -> "ChangeWatcher":
+        """Begin collecting changes; later edits are reported, existing files are not."""
+        if self._running:
+            return self
+        self._signal.clear()
+        if self.use_watchdog:
+            self._observer = Observer()
+            self._observer.schedule(_EventHandler(self), str(self.root), recursive=True)
+            self._observer.start()
+        else:
+            self._snapshot = self._take_snapshot()
+        self._running = True
+        return self
+
+    def stop(self) -> None:
+        """Stop watching and wake up any waiter."""
+        self._running = False
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=5)
+            self._observer = None
+        self._snapshot = None
+        self._signal.set()
+
+    def __enter__(self) -> "ChangeWatcher":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def wait_for_changes(self, timeout: Optional[float] = None,
+                         stop_event: Optional[threading.Event] = None) -> Set[str]:
+        """Block until files changed and then stayed quiet for ``debounce`` seconds.
+
+        Changes made while no one is waiting are kept for the next call.
+        Returns at once if the watcher is not started (or was stopped).
+
+        Args:
+            timeout: Give up after this many seconds without a change (None waits forever)
+            stop_event: Return early (with no changes) once this is set
+
+        Returns:
+            Changed paths relative to the root (created, modified, deleted or
+            moved), or an empty set on timeout, stop() or stop_event
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        next_poll = 0.0
+        while self._running:
+            now = time.monotonic()
+            if not self.use_watchdog and now >= next_poll:
+                self._record(self._poll())
+                next_poll = now + self.poll_interval
+            with self._lock:
+                quiet_for = time.monotonic() - self._last_change
+                if self._pending and quiet_for >= self.debounce:
+                    changed, self._pending = self._pending, set()
+                    return changed
+                settling = bool(self._pending)
+            if stop_event is not None and stop_event.is_set():
+                break
+            now = time.monotonic()
+            step: Optional[float] = None
+            if settling:
+                step = self.debounce - quiet_for
+            elif deadline is not None:
+                if now >= deadline:
+                    break
+                step = deadline - now
+            if not self.use_watchdog:
+                step = min(step, next_poll - now) if step is not None else next_poll - now
+            if stop_event is not None:
+                step = min(step, STOP_CHECK_SECONDS) if step is not None else STOP_CHECK_SECONDS
+            self._signal.wait(None if step is None else max(step, 0.0))
+            self._signal.clear()
+        return set()
+
+    def _record(self, rel_paths: Iterable[str]) -> None:
+        rel_paths = set(rel_paths)
+        if not rel_paths:
+            return
+        with self._lock:
+            self._pending |= rel_paths
+            self._last_change = time.monotonic()
+        self._signal.set()
+
+    def _relative(self, path: str) -> Optional[str]:
+        """Reportable path relative to the root, or None."""
+        try:
+            rel = Path(path).relative_to(self.root)
+        except ValueError:
+            return None
+        if self.extensions is not None and not rel.name.endswith(self.extensions):
+            return None
+        if self.matcher.matches_path(rel.parts):
+            return None
+        return rel.as_posix()
+
+    def _take_snapshot(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        for file_path in walk_files(self.root, self.extensions, self.matcher):
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                continue
+            snapshot[file_path.relative_to(self.root).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def _poll(self) -> Set[str]:
+        """Paths whose mtime or size changed, appeared or vanished since the last poll."""
+        previous = self._snapshot or {}
+        current = self._take_snapshot()
+        self._snapshot = current
+        changed = {path for path, version in current.items() if previous.get(path) != version}
+        changed.update(path for path in previous if path not in current)
+        return changed
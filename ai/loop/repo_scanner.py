@@ -8,19 +8,162 @@ Cross-references:
     - ADR-008: Autonomous Development Loop Architecture
     - Mother Agent: ai/agents/mother.py for task dispatch
     - Development Loop: ai/loop/dev_loop.py for task execution
+    - Scan Cache: ai/loop/scan_cache.py for incremental rescans
+    - File Walker: ai/loop/file_walker.py for pruned enumeration
+    - Test Impact: ai/loop/test_impact.py for incremental test runs
+    - Type Checker: ai/loop/type_checker.py for the mypy daemon
+    - AST Analysis: ai/loop/ast_analysis.py for syntax errors
 """
 from __future__ import annotations
+import asyncio
+import io
+import logging
+import multiprocessing
+import os
 import re
 import subprocess
 import json
+import tempfile
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from enum import Enum
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import List, Optional, Dict, Any
-import fnmatch
+from typing import Deque, Iterator, List, Optional, Dict, Any, Tuple
 
+from ai.loop.ast_analysis import AstAnalyzer
+from ai.loop.file_walker import IgnoreMatcher, walk_files
+from ai.loop.fs_watch import ChangeWatcher
+from ai.loop.scan_cache import ScanCache, content_hash, git_clean_blobs
+from ai.loop.test_impact import TestImpactMap, parse_junit_report
+from ai.loop.type_checker import DaemonFailed, MypyDaemon, parse_mypy_output
 from ai.utils.settings import TIMEOUT_SECONDS
 
+logger = logging.getLogger(__name__)
+
+TODO_PATTERN = re.compile(r'#\s*(TODO|FIXME):\s*(.+)', re.IGNORECASE)
+
+# Changed-mtime files with cache entries before asking git for blob ids;
+# below this, reading and hashing the few changed files is cheaper
+GIT_LOOKUP_THRESHOLD = 64
+
+# Files per parallel-scan task (one thread task reads them, one process task parses them)
+SCAN_BATCH_SIZE = 32
+
+
+def resolve_jobs(jobs: Optional[int]) -> int:
+    """Worker count for a scan: ``None``/``0`` means one per CPU."""
+    if not jobs:
+        return os.cpu_count() or 1
+    return max(1, jobs)
+
+
+def parse_todo_lines(rel_path: str, lines: List[str]) -> List[Dict[str, Any]]:
+    """Extract TODO/FIXME tasks (as ``Task.to_dict()`` dicts) from one file's lines."""
+    tasks = []
+    for line_num, line in enumerate(lines, 1):
+        match = TODO_PATTERN.search(line)
+        if match:
+            task_type = match.group(1).upper()
+            description = f"{task_type}: {match.group(2).strip()}"
+            
+            # Get context (3 lines before and after)
+            start = max(0, line_num - 3)
+            end = min(len(lines), line_num + 2)
+            context = ''.join(lines[start:end])
+            
+            tasks.append({
+                "type": "TODO" if task_type == "TODO" else "FIXME",
+                "description": description,
+                "file_path": rel_path,
+                "line_number": line_num,
+                "priority": 2 if task_type == "FIXME" else 1,
+                "context": context
+            })
+    return tasks
+
+
+def parse_todo_bytes(rel_path: str, data: bytes) -> List[Dict[str, Any]]:
+    """parse_todo_lines() over raw file content; non-UTF-8 files have no TODOs."""
+    try:
+        lines = io.StringIO(data.decode('utf-8'), newline=None).readlines()
+    except UnicodeDecodeError:
+        return []
+    return parse_todo_lines(rel_path, lines)
+
+
+def _read_todos(file_path: Path, rel_path: str,
+                expected_hash: Optional[str]) -> Optional[Tuple[str, Optional[List[Dict[str, Any]]]]]:
+    """Read and hash one file, parsing it unless its hash is ``expected_hash``.
+    
+    Returns (content hash, result dicts or None if not parsed), or None if
+    the file can't be read.
+    """
+    try:
+        data = file_path.read_bytes()
+    except OSError:
+        return None
+    digest = content_hash(data)
+    if digest == expected_hash:
+        return digest, None
+    return digest, parse_todo_bytes(rel_path, data)
+
+
+def parse_todo_batch(items: List[Tuple[str, bytes]]) -> List[List[Dict[str, Any]]]:
+    """parse_todo_bytes() over (rel_path, content) pairs; one process-pool task."""
+    return [parse_todo_bytes(rel_path, data) for rel_path, data in items]
+
+
+def _read_todo_batch(batch: List[Tuple[Path, str, Optional[str]]],
+                     parsers: Optional[Executor] = None) -> List[Optional[Tuple[str, Optional[List[Dict[str, Any]]]]]]:
+    """_read_todos() over (path, rel_path, expected hash) triples.
+    
+    Runs on a scan worker thread: files are read and hashed here, and the
+    ones that need parsing go to ``parsers`` as a single task.
+    """
+    results: List[Optional[tuple]] = []
+    to_parse: List[Tuple[str, bytes]] = []
+    positions: List[int] = []
+    for file_path, rel_path, expected_hash in batch:
+        try:
+            data = file_path.read_bytes()
+        except OSError:
+            results.append(None)
+            continue
+        digest = content_hash(data)
+        results.append((digest, None))
+        if digest != expected_hash:
+            to_parse.append((rel_path, data))
+            positions.append(len(results) - 1)
+    if to_parse:
+        parsed = None
+        if parsers is not None:
+            try:
+                parsed = parsers.submit(parse_todo_batch, to_parse).result()
+            except BrokenProcessPool:
+                pass  # Workers could not start or died; parse on this thread
+        if parsed is None:
+            parsed = parse_todo_batch(to_parse)
+        for position, entries in zip(positions, parsed):
+            results[position] = (results[position][0], entries)
+    return results
+
+
+def _start_process_pool(jobs: int) -> Optional[ProcessPoolExecutor]:
+    """Process pool for parsing, or None where processes are unavailable.
+    
+    Workers are started lazily from scan threads, so they must not be
+    forked from this (multi-threaded) process: the forkserver (or spawn)
+    start method is used instead of the POSIX default.
+    """
+    try:
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        return ProcessPoolExecutor(max_workers=jobs, mp_context=context)
+    except (OSError, ValueError, NotImplementedError, ImportError):
+        return None
+
 
 class TaskType(Enum):
     """Types of tasks that can be detected."""
@@ -53,6 +196,18 @@ class Task:
             "context": self.context
         }
     
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Task":
+        """Create a task from ``to_dict()`` output."""
+        return cls(
+            type=TaskType(data["type"]),
+            description=data["description"],
+            file_path=data["file_path"],
+            line_number=data["line_number"],
+            priority=data.get("priority", 1),
+            context=data.get("context")
+        )
+    
     def __eq__(self, other) -> bool:
         """Check equality based on core attributes."""
         if not isinstance(other, Task):
@@ -78,167 +233,351 @@ class RepoScanner:
         ".mypy_cache", ".ruff_cache"
     ]
     
-    def __init__(self, repo_path: str = ".", ignore_patterns: Optional[List[str]] = None):
+    SOURCE_EXTENSIONS = ('.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.rs', '.java', '.c', '.cpp', '.h')
+    
+    # External checkers: name -> output parser method, in scan order
+    CHECKER_PARSERS = {
+        "tests": "_parse_pytest_output",
+        "types": "_parse_mypy_output",
+        "git": "_parse_git_diff_output",
+    }
+    DEFAULT_CHECKER_TIMEOUTS = {"tests": 30.0, "types": 30.0, "git": float(TIMEOUT_SECONDS)}
+    PYTEST_COMMAND = ["poetry", "run", "pytest"]
+    
+    def __init__(self, repo_path: str = ".", ignore_patterns: Optional[List[str]] = None,
+                 cache_path: Optional[str] = None, use_cache: bool = True,
+                 use_gitignore: bool = True, jobs: int = 1,
+                 checker_timeouts: Optional[Dict[str, float]] = None,
+                 incremental_tests: bool = True, type_daemon: bool = False):
         """Initialize scanner with repository path.
         
         Args:
             repo_path: Path to repository to scan
             ignore_patterns: Patterns to ignore during scanning
+            cache_path: Per-file scan cache location
+                (default: <repo_path>/.fresh/scan_cache.json)
+            use_cache: Reuse results for unchanged files across scans (also
+                the shared AST analysis cache, <repo_path>/.fresh/ast_analysis.json)
+            use_gitignore: Also skip files excluded by .gitignore files
+            jobs: Parallel workers for the TODO scan (0 = one per CPU)
+            checker_timeouts: Per-checker timeouts in seconds ("tests",
+                "types", "git"), merged over DEFAULT_CHECKER_TIMEOUTS
+            incremental_tests: Only run tests affected by changes since the
+                last run, plus last-failed tests (see ai/loop/test_impact.py)
+            type_daemon: Check types with a dmypy daemon kept across scans
+                (falls back to cold mypy); stop it with close()
         """
         self.repo_path = Path(repo_path)
+        self.jobs = resolve_jobs(jobs)
+        self.checker_timeouts = {**self.DEFAULT_CHECKER_TIMEOUTS, **(checker_timeouts or {})}
+        self.checker_status: Dict[str, str] = {}
+        self.incremental_tests = incremental_tests
+        self._impact: Optional[TestImpactMap] = None
+        self._test_report: Optional[Path] = None
         self.ignore_patterns = ignore_patterns or self.DEFAULT_IGNORE_PATTERNS
+        self._ignore = IgnoreMatcher(self.ignore_patterns, use_gitignore=use_gitignore)
+        self._dmypy = MypyDaemon(self.repo_path, self._ignore) if type_daemon else None
+        self._types_via_daemon = False
+        self.analyzer = AstAnalyzer(self.repo_path, use_cache=use_cache)
+        self.cache: Optional[ScanCache] = None
+        if use_cache:
+            self.cache = ScanCache(
+                Path(cache_path) if cache_path else self.repo_path / ".fresh" / "scan_cache.json",
+                signature=TODO_PATTERN.pattern,
+            )
     
     def scan(self) -> List[Task]:
         """Perform comprehensive repository scan.
         
+        The file scan and the external checkers run concurrently on worker
+        threads; see scan_async() for the asyncio variant. A step that
+        raises contributes no tasks and is recorded as "error" in
+        ``checker_status``; the other steps' results are still returned.
+        
         Returns:
             List of tasks found, prioritized by importance
         """
         tasks = []
+        self.checker_status = {}
         
-        # Find TODOs and FIXMEs
-        tasks.extend(self.find_todos())
-        
-        # Find failing tests
-        tasks.extend(self.find_failing_tests())
-        
-        # Find type errors
-        tasks.extend(self.find_type_errors())
-        
-        # Find uncommitted changes
-        tasks.extend(self.parse_git_diff())
+        with ThreadPoolExecutor(max_workers=5, thread_name_prefix="repo_check") as pool:
+            futures = [
+                # Find TODOs and FIXMEs
+                pool.submit(self._guarded, "todos", self.find_todos),
+                # Find files that do not parse
+                pool.submit(self._guarded, "syntax", self.find_syntax_errors),
+                # Find failing tests
+                pool.submit(self._guarded, "tests", self.find_failing_tests),
+                # Find type errors
+                pool.submit(self._guarded, "types", self.find_type_errors),
+                # Find uncommitted changes
+                pool.submit(self._guarded, "git", self.parse_git_diff),
+            ]
+            for future in futures:
+                tasks.extend(future.result())
         
         # Prioritize and return
         return self.prioritize_tasks(tasks)
     
-    def find_todos(self) -> List[Task]:
+    def _guarded(self, name: str, step) -> List[Task]:
+        """Run one scan step; a failure is logged and recorded instead of raised."""
+        try:
+            return list(step())
+        except Exception as e:
+            logger.warning(f"{name} scan failed: {e}")
+            self.checker_status[name] = "error"
+            return []
+    
+    def find_todos(self, jobs: Optional[int] = None) -> List[Task]:
         """Find TODO and FIXME comments in code.
         
+        Files whose mtime/size or content hash match the scan cache are not
+        re-parsed; see ai/loop/scan_cache.py.
+        
+        Args:
+            jobs: Worker count (default: the scanner's ``jobs``); see iter_todos()
+        
         Returns:
             List of TODO/FIXME tasks
         """
-        tasks = []
-        todo_pattern = re.compile(r'#\s*(TODO|FIXME):\s*(.+)', re.IGNORECASE)
+        return list(self.iter_todos(jobs))
+    
+    def iter_todos(self, jobs: Optional[int] = None) -> Iterator[Task]:
+        """Yield TODO and FIXME tasks file by file, in walk order.
+        
+        With ``jobs > 1`` files are read and hashed on a thread pool and
+        parsed on a process pool; results are still yielded in walk order,
+        so output is identical to a sequential scan. The cache is pruned
+        and saved once the iterator is exhausted.
+        
+        Args:
+            jobs: Worker count (default: the scanner's ``jobs``)
+        """
+        jobs = self.jobs if jobs is None else resolve_jobs(jobs)
+        planned = self._plan_todo_scan()
+        results = self._scan_parallel(planned, jobs) if jobs > 1 else self._scan_sequential(planned)
+        scanned = []
+        
+        for key, entries in results:
+            if entries is None:
+                continue  # Unreadable
+            scanned.append(key)
+            for entry in entries:
+                yield Task.from_dict(entry)
+        
+        if self.cache is not None:
+            self.cache.retain(scanned)
+            self.cache.save()
+    
+    def _plan_todo_scan(self) -> Iterator[tuple]:
+        """Yield (path, key, stat, cached results or None) per source file.
+        
+        Resolves everything the cache can answer without reading the file;
+        ``stat`` is None when caching is disabled.
+        """
+        git_blobs: Optional[Dict[str, str]] = None
+        changed = 0
         
         for file_path in self._find_source_files():
-            if self._should_ignore(file_path):
+            key = file_path.relative_to(self.repo_path).as_posix()
+            if self.cache is None:
+                yield file_path, key, None, None
                 continue
-                
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    
-                for line_num, line in enumerate(lines, 1):
-                    match = todo_pattern.search(line)
-                    if match:
-                        task_type = match.group(1).upper()
-                        description = f"{task_type}: {match.group(2).strip()}"
-                        
-                        # Get context (3 lines before and after)
-                        start = max(0, line_num - 3)
-                        end = min(len(lines), line_num + 2)
-                        context = ''.join(lines[start:end])
-                        
-                        tasks.append(Task(
-                            type=TaskType.TODO if task_type == "TODO" else TaskType.FIXME,
-                            description=description,
-                            file_path=str(file_path.relative_to(self.repo_path)),
-                            line_number=line_num,
-                            priority=2 if task_type == "FIXME" else 1,
-                            context=context
-                        ))
-            except Exception:
+                stat = file_path.stat()
+            except OSError:
                 # Skip files that can't be read
                 continue
+            cached = self.cache.lookup(key, stat)
+            if cached is None and key in self.cache:
+                changed += 1
+                if git_blobs is None and changed > GIT_LOOKUP_THRESHOLD:
+                    git_blobs = git_clean_blobs(self.repo_path)
+                if git_blobs and key in git_blobs:
+                    cached = self.cache.lookup_hash(key, stat, git_blobs[key], from_git=True)
+            yield file_path, key, stat, cached
+    
+    def _scan_sequential(self, planned) -> Iterator[tuple]:
+        """Yield (key, result dicts or None if unreadable) on this thread."""
+        for file_path, key, stat, cached in planned:
+            if cached is not None:
+                yield key, cached
+                continue
+            read = _read_todos(file_path, key, self._expected_hash(key))
+            yield key, self._settle(key, stat, read)
+    
+    def _scan_parallel(self, planned, jobs: int) -> Iterator[tuple]:
+        """Like _scan_sequential, with reads on threads and parsing on processes.
+        
+        Files that need reading are grouped into batches of SCAN_BATCH_SIZE
+        (one thread task and one process task each, to amortise hand-off
+        costs). At most ``jobs * 2`` batches are in flight; results are
+        consumed in walk order, and the cache is only touched on this thread.
+        """
+        window = jobs * 2 * SCAN_BATCH_SIZE
+        parsers = _start_process_pool(jobs)
+        pending: Deque[list] = deque()  # [key, stat, cached, batch future, index]
+        batch: List[tuple] = []
+        batch_slots: List[list] = []
+        
+        try:
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="repo_scan") as readers:
+                def flush() -> None:
+                    if batch:
+                        future = readers.submit(_read_todo_batch, list(batch), parsers)
+                        for slot in batch_slots:
+                            slot[3] = future
+                        batch.clear()
+                        batch_slots.clear()
+                
+                def collect() -> tuple:
+                    slot = pending.popleft()
+                    key, stat, cached = slot[:3]
+                    if cached is not None:
+                        return key, cached
+                    if slot[3] is None:
+                        flush()  # Oldest file is still in the unsubmitted batch
+                    return key, self._settle(key, stat, slot[3].result()[slot[4]])
+                
+                for file_path, key, stat, cached in planned:
+                    if cached is not None and not pending:
+                        yield key, cached
+                        continue
+                    slot = [key, stat, cached, None, len(batch)]
+                    pending.append(slot)
+                    if cached is None:
+                        batch.append((file_path, key, self._expected_hash(key)))
+                        batch_slots.append(slot)
+                        if len(batch) >= SCAN_BATCH_SIZE:
+                            flush()
+                    while len(pending) > window:
+                        yield collect()
+                flush()
+                while pending:
+                    yield collect()
+        finally:
+            if parsers is not None:
+                parsers.shutdown(wait=True, cancel_futures=True)
+    
+    def _expected_hash(self, key: str) -> Optional[str]:
+        return self.cache.cached_hash(key) if self.cache is not None else None
+    
+    def _settle(self, key: str, stat, read: Optional[tuple]) -> Optional[List[Dict[str, Any]]]:
+        """Reconcile a _read_todos() result with the cache (main thread only)."""
+        if read is None:
+            return None
+        digest, parsed = read
+        if self.cache is None:
+            return parsed
+        if parsed is None:
+            # Content hash equals the cached one
+            return self.cache.lookup_hash(key, stat, digest)
+        self.cache.store(key, stat, digest, parsed)
+        return parsed
+    
+    def _parse_todos(self, rel_path: str, lines: List[str]) -> List[Task]:
+        """Extract TODO/FIXME tasks from the lines of one file."""
+        return [Task.from_dict(entry) for entry in parse_todo_lines(rel_path, lines)]
+    
+    def find_syntax_errors(self) -> List[Task]:
+        """Find Python files that do not parse.
+        
+        Uses the AST analysis cache shared with CodebaseMonitor and the
+        scripts, so only files changed since any of them last looked are
+        parsed again.
+        
+        Returns:
+            List of syntax error tasks
+        """
+        tasks = []
+        
+        for file_path in walk_files(self.repo_path, (".py",), self._ignore):
+            analysis = self.analyzer.analyze(file_path)
+            if analysis is None or analysis["error"] is None:
+                continue
+            tasks.append(Task(
+                type=TaskType.SYNTAX_ERROR,
+                description=f"Syntax error: {analysis['error']['message']}",
+                file_path=file_path.relative_to(self.repo_path).as_posix(),
+                line_number=analysis["error"]["line"],
+                priority=5
+            ))
         
+        self.analyzer.save()
         return tasks
     
     def find_failing_tests(self) -> List[Task]:
         """Find failing tests using pytest.
         
+        In incremental mode only tests that may have changed outcome since
+        the last run are executed; failures (with line numbers) come from
+        pytest's JUnit XML report.
+        
         Returns:
             List of failing test tasks
         """
         tasks = []
         
         try:
-            # Run pytest with minimal output
+            command = self._checker_command("tests")
+            if command is None:
+                # Nothing changed and nothing failed last time
+                return tasks
             result = subprocess.run(
-                ["poetry", "run", "pytest", "--tb=no", "-q", str(self.repo_path)],
+                command,
                 capture_output=True,
                 text=True,
                 cwd=self.repo_path,
-                timeout=30
+                timeout=self.checker_timeouts["tests"]
             )
-            
-            if result.returncode != 0:
-                # Parse pytest output for failures
-                for line in result.stdout.split('\n'):
-                    if 'FAILED' in line:
-                        # Extract test name and file
-                        parts = line.split('::')
-                        if len(parts) >= 2:
-                            file_path = parts[0].replace('FAILED ', '').strip()
-                            test_name = parts[1].split(' ')[0] if ' ' in parts[1] else parts[1]
-                            
-                            tasks.append(Task(
-                                type=TaskType.FAILING_TEST,
-                                description=f"Failing test: {test_name}",
-                                file_path=file_path,
-                                line_number=1,  # Would need AST parsing for exact line
-                                priority=3
-                            ))
+            tasks = self._parse_pytest_output(result.returncode, result.stdout)
         except (subprocess.TimeoutExpired, FileNotFoundError):
             # pytest not available or timed out
-            pass
+            self._abandon_checker("tests")
         except Exception:
             # Other errors - skip test detection
-            pass
+            self._abandon_checker("tests")
         
         return tasks
     
     def find_type_errors(self) -> List[Task]:
         """Find type errors using mypy.
         
+        With ``type_daemon`` the dmypy daemon rechecks only changed files and
+        unchanged repositories reuse the previous result; a cold mypy run is
+        used when the daemon is unavailable or keeps failing.
+        
         Returns:
             List of type error tasks
         """
         tasks = []
         
         try:
-            # Run mypy
-            result = subprocess.run(
-                ["mypy", "--no-error-summary", "--no-color-output", str(self.repo_path)],
-                capture_output=True,
-                text=True,
-                cwd=self.repo_path,
-                timeout=30
-            )
-            
-            if result.returncode != 0:
-                # Parse mypy output
-                for line in result.stdout.split('\n'):
-                    if ': error:' in line:
-                        # Extract file, line, and error message
-                        match = re.match(r'(.+):(\d+):\s*error:\s*(.+)', line)
-                        if match:
-                            file_path = match.group(1)
-                            line_number = int(match.group(2))
-                            error_msg = match.group(3)
-                            
-                            tasks.append(Task(
-                                type=TaskType.TYPE_ERROR,
-                                description=f"Type error: {error_msg}",
-                                file_path=file_path,
-                                line_number=line_number,
-                                priority=4
-                            ))
+            while True:
+                command = self._checker_command("types")
+                if command is None:
+                    return self._cached_checker_result("types")
+                # Run mypy
+                result = subprocess.run(
+                    command,
+                    capture_output=True,
+                    text=True,
+                    cwd=self.repo_path,
+                    timeout=self.checker_timeouts["types"]
+                )
+                try:
+                    tasks = self._parse_mypy_output(result.returncode, result.stdout)
+                except DaemonFailed as e:
+                    # Restart the daemon, or fall back to a cold run
+                    logger.warning(f"mypy daemon failed: {e}")
+                    continue
+                break
         except (subprocess.TimeoutExpired, FileNotFoundError):
             # mypy not available or timed out
-            pass
+            self._abandon_checker("types")
         except Exception:
             # Other errors - skip type checking
-            pass
+            self._abandon_checker("types")
         
         return tasks
     
@@ -253,30 +592,262 @@ class RepoScanner:
         try:
             # Get list of modified files
             result = subprocess.run(
-                ["git", "diff", "--name-only"],
+                self._checker_command("git"),
                 capture_output=True,
                 text=True,
                 cwd=self.repo_path,
-                timeout=TIMEOUT_SECONDS
+                timeout=self.checker_timeouts["git"]
             )
-            
-            if result.returncode == 0 and result.stdout.strip():
-                modified_files = result.stdout.strip().split('\n')
-                
-                for file_path in modified_files:
-                    tasks.append(Task(
-                        type=TaskType.UNCOMMITTED,
-                        description=f"Uncommitted changes in {file_path}",
-                        file_path=file_path,
-                        line_number=1,
-                        priority=1
-                    ))
+            tasks = self._parse_git_diff_output(result.returncode, result.stdout)
         except (subprocess.CalledProcessError, FileNotFoundError):
             # git not available or not a git repository
             pass
         
         return tasks
     
+    async def scan_async(self, timeouts: Optional[Dict[str, float]] = None) -> List[Task]:
+        """Comprehensive scan with the external checkers run concurrently.
+        
+        pytest, mypy and git run as asyncio subprocesses while the file scan
+        runs on a worker thread, so a scan takes about as long as the slowest
+        checker. A checker that exceeds its timeout is killed and contributes
+        no tasks, as does any step that raises; the others' results are still
+        returned. Per-checker outcomes (and failed file scans) are recorded
+        in ``checker_status``. Cancelling the scan kills any running checker.
+        
+        Args:
+            timeouts: Per-checker overrides ("tests", "types", "git") in seconds
+            
+        Returns:
+            List of tasks found, prioritized by importance
+        """
+        timeouts = {**self.checker_timeouts, **(timeouts or {})}
+        self.checker_status = {}
+        
+        async with asyncio.TaskGroup() as group:
+            todos = group.create_task(asyncio.to_thread(self._guarded, "todos", self.find_todos))
+            syntax = group.create_task(asyncio.to_thread(self._guarded, "syntax", self.find_syntax_errors))
+            checks = [
+                group.create_task(self._run_checker(name, timeouts[name]))
+                for name in self.CHECKER_PARSERS
+            ]
+        
+        tasks = todos.result() + syntax.result()
+        for check in checks:
+            tasks.extend(check.result())
+        return self.prioritize_tasks(tasks)
+    
+    async def _run_checker(self, name: str, timeout: float) -> List[Task]:
+        """Run one external checker as an asyncio subprocess.
+        
+        Returns:
+            Parsed tasks, or an empty list if the checker is unavailable,
+            timed out or failed
+        """
+        try:
+            return await self._exec_checker(name, timeout)
+        except Exception as e:
+            logger.warning(f"{name} checker failed: {e}")
+            self._abandon_checker(name)
+            self.checker_status[name] = "error"
+            return []
+    
+    async def _exec_checker(self, name: str, timeout: float) -> List[Task]:
+        """_run_checker() without the catch-all for unexpected errors."""
+        # Test selection and the dmypy check walk the repository: keep them off the loop
+        command = await asyncio.to_thread(self._checker_command, name)
+        if command is None:
+            self.checker_status[name] = "ok"
+            return self._cached_checker_result(name)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                cwd=self.repo_path
+            )
+        except OSError:
+            self._abandon_checker(name)
+            self.checker_status[name] = "unavailable"
+            return []
+        
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            self._abandon_checker(name)
+            self.checker_status[name] = "timeout"
+            logger.warning(f"{name} checker timed out after {timeout}s")
+            return []
+        except asyncio.CancelledError:
+            if process.returncode is None:
+                process.kill()
+            self._abandon_checker(name)
+            raise
+        
+        try:
+            parse = getattr(self, self.CHECKER_PARSERS[name])
+            tasks = parse(process.returncode, stdout.decode('utf-8', errors='replace'))
+        except DaemonFailed as e:
+            # Restart the daemon, or fall back to a cold run
+            logger.warning(f"mypy daemon failed: {e}")
+            return await self._exec_checker(name, timeout)
+        except Exception:
+            self._abandon_checker(name)
+            self.checker_status[name] = "error"
+            return []
+        self.checker_status[name] = "ok"
+        return tasks
+    
+    def _checker_command(self, name: str) -> Optional[List[str]]:
+        """Command line for a checker, or None if it has nothing to check."""
+        if name == "tests":
+            return self._pytest_command()
+        if name == "types":
+            self._types_via_daemon = self._dmypy is not None and not self._dmypy.disabled
+            if self._types_via_daemon:
+                return self._dmypy.command()
+            return ["mypy", "--no-error-summary", "--no-color-output", str(self.repo_path)]
+        if name == "git":
+            return ["git", "diff", "--name-only"]
+        raise ValueError(f"Unknown checker: {name}")
+    
+    def _pytest_command(self) -> Optional[List[str]]:
+        """pytest command for the next run, writing a JUnit report.
+        
+        Returns None when incremental selection finds nothing to run.
+        """
+        selection = None
+        if self.incremental_tests:
+            if self._impact is None:
+                self._impact = TestImpactMap(self.repo_path, self._ignore)
+            selection = self._impact.select()
+            if selection == []:
+                self._impact.save()
+                return None
+        fd, report = tempfile.mkstemp(prefix="fresh-pytest-", suffix=".xml")
+        os.close(fd)
+        self._test_report = Path(report)
+        # Node ids (selection, lastfailed, report paths) are relative to the repository
+        root = str(self.repo_path.resolve())
+        return [
+            *self.PYTEST_COMMAND, "--tb=short", "-q", f"--rootdir={root}",
+            "-o", "junit_family=xunit1", f"--junitxml={report}",
+            *(selection if selection is not None else [root])
+        ]
+    
+    def _cached_checker_result(self, name: str) -> List[Task]:
+        """Result of a checker whose inputs did not change since its last run."""
+        if name == "types" and self._dmypy is not None and self._dmypy.cached_output() is not None:
+            return self._mypy_tasks(*self._dmypy.cached_output())
+        return []
+    
+    def _abandon_checker(self, name: str) -> None:
+        """Clean up after a checker that did not complete."""
+        if name == "types" and self._types_via_daemon:
+            self._types_via_daemon = False
+            self._dmypy.abandon()
+        if name != "tests":
+            return
+        if self._test_report is not None:
+            self._test_report.unlink(missing_ok=True)
+            self._test_report = None
+        if self._impact is not None:
+            # Keep the changes pending so the next scan selects them again
+            self._impact.discard()
+    
+    def _parse_pytest_output(self, returncode: int, stdout: str) -> List[Task]:
+        """Failing tests from the JUnit report, or from ``FAILED`` lines without one."""
+        report, self._test_report = self._test_report, None
+        failures = parse_junit_report(report) if report is not None else None
+        if report is not None:
+            report.unlink(missing_ok=True)
+        
+        if failures is not None:
+            if self._impact is not None:
+                self._impact.save()
+            return [
+                Task(
+                    type=TaskType.FAILING_TEST,
+                    description=f"Failing test: {failure['name']}",
+                    file_path=failure["file"],
+                    line_number=failure["line"],
+                    priority=3,
+                    context=failure["message"] or None
+                )
+                for failure in failures
+            ]
+        
+        if self._impact is not None:
+            self._impact.discard()
+        tasks = []
+        if returncode != 0:
+            # Parse pytest output for failures
+            for line in stdout.split('\n'):
+                if 'FAILED' in line:
+                    # Extract test name and file
+                    parts = line.split('::')
+                    if len(parts) >= 2:
+                        file_path = parts[0].replace('FAILED ', '').strip()
+                        test_name = parts[1].split(' ')[0] if ' ' in parts[1] else parts[1]
+                        
+                        tasks.append(Task(
+                            type=TaskType.FAILING_TEST,
+                            description=f"Failing test: {test_name}",
+                            file_path=file_path,
+                            line_number=1,  # Would need AST parsing for exact line
+                            priority=3
+                        ))
+        return tasks
+    
+    def _parse_mypy_output(self, returncode: int, stdout: str) -> List[Task]:
+        """Type errors from mypy (or dmypy) output.
+        
+        Raises:
+            DaemonFailed: dmypy could not complete the check
+        """
+        if self._types_via_daemon:
+            self._types_via_daemon = False
+            stdout = self._dmypy.complete(returncode, stdout)
+        return self._mypy_tasks(returncode, stdout)
+    
+    def _mypy_tasks(self, returncode: int, stdout: str) -> List[Task]:
+        tasks = []
+        if returncode != 0:
+            for error in parse_mypy_output(stdout):
+                code = f" [{error.code}]" if error.code else ""
+                tasks.append(Task(
+                    type=TaskType.TYPE_ERROR,
+                    description=f"Type error: {error.message}{code}",
+                    file_path=error.file,
+                    line_number=error.line,
+                    priority=4,
+                    context="\n".join(error.notes) or None
+                ))
+        return tasks
+    
+    def _parse_git_diff_output(self, returncode: int, stdout: str) -> List[Task]:
+        """Uncommitted changes from ``git diff --name-only`` output."""
+        tasks = []
+        if returncode == 0 and stdout.strip():
+            modified_files = stdout.strip().split('\n')
+            
+            for file_path in modified_files:
+                tasks.append(Task(
+                    type=TaskType.UNCOMMITTED,
+                    description=f"Uncommitted changes in {file_path}",
+                    file_path=file_path,
+                    line_number=1,
+                    priority=1
+                ))
+        return tasks
+    
+    def close(self) -> None:
+        """Stop background helpers (the mypy daemon, if one was started)."""
+        if self._dmypy is not None:
+            self._dmypy.stop()
+    
     def prioritize_tasks(self, tasks: List[Task]) -> List[Task]:
         """Sort tasks by priority (highest first).
         
@@ -288,71 +859,77 @@ class RepoScanner:
         """
         return sorted(tasks, key=lambda t: t.priority, reverse=True)
     
-    def _find_source_files(self) -> List[Path]:
+    def _find_source_files(self) -> Iterator[Path]:
         """Find all source files in repository.
         
+        Single pruned walk: ignored directories (ignore_patterns and
+        .gitignore) are never descended into. Files are yielded lazily.
+        
         Returns:
-            List of source file paths
+            Iterator of source file paths
         """
-        source_extensions = ['.py', '.js', '.ts', '.jsx', '.tsx', '.go', '.rs', '.java', '.c', '.cpp', '.h']
-        files = []
-        
-        for ext in source_extensions:
-            files.extend(self.repo_path.rglob(f'*{ext}'))
+        return walk_files(self.repo_path, self.SOURCE_EXTENSIONS, self._ignore)
+    
+    def watch(self, debounce: float = 2.0, poll_interval: float = 2.0) -> ChangeWatcher:
+        """Watcher for the source files this scanner reads.
         
-        return files
+        Args:
+            debounce: Seconds of quiet before a batch of changes is reported
+            poll_interval: Seconds between polls when watchdog is not installed
+            
+        Returns:
+            Unstarted ChangeWatcher with the scanner's extensions and ignore rules
+        """
+        return ChangeWatcher(self.repo_path, self.SOURCE_EXTENSIONS, self._ignore,
+                             debounce=debounce, poll_interval=poll_interval)
     
     def _should_ignore(self, file_path: Path) -> bool:
         """Check if file should be ignored based on patterns.
         
+        A pattern (exact name or glob) matches if it matches any component
+        of the path relative to the repository. .gitignore rules are
+        applied by the walker, not here.
+        
         Args:
             file_path: Path to check
             
         Returns:
             True if file should be ignored
         """
-        path_str = str(file_path)
-        
-        for pattern in self.ignore_patterns:
-            # Check if any part of the path matches the pattern
-            if pattern in path_str:
-                return True
-            # Check glob patterns
-            if fnmatch.fnmatch(path_str, pattern):
-                return True
-            # Check if any parent directory matches
-            for parent in file_path.parents:
-                if parent.name == pattern:
-                    return True
-        
-        return False
+        try:
+            parts = file_path.relative_to(self.repo_path).parts
+        except ValueError:
+            parts = file_path.parts
+        return self._ignore.matches_path(parts)
 
 
 # Module-level convenience functions
 
-def scan_repository(repo_path: str = ".") -> List[Task]:
+def scan_repository(repo_path: str = ".", jobs: int = 1) -> List[Task]:
     """Scan repository for issues.
     
     Args:
         repo_path: Path to repository
+        jobs: Parallel workers for the file scan (0 = one per CPU)
         
     Returns:
         List of tasks found
     """
-    scanner = RepoScanner(repo_path)
+    scanner = RepoScanner(repo_path, jobs=jobs)
     return scanner.scan()
 
 
-def find_todos(repo_path: str = ".") -> List[Task]:
+def find_todos(repo_path: str = ".", jobs: int = 1) -> List[Task]:
     """Find TODO and FIXME comments.
     
     Args:
         repo_path: Path to repository
+        jobs: Parallel workers (0 = one per CPU)
         
     Returns:
         List of TODO/FIXME tasks
     """
-    scanner = RepoScanner(repo_path)
+    scanner = RepoScanner(repo_path, jobs=jobs)
     return scanner.find_todos()
 
 
@@ -0,0 +1,169 @@
+"""Persistent per-file cache for repository scans.
+
+RepoScanner stores each file's scan results keyed by its relative path,
+together with the file's mtime, size and content hash, so repeated scans
+only re-parse files that actually changed.
+
+Change detection, cheapest first:
+    1. mtime + size match the cached entry -> reuse without reading
+    2. git reports the file clean and its index blob id equals the cached
+       content hash -> reuse without reading (e.g. after a checkout that
+       touched mtimes but not content)
+    3. read the file and compare content hashes -> reuse or re-parse
+
+Content hashes use git's blob format (sha1 of ``blob <size>\\0<data>``) so
+they are directly comparable with ``git ls-files -s`` output.
+
+Cross-references:
+    - Repository Scanner: ai/loop/repo_scanner.py (find_todos)
+    - Development Loop: ai/loop/dev_loop.py (one scanner, many cycles)
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from ai.utils.settings import TIMEOUT_SECONDS
+
+CACHE_VERSION = 1
+
+
+def content_hash(data: bytes) -> str:
+    """Git blob id of ``data``."""
+    digest = hashlib.sha1(b"blob %d\0" % len(data))
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def git_clean_blobs(repo_path: Path) -> Dict[str, str]:
+    """Index blob ids of tracked files whose working copy matches the index.
+
+    Returns an empty dict when git is unavailable or this is not a git
+    repository. Paths are relative to ``repo_path`` with ``/`` separators.
+    """
+    def git(*args: str) -> Optional[str]:
+        try:
+            result = subprocess.run(
+                ["git", *args], capture_output=True, text=True,
+                cwd=repo_path, timeout=TIMEOUT_SECONDS,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
+        if result.returncode != 0 or not isinstance(result.stdout, str):
+            return None
+        return result.stdout
+
+    staged = git("ls-files", "-s", "-z", "--", ".")
+    modified = git("diff", "--name-only", "--relative", "-z")
+    if staged is None or modified is None:
+        return {}
+
+    dirty = set(modified.split("\0"))
+    blobs: Dict[str, str] = {}
+    for entry in staged.split("\0"):
+        meta, _, path = entry.partition("\t")
+        fields = meta.split()
+        # Skip merge conflicts (stage != 0) and anything malformed
+        if len(fields) == 3 and fields[2] == "0" and path not in dirty:
+            blobs[path] = fields[1]
+    return blobs
+
+
+class ScanCache:
+    """JSON-backed map of relative path -> (mtime_ns, size, hash, results).
+
+    ``signature`` identifies what produced the results (e.g. the scanner's
+    patterns); a cache written under a different signature is discarded.
+    """
+
+    def __init__(self, path: Path, signature: str = "") -> None:
+        self.path = Path(path)
+        self.signature = signature
+        self._entries: Dict[str, List[Any]] = {}
+        self._dirty = False
+        self.stats = {"stat_hits": 0, "git_hits": 0, "hash_hits": 0, "misses": 0}
+        self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, rel_path: str) -> bool:
+        return rel_path in self._entries
+
+    def load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("signature") == self.signature:
+            self._entries = data.get("files", {})
+
+    def save(self) -> bool:
+        """Write the cache if it changed; returns False if it could not be written."""
+        if not self._dirty:
+            return True
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": CACHE_VERSION, "signature": self.signature,
+                           "files": self._entries}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+        except OSError:
+            return False
+        self._dirty = False
+        return True
+
+    def lookup(self, rel_path: str, stat: os.stat_result) -> Optional[List[Any]]:
+        """Cached results if the file's mtime and size are unchanged."""
+        entry = self._entries.get(rel_path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            self.stats["stat_hits"] += 1
+            return entry[3]
+        return None
+
+    def paths(self) -> List[str]:
+        return list(self._entries)
+
+    def results(self, rel_path: str) -> Optional[List[Any]]:
+        """Cached results without freshness checks."""
+        entry = self._entries.get(rel_path)
+        return entry[3] if entry is not None else None
+
+    def cached_hash(self, rel_path: str) -> Optional[str]:
+        """Content hash of the cached entry, if any (does not count as a hit)."""
+        entry = self._entries.get(rel_path)
+        return entry[2] if entry is not None else None
+
+    def lookup_hash(self, rel_path: str, stat: os.stat_result, digest: str,
+                    from_git: bool = False) -> Optional[List[Any]]:
+        """Cached results if the content hash is unchanged (refreshes mtime/size)."""
+        entry = self._entries.get(rel_path)
+        if entry is None or entry[2] != digest:
+            return None
+        self.stats["git_hits" if from_git else "hash_hits"] += 1
+        entry[0], entry[1] = stat.st_mtime_ns, stat.st_size
+        self._dirty = True
+        return entry[3]
+
+    def store(self, rel_path: str, stat: os.stat_result, digest: str, results: List[Any]) -> None:
+        self.stats["misses"] += 1
+        self._entries[rel_path] = [stat.st_mtime_ns, stat.st_size, digest, results]
+        self._dirty = True
+
+    def retain(self, rel_paths: Iterable[str]) -> None:
+        """Drop entries for files that no longer exist (or are now ignored)."""
+        keep = set(rel_paths)
+        stale = [path for path in self._entries if path not in keep]
+        for path in stale:
+            del self._entries[path]
+        if stale:
+            self._dirty = True
+
+    def reset_stats(self) -> None:
+        for key in self.stats:
+            self.stats[key] = 0
@@ -0,0 +1,237 @@
+"""Test-impact selection for incremental failing-test detection.
+
+Instead of running the whole suite on every scan, RepoScanner asks this
+module which tests could have changed outcome since the last run:
+
+    - tests pytest recorded as failing (``.pytest_cache/v/cache/lastfailed``)
+    - test files that import, directly or transitively, a Python file that
+      changed since the last run (new, modified or deleted)
+
+The import graph is stored per file in a ScanCache (mtime/size/hash), so
+only changed files are re-parsed and a cache miss *is* the change signal.
+A full run is requested when there is no baseline to compare against, or
+when a ``conftest.py`` changed (it can affect any test below it).
+
+Results are read from pytest's built-in JUnit XML report, which carries
+the file and line of every failure.
+
+Cross-references:
+    - Repository Scanner: ai/loop/repo_scanner.py (find_failing_tests)
+    - Scan Cache: ai/loop/scan_cache.py
+    - File Walker: ai/loop/file_walker.py
+"""
+from __future__ import annotations
+import ast
+import json
+import re
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from ai.loop.file_walker import IgnoreMatcher, walk_files
+from ai.loop.scan_cache import ScanCache, content_hash
+
+IMPACT_SIGNATURE = "imports-v1"
+LASTFAILED_PATH = Path(".pytest_cache") / "v" / "cache" / "lastfailed"
+
+
+def is_test_file(rel_path: str) -> bool:
+    """pytest's default test file patterns (test_*.py, *_test.py)."""
+    name = rel_path.rsplit("/", 1)[-1]
+    return name.endswith(".py") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def module_names(rel_path: str) -> List[str]:
+    """Importable names of a repo-relative .py path (also without a leading ``src/``)."""
+    parts = rel_path[:-3].split("/")
+    if parts[-1] == "__init__":
+        parts = parts[:-1]
+    if not parts:
+        return []
+    names = [".".join(parts)]
+    if parts[0] == "src" and len(parts) > 1:
+        names.append(".".join(parts[1:]))
+    return names
+
+
+def parse_imports(rel_path: str, source: bytes) -> List[str]:
+    """Absolute names of every module a file imports (relative imports resolved).
+
+    ``from a import b`` records both ``a`` and ``a.b``, since ``b`` may be a
+    submodule. Unparseable files import nothing.
+    """
+    try:
+        tree = ast.parse(source, filename=rel_path)
+    except (SyntaxError, ValueError):
+        return []
+    names = module_names(rel_path)
+    package = names[0].split(".") if names else []
+    if not rel_path.endswith("__init__.py"):
+        package = package[:-1]
+
+    imported: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            imported.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            if node.level:
+                base = package[:len(package) - node.level + 1] if node.level <= len(package) + 1 else []
+                module = ".".join(base + ([node.module] if node.module else []))
+            else:
+                module = node.module or ""
+            if module:
+                imported.add(module)
+            imported.update(f"{module}.{alias.name}" if module else alias.name
+                            for alias in node.names if alias.name != "*")
+    return sorted(imported)
+
+
+def read_lastfailed(repo_path: Path) -> List[str]:
+    """Node ids pytest last recorded as failing, for files that still exist."""
+    try:
+        with open(repo_path / LASTFAILED_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return sorted(node for node in data if (repo_path / node.split("::", 1)[0]).is_file())
+
+
+def parse_junit_report(report_path: Path) -> Optional[List[Dict[str, Any]]]:
+    """Failures from a pytest JUnit XML report (``junit_family=xunit1``).
+
+    Returns:
+        One dict per failed or errored test (file, line, name, message),
+        or None if the report is missing or unreadable
+    """
+    try:
+        root = ET.parse(report_path).getroot()
+    except (OSError, ET.ParseError):
+        return None
+
+    failures = []
+    for case in root.iter("testcase"):
+        problem = case.find("failure")
+        if problem is None:
+            problem = case.find("error")
+        if problem is None:
+            continue
+        file_path = case.get("file") or case.get("classname", "").replace(".", "/") + ".py"
+        # xunit1 "line" is the 0-based line of the test function
+        line = int(case.get("line", "0") or 0) + 1
+        # Prefer the innermost traceback line inside the test file itself
+        location = re.findall(rf"^{re.escape(file_path)}:(\d+):", problem.text or "", re.MULTILINE)
+        if location:
+            line = int(location[-1])
+        failures.append({
+            "file": file_path,
+            "line": line,
+            "name": case.get("name", ""),
+            "message": (problem.get("message") or "").strip(),
+        })
+    return failures
+
+
+class TestImpactMap:
+    """Per-file import graph and the test selection derived from it."""
+
+    __test__ = False  # Not a pytest test class
+
+    def __init__(self, repo_path: Path, matcher: Optional[IgnoreMatcher] = None,
+                 cache_path: Optional[Path] = None) -> None:
+        self.repo_path = Path(repo_path)
+        self.matcher = matcher
+        self.cache = ScanCache(
+            Path(cache_path) if cache_path else self.repo_path / ".fresh" / "test_impact.json",
+            signature=IMPACT_SIGNATURE,
+        )
+
+    def _refresh(self) -> Optional[Set[str]]:
+        """Update the import graph; returns changed paths (None = no baseline).
+
+        Without a stored graph, pytest's own lastfailed cache serves as the
+        baseline: files modified after it was written count as changed.
+        """
+        baseline_ns: Optional[int] = None
+        if len(self.cache) == 0:
+            try:
+                baseline_ns = (self.repo_path / LASTFAILED_PATH).stat().st_mtime_ns
+            except OSError:
+                baseline_ns = None
+            had_baseline = baseline_ns is not None
+        else:
+            had_baseline = True
+        changed: Set[str] = set()
+        seen = []
+        for file_path in walk_files(self.repo_path, (".py",), self.matcher):
+            key = file_path.relative_to(self.repo_path).as_posix()
+            try:
+                stat = file_path.stat()
+                if self.cache.lookup(key, stat) is not None:
+                    seen.append(key)
+                    continue
+                data = file_path.read_bytes()
+            except OSError:
+                continue
+            seen.append(key)
+            digest = content_hash(data)
+            if self.cache.lookup_hash(key, stat, digest) is None:
+                self.cache.store(key, stat, digest, parse_imports(key, data))
+                if baseline_ns is None or stat.st_mtime_ns > baseline_ns:
+                    changed.add(key)
+        deleted = set(self.cache.paths()) - set(seen)
+        self.cache.retain(seen)
+        return (changed | deleted) if had_baseline else None
+
+    def affected_tests(self, changed: Iterable[str]) -> Set[str]:
+        """Test files whose import closure contains any of ``changed``."""
+        providers: Dict[str, str] = {}
+        for path in self.cache.paths():
+            for name in module_names(path):
+                providers[name] = path
+        changed = set(changed)
+        changed_names = {name for path in changed for name in module_names(path)}
+
+        importers: Dict[str, Set[str]] = {}
+        for path in self.cache.paths():
+            for name in self.cache.results(path) or ():
+                parts = name.split(".")
+                # "import a.b.c" also runs a/__init__.py and a/b/__init__.py
+                for end in range(1, len(parts) + 1):
+                    prefix = ".".join(parts[:end])
+                    target = providers.get(prefix) or (prefix if prefix in changed_names else None)
+                    if target is not None:
+                        importers.setdefault(target, set()).add(path)
+
+        # Deleted files are keyed by module name (they have no provider entry)
+        frontier = [providers.get(name, name) for name in changed_names] + list(changed)
+        reached: Set[str] = set()
+        while frontier:
+            node = frontier.pop()
+            if node in reached:
+                continue
+            reached.add(node)
+            frontier.extend(importers.get(node, ()))
+        return {path for path in reached if is_test_file(path) and path in self.cache}
+
+    def select(self) -> Optional[List[str]]:
+        """pytest arguments covering every test whose outcome may have changed.
+
+        Returns:
+            None for a full run, otherwise test files and node ids (empty
+            when nothing can have changed)
+        """
+        changed = self._refresh()
+        if changed is None or any(path.rsplit("/", 1)[-1] == "conftest.py" for path in changed):
+            return None
+        files = sorted(self.affected_tests(changed))
+        whole = set(files)
+        failed = [node for node in read_lastfailed(self.repo_path) if node.split("::", 1)[0] not in whole]
+        return files + failed
+
+    def save(self) -> bool:
+        """Persist the import graph; call only after the selected tests ran."""
+        return self.cache.save()
+
+    def discard(self) -> None:
+        """Forget unsaved changes so they are selected again next time."""
+        self.cache = ScanCache(self.cache.path, signature=IMPACT_SIGNATURE)
@@ -0,0 +1,204 @@
+"""mypy daemon driver and structured mypy output parsing.
+
+A cold ``mypy`` run re-analyses the whole repository every scan. The daemon
+(``dmypy``) keeps the analysis in memory between cycles:
+
+    1. first check: ``dmypy run`` starts the daemon (if needed) and checks
+    2. later checks: ``dmypy recheck --update/--remove`` with only the files
+       whose mtime/size changed since the previous check
+    3. nothing changed: the previous output is reused without a subprocess
+
+The daemon shuts itself down after IDLE_TIMEOUT seconds without requests,
+so a crashed owner does not leave it running forever.
+
+Cross-references:
+    - Repository Scanner: ai/loop/repo_scanner.py (find_type_errors)
+    - Development Loop: ai/loop/dev_loop.py (starts and stops the daemon)
+"""
+from __future__ import annotations
+import json
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from ai.loop.file_walker import IgnoreMatcher, walk_files
+from ai.utils.settings import TIMEOUT_SECONDS
+
+MYPY_FLAGS = ["--show-column-numbers", "--show-error-codes", "--no-error-summary",
+              "--no-color-output", "--no-pretty"]
+IDLE_TIMEOUT = 3600  # seconds before an unused daemon exits
+
+# dmypy exit codes: 0 clean, 1 type errors, anything else is a daemon failure
+_CHECK_OK = (0, 1)
+
+_DIAGNOSTIC_RE = re.compile(
+    r'^(?P<file>.+?):(?P<line>\d+):(?:(?P<column>\d+):)?\s*'
+    r'(?P<severity>error|warning|note):\s*(?P<message>.*?)(?:\s+\[(?P<code>[\w-]+)\])?$'
+)
+
+
+class MypyDiagnostic(NamedTuple):
+    file: str
+    line: int
+    column: Optional[int]
+    severity: str
+    message: str
+    code: Optional[str]
+    notes: Tuple[str, ...] = ()
+
+
+def parse_mypy_output(stdout: str) -> List[MypyDiagnostic]:
+    """Errors from mypy output, with following notes attached to each.
+
+    Accepts the text format (with or without column numbers and error
+    codes) and mypy's ``--output json`` lines.
+    """
+    diagnostics: List[MypyDiagnostic] = []
+    for line in stdout.splitlines():
+        line = line.rstrip()
+        if line.startswith("{"):
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+            column = data.get("column")
+            item = MypyDiagnostic(
+                file=data.get("file", ""),
+                line=int(data.get("line") or 0),
+                column=column + 1 if isinstance(column, int) and column >= 0 else None,
+                severity=data.get("severity", "error"),
+                message=data.get("message", ""),
+                code=data.get("code"),
+            )
+            if data.get("hint"):
+                item = item._replace(notes=(data["hint"],))
+        else:
+            match = _DIAGNOSTIC_RE.match(line)
+            if not match:
+                continue
+            item = MypyDiagnostic(
+                file=match.group("file"),
+                line=int(match.group("line")),
+                column=int(match.group("column")) if match.group("column") else None,
+                severity=match.group("severity"),
+                message=match.group("message"),
+                code=match.group("code"),
+            )
+        if item.severity == "note":
+            if diagnostics and diagnostics[-1].file == item.file:
+                last = diagnostics[-1]
+                diagnostics[-1] = last._replace(notes=last.notes + (item.message,))
+            continue
+        if item.severity == "error":
+            diagnostics.append(item)
+    return diagnostics
+
+
+class DaemonFailed(Exception):
+    """The daemon could not complete a check; retry (restart or cold run)."""
+
+
+class MypyDaemon:
+    """One dmypy daemon per repository, driven incrementally."""
+
+    EXTENSIONS = (".py", ".pyi")
+
+    def __init__(self, repo_path: Path, matcher: Optional[IgnoreMatcher] = None,
+                 status_file: Optional[Path] = None,
+                 executable: Optional[str] = None) -> None:
+        self.repo_path = Path(repo_path)
+        self.matcher = matcher
+        self.status_file = Path(status_file) if status_file else self.repo_path / ".fresh" / "dmypy.json"
+        self.executable = executable or shutil.which("dmypy")
+        self.disabled = self.executable is None
+        self._files: Dict[str, Tuple[int, int]] = {}
+        self._pending: Optional[Dict[str, Tuple[int, int]]] = None
+        self._output: Optional[Tuple[int, str]] = None
+        self._launched = False
+
+    @property
+    def started(self) -> bool:
+        """True once a check completed (so ``recheck`` is valid)."""
+        return self._output is not None
+
+    def _base(self) -> List[str]:
+        return [self.executable, "--status-file", str(self.status_file)]
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        files = {}
+        for file_path in walk_files(self.repo_path, self.EXTENSIONS, self.matcher):
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            files[file_path.relative_to(self.repo_path).as_posix()] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def command(self) -> Optional[List[str]]:
+        """Next daemon command, or None if nothing changed since the last check.
+
+        Call complete() or abandon() with the outcome of running it.
+        """
+        snapshot = self._snapshot()
+        if not self.started:
+            self._pending = snapshot
+            self._launched = True
+            self.status_file.parent.mkdir(parents=True, exist_ok=True)
+            return [*self._base(), "run", "--timeout", str(IDLE_TIMEOUT), "--", *MYPY_FLAGS, "."]
+
+        updated = sorted(path for path, key in snapshot.items() if self._files.get(path) != key)
+        removed = sorted(path for path in self._files if path not in snapshot)
+        if not updated and not removed:
+            return None
+        self._pending = snapshot
+        command = [*self._base(), "recheck"]
+        for path in updated:
+            command += ["--update", path]
+        for path in removed:
+            command += ["--remove", path]
+        return command
+
+    def complete(self, returncode: int, stdout: str) -> str:
+        """Record a finished command; returns the output to parse.
+
+        Raises:
+            DaemonFailed: The daemon failed. A failed ``recheck`` restarts the
+                daemon on the next command; a failed ``run`` disables it.
+        """
+        pending, self._pending = self._pending, None
+        if returncode not in _CHECK_OK or pending is None:
+            if not self.started:
+                self.disabled = True
+            self._output = None
+            raise DaemonFailed(stdout.strip()[-500:])
+        self._files = pending
+        self._output = (returncode, stdout)
+        return stdout
+
+    def abandon(self) -> None:
+        """The command did not finish (timeout, cancellation).
+
+        The file snapshot is not advanced, so the same changes are sent again
+        by the next command; a ``run`` that did not finish is repeated.
+        """
+        self._pending = None
+
+    def cached_output(self) -> Optional[Tuple[int, str]]:
+        """(returncode, stdout) of the last completed check."""
+        return self._output
+
+    def stop(self) -> None:
+        """Stop the daemon (if running) and forget its state."""
+        self._output = None
+        self._pending = None
+        self._files = {}
+        if not self._launched:
+            return
+        self._launched = False
+        try:
+            subprocess.run([*self._base(), "stop"], capture_output=True, text=True,
+                           cwd=self.repo_path, timeout=TIMEOUT_SECONDS)
+        except (OSError, subprocess.SubprocessError):
+            pass
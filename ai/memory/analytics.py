@@ -0,0 +1,171 @@
+"""
+Memory Analytics
+
+Running aggregates for the intelligent memory stores. Counters are updated
+as items are indexed and dropped, so ``get_memory_analytics()`` reads
+precomputed values instead of scanning every item on each call.
+
+Features:
+- Item count, importance sum and per-type counts
+- Exact keyword counts with a cached top-k list that is patched in place on
+  increments (only dropping a top keyword forces a recount)
+- Time-bucketed creation times for exact sliding windows (e.g. the last hour)
+
+Cross-references:
+    - ai/memory/intelligent_store.py: get_memory_analytics()
+    - ai/memory/enhanced_firestore.py: get_production_analytics()
+    - ai/tools/enhanced_memory_tools.py: AnalyzeMemoryUsage
+"""
+from __future__ import annotations
+import heapq
+from collections import Counter
+from itertools import count
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from ai.utils.clock import now as time_now
+
+
+class MemoryAggregates:
+    """Incrementally maintained analytics over a set of memory items.
+
+    Items are expected to expose ``id``, ``memory_type``, ``keywords``,
+    ``importance_score`` and ``created_at``. Like the index, the aggregates
+    must be told about every add/remove; items mutated in place on those
+    fields need to be removed and re-added.
+
+    Creation times are kept per ``bucket_seconds`` bucket: whole buckets
+    inside a window are counted by size and only the bucket the window
+    starts in is filtered by timestamp, so windows are exact. Buckets older
+    than ``horizon_seconds`` are pruned.
+
+    Keyword count ties go to the keyword seen first since its count last
+    rose from zero. After removals this can differ from the order in which
+    the remaining items first mention the keywords; counts are always exact.
+    """
+
+    def __init__(self, top_k: int = 10, bucket_seconds: int = 60,
+                 horizon_seconds: int = 24 * 3600) -> None:
+        self.top_k = top_k
+        self.bucket_seconds = bucket_seconds
+        self.horizon_seconds = horizon_seconds
+        self.clear()
+
+    def clear(self) -> None:
+        self.total = 0
+        self.importance_sum = 0.0
+        self.types: Counter = Counter()
+        self.keywords: Counter = Counter()
+        self._keyword_seq: Dict[str, int] = {}  # first-seen order breaks count ties
+        self._seq = count()
+        self._top: Optional[List[str]] = []
+        self._buckets: Dict[int, List[float]] = {}  # bucket -> created_at timestamps
+
+    def rebuild(self, items: Iterable[Any]) -> None:
+        self.clear()
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return self.total
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def add(self, item: Any) -> None:
+        self.total += 1
+        self.importance_sum += item.importance_score
+        self.types[item.memory_type] += 1
+        for keyword in item.keywords:
+            if keyword not in self.keywords:
+                self._keyword_seq[keyword] = next(self._seq)
+            self.keywords[keyword] += 1
+            self._promote(keyword)
+
+        created = item.created_at.timestamp()
+        bucket = self._bucket(created)
+        if bucket >= self._bucket(time_now() - self.horizon_seconds):
+            self._buckets.setdefault(bucket, []).append(created)
+
+    def remove(self, item: Any) -> None:
+        self.total -= 1
+        self.importance_sum -= item.importance_score
+        if self.total == 0:
+            self.importance_sum = 0.0  # drop accumulated float error
+        self._decrement(self.types, item.memory_type)
+        for keyword in item.keywords:
+            if self._decrement(self.keywords, keyword):
+                del self._keyword_seq[keyword]
+            if self._top is not None and keyword in self._top:
+                self._top = None
+
+        created = item.created_at.timestamp()
+        times = self._buckets.get(self._bucket(created))
+        if times and created in times:
+            times.remove(created)
+            if not times:
+                del self._buckets[self._bucket(created)]
+
+    def replace(self, old: Optional[Any], new: Any) -> None:
+        """Account for ``new`` taking the place of ``old`` (if any)."""
+        if old is not None:
+            self.remove(old)
+        self.add(new)
+
+    @staticmethod
+    def _decrement(counter: Dict[Hashable, int], key: Hashable) -> bool:
+        """Decrement a count, deleting it at zero; True if it was deleted."""
+        remaining = counter.get(key, 0) - 1
+        if remaining > 0:
+            counter[key] = remaining
+            return False
+        counter.pop(key, None)
+        return True
+
+    def _rank(self, keyword: str) -> Tuple[int, int]:
+        return (self.keywords[keyword], -self._keyword_seq[keyword])
+
+    def _promote(self, keyword: str) -> None:
+        """Patch the cached top-k after ``keyword``'s count went up."""
+        top = self._top
+        if top is None:
+            return
+        if keyword not in top:
+            if len(top) >= self.top_k and self._rank(keyword) <= self._rank(top[-1]):
+                return
+            top.append(keyword)
+        top.sort(key=self._rank, reverse=True)
+        del top[self.top_k:]
+
+    def top_keywords(self) -> Dict[str, int]:
+        """The ``top_k`` most frequent keywords, ties in first-seen order."""
+        if self._top is None:
+            self._top = heapq.nlargest(self.top_k, self.keywords, key=self._rank)
+        return {keyword: self.keywords[keyword] for keyword in self._top}
+
+    def average_importance(self) -> float:
+        return self.importance_sum / self.total if self.total else 0.0
+
+    def activity(self, window_seconds: float = 3600) -> int:
+        """Items created less than ``window_seconds`` ago (up to ``horizon_seconds``)."""
+        now = time_now()
+        if len(self._buckets) > 2 * self.horizon_seconds // self.bucket_seconds:
+            oldest = self._bucket(now - self.horizon_seconds)
+            self._buckets = {b: t for b, t in self._buckets.items() if b >= oldest}
+        cutoff = now - window_seconds
+        first = self._bucket(cutoff)
+        # The bucket holding the cutoff is only partly inside the window
+        edge = sum(1 for created in self._buckets.get(first, ()) if created > cutoff)
+        whole = range(first + 1, self._bucket(now) + 1)
+        return edge + sum(len(self._buckets.get(bucket, ())) for bucket in whole)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Analytics in the shape returned by ``get_memory_analytics()``."""
+        if not self.total:
+            return {"total_memories": 0}
+        return {
+            "total_memories": self.total,
+            "type_distribution": dict(self.types),
+            "average_importance": self.average_importance(),
+            "top_keywords": self.top_keywords(),
+            "recent_activity": self.activity(3600),  # Last hour
+        }
@@ -0,0 +1,247 @@
+"""
+Memory Content Analyzer
+
+Single-pass text analysis for memory ingest. Replaces the per-write keyword
+regex, stop-word set and dozens of substring scans in the intelligent store
+with precompiled structures shared by every write.
+
+Features:
+- One tokenization per content, shared by keyword extraction and cue matching
+- Multi-pattern cue matcher: all classification and importance cues are
+  found in a single regex scan, with results identical to ``cue in text``
+- Per-token memo: cues are alphanumeric, so an occurrence always lies inside
+  one word token; each distinct token is matched once per process
+- ``analyze_many()`` batch mode for bulk ingest
+- Results match the original IntelligentMemoryStore heuristics exactly
+
+Cross-references:
+    - ai/memory/intelligent_store.py: _build_item(), write_many()
+    - scripts/benchmark_memory_analyzer.py: Micro-benchmark against the old path
+"""
+from __future__ import annotations
+import re
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from ai.memory.store import intern_strings
+
+STOP_WORDS: FrozenSet[str] = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
+    'needs', 'after'  # Additional stop words
+})
+
+# (memory type value, content cues, tag cues) in classification priority order
+CLASSIFICATION_RULES: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("goal", ('goal', 'objective', 'mission', 'target', 'aim'), ('goal', 'objective', 'mission')),
+    ("task", ('task', 'todo', 'implement', 'create', 'build', 'fix'), ('task', 'todo', 'action')),
+    ("decision", ('adr', 'decision', 'architecture', 'design'), ('adr', 'decision', 'architecture')),
+    ("progress", ('completed', 'done', 'finished', 'progress', 'status'), ('done', 'completed', 'progress')),
+    ("error", ('error', 'failed', 'bug', 'issue', 'problem'), ('error', 'bug', 'failed')),
+    ("knowledge", ('learned', 'discovered', 'found', 'research'), ('knowledge', 'research', 'learning')),
+)
+DEFAULT_TYPE = "context"
+
+TYPE_SCORES: Dict[str, float] = {
+    "goal": 0.9,
+    "decision": 0.8,
+    "error": 0.7,
+    "task": 0.6,
+    "progress": 0.5,
+    "knowledge": 0.6,
+    "context": 0.4,
+}
+HIGH_VALUE_CUES: Tuple[str, ...] = ('critical', 'important', 'urgent', 'blocker', 'milestone')
+HIGH_VALUE = "high_value"
+
+_WORD_RE = re.compile(r'\w+')  # same maximal runs as r'\b\w+\b'
+_SENTENCE_END_RE = re.compile(r'[.!?]+')
+_TOKEN_CACHE_SIZE = 200_000  # distinct tokens memoised before the memo is reset
+
+
+class CueMatcher:
+    """Find which of many substring cues occur in a text in one scan.
+
+    All cues are compiled into a single zero-width lookahead alternation,
+    longest first, so the regex engine tries every start position once and
+    reports the longest cue beginning there. Shorter cues that are prefixes
+    of the reported one also occur at that position and are added from a
+    precomputed table, which makes the result equal to testing ``cue in
+    text`` for every cue.
+    """
+
+    def __init__(self, cues: Dict[str, Iterable[str]]) -> None:
+        """
+        Args:
+            cues: Label -> substrings; a label matches if any substring occurs
+        """
+        labels: Dict[str, set] = {}
+        for label, words in cues.items():
+            for word in words:
+                labels.setdefault(word, set()).add(label)
+        words = sorted(labels, key=lambda w: (-len(w), w))
+        self._pattern = re.compile("(?=(" + "|".join(map(re.escape, words)) + "))")
+        # A match of ``word`` implies every cue that is a prefix of it
+        self._implied: Dict[str, FrozenSet[str]] = {
+            word: frozenset().union(*(labels[p] for p in words if word.startswith(p)))
+            for word in words
+        }
+
+    def match(self, text: str) -> FrozenSet[str]:
+        """Labels with at least one cue occurring in ``text``."""
+        found = set(self._pattern.findall(text))
+        if not found:
+            return frozenset()
+        return frozenset().union(*(self._implied[word] for word in found))
+
+
+class _TokenMemo:
+    """Per-token results: tokens seen, non-keyword tokens, cue labels by token.
+
+    A token is only added to ``seen`` after the other fields are filled in.
+    """
+
+    __slots__ = ("seen", "rejected", "cue_labels", "cue_tokens")
+
+    def __init__(self) -> None:
+        self.seen: set = set()
+        self.rejected: set = set()
+        self.cue_labels: Dict[str, FrozenSet[str]] = {}
+        self.cue_tokens: set = set()
+
+
+class ContentAnalysis(NamedTuple):
+    keywords: List[str]
+    memory_type: str
+    importance_score: float
+    summary: Optional[str]
+
+
+class ContentAnalyzer:
+    """Keyword extraction, classification, importance and summary in one pass."""
+
+    def __init__(self) -> None:
+        cues = {f"{memory_type}:content": words for memory_type, words, _ in CLASSIFICATION_RULES}
+        cues[HIGH_VALUE] = HIGH_VALUE_CUES
+        self._matcher = CueMatcher(cues)
+        if not all(_WORD_RE.fullmatch(cue) for words in cues.values() for cue in words):
+            raise ValueError("Cues must be single word tokens")
+        self._rules = tuple(
+            (memory_type, f"{memory_type}:content", frozenset(tags))
+            for memory_type, _, tags in CLASSIFICATION_RULES
+        )
+        self._memo = _TokenMemo()
+
+    def _learn(self, tokens: Iterable[str]) -> "_TokenMemo":
+        """Add tokens to the memo (starting a fresh one when it is full)."""
+        memo = self._memo
+        if len(memo.seen) >= _TOKEN_CACHE_SIZE:
+            # Swap rather than clear, so concurrent scans keep a consistent memo
+            memo = self._memo = _TokenMemo()
+        for token in tokens:
+            if token in memo.seen:
+                continue
+            if len(token) <= 2 or token in STOP_WORDS:
+                memo.rejected.add(token)
+            labels = self._matcher.match(token)
+            if labels:
+                memo.cue_labels[token] = labels
+                memo.cue_tokens.add(token)
+            memo.seen.add(token)
+        return memo
+
+    def _scan(self, lowered: str) -> Tuple[List[str], FrozenSet[str]]:
+        """Keywords and matched cue labels from one tokenization.
+
+        Set operations against the token memo run in C, so per-item Python
+        work is limited to stop words, cue-bearing and never-seen tokens.
+        """
+        counts = Counter(_WORD_RE.findall(lowered))
+        memo = self._memo
+        if not memo.seen.issuperset(counts):
+            memo = self._learn(counts)
+        labels: FrozenSet[str] = frozenset()
+        for token in memo.cue_tokens.intersection(counts):
+            labels |= memo.cue_labels[token]
+        for token in memo.rejected.intersection(counts):
+            del counts[token]
+        # Same selection and tie order as Counter.most_common(10); a stable
+        # sort equals heapq.nlargest and is cheaper for short texts
+        top = sorted(counts.items(), key=itemgetter(1), reverse=True)[:10]
+        return intern_strings([k for k, _ in top]), labels
+
+    def keywords(self, lowered: str) -> List[str]:
+        """Ten most frequent non-stop-words (longer than 2 chars), interned."""
+        return self._scan(lowered)[0]
+
+    def classify(self, cues: FrozenSet[str], tags: Sequence[str]) -> str:
+        """Memory type value from matched content cues, then tags, by priority."""
+        tags_lower = {t.lower() for t in tags} if tags else frozenset()
+        for memory_type, content_label, tag_cues in self._rules:
+            if content_label in cues or not tag_cues.isdisjoint(tags_lower):
+                return memory_type
+        return DEFAULT_TYPE
+
+    @staticmethod
+    def importance(content: str, memory_type: str, cues: FrozenSet[str]) -> float:
+        score = TYPE_SCORES.get(memory_type, 0.5)
+        if HIGH_VALUE in cues:
+            score = max(score, 0.8)  # Ensure critical content gets high score
+        # Length-based scoring (longer content often more important)
+        if len(content) > 200:
+            score += 0.1
+        elif len(content) < 50:
+            score -= 0.1
+        return min(1.0, max(0.0, score))
+
+    @staticmethod
+    def summary(content: str) -> Optional[str]:
+        """First sentence (or first 100 chars) of content longer than 100 chars."""
+        if len(content) <= 100:
+            return None
+        first = _SENTENCE_END_RE.split(content, maxsplit=1)[0]
+        if len(first) <= 100:
+            return first.strip()
+        return content[:97] + "..."
+
+    def cues(self, content: str) -> FrozenSet[str]:
+        return self._scan(content.lower())[1]
+
+    def analyze(self, content: str, tags: Optional[Sequence[str]] = None,
+                memory_type: Optional[str] = None) -> ContentAnalysis:
+        """
+        Analyze one memory.
+
+        Args:
+            content: Memory text
+            tags: Memory tags (used for classification)
+            memory_type: Explicit type value; skips classification
+        """
+        keywords, cues = self._scan(content.lower())
+        if memory_type is None:
+            memory_type = self.classify(cues, tags or ())
+        return ContentAnalysis(
+            keywords=keywords,
+            memory_type=memory_type,
+            importance_score=self.importance(content, memory_type, cues),
+            summary=self.summary(content),
+        )
+
+    def analyze_many(self, entries: Iterable[Tuple[str, Optional[Sequence[str]], Optional[str]]]) -> List[ContentAnalysis]:
+        """Analyze (content, tags, memory_type) triples in order."""
+        analyze = self.analyze
+        return [analyze(content, tags, memory_type) for content, tags, memory_type in entries]
+
+
+_default_analyzer: Optional[ContentAnalyzer] = None
+
+
+def get_analyzer() -> ContentAnalyzer:
+    """Shared analyzer (compiling the cue matcher once per process)."""
+    global _default_analyzer
+    if _default_analyzer is None:
+        _default_analyzer = ContentAnalyzer()
+    return _default_analyzer
@@ -0,0 +1,394 @@
+"""
+Delta Sync
+
+Watermark-based incremental synchronization between a local memory cache and
+a Firestore collection. Every synced document carries ``updated_at`` (the
+writer's clock, epoch seconds), ``origin`` (the replica that wrote it) and
+``synced_at`` (the server-assigned commit time). Each replica keeps a
+persisted cursor over ``synced_at``, the set of items it changed since its
+last push and the version of every other item it holds, so a sync pushes
+only dirty items and pulls only documents committed since the cursor: cost
+follows the change volume, not the collection size.
+
+The cursor follows commit times rather than replica clocks, so a write from
+a replica whose clock lags, or one committed just after a peer's pull, still
+sorts above that peer's cursor. Pulls re-read ``PULL_OVERLAP_SECONDS`` below
+the newest commit they saw and skip versions they already applied.
+
+Features:
+- Dirty tracking with a per-item local update time; clean items keep the
+  version they were last pushed or pulled at, so re-serializing one never
+  makes it look newer than a peer's edit
+- Batched pushes (one commit per 500 documents)
+- Cursor-paginated pulls of remote changes since the last watermark, with
+  an overlap window deduplicated by commit time
+- Deterministic conflict resolution: the newer ``updated_at`` wins and ties
+  go to the greater replica id, so every replica picks the same winner
+- Optional live pulls through Firestore snapshot listeners
+- Sync state persisted as JSON so restarts resume from the watermark
+
+Deletes are not propagated; removing a document remotely does not evict it
+from other replicas' caches.
+
+Cross-references:
+    - ai/memory/firestore_store.py: FirestoreMemoryStore.force_sync()
+    - ai/memory/enhanced_firestore.py: sync_with_firestore()
+    - ai/memory/firestore_paging.py: Cursor pagination used by pulls
+"""
+from __future__ import annotations
+import json
+import logging
+import os
+import threading
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from ai.memory.firestore_paging import FIRESTORE_PAGE_SIZE, paginate
+from ai.utils.clock import now as time_now
+
+logger = logging.getLogger(__name__)
+
+# Firestore caps a single batched write at 500 operations
+PUSH_BATCH_LIMIT = 500
+
+# (updated_at, origin) - compared as a tuple to pick conflict winners
+Version = Tuple[float, str]
+
+# Document field holding the commit time pulls are ordered by
+SYNC_FIELD = "synced_at"
+
+# How far below the newest commit seen a pull starts: covers commits that
+# become visible late and, without server timestamps, clock skew between
+# replicas
+PULL_OVERLAP_SECONDS = 30.0
+
+
+def remote_wins(local: Version, remote: Version) -> bool:
+    """Last writer wins; equal timestamps fall back to comparing replica ids."""
+    return remote > local
+
+
+def to_epoch(value: Any) -> float:
+    """Epoch seconds of a stored time (server timestamps are read back as datetimes)."""
+    if isinstance(value, datetime):
+        return value.timestamp()
+    return float(value or 0.0)
+
+
+class SyncState:
+    """Replica id, pull watermark, dirty items and item versions, optionally persisted."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self.replica_id = uuid.uuid4().hex
+        # Commit time pulls start from (0.0 until the first load or pull)
+        self.cursor = 0.0
+        # Commit time of each document version applied at or above the cursor
+        self.seen: Dict[str, float] = {}
+        self.dirty: Dict[str, float] = {}
+        # Version of each clean item as last pushed or applied
+        self.versions: Dict[str, Version] = {}
+        self._last_stamp = 0.0
+        if self.path and self.path.exists():
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.replica_id = data.get("replica_id") or self.replica_id
+            self.cursor = float(data.get("cursor", 0.0))
+            self.seen = {k: float(v) for k, v in data.get("seen", {}).items()}
+            self.dirty = {k: float(v) for k, v in data.get("dirty", {}).items()}
+            self.versions = {k: (float(v[0]), str(v[1])) for k, v in data.get("versions", {}).items()}
+            own = [ts for ts, origin in self.versions.values() if origin == self.replica_id]
+            self._last_stamp = max([0.0, *self.dirty.values(), *own])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable sync state {self.path}: {e}")
+
+    def save(self) -> None:
+        """Write state atomically (no-op without a path)."""
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "replica_id": self.replica_id,
+            "cursor": self.cursor,
+            "seen": self.seen,
+            "dirty": self.dirty,
+            "versions": self.versions,
+        }
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
+
+    def next_stamp(self) -> float:
+        """Strictly increasing ``updated_at`` values for this replica.
+
+        Unique stamps keep two edits of one item within the same clock tick
+        ordered for conflict resolution.
+        """
+        self._last_stamp = max(time_now(), self._last_stamp + 1e-6)
+        return self._last_stamp
+
+    def mark_dirty(self, item_id: str) -> float:
+        """Record a local change."""
+        updated_at = self.dirty[item_id] = self.next_stamp()
+        return updated_at
+
+    def mark_clean(self, item_id: str) -> None:
+        """Record that the local change reached Firestore."""
+        updated_at = self.dirty.pop(item_id, None)
+        if updated_at is not None:
+            self.versions[item_id] = (updated_at, self.replica_id)
+
+    def version(self, item_id: str) -> Version:
+        """Version of the local copy (the oldest possible one if unknown)."""
+        if item_id in self.dirty:
+            return (self.dirty[item_id], self.replica_id)
+        return self.versions.get(item_id, (0.0, ""))
+
+    def advance(self, cursor: float) -> None:
+        """Move the cursor forward; versions below it can no longer be re-read."""
+        if cursor > self.cursor:
+            self.cursor = cursor
+            self.seen = {doc_id: ts for doc_id, ts in self.seen.items() if ts >= cursor}
+
+
+class DeltaSync:
+    """
+    Incremental push/pull between an intelligent memory store and Firestore.
+
+    The store is only touched through ``_index``, ``_upsert_item`` and the
+    serializer pair, so the same engine serves both Firestore stores.
+    """
+
+    def __init__(self, store, client, collection, *,
+                 serialize: Callable[[Any], Dict[str, Any]],
+                 deserialize: Callable[[Dict[str, Any]], Any],
+                 state: Optional[SyncState] = None,
+                 retry: Optional[Callable[[Callable[[], Any]], Any]] = None,
+                 page_size: int = FIRESTORE_PAGE_SIZE,
+                 server_timestamp: Any = None,
+                 overlap: float = PULL_OVERLAP_SECONDS):
+        """Sync engine for one store and collection.
+
+        Args:
+            server_timestamp: Sentinel the server replaces with the commit
+                time (``firestore.SERVER_TIMESTAMP``); without one the
+                writer's ``updated_at`` is used and ``overlap`` must exceed
+                the clock skew between replicas
+            overlap: Seconds below the newest commit seen that pulls re-read
+        """
+        self.store = store
+        self.client = client
+        self.collection = collection
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.state = state or SyncState()
+        self.retry = retry
+        self.page_size = page_size
+        self.server_timestamp = server_timestamp
+        self.overlap = overlap
+        self._pending: deque = deque()
+        self._watch = None
+        self._lock = threading.Lock()
+        self.stats = {"pushed": 0, "pulled": 0, "applied": 0, "conflicts": 0, "failed": 0}
+
+    # ------------------------------------------------------------------
+    # Local changes
+    # ------------------------------------------------------------------
+
+    def mark_dirty(self, item_id: str) -> float:
+        return self.state.mark_dirty(item_id)
+
+    def mark_clean(self, item_ids: Iterable[str]) -> None:
+        for item_id in item_ids:
+            self.state.mark_clean(item_id)
+
+    def stamp(self, item_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Add version fields to serialized document data.
+
+        Only dirty items get this replica's new stamp; clean ones keep the
+        version they were pushed or pulled at.
+        """
+        data["updated_at"], data["origin"] = self.state.version(item_id)
+        data[SYNC_FIELD] = self.server_timestamp if self.server_timestamp is not None else data["updated_at"]
+        return data
+
+    def document(self, item) -> Dict[str, Any]:
+        return self.stamp(item.id, self.serialize(item))
+
+    def push(self, items: Optional[Iterable[Any]] = None) -> Dict[str, int]:
+        """Commit dirty items in batches; failed batches stay dirty.
+
+        Args:
+            items: Items to push (default: every dirty item still cached)
+        """
+        if items is None:
+            items = []
+            for item_id in list(self.state.dirty):
+                item = self.store._index.get(item_id)
+                if item is None:
+                    # Evicted before it could be pushed and no longer recoverable
+                    self.state.dirty.pop(item_id, None)
+                else:
+                    items.append(item)
+        items = [item for item in items if item.id in self.state.dirty]
+
+        pushed = failed = 0
+        for start in range(0, len(items), PUSH_BATCH_LIMIT):
+            chunk = items[start:start + PUSH_BATCH_LIMIT]
+            docs = [(item.id, self.document(item)) for item in chunk]
+
+            def commit(docs=docs):
+                batch = self.client.batch()
+                for doc_id, data in docs:
+                    batch.set(self.collection.document(doc_id), data)
+                batch.commit()
+
+            try:
+                self.retry(commit) if self.retry else commit()
+            except Exception as e:
+                logger.error(f"Delta push of {len(chunk)} memories failed: {e}")
+                failed += len(chunk)
+                continue
+            self.mark_clean(doc_id for doc_id, _ in docs)
+            pushed += len(chunk)
+
+        self.stats["pushed"] += pushed
+        self.stats["failed"] += failed
+        return {"pushed": pushed, "failed": failed}
+
+    # ------------------------------------------------------------------
+    # Remote changes
+    # ------------------------------------------------------------------
+
+    def _changes_query(self):
+        cursor: Any = self.state.cursor
+        if self.server_timestamp is not None:
+            cursor = datetime.fromtimestamp(cursor, timezone.utc)
+        return (self.collection
+                .where(SYNC_FIELD, ">=", cursor)
+                .order_by(SYNC_FIELD))
+
+    def _apply(self, doc_id: str, data: Optional[Dict[str, Any]]) -> str:
+        """Apply one remote document; returns "applied", "skipped" or "conflict"."""
+        if not data:
+            return "skipped"
+        remote: Version = (float(data.get("updated_at") or 0.0), data.get("origin") or "")
+        local_ts = self.state.dirty.get(doc_id)
+        if local_ts is not None:
+            if not remote_wins((local_ts, self.state.replica_id), remote):
+                # Local edit wins and is pushed on the next sync
+                return "conflict"
+            self.state.dirty.pop(doc_id, None)
+        elif remote[1] == self.state.replica_id or not remote_wins(self.state.version(doc_id), remote):
+            # Echo of our own push, or older than the copy we hold
+            return "skipped"
+
+        self.store._upsert_item(self.deserialize(data))
+        self.state.versions[doc_id] = remote
+        return "applied"
+
+    def _apply_docs(self, docs: Iterable[Any]) -> Dict[str, int]:
+        result = {"pulled": 0, "applied": 0, "conflicts": 0, "failed": 0}
+        newest = 0.0
+        retry_from = None
+        for doc in docs:
+            data = doc.to_dict()
+            if not data:
+                continue
+            committed = to_epoch(data.get(SYNC_FIELD))
+            newest = max(newest, committed)
+            if self.server_timestamp is not None:
+                # Every commit up to the read time is visible to the query
+                newest = max(newest, to_epoch(getattr(doc, "read_time", None)))
+            # The overlap window re-reads versions that were already applied
+            if self.state.seen.get(doc.id) == committed:
+                continue
+            result["pulled"] += 1
+            try:
+                outcome = self._apply(doc.id, data)
+            except Exception as e:
+                logger.warning(f"Failed to apply remote memory {doc.id}: {e}")
+                result["failed"] += 1
+                retry_from = committed if retry_from is None else min(retry_from, committed)
+                continue
+            self.state.seen[doc.id] = committed
+            if outcome == "applied":
+                result["applied"] += 1
+            elif outcome == "conflict":
+                result["conflicts"] += 1
+
+        if newest:
+            cursor = newest - self.overlap
+            # Keep failed documents inside the window so the next pull retries them
+            self.state.advance(cursor if retry_from is None else min(cursor, retry_from))
+        for key, value in result.items():
+            self.stats[key] += value
+        return result
+
+    def pull(self) -> Dict[str, int]:
+        """Apply documents changed since the cursor, page by page."""
+        return self._apply_docs(paginate(self._changes_query(), self.page_size, retry=self.retry))
+
+    def listen(self) -> bool:
+        """Receive remote changes through a snapshot listener.
+
+        Changes are queued on the listener thread and applied on the caller's
+        thread by ``apply_pending()`` (called from ``sync()``), so the store
+        is never mutated concurrently.
+        """
+        if self._watch is not None:
+            return True
+
+        def on_snapshot(docs, changes, read_time):
+            with self._lock:
+                for change in changes:
+                    if getattr(getattr(change, "type", None), "name", "") != "REMOVED":
+                        self._pending.append(change.document)
+
+        try:
+            self._watch = self._changes_query().on_snapshot(on_snapshot)
+        except Exception as e:
+            logger.warning(f"Snapshot listener unavailable, falling back to polling pulls: {e}")
+            return False
+        return True
+
+    def stop_listening(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def apply_pending(self) -> Dict[str, int]:
+        """Apply changes delivered by the snapshot listener."""
+        with self._lock:
+            docs = list(self._pending)
+            self._pending.clear()
+        return self._apply_docs(docs)
+
+    # ------------------------------------------------------------------
+
+    def sync(self) -> Dict[str, int]:
+        """Pull remote changes, then push local ones; persists the state.
+
+        Pulling first resolves conflicts before anything is written, so items
+        that lost to a newer remote version are never pushed.
+        """
+        pulled = self.apply_pending() if self._watch is not None else self.pull()
+        pushed = self.push()
+        self.state.save()
+        return {**pulled, **pushed, "dirty": len(self.state.dirty)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "dirty": len(self.state.dirty),
+            "cursor": self.state.cursor,
+            "listening": self._watch is not None,
+        }
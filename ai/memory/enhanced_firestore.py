@@ -7,27 +7,37 @@ with persistent cloud storage.
 
 Features:
 - Full intelligent memory support (classification, keywords, importance)  
-- Backup and restore operations
+- Streaming, compressed and incremental backup snapshots
+- Restore with parallel batched Firestore writes
 - Production-grade error handling and retry logic
-- Memory analytics and metrics
+- Memory analytics from running aggregates; cached Firestore counts
 - Batch operations for performance
 - Data migration utilities
+- Cursor-paginated load, sync and clear (no full-collection reads)
+- Incremental delta sync: dirty pushes and watermark pulls
 """
 from __future__ import annotations
 import os
 import json
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Any, Tuple
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from dataclasses import asdict, fields
 
-from ai.memory.store import MemoryStore, MemoryItem
+from ai.memory.store import MemoryStore, MemoryItem, intern_strings
 from ai.memory.intelligent_store import (
     IntelligentMemoryStore, 
     EnhancedMemoryItem, 
     MemoryType
 )
+from ai.memory.firestore_store import FIRESTORE_BATCH_LIMIT
+from ai.memory.firestore_paging import count_documents, paginate
+from ai.memory.delta_sync import PULL_OVERLAP_SECONDS, SYNC_FIELD, DeltaSync, SyncState
+from ai.memory.snapshot import DEFAULT_CHUNK_SIZE, iter_snapshot, read_manifest, verify_snapshot, write_snapshot
 from ai.monitor.firestore_tracker import wrap_firestore_client
+from ai.utils.clock import now as time_now
 
 
 class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
@@ -38,19 +48,38 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
     including backup/restore, analytics, and production-grade reliability.
     """
     
-    def __init__(self, collection_name: str = "intelligent_memory"):
+    def __init__(self, collection_name: str = "intelligent_memory",
+                 sync_state_path: Optional[str] = None):
         """
         Initialize enhanced Firestore store.
         
         Args:
             collection_name: Firestore collection name for memory storage
+            sync_state_path: Where the delta sync watermark and dirty items
+                are persisted (default: .fresh/memory_sync/<collection_name>.json)
         """
         self.collection_name = collection_name
+        self._firestore_count: Optional[Tuple[float, int]] = None  # (checked_at, count)
+        self._server_timestamp: Any = None  # commit-time sentinel for delta sync
         self._setup_firestore()
         
         # Initialize intelligent memory capabilities
         super().__init__()
         
+        state = SyncState(Path(sync_state_path) if sync_state_path
+                          else Path(".fresh") / "memory_sync" / f"{collection_name}.json")
+        if not state.cursor:
+            # The full load below covers everything older than this
+            state.cursor = time_now() - PULL_OVERLAP_SECONDS
+        self._delta = DeltaSync(
+            self, self._db, self._collection,
+            serialize=self._enhanced_item_to_dict,
+            deserialize=self._dict_to_enhanced_item,
+            state=state,
+            retry=self._retry_operation,
+            server_timestamp=self._server_timestamp,
+        )
+        
         # Load existing memories from Firestore
         self._load_from_firestore()
         
@@ -64,6 +93,7 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
         
         # Store the exceptions module for retry logic
         self._gcp_exceptions = gcp_exceptions
+        self._server_timestamp = firestore.SERVER_TIMESTAMP
         
         project_id = os.getenv("FIREBASE_PROJECT_ID")
         client_email = os.getenv("FIREBASE_CLIENT_EMAIL") 
@@ -109,13 +139,13 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
             "schema_version": "1.0",
             "store_type": "enhanced_firestore"
         }
-        return data
+        return self._delta.stamp(item.id, data)
         
     def _dict_to_enhanced_item(self, data: Dict[str, Any]) -> EnhancedMemoryItem:
         """Convert Firestore dict back to enhanced memory item."""
         # Handle legacy items without enhanced fields
         memory_type = MemoryType(data.get("memory_type", "context"))
-        keywords = data.get("keywords", [])
+        keywords = intern_strings(data.get("keywords"))
         related_ids = data.get("related_ids", [])
         importance_score = data.get("importance_score", 0.5)
         summary = data.get("summary")
@@ -130,7 +160,7 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
         return EnhancedMemoryItem(
             id=data["id"],
             content=data["content"], 
-            tags=data.get("tags", []),
+            tags=intern_strings(data.get("tags")),
             created_at=created_at,
             memory_type=memory_type,
             keywords=keywords,
@@ -142,13 +172,7 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
     def _load_from_firestore(self) -> None:
         """Load existing memories from Firestore into local cache."""
         try:
-            def load_operation():
-                docs = list(self._collection.stream())
-                return docs
-                
-            docs = self._retry_operation(load_operation)
-            
-            for doc in docs:
+            for doc in paginate(self._collection, retry=self._retry_operation):
                 try:
                     data = doc.to_dict()
                     if data:
@@ -168,6 +192,7 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
         """Write enhanced memory item with Firestore persistence."""
         # First create the intelligent memory item locally
         local_item = super().write(content=content, tags=tags)
+        self._delta.mark_dirty(local_item.id)
         
         # Then persist to Firestore
         try:
@@ -178,6 +203,7 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
                 return doc_ref
                 
             self._retry_operation(write_operation)
+            self._delta.mark_clean([local_item.id])
             
         except Exception as e:
             print(f"⚠️  Failed to persist memory {local_item.id} to Firestore: {e}")
@@ -185,56 +211,98 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
             
         return local_item
         
-    def backup_memories(self, backup_path: str) -> Dict[str, Any]:
+    def write_many(self, entries: Iterable[Dict[str, Any]]) -> List[EnhancedMemoryItem]:
+        """Write a batch of memories, persisting them in Firestore batch commits."""
+        local_items = super().write_many(entries)
+        for item in local_items:
+            self._delta.mark_dirty(item.id)
+        
+        for start in range(0, len(local_items), FIRESTORE_BATCH_LIMIT):
+            chunk = local_items[start:start + FIRESTORE_BATCH_LIMIT]
+            try:
+                def batch_operation():
+                    batch = self._db.batch()
+                    for item in chunk:
+                        batch.set(self._collection.document(item.id), self._enhanced_item_to_dict(item))
+                    batch.commit()
+                    
+                self._retry_operation(batch_operation)
+                self._delta.mark_clean(item.id for item in chunk)
+                
+            except Exception as e:
+                print(f"⚠️  Failed to persist batch of {len(chunk)} memories to Firestore: {e}")
+                # Continue with local storage even if Firestore write fails
+                
+        return local_items
+        
+    def backup_memories(self, backup_path: str, base_path: Optional[str] = None,
+                        compression: Optional[str] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE) -> Dict[str, Any]:
         """
-        Backup all memories to a JSON file.
+        Backup all memories to a streaming snapshot directory.
         
         Args:
-            backup_path: Path to save backup file
+            backup_path: Snapshot directory to create
+            base_path: Previous snapshot; only memories changed since it are written
+            compression: "gzip" or "zstd" (default: zstd when available)
+            chunk_size: Memories per compressed chunk file
             
         Returns:
-            Backup metadata including count and timestamp
+            Backup metadata including counts and timestamp
         """
         try:
-            backup_data = {
-                "metadata": {
-                    "backup_timestamp": datetime.now(timezone.utc).isoformat(),
-                    "total_memories": len(self._items),
-                    "collection_name": self.collection_name,
-                    "schema_version": "1.0"
-                },
-                "memories": []
+            metadata = {
+                "backup_timestamp": datetime.now(timezone.utc).isoformat(),
+                "collection_name": self.collection_name,
+                "schema_version": "1.0"
             }
+            # The commit-time placeholder is only meaningful to Firestore
+            records = ({k: v for k, v in self._enhanced_item_to_dict(item).items() if k != SYNC_FIELD}
+                       for item in list(self._items))
+            manifest = write_snapshot(backup_path, records, base=base_path,
+                                      compression=compression, chunk_size=chunk_size,
+                                      metadata=metadata)
             
-            # Export all memories
-            for item in self._items:
-                backup_data["memories"].append(self._enhanced_item_to_dict(item))
-                
-            # Write to file
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, indent=2, ensure_ascii=False)
-                
-            print(f"💾 Backed up {len(self._items)} memories to {backup_path}")
-            return backup_data["metadata"]
+            metadata.update({
+                "total_memories": manifest["total_memories"],
+                "written_memories": manifest["written_memories"],
+                "chunks": len(manifest["chunks"]),
+                "compression": manifest["compression"],
+                "base": base_path,
+            })
+            print(f"💾 Backed up {manifest['total_memories']} memories to {backup_path} "
+                  f"({manifest['written_memories']} written)")
+            return metadata
             
         except Exception as e:
             print(f"❌ Backup failed: {e}")
             raise e
             
-    def restore_memories(self, backup_path: str, clear_existing: bool = False) -> Dict[str, Any]:
+    def restore_memories(self, backup_path: str, clear_existing: bool = False,
+                         max_workers: int = 4) -> Dict[str, Any]:
         """
-        Restore memories from a backup file.
+        Restore memories from a snapshot directory or legacy JSON backup file.
+        
+        Records are streamed and committed to Firestore in batches of
+        FIRESTORE_BATCH_LIMIT, with up to ``max_workers`` commits in flight.
+        Restored memories replace cached ones with the same id.
         
         Args:
-            backup_path: Path to backup file
+            backup_path: Snapshot directory or JSON backup file
             clear_existing: Whether to clear existing memories first
+            max_workers: Concurrent Firestore batch commits
             
         Returns:
             Restore metadata including counts and status
         """
         try:
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
+            if Path(backup_path).is_dir():
+                # Fail before clearing anything if the snapshot is corrupt
+                verify_snapshot(backup_path) if clear_existing else read_manifest(backup_path)
+                records: Iterable[Dict[str, Any]] = iter_snapshot(backup_path)
+            else:
+                with open(backup_path, 'r', encoding='utf-8') as f:
+                    records = json.load(f).get("memories", [])
                 
             if clear_existing:
                 self._clear_all_memories()
@@ -242,24 +310,59 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
             restored_count = 0
             failed_count = 0
             
-            for memory_data in backup_data.get("memories", []):
+            def commit_batch(docs: List[Tuple[str, Dict[str, Any]]]) -> None:
+                # Runs on a pool thread: only touches the prepared documents
+                def batch_operation():
+                    batch = self._db.batch()
+                    for doc_id, data in docs:
+                        batch.set(self._collection.document(doc_id), data)
+                    batch.commit()
+                    
+                self._retry_operation(batch_operation)
+                
+            def settle(future: Future, chunk: List[EnhancedMemoryItem]) -> None:
+                nonlocal restored_count, failed_count
                 try:
-                    # Restore to local storage
-                    enhanced_item = self._dict_to_enhanced_item(memory_data)
-                    self._items.append(enhanced_item)
-                    self._update_indexes(enhanced_item)
+                    future.result()
+                    self._delta.mark_clean(item.id for item in chunk)
+                    restored_count += len(chunk)
+                except Exception as e:
+                    print(f"⚠️  Failed to restore batch of {len(chunk)} memories: {e}")
+                    failed_count += len(chunk)
                     
-                    # Restore to Firestore
-                    def restore_operation():
-                        doc_ref = self._collection.document(enhanced_item.id)
-                        doc_ref.set(memory_data)
-                        
-                    self._retry_operation(restore_operation)
-                    restored_count += 1
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                inflight: Dict[Future, List[EnhancedMemoryItem]] = {}
+                chunk: List[EnhancedMemoryItem] = []
+                
+                def submit(chunk: List[EnhancedMemoryItem]) -> None:
+                    # Bound in-flight batches so memory stays flat on large restores
+                    if len(inflight) >= max_workers * 2:
+                        done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            settle(future, inflight.pop(future))
+                    docs = [(item.id, self._enhanced_item_to_dict(item)) for item in chunk]
+                    inflight[executor.submit(commit_batch, docs)] = chunk
                     
-                except Exception as e:
-                    print(f"⚠️  Failed to restore memory: {e}")
-                    failed_count += 1
+                for memory_data in records:
+                    try:
+                        # Restore to local storage
+                        enhanced_item = self._dict_to_enhanced_item(memory_data)
+                        self._upsert_item(enhanced_item)
+                        self._delta.mark_dirty(enhanced_item.id)
+                        chunk.append(enhanced_item)
+                    except Exception as e:
+                        print(f"⚠️  Failed to restore memory: {e}")
+                        failed_count += 1
+                        continue
+                        
+                    if len(chunk) >= FIRESTORE_BATCH_LIMIT:
+                        submit(chunk)
+                        chunk = []
+                        
+                if chunk:
+                    submit(chunk)
+                for future in list(inflight):
+                    settle(future, inflight.pop(future))
                     
             restore_metadata = {
                 "restore_timestamp": datetime.now(timezone.utc).isoformat(),
@@ -280,41 +383,56 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
         """Clear all memories from both local storage and Firestore."""
         # Clear local storage
         self._items.clear()
-        self._keyword_index.clear()
-        self._type_index.clear()
+        self._index.clear()
+        self._stats.clear()
+        self._eviction.clear()
+        self._bump_generation()
+        if self._vectors is not None:
+            self._vectors.clear()
         
         # Clear Firestore (batch delete)
         try:
-            def delete_operation():
-                docs = list(self._collection.stream())
-                batch = self._db.batch()
-                for doc in docs:
-                    batch.delete(doc.reference)
-                batch.commit()
-                
-            self._retry_operation(delete_operation)
+            # Always re-read the first page: deleted documents drop out of it
+            while True:
+                def delete_operation():
+                    docs = list(self._collection.limit(FIRESTORE_BATCH_LIMIT).stream())
+                    if docs:
+                        batch = self._db.batch()
+                        for doc in docs:
+                            batch.delete(doc.reference)
+                        batch.commit()
+                    return len(docs)
+                    
+                if self._retry_operation(delete_operation) < FIRESTORE_BATCH_LIMIT:
+                    break
             
         except Exception as e:
             print(f"⚠️  Failed to clear Firestore collection: {e}")
             
-    def get_production_analytics(self) -> Dict[str, Any]:
-        """Get enhanced analytics including Firestore metrics."""
+    def get_production_analytics(self, max_age: float = 60.0) -> Dict[str, Any]:
+        """
+        Get enhanced analytics including Firestore metrics.
+        
+        Args:
+            max_age: Seconds a Firestore document count may be reused for, so
+                dashboards polling this do not issue a count query each time
+        """
         base_analytics = self.get_memory_analytics()
         
         # Add production-specific metrics
         try:
-            def get_firestore_stats():
-                docs = list(self._collection.stream())
-                return len(docs)
-                
-            firestore_count = self._retry_operation(get_firestore_stats)
+            checked_at = time_now()
+            if self._firestore_count is None or checked_at - self._firestore_count[0] > max_age:
+                count = count_documents(self._collection, retry=self._retry_operation)
+                self._firestore_count = (checked_at, count)
+            counted_at, firestore_count = self._firestore_count
             
             production_metrics = {
                 "firestore_memory_count": firestore_count,
                 "local_memory_count": len(self._items),
                 "sync_status": "synced" if firestore_count == len(self._items) else "out_of_sync",
                 "collection_name": self.collection_name,
-                "last_check": datetime.now(timezone.utc).isoformat()
+                "last_check": datetime.fromtimestamp(counted_at, timezone.utc).isoformat()
             }
             
             base_analytics["production_metrics"] = production_metrics
@@ -325,47 +443,65 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
             
         return base_analytics
         
-    def sync_with_firestore(self) -> Dict[str, int]:
+    def sync_with_firestore(self, full: bool = False) -> Dict[str, int]:
         """
         Synchronize local memory with Firestore.
         
+        By default only changes move: documents updated since the last sync
+        watermark are pulled and locally dirty memories are pushed, with the
+        newer version winning conflicts. ``full=True`` reconciles the whole
+        collection instead (one paginated pass), e.g. to repair drift.
+        
         Returns:
             Sync statistics
         """
-        try:
-            def get_firestore_memories():
-                docs = list(self._collection.stream())
-                return {doc.id: doc.to_dict() for doc in docs}
+        if not full:
+            try:
+                result = self._delta.sync()
+                sync_stats = {
+                    "mode": "delta",
+                    "local_count": len(self._items),
+                    **result,
+                    "synced": result["applied"] + result["pushed"],
+                }
+                print(f"🔄 Sync complete: {sync_stats}")
+                return sync_stats
+            except Exception as e:
+                print(f"❌ Sync failed: {e}")
+                return {"error": str(e)}
                 
-            firestore_memories = self._retry_operation(get_firestore_memories)
+        try:
             local_memory_ids = {item.id for item in self._items}
-            firestore_ids = set(firestore_memories.keys())
-            
-            # Find differences
-            missing_in_local = firestore_ids - local_memory_ids
-            missing_in_firestore = local_memory_ids - firestore_ids
-            
+            firestore_ids = set()
             sync_stats = {
+                "mode": "full",
                 "local_count": len(self._items),
-                "firestore_count": len(firestore_memories),
-                "missing_in_local": len(missing_in_local),
-                "missing_in_firestore": len(missing_in_firestore),
+                "firestore_count": 0,
+                "missing_in_local": 0,
+                "missing_in_firestore": 0,
                 "synced": 0,
                 "failed": 0
             }
             
-            # Sync missing memories from Firestore to local
-            for memory_id in missing_in_local:
+            # Single paginated pass: pull memories missing locally as they stream by
+            for doc in paginate(self._collection, retry=self._retry_operation):
+                firestore_ids.add(doc.id)
+                if doc.id in local_memory_ids:
+                    continue
+                sync_stats["missing_in_local"] += 1
                 try:
-                    data = firestore_memories[memory_id]
-                    enhanced_item = self._dict_to_enhanced_item(data)
+                    enhanced_item = self._dict_to_enhanced_item(doc.to_dict())
                     self._items.append(enhanced_item)
                     self._update_indexes(enhanced_item)
                     sync_stats["synced"] += 1
                 except Exception as e:
-                    print(f"⚠️  Failed to sync memory {memory_id} from Firestore: {e}")
+                    print(f"⚠️  Failed to sync memory {doc.id} from Firestore: {e}")
                     sync_stats["failed"] += 1
                     
+            missing_in_firestore = local_memory_ids - firestore_ids
+            sync_stats["firestore_count"] = len(firestore_ids)
+            sync_stats["missing_in_firestore"] = len(missing_in_firestore)
+                    
             # Sync missing memories from local to Firestore
             for item in self._items:
                 if item.id in missing_in_firestore:
@@ -376,6 +512,7 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
                             doc_ref.set(doc_data)
                             
                         self._retry_operation(sync_to_firestore)
+                        self._delta.mark_clean([item.id])
                         sync_stats["synced"] += 1
                     except Exception as e:
                         print(f"⚠️  Failed to sync memory {item.id} to Firestore: {e}")
@@ -401,21 +538,9 @@ class EnhancedFirestoreMemoryStore(IntelligentMemoryStore):
         if len(self._items) <= max_items:
             return {"removed": 0, "kept": len(self._items)}
             
-        # Sort by importance and age (keep important and recent)
-        self._items.sort(key=lambda i: (i.importance_score, i.created_at.timestamp()), reverse=True)
-        
-        # Items to remove
-        items_to_remove = self._items[max_items:]
+        # Evict locally by policy (importance and age by default)
+        items_to_remove = self._evict_to(max_items)
         removed_ids = [item.id for item in items_to_remove]
-        
-        # Keep only the top items locally
-        self._items = self._items[:max_items]
-        
-        # Rebuild indexes
-        self._keyword_index.clear()
-        self._type_index.clear()
-        for item in self._items:
-            self._update_indexes(item)
             
         # Remove from Firestore
         removed_count = 0
@@ -0,0 +1,251 @@
+"""
+Memory Eviction Policies
+
+Pluggable eviction policies for bounded local memory caches. Each policy keeps
+a priority heap over the cached items so picking a victim costs O(log n)
+instead of re-sorting the whole cache on every trim.
+
+Features:
+- ImportancePolicy (default): evict lowest importance, then oldest - the
+  ordering the stores have always used for trimming
+- LRUPolicy: evict the least recently accessed item
+- LFUPolicy: evict the least frequently accessed item (LRU among ties)
+- TTLPolicy: expire items older than ``ttl_seconds``; evict oldest when full
+- Hit/miss/eviction/expiration counters via ``get_stats()``
+
+Heap entries are invalidated lazily: re-prioritising an item pushes a new
+entry and stale ones are skipped when popped (and compacted when they pile up).
+
+Cross-references:
+    - ai/memory/intelligent_store.py: optimize_memory() and access tracking
+    - ai/memory/firestore_store.py: max_local_cache trimming
+    - docs/MEMORY_SYSTEM.md: Memory architecture overview
+"""
+from __future__ import annotations
+import heapq
+from itertools import count
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ai.utils.clock import now as time_now
+
+HeapEntry = Tuple[Any, ...]  # (*priority, tick, item_id)
+
+
+class EvictionPolicy:
+    """Base class for cache eviction policies.
+
+    Subclasses implement ``_priority``; the item with the smallest priority
+    is evicted first. Every (re)prioritisation stamps the item with a fresh
+    logical clock tick, which doubles as the recency ordering and as the
+    marker that tells live heap entries from stale ones. Items must expose
+    ``id``; policies read whatever other attributes they rank on
+    (``importance_score``, ``created_at``).
+    """
+
+    name = "base"
+
+    # Policies whose priority ignores access patterns skip the heap push
+    _reprioritize_on_access = False
+
+    def __init__(self) -> None:
+        self._heap: List[HeapEntry] = []
+        self._live: Dict[str, int] = {}  # item id -> tick of its current heap entry
+        self._items: Dict[str, Any] = {}
+        self._clock = count()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._live
+
+    # ------------------------------------------------------------------
+    # Tracking
+    # ------------------------------------------------------------------
+
+    def _priority(self, item: Any, tick: int) -> Tuple:
+        raise NotImplementedError
+
+    def _push(self, item: Any) -> None:
+        tick = next(self._clock)
+        self._live[item.id] = tick
+        # Flat tuples keep the per-item heap overhead to a single object
+        heapq.heappush(self._heap, (*self._priority(item, tick), tick, item.id))
+        # Stale entries are skipped on pop; compact before they dominate
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [entry for entry in self._heap if self._live.get(entry[-1]) == entry[-2]]
+            heapq.heapify(self._heap)
+
+    def track(self, item: Any) -> None:
+        """Start tracking an item (re-tracking refreshes its priority)."""
+        self._items[item.id] = item
+        self._push(item)
+
+    def touch(self, item_id: str) -> None:
+        """Record an access (cache hit) on a tracked item."""
+        item = self._items.get(item_id)
+        if item is None:
+            return
+        self.stats["hits"] += 1
+        self._on_access(item_id)
+        if self._reprioritize_on_access:
+            self._push(item)
+
+    def _on_access(self, item_id: str) -> None:
+        """Hook for policies that keep per-item access state."""
+
+    def miss(self) -> None:
+        """Record a lookup for an item that is not cached."""
+        self.stats["misses"] += 1
+
+    def forget(self, item_id: str) -> None:
+        """Stop tracking an item that was removed by other means."""
+        self._live.pop(item_id, None)
+        self._items.pop(item_id, None)
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._live.clear()
+        self._items.clear()
+
+    def rebuild(self, items: Iterable[Any]) -> None:
+        """Track ``items`` from scratch (access history is reset)."""
+        self.clear()
+        for item in items:
+            self.track(item)
+
+    # ------------------------------------------------------------------
+    # Eviction
+    # ------------------------------------------------------------------
+
+    def _pop(self) -> Optional[str]:
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            if self._live.get(entry[-1]) == entry[-2]:
+                self.forget(entry[-1])
+                return entry[-1]
+        return None
+
+    def _peek(self) -> Optional[HeapEntry]:
+        while self._heap:
+            entry = self._heap[0]
+            if self._live.get(entry[-1]) == entry[-2]:
+                return entry
+            heapq.heappop(self._heap)
+        return None
+
+    def evict(self, n: int = 1) -> List[str]:
+        """Pop the ids of the ``n`` items that should leave the cache next."""
+        victims: List[str] = []
+        while len(victims) < n:
+            item_id = self._pop()
+            if item_id is None:
+                break
+            victims.append(item_id)
+        self.stats["evictions"] += len(victims)
+        return victims
+
+    def expired(self) -> List[str]:
+        """Pop the ids of items whose lifetime has ended (TTL policies only)."""
+        return []
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "policy": self.name,
+            "size": len(self),
+            **self.stats,
+            "hit_rate": self.stats["hits"] / lookups if lookups else 0.0,
+        }
+
+
+class ImportancePolicy(EvictionPolicy):
+    """Evict the least important item, oldest first among equals."""
+
+    name = "importance"
+
+    def _priority(self, item: Any, tick: int) -> Tuple:
+        # Later insertions lose ties, like the stable sort this replaces
+        return (item.importance_score, item.created_at.timestamp(), -tick)
+
+
+class LRUPolicy(EvictionPolicy):
+    """Evict the least recently written or accessed item."""
+
+    name = "lru"
+    _reprioritize_on_access = True
+
+    def _priority(self, item: Any, tick: int) -> Tuple:
+        return ()  # the tick alone orders by recency
+
+
+class LFUPolicy(EvictionPolicy):
+    """Evict the least frequently accessed item, least recent among equals."""
+
+    name = "lfu"
+    _reprioritize_on_access = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._frequency: Dict[str, int] = {}
+
+    def _on_access(self, item_id: str) -> None:
+        self._frequency[item_id] = self._frequency.get(item_id, 0) + 1
+
+    def _priority(self, item: Any, tick: int) -> Tuple:
+        return (self._frequency.get(item.id, 0),)
+
+    def forget(self, item_id: str) -> None:
+        super().forget(item_id)
+        self._frequency.pop(item_id, None)
+
+    def clear(self) -> None:
+        super().clear()
+        self._frequency.clear()
+
+
+class TTLPolicy(EvictionPolicy):
+    """Expire items ``ttl_seconds`` after creation; evict oldest when full."""
+
+    name = "ttl"
+
+    def __init__(self, ttl_seconds: float = 7 * 24 * 3600) -> None:
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+
+    def _priority(self, item: Any, tick: int) -> Tuple:
+        return (item.created_at.timestamp(),)
+
+    def expired(self) -> List[str]:
+        cutoff = time_now() - self.ttl_seconds
+        victims: List[str] = []
+        while True:
+            entry = self._peek()
+            if entry is None or entry[0] >= cutoff:
+                break
+            victims.append(self._pop())
+        self.stats["expirations"] += len(victims)
+        return victims
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**super().get_stats(), "ttl_seconds": self.ttl_seconds}
+
+
+EVICTION_POLICIES = {
+    policy.name: policy for policy in (ImportancePolicy, LRUPolicy, LFUPolicy, TTLPolicy)
+}
+
+
+def create_eviction_policy(policy: "str | EvictionPolicy | None" = None, **kwargs) -> EvictionPolicy:
+    """Build a policy from its name ("importance", "lru", "lfu", "ttl").
+
+    Passing an EvictionPolicy instance returns it unchanged; ``None`` gives
+    the default importance policy.
+    """
+    if isinstance(policy, EvictionPolicy):
+        return policy
+    name = (policy or ImportancePolicy.name).lower()
+    if name not in EVICTION_POLICIES:
+        raise ValueError(f"Unknown eviction policy '{policy}'. Choose from: {', '.join(EVICTION_POLICIES)}")
+    return EVICTION_POLICIES[name](**kwargs)
@@ -0,0 +1,106 @@
+"""
+Firestore Paging
+
+Cursor-based pagination helpers for the Firestore memory stores. Large
+collections are read one page at a time with ``start_after`` cursors, so no
+caller ever materializes a whole collection, and keyword/tag filters are
+pushed to the server with ``array_contains_any`` instead of being applied to
+over-fetched documents on the client.
+
+Features:
+- ``paginate``: lazily yields documents page by page, optionally retrying
+  each page fetch (a retry never replays documents already yielded)
+- ``array_contains_any_queries``: splits long value lists into the chunks
+  Firestore accepts in a single ``array_contains_any`` filter
+- ``merge_ordered``: merges several already-ordered document streams,
+  dropping duplicates, for multi-chunk searches
+- ``count_documents``: ``count()`` aggregation with a projection fallback
+
+Cross-references:
+    - ai/memory/firestore_store.py: search_firestore(), iter_firestore()
+    - ai/memory/enhanced_firestore.py: streaming load, sync and analytics
+    - ai/monitor/firestore_tracker.py: read instrumentation for every page
+"""
+from __future__ import annotations
+import heapq
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence
+
+# Documents fetched per round trip when paginating
+FIRESTORE_PAGE_SIZE = 300
+
+# Firestore accepts at most 30 values in one array-contains-any / in filter
+ARRAY_CONTAINS_ANY_LIMIT = 30
+
+Retry = Callable[[Callable[[], Any]], Any]
+
+
+def paginate(query, page_size: int = FIRESTORE_PAGE_SIZE, *,
+             retry: Optional[Retry] = None, max_documents: Optional[int] = None) -> Iterator[Any]:
+    """Yield every document matched by ``query`` using cursor pagination.
+
+    Args:
+        query: Firestore query or collection reference (ordering, if any,
+            must be applied before paging so cursors are stable)
+        page_size: Documents fetched per request
+        retry: Optional wrapper used to run each page fetch, e.g. a store's
+            ``_retry_operation``
+        max_documents: Stop after this many documents
+    """
+    last_doc = None
+    remaining = max_documents
+    while remaining is None or remaining > 0:
+        size = page_size if remaining is None else min(page_size, remaining)
+        page_query = query.limit(size)
+        if last_doc is not None:
+            page_query = page_query.start_after(last_doc)
+
+        def fetch_page(page_query=page_query) -> List[Any]:
+            return list(page_query.stream())
+
+        page = retry(fetch_page) if retry else fetch_page()
+        yield from page
+        if remaining is not None:
+            remaining -= len(page)
+        if len(page) < size:
+            return
+        last_doc = page[-1]
+
+
+def array_contains_any_queries(query, field: str, values: Iterable[Any]) -> List[Any]:
+    """Return one query per chunk of ``values`` filtered with array_contains_any."""
+    unique = list(dict.fromkeys(values))
+    return [
+        query.where(field, "array_contains_any", unique[start:start + ARRAY_CONTAINS_ANY_LIMIT])
+        for start in range(0, len(unique), ARRAY_CONTAINS_ANY_LIMIT)
+    ]
+
+
+def merge_ordered(streams: Sequence[Iterable[Any]], key: Callable[[Any], Any]) -> Iterator[Any]:
+    """Merge document streams that are each sorted by ``key``; duplicate ids are dropped.
+
+    Streams are consumed lazily, so taking the first N results only reads
+    about N documents per stream.
+    """
+    if len(streams) == 1:
+        yield from streams[0]
+        return
+    seen = set()
+    for doc in heapq.merge(*streams, key=key):
+        if doc.id not in seen:
+            seen.add(doc.id)
+            yield doc
+
+
+def count_documents(query, *, retry: Optional[Retry] = None) -> int:
+    """Count matching documents without downloading them.
+
+    Uses the ``count()`` aggregation (one billed read per 1000 documents)
+    and falls back to paging over an id-only projection on older clients.
+    """
+    def aggregate() -> int:
+        return int(query.count().get()[0][0].value)
+
+    try:
+        return retry(aggregate) if retry else aggregate()
+    except AttributeError:
+        return sum(1 for _ in paginate(query.select([]), retry=retry))
@@ -9,20 +9,40 @@ Features:
 - Automatic memory consolidation and cleanup
 - Activity-based memory scoring and relevance
 - Graceful fallback to in-memory store if Firestore unavailable
+- Optional write-behind queue so writes never block on Firestore
+- Pluggable local cache eviction (importance, LRU, LFU, TTL)
+- Optional vector index for semantic search, persisted next to the spool
+- Server-side filtered, cursor-paginated search and streaming (iter_firestore)
+- Optional watermark-based delta sync (push dirty items, pull changes since cursor)
 
 Cross-references:
     - ADR-004: Persistent Agent Memory
     - ai/memory/store.py: Base memory store interface
     - ai/memory/intelligent_store.py: Enhanced memory features
+    - ai/memory/write_behind.py: Background write-behind queue
+    - ai/memory/eviction.py: Local cache eviction policies
+    - ai/memory/delta_sync.py: Incremental sync engine
 """
 from __future__ import annotations
 import json
 import logging
 from datetime import datetime, timezone, timedelta
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable, Iterator, Tuple
 from dataclasses import asdict
+from pathlib import Path
 
+from ai.memory.store import intern_strings
 from ai.memory.intelligent_store import IntelligentMemoryStore, EnhancedMemoryItem, MemoryType
+from ai.memory.write_behind import WriteBehindQueue
+from ai.memory.eviction import EvictionPolicy
+from ai.memory.delta_sync import PULL_OVERLAP_SECONDS, DeltaSync, SyncState
+from ai.memory.firestore_paging import (
+    FIRESTORE_PAGE_SIZE,
+    array_contains_any_queries,
+    count_documents,
+    merge_ordered,
+    paginate,
+)
 from ai.utils.clock import now as time_now
 from ai.monitor.firestore_tracker import wrap_firestore_client
 
@@ -37,6 +57,9 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Firestore caps a single batched write at 500 operations
+FIRESTORE_BATCH_LIMIT = 500
+
 
 class FirestoreMemoryStore(IntelligentMemoryStore):
     """
@@ -53,7 +76,15 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
                  project_id: Optional[str] = None,
                  collection_name: str = "agent_memories",
                  max_local_cache: int = 100,
-                 sync_on_write: bool = True):
+                 sync_on_write: bool = True,
+                 write_behind: bool = False,
+                 spool_path: Optional[str] = None,
+                 max_pending_writes: int = 10_000,
+                 eviction_policy: "str | EvictionPolicy | None" = None,
+                 vector_search: bool = False,
+                 vector_path: Optional[str] = None,
+                 delta_sync: bool = False,
+                 sync_state_path: Optional[str] = None):
         """
         Initialize Firestore memory store.
         
@@ -62,14 +93,30 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
             collection_name: Firestore collection name for memories
             max_local_cache: Maximum items to keep in local cache
             sync_on_write: Whether to sync to Firestore on every write
+            write_behind: Sync through a background queue instead of on the
+                caller's thread
+            spool_path: Durable spool for queued writes
+                (default: .fresh/memory_spool/<collection_name>.jsonl)
+            max_pending_writes: Queue bound before writes fall back to direct sync
+            eviction_policy: Which items leave the local cache first
+                ("importance" (default), "lru", "lfu", "ttl" or a policy instance)
+            vector_search: Maintain a vector index for semantic_search()
+            vector_path: Where vectors are persisted
+                (default: .fresh/memory_vectors/<collection_name>)
+            delta_sync: Track dirty items and a sync watermark so force_sync()
+                only moves changes
+            sync_state_path: Where the delta sync state is persisted
+                (default: .fresh/memory_sync/<collection_name>.json)
         """
-        super().__init__()
+        super().__init__(eviction_policy=eviction_policy)
         
         self.project_id = project_id
         self.collection_name = collection_name
         self.max_local_cache = max_local_cache
         self.sync_on_write = sync_on_write
         self._firestore_client = None
+        self._write_queue: Optional[WriteBehindQueue] = None
+        self._delta: Optional[DeltaSync] = None
         self._last_sync = 0.0
         
         # Initialize Firestore connection
@@ -78,6 +125,75 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
         # Load existing memories from Firestore
         if self._firestore_client:
             self._load_from_firestore()
+            
+        if delta_sync:
+            self.enable_delta_sync(sync_state_path)
+            
+        if write_behind:
+            self.enable_write_behind(spool_path=spool_path, max_pending=max_pending_writes)
+            
+        if vector_search:
+            self.enable_vector_index(
+                path=vector_path or str(Path(".fresh") / "memory_vectors" / collection_name)
+            )
+    
+    def enable_write_behind(self, spool_path: Optional[str] = None, max_pending: int = 10_000) -> None:
+        """Route Firestore syncs through a background write-behind queue."""
+        if not self._firestore_client or self._write_queue is not None:
+            return
+        spool = Path(spool_path) if spool_path else Path(".fresh") / "memory_spool" / f"{self.collection_name}.jsonl"
+        self._write_queue = WriteBehindQueue(
+            self._commit_documents,
+            spool_path=spool,
+            max_pending=max_pending,
+            batch_size=FIRESTORE_BATCH_LIMIT,
+        )
+        
+    def enable_delta_sync(self, state_path: Optional[str] = None) -> Optional[DeltaSync]:
+        """Switch force_sync() to incremental, watermark-based sync.
+        
+        A fresh replica starts its watermark at load time (less the pull
+        overlap, as the load time comes from the local clock), since the
+        initial load already reflects everything older.
+        """
+        if not self._firestore_client:
+            return None
+        if self._delta is None:
+            path = Path(state_path) if state_path else Path(".fresh") / "memory_sync" / f"{self.collection_name}.json"
+            state = SyncState(path)
+            if not state.cursor:
+                state.cursor = self._last_sync - PULL_OVERLAP_SECONDS
+            self._delta = DeltaSync(
+                self,
+                self._firestore_client,
+                self._firestore_client.collection(self.collection_name),
+                serialize=self._memory_item_to_dict,
+                deserialize=self._dict_to_memory_item,
+                state=state,
+                server_timestamp=firestore.SERVER_TIMESTAMP if firestore is not None else None,
+            )
+        return self._delta
+        
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued writes are committed (no-op without write-behind)."""
+        if self._write_queue is None:
+            return True
+        return self._write_queue.flush(timeout=timeout)
+        
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """Flush and stop the write-behind queue; unsynced writes stay spooled.
+        
+        Also persists the vector index and delta sync state when enabled.
+        """
+        self.save_vector_index()
+        if self._delta is not None:
+            self._delta.stop_listening()
+            self._delta.state.save()
+        if self._write_queue is None:
+            return True
+        drained = self._write_queue.close(timeout=timeout)
+        self._write_queue = None
+        return drained
     
     def _init_firestore(self) -> None:
         """Initialize Firestore client with error handling."""
@@ -130,10 +246,10 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
             # Load recent memories first (last 30 days)
             cutoff_time = datetime.fromtimestamp(time_now() - 30 * 24 * 3600, timezone.utc)
             
-            query = collection_ref.where('created_at', '>=', cutoff_time).order_by('created_at', direction=firestore.Query.DESCENDING).limit(self.max_local_cache)
+            query = collection_ref.where('created_at', '>=', cutoff_time).order_by('created_at', direction='DESCENDING')
             
             memories = []
-            for doc in query.stream():
+            for doc in paginate(query, max_documents=self.max_local_cache):
                 try:
                     data = doc.to_dict()
                     memory_item = self._dict_to_memory_item(data)
@@ -145,10 +261,7 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
             self._items = list(reversed(memories))
             
             # Rebuild indexes
-            self._keyword_index.clear()
-            self._type_index.clear()
-            for item in self._items:
-                self._update_indexes(item)
+            self._rebuild_indexes()
                 
             logger.info(f"Loaded {len(self._items)} memories from Firestore")
             self._last_sync = time_now()
@@ -175,10 +288,10 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
         return EnhancedMemoryItem(
             id=data.get('id', ''),
             content=data.get('content', ''),
-            tags=data.get('tags', []),
+            tags=intern_strings(data.get('tags')),
             created_at=created_at,
             memory_type=memory_type,
-            keywords=data.get('keywords', []),
+            keywords=intern_strings(data.get('keywords')),
             related_ids=data.get('related_ids', []),
             importance_score=data.get('importance_score', 0.5),
             summary=data.get('summary')
@@ -198,12 +311,14 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
             'summary': item.summary,
             'last_accessed': datetime.fromtimestamp(time_now(), timezone.utc)
         }
+        if self._delta is not None:
+            self._delta.stamp(item.id, data)
         return data
     
-    def _sync_to_firestore(self, item: EnhancedMemoryItem) -> None:
+    def _sync_to_firestore(self, item: EnhancedMemoryItem) -> bool:
         """Sync a single memory item to Firestore."""
         if not self._firestore_client:
-            return
+            return False
             
         try:
             collection_ref = self._firestore_client.collection(self.collection_name)
@@ -211,53 +326,117 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
             data = self._memory_item_to_dict(item)
             doc_ref.set(data)
             logger.debug(f"Synced memory {item.id} to Firestore")
+            return True
         except Exception as e:
             logger.error(f"Failed to sync memory {item.id} to Firestore: {e}")
+            return False
     
     def write(self, *, content: str, tags: Optional[List[str]] = None, 
               memory_type: Optional[MemoryType] = None, 
               metadata: Optional[Dict[str, Any]] = None) -> EnhancedMemoryItem:
         """Write enhanced memory item with Firestore persistence."""
-        # Use parent implementation for intelligent processing
-        if memory_type:
-            # Override auto-classification if type provided
-            item = super().write(content=content, tags=tags)
-            item.memory_type = memory_type
-        else:
-            item = super().write(content=content, tags=tags)
-        
-        # Add metadata if provided
-        if metadata:
-            item.metadata = metadata
+        # Use parent implementation for intelligent processing; passing the
+        # type through (rather than patching it afterwards) keeps the type
+        # index consistent
+        item = super().write(content=content, tags=tags,
+                             memory_type=memory_type, metadata=metadata)
+        if self._delta is not None:
+            self._delta.mark_dirty(item.id)
         
         # Sync to Firestore if enabled
         if self.sync_on_write:
-            self._sync_to_firestore(item)
+            self._persist(item)
         
         # Manage local cache size
         self._manage_local_cache()
         
         return item
     
-    def _manage_local_cache(self) -> None:
-        """Manage local cache size by removing least important old items."""
-        if len(self._items) <= self.max_local_cache:
-            return
+    def _persist(self, item: EnhancedMemoryItem) -> None:
+        """Hand an item to the write-behind queue, or sync it directly."""
+        if self._write_queue is not None and self._write_queue.submit(item.id, self._memory_item_to_dict(item)):
+            synced = True  # the queue owns delivery from here
+        else:
+            synced = self._sync_to_firestore(item)
+        if synced and self._delta is not None:
+            self._delta.mark_clean([item.id])
+    
+    def _commit_documents(self, docs: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Commit document data to Firestore in batches; raises on failure."""
+        collection_ref = self._firestore_client.collection(self.collection_name)
+        for start in range(0, len(docs), FIRESTORE_BATCH_LIMIT):
+            batch = self._firestore_client.batch()
+            for doc_id, data in docs[start:start + FIRESTORE_BATCH_LIMIT]:
+                batch.set(collection_ref.document(doc_id), data)
+            batch.commit()
+        self._last_sync = time_now()
+    
+    def _sync_many_to_firestore(self, items: List[EnhancedMemoryItem]) -> int:
+        """Sync memory items to Firestore in batched commits.
+        
+        Returns:
+            Number of items committed successfully
+        """
+        if not self._firestore_client or not items:
+            return 0
             
-        # Sort by importance and recency, keep the most valuable
-        self._items.sort(key=lambda i: (i.importance_score, i.created_at.timestamp()), reverse=True)
+        synced_count = 0
+        
+        for start in range(0, len(items), FIRESTORE_BATCH_LIMIT):
+            chunk = items[start:start + FIRESTORE_BATCH_LIMIT]
+            try:
+                self._commit_documents([(item.id, self._memory_item_to_dict(item)) for item in chunk])
+                synced_count += len(chunk)
+                if self._delta is not None:
+                    self._delta.mark_clean(item.id for item in chunk)
+                logger.debug(f"Synced batch of {len(chunk)} memories to Firestore")
+            except Exception as e:
+                logger.error(f"Failed to sync batch of {len(chunk)} memories to Firestore: {e}")
+                
+        return synced_count
+    
+    def write_many(self, entries: Iterable[Dict[str, Any]]) -> List[EnhancedMemoryItem]:
+        """Write a batch of memories with batched Firestore persistence.
         
-        # Keep only the top items in local cache
-        removed_items = self._items[self.max_local_cache:]
-        self._items = self._items[:self.max_local_cache]
+        Local processing and indexing happen once for the whole batch,
+        Firestore receives one commit per 500 items and the local cache is
+        trimmed once at the end.
+        """
+        items = super().write_many(entries)
+        if self._delta is not None:
+            for item in items:
+                self._delta.mark_dirty(item.id)
         
-        # Rebuild indexes for remaining items
-        self._keyword_index.clear()
-        self._type_index.clear()
-        for item in self._items:
-            self._update_indexes(item)
+        if self.sync_on_write:
+            if self._write_queue is not None:
+                items_to_sync = []
+                for item in items:
+                    if self._write_queue.submit(item.id, self._memory_item_to_dict(item)):
+                        if self._delta is not None:
+                            self._delta.mark_clean([item.id])
+                    else:
+                        items_to_sync.append(item)
+            else:
+                items_to_sync = items
+            self._sync_many_to_firestore(items_to_sync)
             
-        logger.debug(f"Trimmed local cache, removed {len(removed_items)} items")
+        self._manage_local_cache()
+        
+        return items
+    
+    def _manage_local_cache(self) -> None:
+        """Keep the local cache within ``max_local_cache`` using the eviction policy.
+        
+        Victims come off the policy heap and are removed from the indexes
+        incrementally, so a full cache costs O(log n) per write instead of
+        a re-sort and re-index of every item.
+        """
+        removed_items = self._evict_to(self.max_local_cache)
+        if removed_items:
+            logger.debug(f"Trimmed local cache, removed {len(removed_items)} items")
+            if self._delta is not None:
+                # Evicted items exist nowhere else until pushed
+                self._delta.push(removed_items)
     
     def consolidate_memories(self, days_back: int = 7, min_importance: float = 0.6) -> Dict[str, int]:
         """
@@ -354,8 +533,72 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
             logger.error(f"Failed to update access times: {e}")
             return 0
     
+    def iter_firestore(self, *, keywords: Optional[List[str]] = None,
+                       tags: Optional[List[str]] = None,
+                       memory_type: Optional[MemoryType] = None,
+                       limit: Optional[int] = None,
+                       page_size: int = FIRESTORE_PAGE_SIZE) -> Iterator[EnhancedMemoryItem]:
+        """
+        Stream memories from Firestore, most important first.
+        
+        Filters run server-side: keywords (or tags, when no keywords are
+        given) through ``array_contains_any`` and memory_type by equality.
+        Firestore allows one array filter per query, so tags given alongside
+        keywords are checked locally. Results are fetched page by page with
+        cursors; nothing beyond the current page is held in memory.
+        
+        Needs composite indexes on (keywords|tags array, importance_score
+        desc), plus memory_type when filtering by type.
+        
+        Args:
+            keywords: Match memories with any of these keywords
+            tags: Match memories with any of these tags
+            memory_type: Only memories of this type
+            limit: Stop after this many memories
+            page_size: Documents fetched per round trip
+        """
+        if not self._firestore_client or (limit is not None and limit <= 0):
+            return
+            
+        query = self._firestore_client.collection(self.collection_name)
+        if memory_type:
+            query = query.where('memory_type', '==', memory_type.value)
+            
+        keyword_values = [k.lower() for k in keywords or []]
+        tag_values = list(tags or [])
+        local_tags = set(tag_values) if keyword_values and tag_values else None
+        if keyword_values:
+            queries = array_contains_any_queries(query, 'keywords', keyword_values)
+        elif tag_values:
+            queries = array_contains_any_queries(query, 'tags', tag_values)
+        else:
+            queries = [query]
+            
+        # Each stream can stop at ``limit`` unless tags still filter locally
+        per_stream = None if local_tags else limit
+        streams = [
+            paginate(q.order_by('importance_score', direction='DESCENDING'),
+                     min(page_size, limit or page_size), max_documents=per_stream)
+            for q in queries
+        ]
+        
+        yielded = 0
+        for doc in merge_ordered(streams, key=lambda d: -(d.to_dict() or {}).get('importance_score', 0.0)):
+            try:
+                item = self._dict_to_memory_item(doc.to_dict())
+            except Exception as e:
+                logger.warning(f"Failed to process search result: {e}")
+                continue
+            if local_tags is not None and not local_tags.intersection(item.tags):
+                continue
+            yield item
+            yielded += 1
+            if limit is not None and yielded >= limit:
+                return
+    
     def search_firestore(self, keywords: List[str], limit: int = 10, 
-                        memory_type: Optional[MemoryType] = None) -> List[EnhancedMemoryItem]:
+                        memory_type: Optional[MemoryType] = None,
+                        tags: Optional[List[str]] = None) -> List[EnhancedMemoryItem]:
         """
         Search Firestore directly for memories (beyond local cache).
         
@@ -363,47 +606,20 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
             keywords: Keywords to search for
             limit: Maximum results to return
             memory_type: Filter by memory type
+            tags: Additionally require one of these tags
             
         Returns:
-            List of matching memory items
+            List of matching memory items, most important first
         """
         if not self._firestore_client:
             # Fall back to local search
             return self.search_by_keywords(keywords, limit)
+        if not keywords:
+            return []
             
         try:
-            collection_ref = self._firestore_client.collection(self.collection_name)
-            
-            # Build query
-            query = collection_ref.order_by('importance_score', direction=firestore.Query.DESCENDING)
-            
-            if memory_type:
-                query = query.where('memory_type', '==', memory_type.value)
-                
-            # Note: Firestore doesn't support full-text search natively
-            # We'll fetch more results and filter locally
-            query = query.limit(limit * 3)
-            
-            results = []
-            for doc in query.stream():
-                try:
-                    data = doc.to_dict()
-                    item = self._dict_to_memory_item(data)
-                    
-                    # Check keyword match
-                    item_keywords = set(item.keywords)
-                    keyword_set = set(k.lower() for k in keywords)
-                    
-                    if keyword_set & item_keywords:
-                        results.append(item)
-                        if len(results) >= limit:
-                            break
-                            
-                except Exception as e:
-                    logger.warning(f"Failed to process search result: {e}")
-                    
-            return results
-            
+            return list(self.iter_firestore(keywords=keywords, tags=tags,
+                                            memory_type=memory_type, limit=limit))
         except Exception as e:
             logger.error(f"Firestore search failed: {e}")
             return self.search_by_keywords(keywords, limit)  # Fallback to local
@@ -411,25 +627,26 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
     def get_memory_stats(self) -> Dict[str, Any]:
         """Get comprehensive memory statistics including Firestore metrics."""
         stats = self.get_memory_analytics()
+        stats["cache"] = self.get_cache_stats()
         
         if self._firestore_client:
             try:
                 collection_ref = self._firestore_client.collection(self.collection_name)
                 
-                # Count total documents
-                # Note: This is expensive - in production, maintain a counter document
-                total_docs = 0
-                for _ in collection_ref.limit(1).stream():
-                    total_docs = 1  # At least one exists
-                    break
-                
                 stats.update({
                     "firestore_connected": True,
+                    "firestore_document_count": count_documents(collection_ref),
                     "local_cache_size": len(self._items),
                     "max_cache_size": self.max_local_cache,
                     "last_sync": self._last_sync,
                     "sync_on_write": self.sync_on_write
                 })
+                if self._write_queue is not None:
+                    stats["write_behind"] = self._write_queue.get_stats()
+                if self._delta is not None:
+                    stats["delta_sync"] = self._delta.get_stats()
+                if hasattr(self._firestore_client, 'get_usage'):
+                    stats["firestore_usage"] = self._firestore_client.get_usage()
                 
             except Exception as e:
                 logger.error(f"Failed to get Firestore stats: {e}")
@@ -439,11 +656,32 @@ class FirestoreMemoryStore(IntelligentMemoryStore):
             
         return stats
     
-    def force_sync(self) -> Dict[str, int]:
-        """Force sync all local memories to Firestore."""
+    def force_sync(self, full: bool = False) -> Dict[str, int]:
+        """
+        Sync local memories with Firestore.
+        
+        With delta sync enabled, pulls remote changes since the last
+        watermark and pushes only dirty items; otherwise (or with
+        ``full=True``) every cached item is re-uploaded.
+        """
         if not self._firestore_client:
             return {"error": "Firestore not available"}
             
+        if self._delta is not None and not full:
+            try:
+                result = self._delta.sync()
+                self._manage_local_cache()
+                self._last_sync = time_now()
+                return {
+                    **result,
+                    "synced_count": result["pushed"] + result["applied"],
+                    "failed_count": result["failed"],
+                    "total_items": len(self._items)
+                }
+            except Exception as e:
+                logger.error(f"Delta sync failed: {e}")
+                return {"error": str(e)}
+            
         try:
             synced_count = 0
             failed_count = 0
@@ -0,0 +1,195 @@
+"""
+Memory Index
+
+Inverted-index query engine for the intelligent memory stores. Maintains
+posting lists for keywords, tags and memory types so that filtered queries
+only touch matching items instead of scanning the whole store.
+
+Features:
+- Id → item map for O(1) lookup
+- Insertion-ordered posting lists for keywords, tags and memory_type
+- Query planning: union within a filter, intersection across filters,
+  driven from the smallest posting set
+- Heap-based top-k selection (no full sort of the survivors)
+- Bounded related-item candidate generation from posting-list heads
+
+Cross-references:
+    - ai/memory/intelligent_store.py: Primary consumer (query, search_by_keywords)
+    - ai/memory/firestore_store.py: Rebuilds the index after cache loads/trims
+    - docs/MEMORY_SYSTEM.md: Memory architecture overview
+"""
+from __future__ import annotations
+import heapq
+from collections import defaultdict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+# Posting lists are insertion-ordered dicts used as ordered sets (id -> None):
+# O(1) add/remove/membership while remembering write order.
+Postings = Dict[str, None]
+
+
+class MemoryIndex:
+    """Posting-list index over memory items.
+
+    Items are expected to expose ``id``, ``keywords``, ``tags`` and
+    ``memory_type``. The index must be told about every add/remove; items
+    mutated in place on indexed fields need to be removed and re-added.
+    """
+
+    def __init__(self) -> None:
+        self.items: Dict[str, Any] = {}
+        self.keywords: Dict[str, Postings] = defaultdict(dict)
+        self.tags: Dict[str, Postings] = defaultdict(dict)
+        self.types: Dict[Hashable, Postings] = defaultdict(dict)
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.items
+
+    def get(self, item_id: str) -> Optional[Any]:
+        return self.items.get(item_id)
+
+    def seq(self, item_id: str) -> int:
+        """Insertion sequence number, used as a stable tie-breaker."""
+        return self._seq[item_id]
+
+    def add(self, item: Any) -> None:
+        """Index an item (re-adding an existing id replaces it)."""
+        if item.id in self.items:
+            self.remove(item.id)
+        self.items[item.id] = item
+        self._seq[item.id] = self._next_seq
+        self._next_seq += 1
+        for keyword in item.keywords:
+            self.keywords[keyword][item.id] = None
+        for tag in item.tags:
+            self.tags[tag][item.id] = None
+        self.types[item.memory_type][item.id] = None
+
+    def remove(self, item_id: str) -> Optional[Any]:
+        """Drop an item from every posting list it appears in."""
+        item = self.items.pop(item_id, None)
+        if item is None:
+            return None
+        del self._seq[item_id]
+        for keyword in item.keywords:
+            self._discard(self.keywords, keyword, item_id)
+        for tag in item.tags:
+            self._discard(self.tags, tag, item_id)
+        self._discard(self.types, item.memory_type, item_id)
+        return item
+
+    def clear(self) -> None:
+        self.items.clear()
+        self.keywords.clear()
+        self.tags.clear()
+        self.types.clear()
+        self._seq.clear()
+        self._next_seq = 0
+
+    def rebuild(self, items: Iterable[Any]) -> None:
+        """Re-index from scratch; sequence order follows ``items``."""
+        self.clear()
+        for item in items:
+            self.add(item)
+
+    @staticmethod
+    def _discard(index: Dict[Hashable, Postings], key: Hashable, item_id: str) -> None:
+        postings = index.get(key)
+        if postings is None:
+            return
+        postings.pop(item_id, None)
+        if not postings:
+            del index[key]
+
+    # ------------------------------------------------------------------
+    # Query planning
+    # ------------------------------------------------------------------
+
+    def _postings_for(self, index: Dict[Hashable, Postings], keys: Iterable[Hashable]) -> List[Postings]:
+        # Use .get so lookups for unknown keys don't grow the defaultdict
+        return [p for p in (index.get(k) for k in set(keys)) if p]
+
+    def candidates(self,
+                   *,
+                   keywords: Optional[Iterable[str]] = None,
+                   tags: Optional[Iterable[str]] = None,
+                   memory_type: Optional[Hashable] = None) -> Iterable[str]:
+        """Return ids matching all given filters (any-of within each filter).
+
+        Filters that are ``None``/empty are ignored; with no filters every
+        indexed id is a candidate.
+        """
+        groups: List[List[Postings]] = []
+        if memory_type is not None:
+            groups.append(self._postings_for(self.types, [memory_type]))
+        if tags:
+            groups.append(self._postings_for(self.tags, tags))
+        if keywords:
+            groups.append(self._postings_for(self.keywords, keywords))
+
+        if not groups:
+            return self.items.keys()
+        if any(not group for group in groups):
+            return ()
+
+        # Drive the intersection from the cheapest filter and probe the rest
+        groups.sort(key=lambda group: sum(len(p) for p in group))
+        driver, rest = groups[0], groups[1:]
+        if len(driver) == 1:
+            seed: Iterable[str] = driver[0]
+        else:
+            seed = set().union(*driver)
+        if not rest:
+            return seed
+        return [
+            item_id for item_id in seed
+            if all(any(item_id in p for p in group) for group in rest)
+        ]
+
+    def top_k(self, ids: Iterable[str], k: int, key: Callable[[Any], Tuple]) -> List[Any]:
+        """Select the ``k`` best items by ``key`` (descending) with a heap.
+
+        Ties fall back to insertion order, matching a stable sort over the
+        store's item list.
+        """
+        if k <= 0:
+            return []
+        items = self.items
+        seq = self._seq
+        best = heapq.nlargest(k, ids, key=lambda i: (key(items[i]), -seq[i]))
+        return [items[i] for i in best]
+
+    def earliest_with_keywords(self, keywords: Iterable[str], k: int,
+                               exclude_id: Optional[str] = None) -> List[str]:
+        """Return the ``k`` earliest-indexed ids sharing any of ``keywords``.
+
+        Posting lists are kept in insertion order, so only the first ``k``
+        entries of each list can qualify; the work is bounded by
+        ``len(keywords) * k`` regardless of store size.
+        """
+        if k <= 0:
+            return []
+        heads: Set[str] = set()
+        for postings in self._postings_for(self.keywords, keywords):
+            taken = 0
+            for item_id in postings:
+                if item_id == exclude_id:
+                    continue
+                heads.add(item_id)
+                taken += 1
+                if taken >= k:
+                    break
+        return heapq.nsmallest(k, heads, key=self._seq.__getitem__)
+
+    def keyword_overlap(self, keywords: Iterable[str]) -> Dict[str, int]:
+        """Count how many of ``keywords`` each matching item carries."""
+        counts: Dict[str, int] = defaultdict(int)
+        for postings in self._postings_for(self.keywords, keywords):
+            for item_id in postings:
+                counts[item_id] += 1
+        return counts
@@ -7,18 +7,30 @@ Extends the basic memory store with AI-powered features for better agent coordin
 Cross-references:
     - Base implementation: ai/memory/store.py
     - Memory tools: ai/tools/memory_tools.py
+    - Query engine: ai/memory/index.py
+    - Eviction policies: ai/memory/eviction.py
+    - Vector search: ai/memory/vector_index.py
+    - Running analytics: ai/memory/analytics.py
+    - Text analysis: ai/memory/analyzer.py
     - ADR-008: Intelligent Memory System (to be created)
 """
 from __future__ import annotations
-import re
+import atexit
 import hashlib
-from collections import defaultdict, Counter
+import weakref
+from bisect import bisect_left
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional, Dict, Set, Tuple, Any
+from typing import List, Optional, Dict, Iterable, Tuple, Any
 from enum import Enum
+from pathlib import Path
 
-from ai.memory.store import MemoryStore, MemoryItem
+from ai.memory.store import MemoryStore, MemoryItem, intern_strings
+from ai.memory.index import MemoryIndex
+from ai.memory.analytics import MemoryAggregates
+from ai.memory.analyzer import ContentAnalysis, get_analyzer
+from ai.memory.eviction import EvictionPolicy, create_eviction_policy
+from ai.memory.vector_index import Embedder, VectorIndex
 from ai.utils.clock import now as time_now
 
 
@@ -33,7 +45,7 @@ class MemoryType(Enum):
     KNOWLEDGE = "knowledge" # Facts and learned information
 
 
-@dataclass(frozen=False)  # Changed to mutable for metadata updates
+@dataclass(frozen=False, slots=True)  # Mutable for metadata updates; slotted to keep large caches small
 class EnhancedMemoryItem(MemoryItem):
     """Enhanced memory item with intelligent metadata."""
     memory_type: MemoryType = field(default=MemoryType.CONTEXT)
@@ -47,11 +59,24 @@ class EnhancedMemoryItem(MemoryItem):
 class IntelligentMemoryStore(MemoryStore):
     """Enhanced memory store with semantic search and auto-classification."""
     
-    def __init__(self):
+    def __init__(self, eviction_policy: "str | EvictionPolicy | None" = None):
+        """
+        Args:
+            eviction_policy: Policy (or policy name: "importance", "lru",
+                "lfu", "ttl") deciding which items optimize_memory() and
+                bounded caches drop first. Defaults to importance.
+        """
         self._items: List[EnhancedMemoryItem] = []
         self._id_counter = 0
-        self._keyword_index: Dict[str, Set[str]] = defaultdict(set)
-        self._type_index: Dict[MemoryType, List[str]] = defaultdict(list)
+        self._index = MemoryIndex()
+        self._stats = MemoryAggregates()
+        self._analyzer = get_analyzer()
+        self._eviction = create_eviction_policy(eviction_policy)
+        self._vectors: Optional[VectorIndex] = None
+        self._vector_path: Optional[Path] = None
+        
+    def context_generation(self) -> Optional[int]:
+        return self._generation
         
     def _generate_id(self) -> str:
         """Generate unique memory ID."""
@@ -60,252 +85,287 @@ class IntelligentMemoryStore(MemoryStore):
         
     def _extract_keywords(self, content: str) -> List[str]:
         """Extract relevant keywords from content."""
-        # Simple keyword extraction - can be enhanced with NLP
-        words = re.findall(r'\b\w+\b', content.lower())
-        
-        # Filter out common words and focus on meaningful terms
-        stop_words = {
-            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
-            'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have',
-            'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-            'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
-            'needs', 'after'  # Additional stop words
-        }
-        
-        keywords = [w for w in words if len(w) > 2 and w not in stop_words]
-        
-        # Return most frequent keywords
-        keyword_counts = Counter(keywords)
-        return [k for k, v in keyword_counts.most_common(10)]
+        return self._analyzer.keywords(content.lower())
         
     def _classify_content(self, content: str, tags: List[str]) -> MemoryType:
         """Auto-classify memory content type."""
-        content_lower = content.lower()
-        tags_lower = [t.lower() for t in tags]
-        
-        # Goal indicators
-        if any(word in content_lower for word in ['goal', 'objective', 'mission', 'target', 'aim']):
-            return MemoryType.GOAL
-        if any(tag in tags_lower for tag in ['goal', 'objective', 'mission']):
-            return MemoryType.GOAL
-            
-        # Task indicators  
-        if any(word in content_lower for word in ['task', 'todo', 'implement', 'create', 'build', 'fix']):
-            return MemoryType.TASK
-        if any(tag in tags_lower for tag in ['task', 'todo', 'action']):
-            return MemoryType.TASK
-            
-        # Decision indicators
-        if any(word in content_lower for word in ['adr', 'decision', 'architecture', 'design']):
-            return MemoryType.DECISION  
-        if any(tag in tags_lower for tag in ['adr', 'decision', 'architecture']):
-            return MemoryType.DECISION
-            
-        # Progress indicators
-        if any(word in content_lower for word in ['completed', 'done', 'finished', 'progress', 'status']):
-            return MemoryType.PROGRESS
-        if any(tag in tags_lower for tag in ['done', 'completed', 'progress']):
-            return MemoryType.PROGRESS
-            
-        # Error indicators
-        if any(word in content_lower for word in ['error', 'failed', 'bug', 'issue', 'problem']):
-            return MemoryType.ERROR
-        if any(tag in tags_lower for tag in ['error', 'bug', 'failed']):
-            return MemoryType.ERROR
-            
-        # Knowledge indicators
-        if any(word in content_lower for word in ['learned', 'discovered', 'found', 'research']):
-            return MemoryType.KNOWLEDGE
-        if any(tag in tags_lower for tag in ['knowledge', 'research', 'learning']):
-            return MemoryType.KNOWLEDGE
-            
-        return MemoryType.CONTEXT  # Default
+        return MemoryType(self._analyzer.classify(self._analyzer.cues(content), tags))
         
     def _calculate_importance(self, content: str, memory_type: MemoryType) -> float:
         """Calculate importance score for memory item."""
-        score = 0.5  # Base score
-        
-        # Type-based scoring
-        type_scores = {
-            MemoryType.GOAL: 0.9,
-            MemoryType.DECISION: 0.8, 
-            MemoryType.ERROR: 0.7,
-            MemoryType.TASK: 0.6,
-            MemoryType.PROGRESS: 0.5,
-            MemoryType.KNOWLEDGE: 0.6,
-            MemoryType.CONTEXT: 0.4
-        }
-        score = type_scores.get(memory_type, 0.5)
-        
-        # Content-based scoring
-        high_value_words = ['critical', 'important', 'urgent', 'blocker', 'milestone']
-        if any(word in content.lower() for word in high_value_words):
-            score = max(score, 0.8)  # Ensure critical content gets high score
-            
-        # Length-based scoring (longer content often more important)
-        if len(content) > 200:
-            score += 0.1
-        elif len(content) < 50:
-            score -= 0.1
-            
-        return min(1.0, max(0.0, score))
+        return self._analyzer.importance(content, memory_type.value, self._analyzer.cues(content))
         
     def _generate_summary(self, content: str) -> Optional[str]:
         """Generate a summary for long content."""
-        if len(content) <= 100:
-            return None
-            
-        # Simple summary: first sentence or first 100 chars
-        sentences = re.split(r'[.!?]+', content)
-        if sentences and len(sentences[0]) <= 100:
-            return sentences[0].strip()
-        else:
-            return content[:97] + "..."
+        return self._analyzer.summary(content)
             
     def _find_related_items(self, keywords: List[str], exclude_id: str) -> List[str]:
-        """Find related memory items based on keyword overlap."""
-        related = []
+        """Find related memory items based on keyword overlap.
         
-        for item in self._items:
-            if item.id == exclude_id:
-                continue
-                
-            # Calculate keyword overlap
-            common_keywords = set(keywords) & set(item.keywords)
-            if len(common_keywords) >= 1:  # At least 1 common keyword
-                related.append(item.id)
-                
-        return related[:5]  # Limit to 5 most related
+        Candidates come from the keyword posting lists, so the cost depends
+        on the number of keywords rather than the size of the store.
+        """
+        # Limit to 5 most related
+        return self._index.earliest_with_keywords(keywords, 5, exclude_id=exclude_id)
         
     def _update_indexes(self, item: EnhancedMemoryItem) -> None:
         """Update internal indexes for fast lookup."""
-        # Update keyword index
-        for keyword in item.keywords:
-            self._keyword_index[keyword].add(item.id)
+        self._stats.replace(self._index.get(item.id), item)
+        self._index.add(item)
+        self._bump_generation()
+        self._eviction.track(item)
+        if self._vectors is not None and item.id not in self._vectors:
+            self._vectors.add([(item.id, self._embedding_text(item))])
+        
+    def _rebuild_indexes(self) -> None:
+        """Re-index ``self._items`` after it was replaced or reordered."""
+        self._index.rebuild(self._items)
+        self._stats.rebuild(self._index.items.values())
+        self._bump_generation()
+        self._eviction.rebuild(self._items)
+        self._sync_vectors()
+        
+    def _remove_items(self, item_ids: Iterable[str]) -> List[EnhancedMemoryItem]:
+        """Drop items from the item list, the index and the eviction policy.
+        
+        ``_items`` stays in index sequence order, so a few removals are
+        located by bisection; large removals filter the list in one pass.
+        """
+        removed = [item for item in map(self._index.get, set(item_ids)) if item is not None]
+        if not removed:
+            return []
             
-        # Update type index
-        self._type_index[item.memory_type].append(item.id)
+        if len(removed) * 32 < len(self._items):
+            seq = self._index.seq
+            for item in removed:
+                pos = bisect_left(self._items, seq(item.id), key=lambda i: seq(i.id))
+                if pos < len(self._items) and self._items[pos] is item:
+                    del self._items[pos]
+                else:
+                    # Order drifted (e.g. an item was re-indexed); fall back to a scan
+                    self._items.remove(item)
+        else:
+            dead = {item.id for item in removed}
+            self._items = [item for item in self._items if item.id not in dead]
+            
+        for item in removed:
+            self._index.remove(item.id)
+            self._stats.remove(item)
+            self._eviction.forget(item.id)
+            if self._vectors is not None:
+                self._vectors.remove(item.id)
+        self._bump_generation()
+        return removed
         
-    def write(self, *, content: str, tags: Optional[List[str]] = None, memory_type: Optional[MemoryType] = None, metadata: Optional[Dict[str, Any]] = None) -> MemoryItem:
-        """Write enhanced memory item with automatic intelligence."""
-        tags = tags or []
-        item_id = self._generate_id()
-        
-        # Extract intelligence
-        keywords = self._extract_keywords(content)
-        # Use provided memory_type or auto-classify
-        if memory_type is None:
-            memory_type = self._classify_content(content, tags)
-        importance = self._calculate_importance(content, memory_type)
-        summary = self._generate_summary(content)
-        
-        # Create enhanced item
-        item = EnhancedMemoryItem(
-            id=item_id,
+    def _upsert_item(self, item: EnhancedMemoryItem) -> None:
+        """Insert an item, replacing any cached item with the same id."""
+        self._remove_items([item.id])
+        self._items.append(item)
+        self._update_indexes(item)
+        
+    def _evict_to(self, max_items: int) -> List[EnhancedMemoryItem]:
+        """Drop expired items, then evict by policy until ``max_items`` remain."""
+        victims = self._eviction.expired()
+        overflow = len(self._items) - len(victims) - max(0, max_items)
+        if overflow > 0:
+            victims.extend(self._eviction.evict(overflow))
+        return self._remove_items(victims)
+        
+    def _record_access(self, items: List[EnhancedMemoryItem]) -> List[EnhancedMemoryItem]:
+        """Count returned items as cache hits for access-based policies."""
+        for item in items:
+            self._eviction.touch(item.id)
+        return items
+        
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Eviction policy name, size and hit/miss/eviction counters."""
+        return self._eviction.get_stats()
+        
+    @staticmethod
+    def _embedding_text(item: EnhancedMemoryItem) -> str:
+        return " ".join([item.content, *item.tags])
+        
+    def _sync_vectors(self) -> None:
+        """Embed items missing from the vector index and drop stale vectors."""
+        if self._vectors is None:
+            return
+        for item_id in self._vectors.ids:
+            if item_id not in self._index:
+                self._vectors.remove(item_id)
+        self._vectors.add(
+            (item.id, self._embedding_text(item)) for item in self._items if item.id not in self._vectors
+        )
+        
+    def enable_vector_index(self, embedder: Optional[Embedder] = None, path: Optional[str] = None) -> VectorIndex:
+        """Turn on dense-vector semantic search.
+        
+        Args:
+            embedder: Embedding backend (default: offline HashingEmbedder)
+            path: Where to persist vectors (``<path>.f32`` + ``<path>.json``).
+                Saved vectors are reused when the embedder matches; only
+                memories without one are embedded. Saved again at exit.
+        """
+        self._vector_path = Path(path) if path else None
+        if self._vector_path is not None:
+            self._vectors = VectorIndex.load(self._vector_path, embedder)
+            _stores_with_vectors.add(self)
+        else:
+            self._vectors = VectorIndex(embedder)
+        self._sync_vectors()
+        return self._vectors
+        
+    @property
+    def vector_index(self) -> Optional[VectorIndex]:
+        return self._vectors
+        
+    def save_vector_index(self) -> bool:
+        """Persist vectors to the path given to enable_vector_index()."""
+        if self._vectors is None or self._vector_path is None:
+            return False
+        self._vectors.save(self._vector_path)
+        return True
+        
+    def semantic_search(self, query: str, limit: int = 10, *,
+                        similarity_weight: float = 0.7,
+                        importance_weight: float = 0.2,
+                        recency_weight: float = 0.1,
+                        recency_half_life: float = 7 * 24 * 3600,
+                        candidates: int = 50) -> List[EnhancedMemoryItem]:
+        """Search memories by meaning rather than exact keywords.
+        
+        The ``max(candidates, 4 * limit)`` nearest memories by cosine
+        similarity are re-ranked by a weighted blend of similarity,
+        importance and recency (halving every ``recency_half_life`` seconds).
+        Falls back to keyword search when the vector index is not enabled.
+        """
+        if self._vectors is None:
+            return self.search_by_keywords(self._extract_keywords(query), limit)
+        if limit <= 0:
+            return []
+            
+        now = time_now()
+        
+        def hybrid(pair: Tuple[str, float]) -> float:
+            item = self._index.get(pair[0])
+            age = max(0.0, now - item.created_at.timestamp())
+            return (similarity_weight * pair[1]
+                    + importance_weight * item.importance_score
+                    + recency_weight * 0.5 ** (age / recency_half_life))
+            
+        nearest = [
+            pair for pair in self._vectors.search(query, max(candidates, 4 * limit))
+            if pair[1] > 0 and pair[0] in self._index
+        ]
+        nearest.sort(key=hybrid, reverse=True)
+        return self._record_access([self._index.get(item_id) for item_id, _ in nearest[:limit]])
+        
+    def _build_item(self, *, content: str, tags: Optional[List[str]] = None, memory_type: Optional[MemoryType] = None, metadata: Optional[Dict[str, Any]] = None, analysis: Optional[ContentAnalysis] = None) -> EnhancedMemoryItem:
+        """Create an enhanced item with extracted intelligence (not yet stored)."""
+        tags = intern_strings(tags)
+        
+        # Extract intelligence (keywords, type unless provided, importance, summary)
+        if analysis is None:
+            analysis = self._analyzer.analyze(content, tags, memory_type.value if memory_type else None)
+        
+        return EnhancedMemoryItem(
+            id=self._generate_id(),
             content=content,
             tags=tags,
             created_at=datetime.fromtimestamp(time_now(), timezone.utc),
-            memory_type=memory_type,
-            keywords=keywords,
+            memory_type=memory_type or MemoryType(analysis.memory_type),
+            keywords=analysis.keywords,
             related_ids=[],  # Will be populated after storage
-            importance_score=importance,
-            summary=summary,
+            importance_score=analysis.importance_score,
+            summary=analysis.summary,
             metadata=metadata or {}
         )
         
-        # Store item
-        self._items.append(item)
+    def _build_items(self, entries: Iterable[Dict[str, Any]]) -> List[EnhancedMemoryItem]:
+        """Build items for a batch of ``write()`` keyword dicts, analysed in one call."""
+        entries = list(entries)
+        analyses = self._analyzer.analyze_many(
+            (entry["content"], entry.get("tags"), entry["memory_type"].value if entry.get("memory_type") else None)
+            for entry in entries
+        )
+        return [self._build_item(**entry, analysis=analysis) for entry, analysis in zip(entries, analyses)]
+        
+    def _link_item(self, item: EnhancedMemoryItem) -> None:
+        """Index a stored item and link it to related memories."""
         self._update_indexes(item)
         
-        # Update related items (after storage so item exists in search)
-        related_ids = self._find_related_items(keywords, item_id)
+        # Update related items (after indexing so item exists in search)
+        related_ids = self._find_related_items(item.keywords, item.id)
         if related_ids:
-            # Update the stored item with related IDs
-            updated_item = EnhancedMemoryItem(
-                id=item.id,
-                content=item.content,
-                tags=item.tags,
-                created_at=item.created_at,
-                memory_type=item.memory_type,
-                keywords=item.keywords,
-                related_ids=related_ids,
-                importance_score=item.importance_score,
-                summary=item.summary,
-                metadata=item.metadata
-            )
-            self._items[-1] = updated_item  # Replace the last added item
-            
-            # Update existing related items to include this item
-            for i, existing_item in enumerate(self._items[:-1]):  # Exclude the current item
-                if existing_item.id in related_ids:
-                    # Add bidirectional relationship
-                    if item_id not in existing_item.related_ids:
-                        updated_existing = EnhancedMemoryItem(
-                            id=existing_item.id,
-                            content=existing_item.content,
-                            tags=existing_item.tags,
-                            created_at=existing_item.created_at,
-                            memory_type=existing_item.memory_type,
-                            keywords=existing_item.keywords,
-                            related_ids=existing_item.related_ids + [item_id],
-                            importance_score=existing_item.importance_score,
-                            summary=existing_item.summary,
-                            metadata=existing_item.metadata
-                        )
-                        self._items[i] = updated_existing
+            item.related_ids = related_ids
             
-        return self._items[-1]
+            # Add bidirectional relationship on the existing items in place.
+            # The id was just generated, so it cannot be linked already (a
+            # membership test here is linear in the size of popular items).
+            for related_id in related_ids:
+                existing_item = self._index.get(related_id)
+                if existing_item is not None:
+                    existing_item.related_ids.append(item.id)
+        
+    def write(self, *, content: str, tags: Optional[List[str]] = None, memory_type: Optional[MemoryType] = None, metadata: Optional[Dict[str, Any]] = None) -> MemoryItem:
+        """Write enhanced memory item with automatic intelligence."""
+        item = self._build_item(content=content, tags=tags, memory_type=memory_type, metadata=metadata)
+        self._items.append(item)
+        self._link_item(item)
+        return item
+        
+    def write_many(self, entries: Iterable[Dict[str, Any]]) -> List[EnhancedMemoryItem]:
+        """Write a batch of memories in one pass.
+        
+        Each entry takes the same keys as ``write()`` (content, tags,
+        memory_type, metadata). Items are analysed up front, appended to the
+        store in one step and then indexed/linked in order, so the result is
+        identical to calling ``write()`` for each entry.
+        """
+        items = self._build_items(entries)
+        self._items.extend(items)
+        if self._vectors is not None:
+            # Embed the batch in one call; _update_indexes skips these ids
+            self._vectors.add((item.id, self._embedding_text(item)) for item in items)
+        for item in items:
+            self._link_item(item)
+        return items
         
     def query(self, *, limit: int = 5, tags: Optional[List[str]] = None, keywords: Optional[List[str]] = None, memory_type: Optional[MemoryType] = None) -> List[MemoryItem]:
-        """Enhanced query with intelligent filtering."""
-        items = self._items
+        """Enhanced query with intelligent filtering.
         
-        # Filter by memory type if provided
-        if memory_type is not None:
-            items = [i for i in items if i.memory_type == memory_type]
-            
-        # Filter by tags if provided
-        if tags:
-            tagset = set(tags)
-            items = [i for i in items if tagset.intersection(i.tags)]
-            
-        # Filter by keywords if provided
-        if keywords:
-            keyword_set = set(k.lower() for k in keywords)
-            filtered_items = []
-            for item in items:
-                item_keywords = set(item.keywords)
-                if keyword_set & item_keywords:  # If any keywords match
-                    filtered_items.append(item)
-            items = filtered_items
-            
-        # Sort by importance and recency
-        items = sorted(items, key=lambda i: (i.importance_score, i.created_at.timestamp()), reverse=True)
+        Filters are resolved against the posting lists (any-of within a
+        filter, all-of across filters) and the best ``limit`` items by
+        importance and recency are picked with a heap.
+        """
+        candidates = self._index.candidates(
+            keywords=[k.lower() for k in keywords] if keywords else None,
+            tags=tags,
+            memory_type=memory_type,
+        )
+        return self._record_access(self._index.top_k(candidates, max(0, limit), self._rank_key))
         
-        return items[:max(0, limit)]
+    @staticmethod
+    def _rank_key(item: EnhancedMemoryItem) -> Tuple[float, float]:
+        """Default ordering: importance first, then recency."""
+        return (item.importance_score, item.created_at.timestamp())
         
     def search_by_keywords(self, keywords: List[str], limit: int = 10) -> List[EnhancedMemoryItem]:
         """Search memories by keywords."""
         keyword_set = set(k.lower() for k in keywords)
-        results = []
-        
-        for item in self._items:
-            item_keywords = set(item.keywords)
-            overlap = len(keyword_set & item_keywords)
-            if overlap > 0:
-                # Score based on keyword overlap and importance
-                relevance_score = (overlap / len(keyword_set)) * item.importance_score
-                results.append((relevance_score, item))
-                
-        # Sort by relevance
-        results.sort(key=lambda x: x[0], reverse=True)
-        return [item for _, item in results[:limit]]
+        if not keyword_set:
+            return []
+        overlap = self._index.keyword_overlap(keyword_set)
+        
+        # Score based on keyword overlap and importance
+        def relevance(item: EnhancedMemoryItem) -> Tuple[float]:
+            return ((overlap[item.id] / len(keyword_set)) * item.importance_score,)
+            
+        return self._record_access(self._index.top_k(overlap.keys(), limit, relevance))
         
     def search_by_type(self, memory_type: MemoryType, limit: int = 10) -> List[EnhancedMemoryItem]:
         """Search memories by type."""
-        items = [item for item in self._items if item.memory_type == memory_type]
-        items = sorted(items, key=lambda i: (i.importance_score, i.created_at.timestamp()), reverse=True)
-        return items[:limit]
+        candidates = self._index.candidates(memory_type=memory_type)
+        return self._record_access(self._index.top_k(candidates, limit, self._rank_key))
         
     def get_related_memories(self, memory_id: str, limit: int = 5) -> List[EnhancedMemoryItem]:
         """Get memories related to a specific memory."""
@@ -323,47 +383,37 @@ class IntelligentMemoryStore(MemoryStore):
         
     def get_by_id(self, memory_id: str) -> Optional[EnhancedMemoryItem]:
         """Get memory by ID."""
-        for item in self._items:
-            if item.id == memory_id:
-                return item
-        return None
+        item = self._index.get(memory_id)
+        if item is None:
+            self._eviction.miss()
+        else:
+            self._eviction.touch(memory_id)
+        return item
         
     def get_memory_analytics(self) -> Dict[str, any]:
-        """Get analytics about memory usage."""
-        if not self._items:
-            return {"total_memories": 0}
-            
-        type_counts = Counter(item.memory_type for item in self._items)
-        avg_importance = sum(item.importance_score for item in self._items) / len(self._items)
-        top_keywords = Counter()
+        """Get analytics about memory usage.
         
-        for item in self._items:
-            top_keywords.update(item.keywords)
-            
-        return {
-            "total_memories": len(self._items),
-            "type_distribution": dict(type_counts),
-            "average_importance": avg_importance,
-            "top_keywords": dict(top_keywords.most_common(10)),
-            "recent_activity": len([i for i in self._items if time_now() - i.created_at.timestamp() < 3600])  # Last hour
-        }
+        Served from running aggregates maintained on write and eviction, so
+        polling this is cheap regardless of store size.
+        """
+        return self._stats.snapshot()
         
     def optimize_memory(self, max_items: int = 1000) -> int:
-        """Optimize memory by removing low-importance old items."""
-        if len(self._items) <= max_items:
-            return 0
-            
-        # Sort by importance and age (keep important and recent)
-        self._items.sort(key=lambda i: (i.importance_score, i.created_at.timestamp()), reverse=True)
-        
-        # Keep only the top items
-        removed_count = len(self._items) - max_items
-        self._items = self._items[:max_items]
-        
-        # Rebuild indexes
-        self._keyword_index.clear()
-        self._type_index.clear()
-        for item in self._items:
-            self._update_indexes(item)
-            
-        return removed_count
+        """Optimize memory by removing low-importance old items.
+        
+        Victims are chosen by the store's eviction policy (importance and
+        age by default) and removed from the indexes incrementally.
+        """
+        return len(self._evict_to(max_items))
+
+
+_stores_with_vectors: "weakref.WeakSet[IntelligentMemoryStore]" = weakref.WeakSet()
+
+
+@atexit.register
+def _save_vector_indexes() -> None:
+    for store in list(_stores_with_vectors):
+        try:
+            store.save_vector_index()
+        except Exception:  # pragma: no cover - best effort at interpreter exit
+            pass
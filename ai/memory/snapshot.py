@@ -0,0 +1,261 @@
+"""
+Memory Snapshots
+
+Streaming, compressed backup format for memory stores. A snapshot is a
+directory of compressed JSONL chunks plus a manifest, written and read one
+record at a time so backups and restores never hold the whole store in
+memory.
+
+Layout::
+
+    <snapshot>/
+        manifest.json          # format, counts, chunk list with sha256 checksums
+        chunk-00000.jsonl.gz   # up to chunk_size memory records per chunk
+        index.jsonl.gz         # [id, digest] of every live memory
+
+Features:
+- gzip (stdlib) or zstd (when ``zstandard`` is installed) compression
+- Per-chunk SHA-256 checksums verified before a chunk is parsed
+- Incremental snapshots: only records whose digest changed since a base
+  snapshot are written; restores follow the base chain and skip memories
+  deleted since the base
+- Plain generator API (``iter_snapshot``) so callers can batch writes
+
+Cross-references:
+    - ai/memory/enhanced_firestore.py: backup_memories(), restore_memories()
+    - ai/tools/production_memory_tools.py: BackupMemoryStore, RestoreMemoryStore
+"""
+from __future__ import annotations
+import gzip
+import hashlib
+import io
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Try to import zstandard with graceful fallback
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+SNAPSHOT_FORMAT = "fresh-memory-snapshot"
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+DEFAULT_CHUNK_SIZE = 10_000
+
+# Fields that change on every serialization and must not affect digests
+VOLATILE_FIELDS = frozenset({"updated_at", "origin", "last_accessed"})
+
+_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+
+class SnapshotError(ValueError):
+    """Raised for missing, corrupt or incompatible snapshots."""
+
+
+def record_digest(record: Dict[str, Any]) -> str:
+    """Stable digest of a memory record, ignoring volatile fields."""
+    stable = {k: v for k, v in record.items() if k not in VOLATILE_FIELDS}
+    payload = json.dumps(stable, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def _open_text(path: Path, mode: str, compression: str):
+    """Open a compressed text stream for reading ("r") or writing ("w")."""
+    if compression == "gzip":
+        with gzip.open(path, mode + "t", encoding="utf-8", compresslevel=6) as f:
+            yield f
+    elif compression == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise SnapshotError("zstd snapshot requires the 'zstandard' package")
+        with open(path, mode + "b") as raw:
+            if mode == "w":
+                stream = zstandard.ZstdCompressor(level=3).stream_writer(raw)
+            else:
+                stream = zstandard.ZstdDecompressor().stream_reader(raw)
+            with io.TextIOWrapper(stream, encoding="utf-8") as f:
+                yield f
+    else:
+        raise SnapshotError(f"Unknown snapshot compression: {compression}")
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def read_manifest(path: str | Path) -> Dict[str, Any]:
+    """Load and validate a snapshot manifest."""
+    manifest_path = Path(path) / MANIFEST_NAME
+    if not manifest_path.exists():
+        raise SnapshotError(f"No snapshot manifest at {manifest_path}")
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise SnapshotError(f"{path} is not a memory snapshot")
+    if manifest.get("version", 0) > SNAPSHOT_VERSION:
+        raise SnapshotError(f"Snapshot version {manifest['version']} is newer than supported")
+    return manifest
+
+
+def _iter_lines(path: Path, entry: Dict[str, Any], compression: str, verify: bool) -> Iterator[Any]:
+    file_path = path / entry["file"]
+    if not file_path.exists():
+        raise SnapshotError(f"Missing snapshot file {file_path}")
+    if verify and _file_sha256(file_path) != entry["sha256"]:
+        raise SnapshotError(f"Checksum mismatch for {file_path}")
+    with _open_text(file_path, "r", compression) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _load_index(path: Path, manifest: Dict[str, Any], verify: bool = True) -> Dict[str, str]:
+    return dict(_iter_lines(path, manifest["index"], manifest["compression"], verify))
+
+
+def write_snapshot(path: str | Path, records: Iterable[Dict[str, Any]], *,
+                   base: str | Path | None = None,
+                   compression: Optional[str] = None,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE,
+                   metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Stream memory records into a snapshot directory.
+
+    Args:
+        path: Snapshot directory (created; must not already hold a snapshot)
+        records: Memory records with an ``id`` field
+        base: Previous snapshot; only records changed since it are written
+        compression: "gzip" or "zstd" (default: zstd when available)
+        chunk_size: Records per chunk file
+        metadata: Extra fields stored in the manifest
+
+    Returns:
+        The manifest that was written
+    """
+    path = Path(path)
+    compression = compression or ("zstd" if ZSTD_AVAILABLE else "gzip")
+    extension = _EXTENSIONS.get(compression)
+    if extension is None:
+        raise SnapshotError(f"Unknown snapshot compression: {compression}")
+    if (path / MANIFEST_NAME).exists():
+        raise SnapshotError(f"Snapshot already exists at {path}")
+    path.mkdir(parents=True, exist_ok=True)
+
+    base_digests: Dict[str, str] = {}
+    if base is not None:
+        base = Path(base)
+        base_digests = _load_index(base, read_manifest(base))
+
+    chunks: List[Dict[str, Any]] = []
+    index_name = f"index.jsonl{extension}"
+    total = 0
+
+    with _open_text(path / index_name, "w", compression) as index:
+        def changed_records() -> Iterator[Dict[str, Any]]:
+            nonlocal total
+            for record in records:
+                digest = record_digest(record)
+                index.write(_dumps([record["id"], digest]) + "\n")
+                total += 1
+                if base_digests.get(record["id"]) != digest:
+                    yield record
+
+        pending = changed_records()
+        for first in pending:
+            name = f"chunk-{len(chunks):05d}.jsonl{extension}"
+            count = 0
+            with _open_text(path / name, "w", compression) as chunk:
+                for record in chain([first], islice(pending, chunk_size - 1)):
+                    chunk.write(_dumps(record) + "\n")
+                    count += 1
+            chunks.append({"file": name, "count": count, "sha256": _file_sha256(path / name)})
+
+    manifest = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "compression": compression,
+        "total_memories": total,
+        "written_memories": sum(entry["count"] for entry in chunks),
+        "base": os.path.relpath(base, path) if base is not None else None,
+        "chunks": chunks,
+        "index": {"file": index_name, "count": total, "sha256": _file_sha256(path / index_name)},
+        **(metadata or {}),
+    }
+    tmp_path = path / (MANIFEST_NAME + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path / MANIFEST_NAME)
+    return manifest
+
+
+def _snapshot_chain(path: Path) -> List[Tuple[Path, Dict[str, Any]]]:
+    """Snapshot and its bases, newest first."""
+    snapshots = []
+    seen = set()
+    while path is not None:
+        resolved = path.resolve()
+        if resolved in seen:
+            raise SnapshotError(f"Snapshot base cycle at {path}")
+        seen.add(resolved)
+        manifest = read_manifest(path)
+        snapshots.append((path, manifest))
+        path = path / manifest["base"] if manifest.get("base") else None
+    return snapshots
+
+
+def iter_snapshot(path: str | Path, *, verify: bool = True) -> Iterator[Dict[str, Any]]:
+    """
+    Yield the live memory records of a snapshot, resolving incremental bases.
+
+    Every record is yielded once, from the newest snapshot that contains it;
+    memories missing from the newest index (deleted) are skipped.
+
+    Raises:
+        SnapshotError: On missing files, checksum mismatches or bad manifests
+    """
+    snapshots = _snapshot_chain(Path(path))
+    newest_path, newest = snapshots[0]
+    if len(snapshots) == 1:
+        for entry in newest["chunks"]:
+            yield from _iter_lines(newest_path, entry, newest["compression"], verify)
+        return
+
+    remaining = set(_load_index(newest_path, newest, verify))
+    for snapshot_path, manifest in snapshots:
+        for entry in manifest["chunks"]:
+            for record in _iter_lines(snapshot_path, entry, manifest["compression"], verify):
+                if record["id"] in remaining:
+                    remaining.discard(record["id"])
+                    yield record
+        if not remaining:
+            return
+    if remaining:
+        raise SnapshotError(f"{len(remaining)} memories missing from the snapshot chain")
+
+
+def verify_snapshot(path: str | Path) -> Dict[str, Any]:
+    """Check every file checksum along the base chain; returns the newest manifest."""
+    snapshots = _snapshot_chain(Path(path))
+    for snapshot_path, manifest in snapshots:
+        for entry in [*manifest["chunks"], manifest["index"]]:
+            file_path = snapshot_path / entry["file"]
+            if not file_path.exists() or _file_sha256(file_path) != entry["sha256"]:
+                raise SnapshotError(f"Checksum mismatch for {file_path}")
+    return snapshots[0][1]
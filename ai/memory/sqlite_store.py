@@ -0,0 +1,428 @@
+"""
+SQLite Memory Store
+
+Persistent local memory store backed by a single SQLite database file. Gives
+agents cross-session memory on one machine without any cloud dependency,
+while keeping the full IntelligentMemoryStore API.
+
+Features:
+- WAL journaling for concurrent readers and cheap commits
+- Indexes on created_at, importance_score and memory_type so ranked queries
+  read only the rows they return
+- Tag and keyword posting tables matching IntelligentMemoryStore semantics
+- FTS5 full-text index with bm25 ranking (``search_text``), when the SQLite
+  build supports it
+- Related-memory linking, analytics and optimization done in SQL
+
+Cross-references:
+    - ai/memory/intelligent_store.py: API and analysis pipeline reused here
+    - ai/memory/firestore_store.py: Cloud-backed alternative
+    - ai/agency.py: Selected when FRESH_MEMORY_DB is set
+"""
+from __future__ import annotations
+import json
+import logging
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from ai.memory.store import intern_strings
+from ai.memory.intelligent_store import IntelligentMemoryStore, EnhancedMemoryItem, MemoryType
+from ai.utils.clock import now as time_now
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS memories (
+    seq INTEGER PRIMARY KEY,
+    id TEXT NOT NULL UNIQUE,
+    content TEXT NOT NULL,
+    tags TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    memory_type TEXT NOT NULL,
+    keywords TEXT NOT NULL,
+    importance_score REAL NOT NULL,
+    summary TEXT,
+    metadata TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_memories_created_at ON memories(created_at);
+CREATE INDEX IF NOT EXISTS idx_memories_rank ON memories(importance_score, created_at);
+CREATE INDEX IF NOT EXISTS idx_memories_type ON memories(memory_type, importance_score, created_at);
+
+CREATE TABLE IF NOT EXISTS memory_tags (
+    tag TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (tag, seq)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS memory_keywords (
+    keyword TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (keyword, seq)
+) WITHOUT ROWID;
+
+-- Relationships live in their own table so linking a new memory to a
+-- popular one is an O(1) insert rather than rewriting a growing list
+CREATE TABLE IF NOT EXISTS memory_links (
+    owner_seq INTEGER NOT NULL,
+    related_id TEXT NOT NULL,
+    UNIQUE (owner_seq, related_id)
+);
+
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+
+CREATE TRIGGER IF NOT EXISTS memories_cleanup AFTER DELETE ON memories BEGIN
+    DELETE FROM memory_tags WHERE seq = old.seq;
+    DELETE FROM memory_keywords WHERE seq = old.seq;
+    DELETE FROM memory_links WHERE owner_seq = old.seq;
+END;
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS memories_fts USING fts5(
+    content, keywords, content='memories', content_rowid='seq'
+);
+CREATE TRIGGER IF NOT EXISTS memories_fts_insert AFTER INSERT ON memories BEGIN
+    INSERT INTO memories_fts(rowid, content, keywords) VALUES (new.seq, new.content, new.keywords);
+END;
+CREATE TRIGGER IF NOT EXISTS memories_fts_delete AFTER DELETE ON memories BEGIN
+    INSERT INTO memories_fts(memories_fts, rowid, content, keywords) VALUES ('delete', old.seq, old.content, old.keywords);
+END;
+"""
+
+_FIELDS = ("id", "content", "tags", "created_at", "memory_type", "keywords",
+           "importance_score", "summary", "metadata")
+_COLUMNS = ", ".join(("seq",) + _FIELDS)
+_JOINED_COLUMNS = ", ".join(f"m.{column}" for column in ("seq",) + _FIELDS)
+_INSERT_SQL = f"INSERT INTO memories ({', '.join(_FIELDS)}) VALUES ({', '.join('?' * len(_FIELDS))})"
+_RANK_ORDER = "importance_score DESC, created_at DESC, seq ASC"
+
+
+class SqliteMemoryStore(IntelligentMemoryStore):
+    """
+    SQLite-backed intelligent memory store for persistent local memory.
+
+    Items live in the database rather than in ``_items``; every query is
+    answered by SQLite using the indexes above. Thread-safe: a single
+    connection is shared behind a lock.
+    """
+
+    def __init__(self, db_path: Union[str, Path] = ".fresh/memory.db"):
+        """
+        Initialize SQLite memory store.
+
+        Args:
+            db_path: Database file path (":memory:" for an ephemeral store)
+        """
+        super().__init__()
+
+        self.db_path = str(db_path)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.executescript(_SCHEMA)
+
+        try:
+            self._conn.executescript(_FTS_SCHEMA)
+            self.fts_enabled = True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"FTS5 unavailable, full-text search disabled: {e}")
+            self.fts_enabled = False
+
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'id_counter'").fetchone()
+        self._id_counter = int(row["value"]) if row else 0
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "SqliteMemoryStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def context_generation(self) -> Tuple[int, int]:
+        """Local write counter plus SQLite's data_version, which changes when
+        another connection (e.g. another process) commits to the database."""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return (self._generation, data_version)
+
+    # ------------------------------------------------------------------
+    # Row conversion
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _row_to_item(row: sqlite3.Row, related_ids: List[str]) -> EnhancedMemoryItem:
+        """Convert a database row to EnhancedMemoryItem."""
+        return EnhancedMemoryItem(
+            id=row["id"],
+            content=row["content"],
+            tags=intern_strings(json.loads(row["tags"])),
+            created_at=datetime.fromtimestamp(row["created_at"], timezone.utc),
+            memory_type=MemoryType(row["memory_type"]),
+            keywords=intern_strings(json.loads(row["keywords"])),
+            related_ids=related_ids,
+            importance_score=row["importance_score"],
+            summary=row["summary"],
+            metadata=json.loads(row["metadata"]),
+        )
+
+    def _fetch(self, sql: str, params: Sequence[Any] = ()) -> List[EnhancedMemoryItem]:
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            links: Dict[int, List[str]] = {row["seq"]: [] for row in rows}
+            seqs = list(links)
+            for start in range(0, len(seqs), 500):
+                chunk = seqs[start:start + 500]
+                for link in self._conn.execute(
+                    f"SELECT owner_seq, related_id FROM memory_links WHERE owner_seq IN ({self._placeholders(chunk)}) ORDER BY rowid",
+                    chunk,
+                ):
+                    links[link["owner_seq"]].append(link["related_id"])
+        return [self._row_to_item(row, links[row["seq"]]) for row in rows]
+
+    @staticmethod
+    def _placeholders(values: Sequence[Any]) -> str:
+        return ", ".join("?" * len(values))
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _insert_item(self, item: EnhancedMemoryItem) -> int:
+        """Insert a built item and its postings (transaction held by caller)."""
+        cur = self._conn.execute(
+            _INSERT_SQL,
+            (
+                item.id,
+                item.content,
+                json.dumps(item.tags),
+                item.created_at.timestamp(),
+                item.memory_type.value,
+                json.dumps(item.keywords),
+                item.importance_score,
+                item.summary,
+                json.dumps(item.metadata, default=str),
+            ),
+        )
+        seq = cur.lastrowid
+        self._conn.executemany("INSERT OR IGNORE INTO memory_tags (tag, seq) VALUES (?, ?)",
+                               [(tag, seq) for tag in item.tags])
+        self._conn.executemany("INSERT OR IGNORE INTO memory_keywords (keyword, seq) VALUES (?, ?)",
+                               [(keyword, seq) for keyword in item.keywords])
+        return seq
+
+    def _link_row(self, item: EnhancedMemoryItem, seq: int) -> None:
+        """Link a freshly inserted item to the earliest 5 items sharing a keyword."""
+        heads = set()
+        for keyword in set(item.keywords):
+            rows = self._conn.execute(
+                "SELECT seq FROM memory_keywords WHERE keyword = ? AND seq != ? ORDER BY seq LIMIT 5",
+                (keyword, seq),
+            ).fetchall()
+            heads.update(row["seq"] for row in rows)
+        if not heads:
+            return
+
+        related_seqs = sorted(heads)[:5]
+        rows = self._conn.execute(
+            f"SELECT seq, id FROM memories WHERE seq IN ({self._placeholders(related_seqs)}) ORDER BY seq",
+            related_seqs,
+        ).fetchall()
+        item.related_ids = [row["id"] for row in rows]
+
+        # Add bidirectional relationship
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO memory_links (owner_seq, related_id) VALUES (?, ?)",
+            [(seq, row["id"]) for row in rows] + [(row["seq"], item.id) for row in rows],
+        )
+
+    def _store_items(self, items: List[EnhancedMemoryItem]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Other connections may have written since; ids are assigned
+                # from the stored counter while the write lock is held
+                row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'id_counter'").fetchone()
+                self._id_counter = int(row["value"]) if row else 0
+                for item in items:
+                    item.id = self._generate_id()
+                    seq = self._insert_item(item)
+                    self._link_row(item, seq)
+                self._conn.execute(
+                    "INSERT INTO store_meta (key, value) VALUES ('id_counter', ?) "
+                    "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                    (str(self._id_counter),),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._bump_generation()
+
+    def write(self, *, content: str, tags: Optional[List[str]] = None, memory_type: Optional[MemoryType] = None, metadata: Optional[Dict[str, Any]] = None) -> EnhancedMemoryItem:
+        """Write enhanced memory item to the database."""
+        with self._lock:
+            item = self._build_item(content=content, tags=tags, memory_type=memory_type, metadata=metadata)
+            self._store_items([item])
+        return item
+
+    def write_many(self, entries: Iterable[Dict[str, Any]]) -> List[EnhancedMemoryItem]:
+        """Write a batch of memories in a single transaction."""
+        with self._lock:
+            items = self._build_items(entries)
+            self._store_items(items)
+        return items
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def query(self, *, limit: int = 5, tags: Optional[List[str]] = None, keywords: Optional[List[str]] = None, memory_type: Optional[MemoryType] = None) -> List[EnhancedMemoryItem]:
+        """Enhanced query with intelligent filtering, ranked by importance and recency."""
+        clauses: List[str] = []
+        params: List[Any] = []
+        if memory_type is not None:
+            clauses.append("memory_type = ?")
+            params.append(memory_type.value)
+        if tags:
+            tag_list = list(set(tags))
+            clauses.append(f"seq IN (SELECT seq FROM memory_tags WHERE tag IN ({self._placeholders(tag_list)}))")
+            params.extend(tag_list)
+        if keywords:
+            keyword_list = list({k.lower() for k in keywords})
+            clauses.append(f"seq IN (SELECT seq FROM memory_keywords WHERE keyword IN ({self._placeholders(keyword_list)}))")
+            params.extend(keyword_list)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        params.append(max(0, limit))
+        return self._fetch(f"SELECT {_COLUMNS} FROM memories {where} ORDER BY {_RANK_ORDER} LIMIT ?", params)
+
+    def search_by_keywords(self, keywords: List[str], limit: int = 10) -> List[EnhancedMemoryItem]:
+        """Search memories by keyword overlap weighted by importance."""
+        keyword_list = list({k.lower() for k in keywords})
+        if not keyword_list:
+            return []
+        return self._fetch(
+            f"""
+            SELECT {_JOINED_COLUMNS}
+            FROM memory_keywords k JOIN memories m ON m.seq = k.seq
+            WHERE k.keyword IN ({self._placeholders(keyword_list)})
+            GROUP BY m.seq
+            ORDER BY (COUNT(*) * 1.0 / ?) * m.importance_score DESC, m.seq ASC
+            LIMIT ?
+            """,
+            [*keyword_list, len(keyword_list), max(0, limit)],
+        )
+
+    def search_text(self, text: str, limit: int = 10) -> List[EnhancedMemoryItem]:
+        """Full-text search ranked by bm25 and boosted by importance.
+
+        Falls back to keyword search when FTS5 is unavailable.
+        """
+        terms = re.findall(r'\w+', text.lower())
+        if not terms:
+            return []
+        if not self.fts_enabled:
+            return self.search_by_keywords(terms, limit)
+        match = " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+        return self._fetch(
+            f"""
+            SELECT {_JOINED_COLUMNS}
+            FROM memories_fts f JOIN memories m ON m.seq = f.rowid
+            WHERE memories_fts MATCH ?
+            ORDER BY bm25(memories_fts) * (0.5 + m.importance_score) ASC, m.seq ASC
+            LIMIT ?
+            """,
+            [match, max(0, limit)],
+        )
+
+    def search_by_type(self, memory_type: MemoryType, limit: int = 10) -> List[EnhancedMemoryItem]:
+        """Search memories by type."""
+        return self._fetch(
+            f"SELECT {_COLUMNS} FROM memories WHERE memory_type = ? ORDER BY {_RANK_ORDER} LIMIT ?",
+            (memory_type.value, max(0, limit)),
+        )
+
+    def get_by_id(self, memory_id: str) -> Optional[EnhancedMemoryItem]:
+        """Get memory by ID."""
+        items = self._fetch(f"SELECT {_COLUMNS} FROM memories WHERE id = ?", (memory_id,))
+        return items[0] if items else None
+
+    def get_related_memories(self, memory_id: str, limit: int = 5) -> List[EnhancedMemoryItem]:
+        """Get memories related to a specific memory."""
+        item = self.get_by_id(memory_id)
+        if not item or not item.related_ids:
+            return []
+        related_ids = item.related_ids[:limit]
+        by_id = {
+            related.id: related
+            for related in self._fetch(
+                f"SELECT {_COLUMNS} FROM memories WHERE id IN ({self._placeholders(related_ids)})",
+                related_ids,
+            )
+        }
+        return [by_id[rid] for rid in related_ids if rid in by_id]
+
+    def count(self) -> int:
+        """Number of stored memories."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM memories").fetchone()[0]
+
+    def get_memory_analytics(self) -> Dict[str, Any]:
+        """Get analytics about memory usage, aggregated in SQL."""
+        with self._lock:
+            total, avg_importance = self._conn.execute(
+                "SELECT COUNT(*), AVG(importance_score) FROM memories"
+            ).fetchone()
+            if not total:
+                return {"total_memories": 0}
+            type_rows = self._conn.execute(
+                "SELECT memory_type, COUNT(*) AS n FROM memories GROUP BY memory_type ORDER BY MIN(seq)"
+            ).fetchall()
+            keyword_rows = self._conn.execute(
+                "SELECT keyword, COUNT(*) AS n FROM memory_keywords GROUP BY keyword ORDER BY n DESC, MIN(seq) ASC LIMIT 10"
+            ).fetchall()
+            recent = self._conn.execute(
+                "SELECT COUNT(*) FROM memories WHERE created_at > ?", (time_now() - 3600,)
+            ).fetchone()[0]
+
+        return {
+            "total_memories": total,
+            "type_distribution": {MemoryType(row["memory_type"]): row["n"] for row in type_rows},
+            "average_importance": avg_importance,
+            "top_keywords": {row["keyword"]: row["n"] for row in keyword_rows},
+            "recent_activity": recent,  # Last hour
+        }
+
+    def optimize_memory(self, max_items: int = 1000) -> int:
+        """Optimize memory by removing low-importance old items."""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                cur = self._conn.execute(
+                    f"DELETE FROM memories WHERE seq NOT IN "
+                    f"(SELECT seq FROM memories ORDER BY {_RANK_ORDER} LIMIT ?)",
+                    (max(0, max_items),),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._bump_generation()
+        return cur.rowcount
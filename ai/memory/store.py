@@ -5,7 +5,7 @@
 @connections
 - imports: dataclasses for MemoryItem, typing for interfaces, ai.utils.clock for timestamps
 - exports: MemoryStore abstract class, InMemoryMemoryStore implementation, MemoryItem data class
-- implements: Abstract MemoryStore interface with write/query operations
+- implements: Abstract MemoryStore interface with write/write_many/query operations
 
 @usage
 # Get the current memory store (auto-creates InMemoryMemoryStore if none set)
@@ -14,14 +14,24 @@ store = get_store()
 # Write memory with tags
 memory = store.write(content="Goal: implement user auth", tags=["goal", "auth"])
 
+# Ingest a burst of memories in one call
+items = store.write_many([{"content": "Task: add auth tests", "tags": ["task"]}])
+
 # Query memories by tags and limit
 recent_auth = store.query(tags=["auth"], limit=10)
 
+# Prompt-ready context, cached until the store changes
+context = render_context(limit=10, tags=["auth"], max_tokens=500)
+
 @notes
 - Global store pointer allows tools to access memory without explicit injection
 - InMemoryMemoryStore is ephemeral (lost on restart) - use FirestoreMemoryStore for persistence
 - MemoryItem uses timezone-aware timestamps for consistency across deployments
+- Memory items are slotted and tag/keyword strings are interned, since large
+  caches repeat the same handful of strings in every item
 - Query results are ordered newest first for better context relevance
+- render_context() caches rendered lines per (store generation, limit, tags);
+  stores bump their generation on every write/removal, invalidating the cache
 
 @see
 - intelligent_store.py - Enhanced memory with auto-classification
@@ -33,8 +43,11 @@ recent_auth = store.query(tags=["auth"], limit=10)
 from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import List, Optional
+from bisect import bisect_right
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 import itertools
+import sys
+import weakref
 
 from ai.utils.clock import now as time_now
 
@@ -55,13 +68,73 @@ def get_store() -> "MemoryStore":
     return _current_store
 
 
-def render_context(limit: int = 5, tags: Optional[List[str]] = None) -> str:
-    items = get_store().query(limit=limit, tags=tags)
-    lines = [f"- [{i.created_at.isoformat()}] {i.content}" for i in items]
-    return "\n".join(lines)
+# Rendered context per store: (generation, {(limit, tags): fragment})
+_context_cache: "weakref.WeakKeyDictionary[MemoryStore, Tuple[Hashable, Dict[Tuple[int, Any], ContextFragment]]]" = weakref.WeakKeyDictionary()
+_CONTEXT_CACHE_ENTRIES = 32
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+class ContextFragment:
+    """Pre-rendered context lines with cumulative token estimates."""
+
+    __slots__ = ("lines", "text", "_token_ends")
+
+    def __init__(self, lines: List[str]) -> None:
+        self.lines = lines
+        self.text = "\n".join(lines)
+        self._token_ends = list(itertools.accumulate(estimate_tokens(line) for line in lines))
+
+    def truncate(self, max_tokens: Optional[int]) -> str:
+        """The leading whole lines that fit in ``max_tokens`` (all if None)."""
+        if max_tokens is None or not self._token_ends or self._token_ends[-1] <= max_tokens:
+            return self.text
+        return "\n".join(self.lines[:bisect_right(self._token_ends, max_tokens)])
+
+
+def _context_fragment(store: "MemoryStore", limit: int, tags: Optional[List[str]]) -> ContextFragment:
+    generation = store.context_generation()
+    if generation is None:
+        items = store.query(limit=limit, tags=tags)
+        return ContextFragment([f"- [{i.created_at.isoformat()}] {i.content}" for i in items])
+
+    key = (limit, tuple(sorted(set(tags))) if tags else None)
+    cached_generation, fragments = _context_cache.get(store, (None, {}))
+    if cached_generation != generation:
+        fragments = {}
+        _context_cache[store] = (generation, fragments)
+    fragment = fragments.get(key)
+    if fragment is None:
+        items = store.query(limit=limit, tags=tags)
+        fragment = ContextFragment([f"- [{i.created_at.isoformat()}] {i.content}" for i in items])
+        if len(fragments) >= _CONTEXT_CACHE_ENTRIES:
+            del fragments[next(iter(fragments))]
+        fragments[key] = fragment
+    return fragment
+
 
+def render_context(limit: int = 5, tags: Optional[List[str]] = None, max_tokens: Optional[int] = None) -> str:
+    """Render the top ``limit`` memories (optionally filtered by tags) as prompt lines.
 
-@dataclass(frozen=False)
+    Results are cached until the store's generation changes. With
+    ``max_tokens``, only the leading lines that fit the budget are kept.
+    """
+    return _context_fragment(get_store(), limit, tags).truncate(max_tokens)
+
+
+def intern_strings(values: Optional[Iterable[str]]) -> List[str]:
+    """Return ``values`` as a list of interned strings (shared across items)."""
+    # list(<list>) is allocated exact-size; comprehensions over-allocate
+    strings = list(values) if values else []
+    for i, value in enumerate(strings):
+        strings[i] = sys.intern(value)
+    return strings
+
+
+@dataclass(frozen=False, slots=True)
 class MemoryItem:
     id: str
     content: str
@@ -70,12 +143,33 @@ class MemoryItem:
 
 
 class MemoryStore:
+    _generation = 0
+
+    def context_generation(self) -> Optional[Hashable]:
+        """Version of the store's contents, changed by every write or removal.
+
+        render_context() reuses rendered results while this stays the same.
+        Stores that cannot track their own changes return None (no caching).
+        """
+        return None
+
+    def _bump_generation(self) -> None:
+        self._generation += 1
+
     def write(self, *, content: str, tags: Optional[List[str]] = None) -> MemoryItem:  # pragma: no cover - interface
         raise NotImplementedError
 
     def query(self, *, limit: int = 5, tags: Optional[List[str]] = None) -> List[MemoryItem]:  # pragma: no cover - interface
         raise NotImplementedError
 
+    def write_many(self, entries: Iterable[Dict[str, Any]]) -> List[MemoryItem]:
+        """Write several memories; each entry holds ``write()`` keyword arguments.
+
+        Stores override this to amortise per-item overhead (indexing, remote
+        round trips). The default simply writes one by one.
+        """
+        return [self.write(**entry) for entry in entries]
+
 
 class InMemoryMemoryStore(MemoryStore):
     _id_counter = itertools.count(1)
@@ -83,12 +177,25 @@ class InMemoryMemoryStore(MemoryStore):
     def __init__(self) -> None:
         self._items: List[MemoryItem] = []
 
+    def context_generation(self) -> Optional[Hashable]:
+        return self._generation
+
     def write(self, *, content: str, tags: Optional[List[str]] = None) -> MemoryItem:
         mid = f"mem-{next(self._id_counter)}"
-        item = MemoryItem(id=mid, content=content, tags=list(tags or []))
+        item = MemoryItem(id=mid, content=content, tags=intern_strings(tags))
         self._items.append(item)
+        self._bump_generation()
         return item
 
+    def write_many(self, entries: Iterable[Dict[str, Any]]) -> List[MemoryItem]:
+        items = [
+            MemoryItem(id=f"mem-{next(self._id_counter)}", content=entry["content"], tags=intern_strings(entry.get("tags")))
+            for entry in entries
+        ]
+        self._items.extend(items)
+        self._bump_generation()
+        return items
+
     def query(self, *, limit: int = 5, tags: Optional[List[str]] = None) -> List[MemoryItem]:
         items = self._items
         if tags:
@@ -0,0 +1,281 @@
+"""
+Vector Index
+
+Dense-vector semantic search for the intelligent memory stores. Memories are
+embedded once on write and kept in a contiguous float32 matrix, so a query is
+a single matrix-vector product followed by a partial top-k selection.
+
+Features:
+- Pluggable embedders: anything with ``name``, ``dim`` and ``embed(texts)``
+- HashingEmbedder: offline default using signed feature hashing of words and
+  character n-grams, so paraphrases and word variants still overlap
+- NumPy matrix backend with a pure-Python fallback when NumPy is missing
+- Upserts and O(1) removals (the last row is swapped into the hole)
+- Persistence as a raw float32 file plus a JSON header next to the store
+
+Cross-references:
+    - ai/memory/intelligent_store.py: enable_vector_index(), semantic_search()
+    - ai/tools/enhanced_memory_tools.py: SemanticSearchMemory
+    - docs/MEMORY_SYSTEM.md: Memory architecture overview
+"""
+from __future__ import annotations
+import json
+import math
+import os
+import re
+import sys
+import zlib
+from array import array
+from operator import mul
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Protocol, Sequence, Tuple
+
+# Try to import NumPy with graceful fallback
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Function words carry no topical signal and would dominate short memories
+_STOP_WORDS = frozenset({
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
+})
+
+
+class Embedder(Protocol):
+    """Turns texts into fixed-size vectors."""
+
+    name: str
+    dim: int
+
+    def embed(self, texts: Sequence[str]) -> Sequence[Sequence[float]]:
+        ...
+
+
+class HashingEmbedder:
+    """Offline embedder based on signed feature hashing.
+
+    Each text becomes a bag of words and character n-grams (with word
+    boundary markers) weighted by ``1 + log(tf)``; features are hashed into
+    ``dim`` buckets with a stable CRC32 hash, so vectors are reproducible
+    across processes and can be persisted.
+    """
+
+    def __init__(self, dim: int = 256, ngram_range: Tuple[int, int] = (3, 4), ngram_weight: float = 0.5):
+        self.dim = dim
+        self.ngram_range = ngram_range
+        self.ngram_weight = ngram_weight
+        self.name = f"hashing-{dim}-{ngram_range[0]}{ngram_range[1]}"
+
+    def _features(self, text: str) -> Dict[str, float]:
+        counts: Dict[str, float] = {}
+        low, high = self.ngram_range
+        for word in _TOKEN_RE.findall(text.lower()):
+            if word in _STOP_WORDS:
+                continue
+            counts[word] = counts.get(word, 0.0) + 1.0
+            marked = f"<{word}>"
+            for n in range(low, high + 1):
+                for i in range(len(marked) - n + 1):
+                    gram = "#" + marked[i:i + n]
+                    counts[gram] = counts.get(gram, 0.0) + self.ngram_weight
+        return counts
+
+    def embed(self, texts: Sequence[str]) -> List[array]:
+        vectors = []
+        for text in texts:
+            vector = array("f", bytes(4 * self.dim))
+            for feature, count in self._features(text).items():
+                h = zlib.crc32(feature.encode("utf-8"))
+                weight = 1.0 + math.log(count) if count >= 1.0 else count
+                vector[h % self.dim] += weight if h & 0x80000000 else -weight
+            vectors.append(vector)
+        return vectors
+
+
+def _normalized(vector: Sequence[float]) -> array:
+    values = array("f", vector)
+    norm = math.sqrt(sum(v * v for v in values))
+    if norm > 0:
+        for i, v in enumerate(values):
+            values[i] = v / norm
+    return values
+
+
+class VectorIndex:
+    """Contiguous matrix of unit vectors keyed by memory id."""
+
+    def __init__(self, embedder: Optional[Embedder] = None, *, initial_capacity: int = 1024):
+        self.embedder = embedder or HashingEmbedder()
+        self.dim = self.embedder.dim
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        if NUMPY_AVAILABLE:
+            self._matrix = np.zeros((max(1, initial_capacity), self.dim), dtype=np.float32)
+        else:
+            self._matrix = array("f")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._ids)
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def add(self, entries: Iterable[Tuple[str, str]]) -> None:
+        """Embed and store ``(item_id, text)`` pairs (existing ids are replaced)."""
+        entries = list(entries)
+        if not entries:
+            return
+        vectors = self.embedder.embed([text for _, text in entries])
+        for (item_id, _), vector in zip(entries, vectors):
+            self._set(item_id, _normalized(vector))
+
+    def _set(self, item_id: str, vector: array) -> None:
+        if len(vector) != self.dim:
+            raise ValueError(f"Embedder returned {len(vector)} dims, index expects {self.dim}")
+        row = self._rows.get(item_id)
+        if row is None:
+            row = len(self._ids)
+            self._rows[item_id] = row
+            self._ids.append(item_id)
+            if NUMPY_AVAILABLE:
+                if row >= len(self._matrix):
+                    grown = np.zeros((2 * len(self._matrix), self.dim), dtype=np.float32)
+                    grown[:row] = self._matrix[:row]
+                    self._matrix = grown
+            else:
+                self._matrix.extend(vector)
+                return
+        if NUMPY_AVAILABLE:
+            self._matrix[row] = np.frombuffer(vector, dtype=np.float32)
+        else:
+            self._matrix[row * self.dim:(row + 1) * self.dim] = vector
+
+    def remove(self, item_id: str) -> bool:
+        """Drop a vector by moving the last row into its slot."""
+        row = self._rows.pop(item_id, None)
+        if row is None:
+            return False
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+            if NUMPY_AVAILABLE:
+                self._matrix[row] = self._matrix[last]
+            else:
+                self._matrix[row * self.dim:(row + 1) * self.dim] = self._matrix[last * self.dim:]
+        self._ids.pop()
+        if not NUMPY_AVAILABLE:
+            del self._matrix[last * self.dim:]
+        return True
+
+    def clear(self) -> None:
+        self._ids.clear()
+        self._rows.clear()
+        if not NUMPY_AVAILABLE:
+            del self._matrix[:]
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Return up to ``k`` ``(item_id, cosine_similarity)`` pairs, best first."""
+        size = len(self._ids)
+        if k <= 0 or not size:
+            return []
+        query = _normalized(self.embedder.embed([text])[0])
+        if not any(query):
+            return []
+        k = min(k, size)
+
+        if NUMPY_AVAILABLE:
+            scores = self._matrix[:size] @ np.frombuffer(query, dtype=np.float32)
+            top = np.argpartition(-scores, k - 1)[:k] if k < size else np.arange(size)
+            top = top[np.argsort(-scores[top], kind="stable")]
+            return [(self._ids[i], float(scores[i])) for i in top]
+
+        dim = self.dim
+        matrix = self._matrix
+        scored = [
+            (sum(map(mul, matrix[row * dim:(row + 1) * dim], query)), row)
+            for row in range(size)
+        ]
+        scored.sort(key=lambda pair: -pair[0])
+        return [(self._ids[row], score) for score, row in scored[:k]]
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _paths(path: Path) -> Tuple[Path, Path]:
+        path = Path(path)
+        return path.with_suffix(".f32"), path.with_suffix(".json")
+
+    def save(self, path: Path) -> None:
+        """Write vectors (raw little-endian float32) and a JSON header."""
+        data_path, header_path = self._paths(path)
+        data_path.parent.mkdir(parents=True, exist_ok=True)
+        size = len(self._ids)
+        if NUMPY_AVAILABLE:
+            raw = self._matrix[:size].astype("<f4").tobytes()
+        else:
+            values = array("f", self._matrix)
+            if sys.byteorder != "little":
+                values.byteswap()
+            raw = values.tobytes()
+
+        header = {"embedder": self.embedder.name, "dim": self.dim, "ids": self._ids}
+        for target, payload, mode in ((data_path, raw, "wb"), (header_path, json.dumps(header), "w")):
+            tmp = target.with_suffix(target.suffix + ".tmp")
+            with open(tmp, mode) as f:
+                f.write(payload)
+            os.replace(tmp, target)
+
+    @classmethod
+    def load(cls, path: Path, embedder: Optional[Embedder] = None) -> "VectorIndex":
+        """Load a saved index; returns an empty one if missing or built by another embedder."""
+        index = cls(embedder)
+        data_path, header_path = cls._paths(path)
+        if not data_path.exists() or not header_path.exists():
+            return index
+        with open(header_path, "r", encoding="utf-8") as f:
+            header = json.load(f)
+        if header.get("embedder") != index.embedder.name or header.get("dim") != index.dim:
+            return index
+
+        values = array("f")
+        with open(data_path, "rb") as f:
+            values.frombytes(f.read())
+        if sys.byteorder != "little":
+            values.byteswap()
+        ids = header["ids"]
+        if len(values) != len(ids) * index.dim:
+            return index
+
+        index._ids = list(ids)
+        index._rows = {item_id: row for row, item_id in enumerate(ids)}
+        if NUMPY_AVAILABLE:
+            capacity = max(len(index._matrix), len(ids))
+            index._matrix = np.zeros((capacity, index.dim), dtype=np.float32)
+            index._matrix[:len(ids)] = np.frombuffer(values, dtype=np.float32).reshape(len(ids), index.dim)
+        else:
+            index._matrix = values
+        return index
@@ -0,0 +1,306 @@
+"""
+Write-Behind Queue
+
+Background persistence queue for remote memory backends. Writes are accepted
+immediately on the caller's thread and committed to the backend by a worker
+thread in coalesced batches, so agent turns never wait on a network round trip.
+
+Features:
+- Coalescing: repeated writes to the same document collapse to the latest data
+- Batch commits (up to ``batch_size`` documents per commit) with retry/backoff
+- Bounded memory: ``max_pending`` documents; producers wait briefly when full
+  and ``submit`` reports rejection so callers can fall back to a direct write
+- Durable JSONL spool: accepted writes survive a crash and are replayed on start
+- Flush-on-shutdown via ``close()`` and an ``atexit`` hook
+
+Cross-references:
+    - ai/memory/firestore_store.py: FirestoreMemoryStore(write_behind=True)
+    - docs/MEMORY_SYSTEM.md: Memory architecture overview
+"""
+from __future__ import annotations
+import atexit
+import json
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    from google.cloud.firestore import SERVER_TIMESTAMP
+except ImportError:
+    SERVER_TIMESTAMP = None
+
+logger = logging.getLogger(__name__)
+
+Document = Tuple[str, Dict[str, Any]]
+CommitFn = Callable[[List[Document]], None]
+
+_live_queues: "weakref.WeakSet[WriteBehindQueue]" = weakref.WeakSet()
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if value is SERVER_TIMESTAMP and value is not None:
+        # Delta sync commit time; a replayed write gets its own
+        return {"__server_timestamp__": True}
+    raise TypeError(f"Object of type {type(value).__name__} is not spoolable")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if set(obj) == {"__datetime__"}:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if set(obj) == {"__server_timestamp__"}:
+        return SERVER_TIMESTAMP
+    return obj
+
+
+class WriteBehindQueue:
+    """Coalescing, batching write-behind queue with a durable spool.
+
+    ``commit_fn`` receives a list of ``(doc_id, data)`` pairs and must raise
+    on failure; failed batches are re-queued (newer pending data wins) and
+    retried with exponential backoff.
+    """
+
+    def __init__(self,
+                 commit_fn: CommitFn,
+                 *,
+                 spool_path: Optional[Path] = None,
+                 max_pending: int = 10_000,
+                 batch_size: int = 500,
+                 flush_interval: float = 0.25,
+                 submit_timeout: float = 1.0,
+                 max_backoff: float = 30.0):
+        """
+        Args:
+            commit_fn: Persists one batch of documents, raising on failure
+            spool_path: JSONL file for crash durability (None disables spooling)
+            max_pending: Maximum documents held in memory before backpressure
+            batch_size: Maximum documents per commit
+            flush_interval: How long the worker lets writes accumulate
+            submit_timeout: How long ``submit`` waits for room when full
+            max_backoff: Upper bound for retry backoff in seconds
+        """
+        self._commit_fn = commit_fn
+        self._spool_path = Path(spool_path) if spool_path else None
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.submit_timeout = submit_timeout
+        self.max_backoff = max_backoff
+
+        self._pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._flush_requested = False
+        self._failures_in_row = 0
+        self._spool_lines = 0
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "rejected": 0,
+            "committed": 0,
+            "batches": 0,
+            "failed_batches": 0,
+            "replayed": 0,
+        }
+
+        self._replay_spool()
+
+        self._worker = threading.Thread(target=self._run, name="memory-write-behind", daemon=True)
+        self._worker.start()
+        _live_queues.add(self)
+
+    # ------------------------------------------------------------------
+    # Producer API
+    # ------------------------------------------------------------------
+
+    def submit(self, doc_id: str, data: Dict[str, Any]) -> bool:
+        """Queue a document write.
+
+        Returns False if the queue stayed full for ``submit_timeout`` seconds
+        (or is closed); the caller should then persist the write directly.
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            if doc_id not in self._pending:
+                ok = self._cond.wait_for(
+                    lambda: self._closed or len(self._pending) < self.max_pending,
+                    timeout=self.submit_timeout,
+                )
+                if not ok or self._closed:
+                    self._stats["rejected"] += 1
+                    return False
+            else:
+                self._stats["coalesced"] += 1
+            self._spool_append(doc_id, data)
+            self._pending[doc_id] = data
+            self._stats["submitted"] += 1
+            self._cond.notify_all()
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until everything queued so far is committed.
+
+        Returns:
+            True if the queue drained within ``timeout``
+        """
+        with self._cond:
+            self._flush_requested = True
+            self._cond.notify_all()
+            drained = self._cond.wait_for(
+                lambda: not self._pending and not self._inflight,
+                timeout=timeout,
+            )
+            self._flush_requested = False
+            return drained
+
+    def close(self, timeout: Optional[float] = 10.0) -> bool:
+        """Flush outstanding writes and stop the worker.
+
+        Anything that could not be committed stays in the spool and is
+        replayed the next time a queue is opened on the same spool file.
+        """
+        if self._closed:
+            return not self._pending and not self._inflight
+        drained = self.flush(timeout=timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join(timeout=timeout)
+        _live_queues.discard(self)
+        if not drained:
+            logger.warning(f"Write-behind queue closed with {self.pending_count} unsynced writes left in spool")
+        return drained
+
+    @property
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending) + len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                **self._stats,
+                "pending": len(self._pending),
+                "inflight": len(self._inflight),
+                "spool_path": str(self._spool_path) if self._spool_path else None,
+            }
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or bool(self._pending))
+                if self._closed:
+                    return
+                # Give bursts a moment to coalesce unless a flush is waiting
+                if len(self._pending) < self.batch_size and not self._flush_requested:
+                    self._cond.wait_for(
+                        lambda: self._closed or self._flush_requested or len(self._pending) >= self.batch_size,
+                        timeout=self.flush_interval,
+                    )
+                batch: List[Document] = []
+                while self._pending and len(batch) < self.batch_size:
+                    batch.append(self._pending.popitem(last=False))
+                self._inflight = dict(batch)
+
+            try:
+                self._commit_fn(batch)
+            except Exception as e:
+                self._on_failure(batch, e)
+            else:
+                self._on_success(batch)
+
+    def _on_success(self, batch: List[Document]) -> None:
+        with self._cond:
+            self._inflight = {}
+            self._failures_in_row = 0
+            self._stats["committed"] += len(batch)
+            self._stats["batches"] += 1
+            self._compact_spool()
+            self._cond.notify_all()
+
+    def _on_failure(self, batch: List[Document], error: Exception) -> None:
+        with self._cond:
+            self._inflight = {}
+            self._failures_in_row += 1
+            self._stats["failed_batches"] += 1
+            # Put the batch back in front; newer data submitted meanwhile wins
+            for doc_id, data in reversed(batch):
+                if doc_id not in self._pending:
+                    self._pending[doc_id] = data
+                    self._pending.move_to_end(doc_id, last=False)
+            backoff = min(self.max_backoff, 0.1 * (2 ** (self._failures_in_row - 1)))
+            logger.error(f"Write-behind commit of {len(batch)} documents failed, retrying in {backoff:.1f}s: {error}")
+            self._cond.notify_all()
+            self._cond.wait_for(lambda: self._closed, timeout=backoff)
+
+    # ------------------------------------------------------------------
+    # Spool
+    # ------------------------------------------------------------------
+
+    def _spool_append(self, doc_id: str, data: Dict[str, Any]) -> None:
+        if not self._spool_path:
+            return
+        line = json.dumps({"id": doc_id, "data": data}, default=_encode)
+        with open(self._spool_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        self._spool_lines += 1
+
+    def _compact_spool(self) -> None:
+        """Rewrite the spool with only uncommitted documents (lock held)."""
+        if not self._spool_path:
+            return
+        outstanding = len(self._pending) + len(self._inflight)
+        if outstanding and self._spool_lines < outstanding + self.batch_size:
+            return
+        if not outstanding:
+            self._spool_path.unlink(missing_ok=True)
+            self._spool_lines = 0
+            return
+        tmp_path = self._spool_path.with_suffix(self._spool_path.suffix + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for doc_id, data in list(self._inflight.items()) + list(self._pending.items()):
+                f.write(json.dumps({"id": doc_id, "data": data}, default=_encode) + "\n")
+        os.replace(tmp_path, self._spool_path)
+        self._spool_lines = outstanding
+
+    def _replay_spool(self) -> None:
+        if not self._spool_path:
+            return
+        self._spool_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self._spool_path.exists():
+            return
+        with open(self._spool_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line, object_hook=_decode)
+                except json.JSONDecodeError:
+                    # A crash mid-append can leave a torn last line
+                    logger.warning(f"Skipping corrupt spool entry in {self._spool_path}")
+                    continue
+                self._pending[record["id"]] = record["data"]
+                self._spool_lines += 1
+        self._stats["replayed"] = len(self._pending)
+        if self._pending:
+            logger.info(f"Replaying {len(self._pending)} unsynced memory writes from {self._spool_path}")
+
+
+@atexit.register
+def _flush_live_queues() -> None:
+    for queue in list(_live_queues):
+        try:
+            queue.close(timeout=5.0)
+        except Exception as e:  # pragma: no cover - best effort at interpreter exit
+            logger.error(f"Failed to flush write-behind queue at exit: {e}")
@@ -9,13 +9,14 @@ Features:
 - Automatic cost tracking for reads, writes, deletes
 - Batch operation support
 - Collection and document level tracking
-- Real-time cost estimation
+- Cursor pagination, projections and count() aggregations stay tracked
+- Real-time cost estimation and per-client read/write/delete totals
 """
 from __future__ import annotations
 import logging
+import math
 from typing import Any, Dict, List, Optional, Union, Iterator
 from datetime import datetime, timezone
-from contextlib import contextmanager
 
 from ai.monitor.cost_tracker import get_cost_tracker, ServiceType, OperationType
 
@@ -27,9 +28,11 @@ class FirestoreUsageTracker:
     
     def __init__(self):
         self.cost_tracker = get_cost_tracker()
+        self.totals = {"reads": 0, "writes": 0, "deletes": 0}
         
     def track_read(self, count: int = 1, collection: str = "", metadata: Optional[Dict] = None):
         """Track document read operations."""
+        self.totals["reads"] += count
         self.cost_tracker.record_usage(
             service=ServiceType.FIRESTORE,
             operation=OperationType.READ,
@@ -43,6 +46,7 @@ class FirestoreUsageTracker:
         
     def track_write(self, count: int = 1, collection: str = "", metadata: Optional[Dict] = None):
         """Track document write operations.""" 
+        self.totals["writes"] += count
         self.cost_tracker.record_usage(
             service=ServiceType.FIRESTORE,
             operation=OperationType.WRITE,
@@ -56,6 +60,7 @@ class FirestoreUsageTracker:
         
     def track_delete(self, count: int = 1, collection: str = "", metadata: Optional[Dict] = None):
         """Track document delete operations."""
+        self.totals["deletes"] += count
         self.cost_tracker.record_usage(
             service=ServiceType.FIRESTORE,
             operation=OperationType.DELETE,
@@ -93,12 +98,17 @@ class TrackedFirestoreClient:
             collection_path
         )
         
-    @contextmanager
-    def batch(self):
-        """Create a tracked batch write context."""
-        batch = self._client.batch()
-        tracked_batch = TrackedWriteBatch(batch, self._tracker)
-        yield tracked_batch
+    def batch(self) -> 'TrackedWriteBatch':
+        """Create a tracked write batch.
+        
+        Mirrors ``Client.batch()``: the batch can be committed explicitly or
+        used as a context manager that commits on a clean exit.
+        """
+        return TrackedWriteBatch(self._client.batch(), self._tracker)
+        
+    def get_usage(self) -> Dict[str, int]:
+        """Reads, writes and deletes issued through this client so far."""
+        return dict(self._tracker.totals)
         
     def __getattr__(self, name):
         """Delegate unknown attributes to the wrapped client."""
@@ -124,14 +134,7 @@ class TrackedCollectionReference:
         
     def stream(self, **kwargs) -> Iterator['TrackedDocumentSnapshot']:
         """Stream documents with tracking."""
-        doc_count = 0
-        for doc_snapshot in self._ref.stream(**kwargs):
-            doc_count += 1
-            yield TrackedDocumentSnapshot(doc_snapshot, self._tracker, self._collection_path)
-            
-        # Track total reads after streaming
-        if doc_count > 0:
-            self._tracker.track_read(doc_count, self._collection_path, {"operation": "stream"})
+        return _tracked_stream(self._ref, self._tracker, self._collection_path, "stream", **kwargs)
             
     def add(self, document_data: dict, **kwargs) -> 'TrackedDocumentReference':
         """Add document with tracking."""
@@ -160,6 +163,20 @@ class TrackedCollectionReference:
         query = self._ref.limit(count)
         return TrackedQuery(query, self._tracker, self._collection_path)
         
+    def start_after(self, document_fields_or_snapshot) -> 'TrackedQuery':
+        """Create tracked query resuming after a cursor."""
+        query = self._ref.start_after(_unwrap_snapshot(document_fields_or_snapshot))
+        return TrackedQuery(query, self._tracker, self._collection_path)
+        
+    def select(self, field_paths) -> 'TrackedQuery':
+        """Create tracked projection query."""
+        query = self._ref.select(field_paths)
+        return TrackedQuery(query, self._tracker, self._collection_path)
+        
+    def count(self, **kwargs) -> 'TrackedAggregationQuery':
+        """Create tracked count() aggregation."""
+        return TrackedAggregationQuery(self._ref.count(**kwargs), self._tracker, self._collection_path)
+        
     def __getattr__(self, name):
         """Delegate unknown attributes to the wrapped collection reference."""
         return getattr(self._ref, name)
@@ -233,13 +250,7 @@ class TrackedQuery:
         
     def stream(self, **kwargs) -> Iterator['TrackedDocumentSnapshot']:
         """Stream query results with tracking."""
-        doc_count = 0
-        for doc_snapshot in self._query.stream(**kwargs):
-            doc_count += 1
-            yield TrackedDocumentSnapshot(doc_snapshot, self._tracker, self._collection_path)
-            
-        if doc_count > 0:
-            self._tracker.track_read(doc_count, self._collection_path, {"operation": "query_stream"})
+        return _tracked_stream(self._query, self._tracker, self._collection_path, "query_stream", **kwargs)
             
     def where(self, field_path: str, op_string: str, value: Any) -> 'TrackedQuery':
         """Chain where clause."""
@@ -256,11 +267,71 @@ class TrackedQuery:
         query = self._query.limit(count)
         return TrackedQuery(query, self._tracker, self._collection_path)
         
+    def start_after(self, document_fields_or_snapshot) -> 'TrackedQuery':
+        """Chain cursor: resume after a document snapshot or field values."""
+        query = self._query.start_after(_unwrap_snapshot(document_fields_or_snapshot))
+        return TrackedQuery(query, self._tracker, self._collection_path)
+        
+    def select(self, field_paths) -> 'TrackedQuery':
+        """Chain projection (only the given fields are transferred)."""
+        query = self._query.select(field_paths)
+        return TrackedQuery(query, self._tracker, self._collection_path)
+        
+    def count(self, **kwargs) -> 'TrackedAggregationQuery':
+        """Chain count() aggregation."""
+        return TrackedAggregationQuery(self._query.count(**kwargs), self._tracker, self._collection_path)
+        
     def __getattr__(self, name):
         """Delegate unknown attributes to the wrapped query."""
         return getattr(self._query, name)
 
 
+class TrackedAggregationQuery:
+    """count() aggregation wrapper with usage tracking.
+    
+    Firestore bills one read per batch of up to 1000 index entries counted.
+    """
+    
+    def __init__(self, aggregation_query, tracker: FirestoreUsageTracker, collection_path: str):
+        self._query = aggregation_query
+        self._tracker = tracker
+        self._collection_path = collection_path
+        
+    def get(self, **kwargs):
+        """Run the aggregation with tracking."""
+        result = self._query.get(**kwargs)
+        try:
+            counted = int(result[0][0].value)
+        except Exception:
+            counted = 0
+        self._tracker.track_read(max(1, math.ceil(counted / 1000)), self._collection_path, {"operation": "count"})
+        return result
+        
+    def __getattr__(self, name):
+        """Delegate unknown attributes to the wrapped aggregation query."""
+        return getattr(self._query, name)
+
+
+def _unwrap_snapshot(value):
+    """Pass raw snapshots to cursor methods of the wrapped query."""
+    return value._snapshot if isinstance(value, TrackedDocumentSnapshot) else value
+
+
+def _tracked_stream(source, tracker: FirestoreUsageTracker, collection_path: str,
+                    operation: str, **kwargs) -> Iterator['TrackedDocumentSnapshot']:
+    """Stream documents, tracking reads even if the caller stops early.
+    
+    Firestore bills at least one read per query, including empty results.
+    """
+    doc_count = 0
+    try:
+        for doc_snapshot in source.stream(**kwargs):
+            doc_count += 1
+            yield TrackedDocumentSnapshot(doc_snapshot, tracker, collection_path)
+    finally:
+        tracker.track_read(max(1, doc_count), collection_path, {"operation": operation})
+
+
 class TrackedQuerySnapshot:
     """Query snapshot wrapper with usage tracking."""
     
@@ -325,23 +396,35 @@ class TrackedWriteBatch:
             "collections": set()
         }
         
+    def __enter__(self) -> 'TrackedWriteBatch':
+        return self
+        
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.commit()
+            
+    @staticmethod
+    def _unwrap(reference):
+        """Pass the raw document reference through to the wrapped batch."""
+        return reference._ref if isinstance(reference, TrackedDocumentReference) else reference
+        
     def set(self, reference, document_data: dict, **kwargs):
         """Set document in batch."""
-        result = self._batch.set(reference, document_data, **kwargs)
+        result = self._batch.set(self._unwrap(reference), document_data, **kwargs)
         self._operations["writes"] += 1
         self._operations["collections"].add(self._extract_collection_path(reference))
         return result
         
     def update(self, reference, field_updates: dict, **kwargs):
         """Update document in batch."""
-        result = self._batch.update(reference, field_updates, **kwargs)
+        result = self._batch.update(self._unwrap(reference), field_updates, **kwargs)
         self._operations["writes"] += 1
         self._operations["collections"].add(self._extract_collection_path(reference))
         return result
         
     def delete(self, reference, **kwargs):
         """Delete document in batch."""
-        result = self._batch.delete(reference, **kwargs)
+        result = self._batch.delete(self._unwrap(reference), **kwargs)
         self._operations["deletes"] += 1
         self._operations["collections"].add(self._extract_collection_path(reference))
         return result
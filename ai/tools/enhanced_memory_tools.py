@@ -98,10 +98,13 @@ class SemanticSearchMemory(BaseTool):
     
     SemanticSearchMemory finds relevant memories using keyword matching,
     importance scoring, and relevance ranking. More intelligent than basic tag filtering.
+    When the store has a vector index enabled, the keywords are matched by
+    meaning (embedding similarity) instead of exact overlap.
     
     Cross-references:
         - Basic search: ai/tools/memory_tools.py#ReadMemoryContext
         - Search algorithm: ai/memory/intelligent_store.py#search_by_keywords
+        - Vector search: ai/memory/intelligent_store.py#semantic_search
         
     Examples:
         Find architecture decisions:
@@ -134,7 +137,10 @@ class SemanticSearchMemory(BaseTool):
         record_memory_operation("read")
         
         if isinstance(store, IntelligentMemoryStore):
-            results = store.search_by_keywords(self.keywords, self.limit)
+            if store.vector_index is not None:
+                results = store.semantic_search(" ".join(self.keywords), self.limit)
+            else:
+                results = store.search_by_keywords(self.keywords, self.limit)
             
             if not results:
                 return "No memories found matching keywords."
@@ -362,6 +368,7 @@ class OptimizeMemoryStore(BaseTool):
             if removed > 0:
                 return f"🧹 Memory optimized: Removed {removed} low-importance items, kept {self.max_items} most valuable memories."
             else:
-                return f"✅ Memory already optimized: {len(store._items)} items (under {self.max_items} limit)."
+                total = store.get_memory_analytics().get("total_memories", 0)
+                return f"✅ Memory already optimized: {total} items (under {self.max_items} limit)."
         else:
             return "Memory optimization requires intelligent memory store."
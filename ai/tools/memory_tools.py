@@ -86,15 +86,19 @@ class ReadMemoryContext(BaseTool):
         All context for planning:
             ReadMemoryContext(limit=50)
             
+        Fit a prompt budget:
+            ReadMemoryContext(limit=50, max_tokens=800)
+            
     Returns:
         str: Formatted context string with recent memory entries
     """
 
     limit: int = Field(default=5, description="Max number of recent items to include")
     tags: Optional[List[str]] = Field(default=None, description="Optional tags filter")
+    max_tokens: Optional[int] = Field(default=None, description="Optional token budget; whole entries beyond it are dropped")
 
     def run(self) -> str:  # type: ignore[override]
         from ai.memory.store import render_context
-        result = render_context(limit=self.limit, tags=self.tags)
+        result = render_context(limit=self.limit, tags=self.tags, max_tokens=self.max_tokens)
         record_memory_operation("read")
         return result
@@ -10,7 +10,7 @@ features for data protection, monitoring, and optimization.
 from __future__ import annotations
 import os
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from pydantic import BaseModel, Field
 
 from agency_swarm import BaseTool
@@ -20,14 +20,19 @@ from ai.memory.enhanced_firestore import EnhancedFirestoreMemoryStore
 
 class BackupMemoryStore(BaseTool):
     """
-    Backup all memories to a JSON file for data protection.
+    Backup all memories to a compressed snapshot for data protection.
     
-    Creates a complete backup of the memory store including metadata,
-    memory content, classifications, and relationships.
+    Creates a snapshot directory of compressed JSONL chunks with a checksummed
+    manifest. Pass base_path to write an incremental snapshot holding only
+    memories changed since a previous backup.
     """
     
     backup_path: str = Field(
-        description="Path where backup file should be saved (e.g., 'backup/memory-2024-01-01.json')"
+        description="Snapshot directory to create (e.g., 'backup/memory-2024-01-01')"
+    )
+    base_path: Optional[str] = Field(
+        default=None,
+        description="Previous snapshot to back up incrementally against (default: full backup)"
     )
     
     def run(self) -> str:
@@ -38,17 +43,19 @@ class BackupMemoryStore(BaseTool):
             if not isinstance(store, EnhancedFirestoreMemoryStore):
                 return "❌ Backup requires Enhanced Firestore Memory Store"
             
-            # Ensure backup directory exists
-            os.makedirs(os.path.dirname(self.backup_path), exist_ok=True)
+            if self.base_path and not os.path.exists(self.base_path):
+                return f"❌ Base snapshot not found: {self.base_path}"
             
             # Perform backup
-            backup_metadata = store.backup_memories(self.backup_path)
+            backup_metadata = store.backup_memories(self.backup_path, base_path=self.base_path)
             
             result = f"""✅ Memory Backup Complete
 
-📁 Backup File: {self.backup_path}
+📁 Snapshot: {self.backup_path}
 📊 Backup Statistics:
    • Total Memories: {backup_metadata['total_memories']}
+   • Written Memories: {backup_metadata['written_memories']} ({backup_metadata['chunks']} chunks, {backup_metadata['compression']})
+   • Base Snapshot: {backup_metadata['base'] or 'None (full backup)'}
    • Backup Timestamp: {backup_metadata['backup_timestamp']}
    • Collection: {backup_metadata['collection_name']}
    • Schema Version: {backup_metadata['schema_version']}
@@ -65,12 +72,13 @@ class RestoreMemoryStore(BaseTool):
     """
     Restore memories from a backup file.
     
-    Restores memory data from a JSON backup file, optionally clearing
-    existing memories first.
+    Restores memory data from a snapshot directory (following incremental
+    bases) or a legacy JSON backup file, optionally clearing existing
+    memories first.
     """
     
     backup_path: str = Field(
-        description="Path to backup file to restore from"
+        description="Snapshot directory or legacy JSON backup file to restore from"
     )
     clear_existing: bool = Field(
         default=False,
@@ -116,10 +124,16 @@ class SyncFirestoreMemory(BaseTool):
     """
     Synchronize local memory with Firestore backend.
     
-    Ensures consistency between local memory cache and Firestore
-    by syncing missing memories in both directions.
+    Ensures consistency between local memory cache and Firestore.
+    By default only changes since the last sync are exchanged; a full
+    reconcile syncs missing memories in both directions.
     """
     
+    full: bool = Field(
+        default=False,
+        description="Reconcile the whole collection instead of exchanging only changes"
+    )
+    
     def run(self) -> str:
         """Execute Firestore synchronization."""
         try:
@@ -129,11 +143,23 @@ class SyncFirestoreMemory(BaseTool):
                 return "❌ Sync requires Enhanced Firestore Memory Store"
             
             # Perform synchronization
-            sync_stats = store.sync_with_firestore()
+            sync_stats = store.sync_with_firestore(full=self.full)
             
             if "error" in sync_stats:
                 return f"❌ Sync failed: {sync_stats['error']}"
             
+            if sync_stats.get("mode") == "delta":
+                return f"""✅ Firestore Delta Sync Complete
+
+📊 Sync Statistics:
+   • Local Memories: {sync_stats['local_count']}
+   • Remote Changes Pulled: {sync_stats['pulled']}
+   • Applied Locally: {sync_stats['applied']}
+   • Pushed to Firestore: {sync_stats['pushed']}
+   • Conflicts Kept Local: {sync_stats['conflicts']}
+   • Failed: {sync_stats['failed']}
+   • Still Dirty: {sync_stats['dirty']}"""
+            
             result = f"""✅ Firestore Sync Complete
 
 📊 Sync Statistics:
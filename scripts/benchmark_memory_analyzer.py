@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Memory Analyzer Micro-benchmark
+
+Times memory ingest text analysis (keywords, classification, importance,
+summary) with the precompiled ContentAnalyzer against the original
+per-write implementation, and checks both produce identical results.
+
+- Synthetic memories mixing classification cues, tags and filler text
+  (seeded, reproducible)
+- Reports per-item microseconds for the legacy path, analyze() and
+  analyze_many()
+
+Usage:
+  poetry run python scripts/benchmark_memory_analyzer.py
+  poetry run python scripts/benchmark_memory_analyzer.py --items 50000 --repeat 5
+"""
+from __future__ import annotations
+import argparse
+import random
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from ai.memory.analyzer import ContentAnalyzer  # noqa: E402
+from ai.memory.intelligent_store import MemoryType  # noqa: E402
+
+TAGS = ["goal", "task", "adr", "done", "bug", "research", "auth", "db", "ui", "ops"]
+PREFIXES = ["Task:", "Goal:", "Decision:", "Progress:", "Error:", "Note:", "Learned:", ""]
+CUES = ["critical", "prefix", "designer", "statuses", "todo", "issue", "found", "milestone", "aim"]
+
+
+class LegacyAnalyzer:
+    """The IntelligentMemoryStore text analysis as it was before ContentAnalyzer."""
+
+    def _extract_keywords(self, content: str) -> List[str]:
+        """Extract relevant keywords from content."""
+        # Simple keyword extraction - can be enhanced with NLP
+        words = re.findall(r'\b\w+\b', content.lower())
+        
+        # Filter out common words and focus on meaningful terms
+        stop_words = {
+            'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+            'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have',
+            'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+            'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
+            'needs', 'after'  # Additional stop words
+        }
+        
+        keywords = [w for w in words if len(w) > 2 and w not in stop_words]
+        
+        # Return most frequent keywords (interned: the vocabulary is shared
+        # across items, and the index keys on the same string objects)
+        keyword_counts = Counter(keywords)
+        return [k for k, v in keyword_counts.most_common(10)]
+        
+    def _classify_content(self, content: str, tags: List[str]) -> MemoryType:
+        """Auto-classify memory content type."""
+        content_lower = content.lower()
+        tags_lower = [t.lower() for t in tags]
+        
+        # Goal indicators
+        if any(word in content_lower for word in ['goal', 'objective', 'mission', 'target', 'aim']):
+            return MemoryType.GOAL
+        if any(tag in tags_lower for tag in ['goal', 'objective', 'mission']):
+            return MemoryType.GOAL
+            
+        # Task indicators  
+        if any(word in content_lower for word in ['task', 'todo', 'implement', 'create', 'build', 'fix']):
+            return MemoryType.TASK
+        if any(tag in tags_lower for tag in ['task', 'todo', 'action']):
+            return MemoryType.TASK
+            
+        # Decision indicators
+        if any(word in content_lower for word in ['adr', 'decision', 'architecture', 'design']):
+            return MemoryType.DECISION  
+        if any(tag in tags_lower for tag in ['adr', 'decision', 'architecture']):
+            return MemoryType.DECISION
+            
+        # Progress indicators
+        if any(word in content_lower for word in ['completed', 'done', 'finished', 'progress', 'status']):
+            return MemoryType.PROGRESS
+        if any(tag in tags_lower for tag in ['done', 'completed', 'progress']):
+            return MemoryType.PROGRESS
+            
+        # Error indicators
+        if any(word in content_lower for word in ['error', 'failed', 'bug', 'issue', 'problem']):
+            return MemoryType.ERROR
+        if any(tag in tags_lower for tag in ['error', 'bug', 'failed']):
+            return MemoryType.ERROR
+            
+        # Knowledge indicators
+        if any(word in content_lower for word in ['learned', 'discovered', 'found', 'research']):
+            return MemoryType.KNOWLEDGE
+        if any(tag in tags_lower for tag in ['knowledge', 'research', 'learning']):
+            return MemoryType.KNOWLEDGE
+            
+        return MemoryType.CONTEXT  # Default
+        
+    def _calculate_importance(self, content: str, memory_type: MemoryType) -> float:
+        """Calculate importance score for memory item."""
+        score = 0.5  # Base score
+        
+        # Type-based scoring
+        type_scores = {
+            MemoryType.GOAL: 0.9,
+            MemoryType.DECISION: 0.8, 
+            MemoryType.ERROR: 0.7,
+            MemoryType.TASK: 0.6,
+            MemoryType.PROGRESS: 0.5,
+            MemoryType.KNOWLEDGE: 0.6,
+            MemoryType.CONTEXT: 0.4
+        }
+        score = type_scores.get(memory_type, 0.5)
+        
+        # Content-based scoring
+        high_value_words = ['critical', 'important', 'urgent', 'blocker', 'milestone']
+        if any(word in content.lower() for word in high_value_words):
+            score = max(score, 0.8)  # Ensure critical content gets high score
+            
+        # Length-based scoring (longer content often more important)
+        if len(content) > 200:
+            score += 0.1
+        elif len(content) < 50:
+            score -= 0.1
+            
+        return min(1.0, max(0.0, score))
+        
+    def _generate_summary(self, content: str) -> Optional[str]:
+        """Generate a summary for long content."""
+        if len(content) <= 100:
+            return None
+            
+        # Simple summary: first sentence or first 100 chars
+        sentences = re.split(r'[.!?]+', content)
+        if sentences and len(sentences[0]) <= 100:
+            return sentences[0].strip()
+        else:
+            return content[:97] + "..."
+
+    def analyze(self, content: str, tags: List[str], memory_type: Optional[MemoryType] = None):
+        keywords = self._extract_keywords(content)
+        if memory_type is None:
+            memory_type = self._classify_content(content, tags)
+        return (keywords, memory_type.value, self._calculate_importance(content, memory_type),
+                self._generate_summary(content))
+
+
+def make_entries(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(5_000)] + CUES
+    entries = []
+    for _ in range(count):
+        words = rng.choices(vocabulary, k=rng.randint(4, 60))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), ". Then")
+        content = f"{rng.choice(PREFIXES)} {' '.join(words)}"
+        entries.append((content, rng.sample(TAGS, k=rng.randint(0, 2))))
+    return entries
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark memory ingest text analysis")
+    parser.add_argument("--items", type=int, default=20_000, help="Number of synthetic memories")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    entries = make_entries(args.items)
+    legacy = LegacyAnalyzer()
+    analyzer = ContentAnalyzer()
+
+    expected = [legacy.analyze(content, tags) for content, tags in entries]
+    actual = [tuple(a) for a in analyzer.analyze_many((content, tags, None) for content, tags in entries)]
+    mismatches = sum(1 for e, a in zip(expected, actual) if e != a)
+    if mismatches:
+        print(f"❌ {mismatches} of {len(entries)} results differ from the legacy analyzer")
+        return 1
+
+    variants = {
+        "legacy": lambda: [legacy.analyze(content, tags) for content, tags in entries],
+        "analyze": lambda: [analyzer.analyze(content, tags) for content, tags in entries],
+        "analyze_many": lambda: analyzer.analyze_many((content, tags, None) for content, tags in entries),
+    }
+    baseline = None
+    print(f"{'variant':>14} {'us/item':>9} {'speedup':>8}")
+    for name, func in variants.items():
+        seconds = best_of(args.repeat, func)
+        baseline = baseline or seconds
+        print(f"{name:>14} {seconds / len(entries) * 1e6:>9.2f} {baseline / seconds:>7.2f}x")
+    print(f"✅ {len(entries)} results identical to the legacy analyzer")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Memory Footprint Benchmark
+
+Measures resident memory per cached memory item for the in-process stores at
+realistic cache sizes (100k and 1M items by default). Each size runs in a
+fresh interpreter so RSS numbers are not polluted by earlier runs.
+
+- Synthetic memories drawn from a fixed vocabulary (seeded, reproducible)
+- Reports RSS growth per item, ingest throughput and query latency
+- Linux reads current RSS from /proc; elsewhere peak RSS is used
+
+Usage:
+  poetry run python scripts/benchmark_memory_footprint.py
+  poetry run python scripts/benchmark_memory_footprint.py --sizes 100000 --store inmemory
+"""
+from __future__ import annotations
+import argparse
+import gc
+import json
+import random
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+TAGS = ["auth", "db", "ui", "ops", "infra", "docs", "tests", "perf"]
+PREFIXES = ["Task:", "Goal:", "Decision:", "Progress:", "Error:", "Note:"]
+
+
+def current_rss() -> int:
+    """Resident set size in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # ru_maxrss is KiB on Linux, bytes on macOS; only a peak either way
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def make_entries(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(20_000)]
+    for _ in range(count):
+        words = " ".join(rng.choices(vocabulary, k=rng.randint(6, 18)))
+        yield {"content": f"{rng.choice(PREFIXES)} {words}", "tags": rng.sample(TAGS, k=rng.randint(0, 2))}
+
+
+def measure(size: int, store_name: str, chunk: int = 10_000) -> dict:
+    if store_name == "inmemory":
+        from ai.memory.store import InMemoryMemoryStore
+        store = InMemoryMemoryStore()
+    else:
+        from ai.memory.intelligent_store import IntelligentMemoryStore
+        store = IntelligentMemoryStore()
+
+    gc.collect()
+    baseline = current_rss()
+    started = time.perf_counter()
+    entries = make_entries(size)
+    while True:
+        batch = [entry for _, entry in zip(range(chunk), entries)]
+        if not batch:
+            break
+        store.write_many(batch)
+    ingest_seconds = time.perf_counter() - started
+    gc.collect()
+    used = current_rss() - baseline
+
+    started = time.perf_counter()
+    for tag in TAGS:
+        store.query(limit=10, tags=[tag])
+    query_ms = (time.perf_counter() - started) / len(TAGS) * 1000
+
+    return {
+        "store": store_name,
+        "items": size,
+        "rss_mb": round(used / 2**20, 1),
+        "bytes_per_item": round(used / size),
+        "ingest_items_per_s": round(size / ingest_seconds),
+        "tag_query_ms": round(query_ms, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark memory store RSS per cached item")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000], help="Item counts to measure")
+    parser.add_argument("--store", choices=["intelligent", "inmemory"], default="intelligent", help="Store implementation")
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child, args.store)))
+        return 0
+
+    print(f"{'items':>10} {'RSS MB':>9} {'B/item':>8} {'ingest/s':>10} {'query ms':>9}")
+    for size in args.sizes:
+        result = subprocess.run(
+            [sys.executable, __file__, "--store", args.store, "--child", str(size)],
+            capture_output=True, text=True, check=True,
+        )
+        row = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f"{row['items']:>10} {row['rss_mb']:>9} {row['bytes_per_item']:>8} "
+              f"{row['ingest_items_per_s']:>10} {row['tag_query_ms']:>9}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
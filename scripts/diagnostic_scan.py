@@ -10,6 +10,9 @@ This script analyzes the codebase to identify potential bloat including:
 - Large binary files
 - Dead code and imports
 
+Python structure (imports, functions, classes) comes from the shared AST
+analysis cache (ai/loop/ast_analysis.py).
+
 Usage:
     python scripts/diagnostic_scan.py [--output docs/_generated/diagnostic_report.md]
 """
@@ -17,7 +20,6 @@ Usage:
 import os
 import sys
 import hashlib
-import ast
 import re
 from pathlib import Path
 from typing import Dict, List, Set, Tuple, Any
@@ -26,6 +28,11 @@ from collections import defaultdict, Counter
 import json
 import argparse
 
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from ai.loop.ast_analysis import AstAnalyzer  # noqa: E402
+
 
 @dataclass
 class FileAnalysis:
@@ -57,6 +64,7 @@ class CodebaseDiagnostic:
         self.duplicates: List[DuplicateGroup] = []
         self.unused_files: List[str] = []
         self.bloat_score = 0.0
+        self.analyzer = AstAnalyzer(repo_root)
         
         # Configuration
         self.large_file_threshold = 100 * 1024  # 100KB
@@ -107,6 +115,7 @@ class CodebaseDiagnostic:
                 if analysis:
                     self.file_analyses.append(analysis)
                 total_files += 1
+        self.analyzer.save()
         
         print(f"   📄 Analyzed {len(self.file_analyses)} files")
 
@@ -179,59 +188,52 @@ class CodebaseDiagnostic:
         issues = []
         metadata = {}
         
-        try:
-            tree = ast.parse(content)
-            
-            # Count different types of nodes
-            imports = []
-            functions = []
-            classes = []
-            
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.Import, ast.ImportFrom)):
-                    if isinstance(node, ast.Import):
-                        imports.extend([alias.name for alias in node.names])
-                    else:
-                        imports.append(node.module or 'relative_import')
-                elif isinstance(node, ast.FunctionDef):
-                    functions.append(node.name)
-                elif isinstance(node, ast.ClassDef):
-                    classes.append(node.name)
-            
-            metadata['imports'] = imports
-            metadata['functions'] = functions
-            metadata['classes'] = classes
-            metadata['import_count'] = len(imports)
-            metadata['function_count'] = len(functions)
-            metadata['class_count'] = len(classes)
-            
-            # Check for potential issues
-            if len(imports) > 20:
-                issues.append("many_imports")
-            
-            if len(functions) > 50:
-                issues.append("many_functions")
-            
-            # Check for long lines
-            long_lines = [i for i, line in enumerate(content.splitlines(), 1) 
-                         if len(line) > 120]
-            if len(long_lines) > 10:
-                issues.append("long_lines")
-                metadata['long_lines_count'] = len(long_lines)
-            
-            # Check for potential dead code (functions starting with _test or _old)
-            dead_code_patterns = [
-                r'def _test_', r'def test_.*_old', r'def _old_', r'def deprecated_',
-                r'class.*Test.*Old', r'class Old.*', r'# TODO.*remove'
-            ]
-            
-            for pattern in dead_code_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    issues.append("potential_dead_code")
-                    break
-            
-        except SyntaxError:
+        analysis = self.analyzer.analyze(file_path)
+        if analysis is None or analysis["error"]:
             issues.append("syntax_error")
+            return issues, metadata
+        
+        # Count different types of nodes
+        imports = []
+        for imported in analysis["imports"]:
+            if imported["from"]:
+                imports.append(imported["module"] or 'relative_import')
+            else:
+                imports.extend(imported["names"])
+        functions = [f["name"] for f in analysis["functions"] if not f["is_async"]]
+        classes = [c["name"] for c in analysis["classes"]]
+        
+        metadata['imports'] = imports
+        metadata['functions'] = functions
+        metadata['classes'] = classes
+        metadata['import_count'] = len(imports)
+        metadata['function_count'] = len(functions)
+        metadata['class_count'] = len(classes)
+        
+        # Check for potential issues
+        if len(imports) > 20:
+            issues.append("many_imports")
+        
+        if len(functions) > 50:
+            issues.append("many_functions")
+        
+        # Check for long lines
+        long_lines = [i for i, line in enumerate(content.splitlines(), 1) 
+                     if len(line) > 120]
+        if len(long_lines) > 10:
+            issues.append("long_lines")
+            metadata['long_lines_count'] = len(long_lines)
+        
+        # Check for potential dead code (functions starting with _test or _old)
+        dead_code_patterns = [
+            r'def _test_', r'def test_.*_old', r'def _old_', r'def deprecated_',
+            r'class.*Test.*Old', r'class Old.*', r'# TODO.*remove'
+        ]
+        
+        for pattern in dead_code_patterns:
+            if re.search(pattern, content, re.IGNORECASE):
+                issues.append("potential_dead_code")
+                break
         
         return issues, metadata
 
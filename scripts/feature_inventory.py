@@ -10,9 +10,12 @@ Implements the self-documenting loop by:
 5. Ensuring no feature bloat and proper test coverage
 
 This is a core implementation of the "Self-Documenting Loop" rule.
+
+Python files are analysed through the shared AST analysis cache
+(ai/loop/ast_analysis.py), so files unchanged since the last inventory,
+monitor scan or repository scan are not parsed again.
 """
 
-import ast
 import json
 import sys
 from pathlib import Path
@@ -24,6 +27,11 @@ import subprocess
 import re
 from datetime import datetime
 
+project_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(project_root))
+
+from ai.loop.ast_analysis import AstAnalyzer  # noqa: E402
+
 
 @dataclass
 class Feature:
@@ -73,6 +81,7 @@ class FeatureScanner:
         self.api_endpoints: Set[str] = set()
         self.test_files: Dict[str, List[str]] = {}
         self.documentation_files: Dict[str, List[str]] = {}
+        self.analyzer = AstAnalyzer(root_path)
         
     def scan_codebase(self) -> FeatureInventory:
         """Perform complete feature scan and validation."""
@@ -95,6 +104,7 @@ class FeatureScanner:
         
         # Phase 6: Generate inventory
         inventory = self._generate_inventory()
+        self.analyzer.save()
         
         print(f"✅ Feature scan complete: {len(self.features)} features analyzed")
         return inventory
@@ -124,37 +134,37 @@ class FeatureScanner:
     
     def _analyze_python_file(self, file_path: Path):
         """Analyze a Python file for features."""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-            tree = ast.parse(content)
-            relative_path = file_path.relative_to(self.root_path)
-            
-            # Look for classes and functions that represent features
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    self._analyze_class(node, str(relative_path), content)
-                elif isinstance(node, ast.FunctionDef):
-                    if not node.name.startswith('_'):  # Skip private functions
-                        self._analyze_function(node, str(relative_path), content)
-                        
-        except Exception as e:
-            print(f"⚠️  Error parsing {file_path}: {e}")
-    
-    def _analyze_class(self, node: ast.ClassDef, file_path: str, content: str):
+        analysis = self.analyzer.analyze(file_path)
+        if analysis is None:
+            print(f"⚠️  Error parsing {file_path}: cannot read file")
+            return
+        if analysis["error"]:
+            print(f"⚠️  Error parsing {file_path}: {analysis['error']['message']} (line {analysis['error']['line']})")
+            return
+        relative_path = file_path.relative_to(self.root_path)
+        
+        # Look for classes and functions that represent features, in source order
+        definitions = [("class", c) for c in analysis["classes"]] + \
+                      [("function", f) for f in analysis["functions"] if not f["is_async"]]
+        for kind, definition in sorted(definitions, key=lambda d: d[1]["line"]):
+            if kind == "class":
+                self._analyze_class(definition, str(relative_path))
+            elif not definition["name"].startswith('_'):  # Skip private functions
+                self._analyze_function(definition, str(relative_path))
+    
+    def _analyze_class(self, definition: Dict[str, Any], file_path: str):
         """Analyze a class to determine if it's a feature."""
-        class_name = node.name
+        class_name = definition["name"]
         
         # Skip test classes and private classes
         if class_name.startswith('Test') or class_name.startswith('_'):
             return
             
-        # Get docstring
-        description = ast.get_docstring(node) or f"Class {class_name}"
+        # First docstring line
+        description = definition["doc"] or f"Class {class_name}"
         
         # Determine if this is a significant feature
-        if self._is_significant_feature(class_name, description, node):
+        if self._is_significant_feature(class_name, description, "class", len(definition["methods"])):
             feature = Feature(
                 name=f"{class_name}",
                 module_path=file_path,
@@ -175,19 +185,19 @@ class FeatureScanner:
             )
             self.features.append(feature)
     
-    def _analyze_function(self, node: ast.FunctionDef, file_path: str, content: str):
+    def _analyze_function(self, definition: Dict[str, Any], file_path: str):
         """Analyze a function to determine if it's a feature."""
-        func_name = node.name
+        func_name = definition["name"]
         
         # Skip special methods and test functions
         if func_name.startswith('__') or func_name.startswith('test_'):
             return
             
-        # Get docstring
-        description = ast.get_docstring(node) or f"Function {func_name}"
+        # First docstring line
+        description = definition["doc"] or f"Function {func_name}"
         
         # Determine if this is a significant feature
-        if self._is_significant_feature(func_name, description, node):
+        if self._is_significant_feature(func_name, description, "function", definition["statements"]):
             feature = Feature(
                 name=f"{func_name}",
                 module_path=file_path,
@@ -208,8 +218,12 @@ class FeatureScanner:
             )
             self.features.append(feature)
     
-    def _is_significant_feature(self, name: str, description: str, node: ast.AST) -> bool:
-        """Determine if a class/function represents a significant feature."""
+    def _is_significant_feature(self, name: str, description: str, kind: str, size: int) -> bool:
+        """Determine if a class/function represents a significant feature.
+        
+        ``size`` is the method count of a class or the statement count of a
+        function body.
+        """
         # Skip utility functions and internal helpers
         if any(skip in name.lower() for skip in ['helper', 'util', 'internal', '_private']):
             return False
@@ -225,12 +239,11 @@ class FeatureScanner:
             return True
             
         # Check if it has substantial implementation
-        if isinstance(node, ast.ClassDef):
-            method_count = len([n for n in node.body if isinstance(n, ast.FunctionDef)])
-            return method_count >= 2
-        elif isinstance(node, ast.FunctionDef):
+        if kind == "class":
+            return size >= 2
+        elif kind == "function":
             # Check if function has substantial body
-            return len(node.body) >= 3
+            return size >= 3
             
         return False
     
@@ -254,27 +267,22 @@ class FeatureScanner:
     
     def _analyze_cli_endpoints(self, cli_file: Path):
         """Extract CLI command endpoints from the CLI module."""
-        try:
-            with open(cli_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Look for command functions and class imports
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                # Look for function definitions that start with 'cmd_'
-                if isinstance(node, ast.FunctionDef) and node.name.startswith('cmd_'):
-                    command_name = node.name.replace('cmd_', '')
-                    self.cli_endpoints.add(command_name)
-                
-                # Look for imports that might be CLI accessible
-                elif isinstance(node, ast.ImportFrom):
-                    if node.names:
-                        for alias in node.names:
-                            self.cli_endpoints.add(alias.name)
-                            
-        except Exception as e:
-            print(f"⚠️  Error analyzing CLI endpoints: {e}")
+        analysis = self.analyzer.analyze(cli_file)
+        if analysis is None or analysis["error"]:
+            error = analysis["error"]["message"] if analysis else "cannot read file"
+            print(f"⚠️  Error analyzing CLI endpoints: {error}")
+            return
+        
+        # Look for function definitions that start with 'cmd_'
+        for function in analysis["functions"]:
+            if not function["is_async"] and function["name"].startswith('cmd_'):
+                command_name = function["name"].replace('cmd_', '')
+                self.cli_endpoints.add(command_name)
+        
+        # Look for imports that might be CLI accessible
+        for imported in analysis["imports"]:
+            if imported["from"]:
+                self.cli_endpoints.update(imported["names"])
     
     def _map_test_coverage(self):
         """Map test files to features."""
@@ -296,11 +304,12 @@ class FeatureScanner:
         """Scan test directory for test files."""
         for test_file in test_dir.rglob("test_*.py"):
             try:
-                with open(test_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                analysis = self.analyzer.analyze(test_file)
+                if analysis is None:
+                    raise OSError("cannot read file")
                 
                 # Extract tested features from test file
-                tested_features = self._extract_tested_features(content, test_file.name)
+                tested_features = self._extract_tested_features(analysis, test_file.name)
                 
                 for feature_name in tested_features:
                     if feature_name not in self.test_files:
@@ -310,30 +319,22 @@ class FeatureScanner:
             except Exception as e:
                 print(f"⚠️  Error analyzing test file {test_file}: {e}")
     
-    def _extract_tested_features(self, content: str, filename: str) -> List[str]:
-        """Extract feature names that are being tested."""
+    def _extract_tested_features(self, analysis: Dict[str, Any], filename: str) -> List[str]:
+        """Extract feature names that are being tested (from the file's AST analysis)."""
         features = []
         
-        # Look for imports and class names being tested
-        try:
-            tree = ast.parse(content)
-            
-            for node in ast.walk(tree):
-                # Look for imports
-                if isinstance(node, ast.ImportFrom):
-                    if node.names:
-                        for alias in node.names:
-                            features.append(alias.name)
-                
-                # Look for test class names
-                elif isinstance(node, ast.ClassDef) and node.name.startswith('Test'):
-                    # Extract feature name from test class name
-                    feature_name = node.name.replace('Test', '')
-                    if feature_name:
-                        features.append(feature_name)
-                        
-        except:
-            pass
+        # Look for imports
+        for imported in analysis["imports"]:
+            if imported["from"]:
+                features.extend(imported["names"])
+        
+        # Look for test class names
+        for test_class in analysis["classes"]:
+            if test_class["name"].startswith('Test'):
+                # Extract feature name from test class name
+                feature_name = test_class["name"].replace('Test', '')
+                if feature_name:
+                    features.append(feature_name)
             
         # Also extract from filename
         if filename.startswith('test_'):
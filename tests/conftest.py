@@ -17,6 +17,7 @@ def pytest_collection_modifyitems(config, items):
                 item.add_marker(pytest.mark.integration)
                 break
 
+import subprocess
 import sys
 from pathlib import Path
 import pytest
@@ -54,11 +55,16 @@ def reset_global_state():
     import ai.monitor.activity
     ai.monitor.activity._activity_detector = None
     
+    # Tests install their own memory store with set_memory_store()
+    import ai.memory.store
+    original_memory_store = ai.memory.store._current_store
+    
     yield
     
     # Cleanup after test
     reset_to_system_clock()
     ai.monitor.activity._activity_detector = None
+    ai.memory.store._current_store = original_memory_store
     
     # Restore original environment variables
     if original_persist_write is not None:
@@ -88,6 +94,32 @@ def fast_forward(mock_clock):
     return _fast_forward
 
 
+def run_git(repo, *args) -> str:
+    """Run git in ``repo`` and return its stdout."""
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def git():
+    """The run_git helper, for tests working on a git_repo."""
+    return run_git
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Factory for a git repository in tmp_path with the given files committed."""
+    def _git_repo(files):
+        run_git(tmp_path, "init", "-q")
+        run_git(tmp_path, "config", "user.email", "test@example.com")
+        run_git(tmp_path, "config", "user.name", "Test User")
+        for name, content in files.items():
+            (tmp_path / name).write_text(content)
+        run_git(tmp_path, "add", ".")
+        run_git(tmp_path, "commit", "-q", "-m", "initial")
+        return tmp_path
+    return _git_repo
+
+
 @pytest.fixture
 def no_rich_live():
     """Disable Rich Live displays during tests to prevent hanging."""
@@ -0,0 +1,191 @@
+"""
+In-process fake of the Firestore client used by the memory store tests
+
+Supports what the stores use: collections, document refs, batched writes,
+where/order_by/limit/start_after queries, snapshot listeners and server
+timestamps. Every operation is recorded so tests can assert how much data
+a store actually reads and writes:
+
+- ``reads``: documents served (an empty query is billed as one read)
+- ``pages``: documents per query result, in order
+- ``queries``: the filters of every query streamed
+- ``writes``: documents written; ``commits``: document ids per batch commit
+- ``direct_sets``: ids written with ``DocumentReference.set``
+
+``gate`` (cleared: commits block) and ``fail_commits`` simulate a hanging or
+unavailable backend.
+"""
+from __future__ import annotations
+import threading
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from ai.utils.clock import now as time_now
+
+# Stands in for firestore.SERVER_TIMESTAMP
+SERVER_TIMESTAMP = object()
+
+# Patch over a store module's ``firestore`` import to hand it the sentinel
+firestore_module = SimpleNamespace(SERVER_TIMESTAMP=SERVER_TIMESTAMP)
+
+
+def server_now() -> datetime:
+    return datetime.fromtimestamp(time_now(), timezone.utc)
+
+
+class FakeSnapshot:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+        self.read_time = server_now()
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeDocumentRef:
+    def __init__(self, db, doc_id):
+        self._db = db
+        self.id = doc_id
+
+    def set(self, data):
+        self._db.direct_sets.append(self.id)
+        self._db.write(self.id, data)
+
+
+class FakeQuery:
+    """A collection or a query over it; queries are immutable, like Firestore's."""
+
+    def __init__(self, db, filters=(), order=None, limit=None, cursor=None):
+        self._db = db
+        self._filters = tuple(filters)
+        self._order = order
+        self._limit = limit
+        self._cursor = cursor
+
+    def _copy(self, **changes):
+        state = {"filters": self._filters, "order": self._order, "limit": self._limit, "cursor": self._cursor}
+        state.update(changes)
+        return FakeQuery(self._db, **state)
+
+    def document(self, doc_id):
+        return FakeDocumentRef(self._db, doc_id)
+
+    def where(self, field, op, value):
+        assert op in (">=", "<", "==", "array_contains_any"), op
+        return self._copy(filters=self._filters + ((field, op, value),))
+
+    def order_by(self, field, direction="ASCENDING"):
+        return self._copy(order=(field, direction == "DESCENDING"))
+
+    def limit(self, count):
+        return self._copy(limit=count)
+
+    def start_after(self, snapshot):
+        return self._copy(cursor=snapshot.id)
+
+    def select(self, fields):
+        return self
+
+    def on_snapshot(self, callback):
+        self._db.listeners.append(callback)
+        return FakeWatch(self._db, callback)
+
+    def _matches(self, data):
+        for field, op, value in self._filters:
+            if op == "==":
+                if data.get(field) != value:
+                    return False
+            elif op == "array_contains_any":
+                if not set(value) & set(data.get(field, [])):
+                    return False
+            elif field not in data:
+                return False
+            elif op == ">=" and not data[field] >= value:
+                return False
+            elif op == "<" and not data[field] < value:
+                return False
+        return True
+
+    def stream(self):
+        self._db.queries.append(self._filters)
+        with self._db.lock:
+            docs = sorted(self._db.docs.items())
+        docs = [(doc_id, data) for doc_id, data in docs if self._matches(data)]
+        if self._order:
+            field, descending = self._order
+            docs.sort(key=lambda kv: kv[1][field], reverse=descending)
+        if self._cursor is not None:
+            position = [doc_id for doc_id, _ in docs].index(self._cursor)
+            docs = docs[position + 1:]
+        if self._limit is not None:
+            docs = docs[:self._limit]
+        self._db.pages.append(len(docs))
+        self._db.reads += max(1, len(docs))
+        for doc_id, data in docs:
+            yield FakeSnapshot(doc_id, data)
+
+
+class FakeWatch:
+    def __init__(self, db, callback):
+        self._db = db
+        self._callback = callback
+
+    def unsubscribe(self):
+        self._db.listeners.remove(self._callback)
+
+
+class FakeChange:
+    def __init__(self, document):
+        self.type = SimpleNamespace(name="MODIFIED")
+        self.document = document
+
+
+class FakeBatch:
+    def __init__(self, db):
+        self._db = db
+        self._writes = []
+
+    def set(self, ref, data):
+        self._writes.append((ref.id, data))
+
+    def commit(self):
+        self._db.gate.wait(timeout=5)
+        if self._db.fail_commits:
+            raise RuntimeError("unavailable")
+        with self._db.lock:
+            self._db.commits.append([doc_id for doc_id, _ in self._writes])
+        for doc_id, data in self._writes:
+            self._db.write(doc_id, data)
+
+
+class FakeFirestore:
+    def __init__(self, docs=None):
+        self.docs = dict(docs or {})
+        self.reads = 0
+        self.writes = 0
+        self.pages = []
+        self.queries = []
+        self.commits = []
+        self.direct_sets = []
+        self.listeners = []
+        self.fail_commits = False
+        self.gate = threading.Event()
+        self.gate.set()
+        self.lock = threading.Lock()
+
+    def write(self, doc_id, data):
+        """Store one document, filling in server timestamps, and notify listeners."""
+        data = {k: server_now() if v is SERVER_TIMESTAMP else v for k, v in data.items()}
+        with self.lock:
+            self.writes += 1
+            self.docs[doc_id] = data
+        change = FakeChange(FakeSnapshot(doc_id, data))
+        for callback in list(self.listeners):
+            callback([], [change], None)
+
+    def collection(self, name):
+        return FakeQuery(self)
+
+    def batch(self):
+        return FakeBatch(self)
@@ -0,0 +1,153 @@
+"""Tests for the cached AST analysis layer (ai/loop/ast_analysis.py)."""
+from __future__ import annotations
+import os
+
+from ai.loop import ast_analysis
+from ai.loop.ast_analysis import AstAnalyzer, analyze_source
+
+SOURCE = '''
+import os, sys
+from . import sibling
+from ..pkg import thing as alias
+
+class Service:
+    """Runs things.
+
+    Details.
+    """
+    def run(self, items):
+        if items and self.ready or self.forced:
+            for item in items:
+                self.out.append(item)
+        elif items:
+            pass
+        else:
+            while self.pending:
+                self.step().append(1)
+        return [self.wrap(v) for v in items if v]
+
+    async def stop(self):
+        def cleanup():
+            if self.pending:
+                pass
+        return cleanup
+
+def stub():
+    """Not implemented yet."""
+    ...
+
+def handler(event):
+    try:
+        with open(event) as f:
+            if f:
+                process(f)
+    except OSError:
+        pass
+    match event:
+        case 1:
+            pass
+        case _:
+            pass
+'''
+
+
+def by_name(analysis, name):
+    return next(f for f in analysis["functions"] if f["name"] == name)
+
+
+class TestAnalyzeSource:
+    """Complexity, nesting, structure and call sites from one parse."""
+
+    def test_function_metrics(self):
+        analysis = analyze_source(SOURCE)
+        run = by_name(analysis, "run")
+        # if, and/or (2), for, elif, while, comprehension for + if
+        assert (run["qualname"], run["complexity"], run["nesting"]) == ("Service.run", 9, 2)
+        assert (run["line"], run["length"]) == (11, 10)
+        # Nested functions are measured on their own
+        assert by_name(analysis, "stop")["complexity"] == 1
+        assert by_name(analysis, "cleanup")["qualname"] == "Service.stop.cleanup"
+        assert by_name(analysis, "cleanup")["complexity"] == 2
+        handler = by_name(analysis, "handler")
+        assert (handler["complexity"], handler["nesting"]) == (5, 3)
+        assert [f["name"] for f in analysis["functions"] if f["empty"]] == ["stub"]
+
+    def test_classes_and_imports(self):
+        analysis = analyze_source(SOURCE)
+        assert analysis["classes"] == [{
+            "name": "Service", "qualname": "Service", "line": 6,
+            "methods": ["run"], "async_methods": ["stop"], "doc": "Runs things.",
+        }]
+        assert [(i["from"], i["module"], i["level"], i["names"]) for i in analysis["imports"]] == [
+            (False, None, 0, ["os", "sys"]),
+            (True, None, 1, ["sibling"]),
+            (True, "pkg", 2, ["thing"]),
+        ]
+
+    def test_call_sites_know_their_loop_and_function(self):
+        calls = [(c["name"], c["function"], c["in_loop"]) for c in analyze_source(SOURCE)["calls"]]
+        assert ("self.out.append", "Service.run", True) in calls
+        assert (".append", "Service.run", True) in calls
+        assert ("self.step", "Service.run", True) in calls
+        assert ("self.wrap", "Service.run", True) in calls
+        assert ("open", "handler", False) in calls
+        assert ("process", "handler", False) in calls
+
+    def test_syntax_errors_are_reported(self):
+        analysis = analyze_source("def broken(:\n    pass\n")
+        assert analysis["error"] == {"line": 1, "message": "invalid syntax"}
+        assert analysis["functions"] == []
+        assert analyze_source(b"x = 1\0")["error"]["line"] == 0
+
+
+class TestAstAnalyzer:
+    """Per-file-version caching shared between analyzer instances."""
+
+    def _count_parses(self, monkeypatch):
+        parsed = []
+        real = ast_analysis.analyze_source
+
+        def counting(source, rel_path="<unknown>"):
+            parsed.append(rel_path)
+            return real(source, rel_path)
+
+        monkeypatch.setattr(ast_analysis, "analyze_source", counting)
+        return parsed
+
+    def test_unchanged_files_are_not_parsed_again(self, tmp_path, monkeypatch):
+        parsed = self._count_parses(monkeypatch)
+        module = tmp_path / "pkg" / "mod.py"
+        module.parent.mkdir()
+        module.write_text("def f(x):\n    return x if x else 0\n")
+
+        first = AstAnalyzer(tmp_path)
+        assert by_name(first.analyze(module), "f")["complexity"] == 2
+        assert first.save()
+        assert (tmp_path / ".fresh" / "ast_analysis.json").exists()
+
+        # Another tool on the same repository reuses the stored analysis
+        second = AstAnalyzer(tmp_path)
+        assert second.analyze(module) == first.analyze(module)
+        # Touching the file without changing it is a hash hit
+        stat = module.stat()
+        os.utime(module, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+        second.analyze(module)
+        assert parsed == ["pkg/mod.py"]
+        assert second.cache.stats["hash_hits"] == 1
+
+        module.write_text("def f(x):\n    return x\n")
+        assert by_name(second.analyze(module), "f")["complexity"] == 1
+        assert parsed == ["pkg/mod.py", "pkg/mod.py"]
+
+    def test_save_drops_deleted_files(self, tmp_path):
+        (tmp_path / "a.py").write_text("a = 1\n")
+        (tmp_path / "b.py").write_text("b = 1\n")
+        analyzer = AstAnalyzer(tmp_path)
+        analyzer.analyze(tmp_path / "a.py")
+        analyzer.analyze(tmp_path / "b.py")
+        (tmp_path / "b.py").unlink()
+        analyzer.save()
+        assert AstAnalyzer(tmp_path).cache.paths() == ["a.py"]
+
+    def test_unreadable_file(self, tmp_path):
+        assert AstAnalyzer(tmp_path, use_cache=False).analyze(tmp_path / "missing.py") is None
@@ -0,0 +1,78 @@
+"""
+Tests for working-tree checkpoints (ai/autonomous/checkpoints.py)
+
+A rollback must bring back the state at the checkpoint, including work
+that was uncommitted then, while rewriting only the files that changed.
+"""
+from __future__ import annotations
+import pytest
+
+from ai.autonomous.checkpoints import REF_PREFIX
+from ai.autonomous.safety import SafetyController
+
+
+@pytest.fixture
+def repo(git_repo):
+    files = {name: f"# {name}\n" for name in ("edited.py", "deleted.py", "untouched.py", "staged.py")}
+    return git_repo({**files, ".gitignore": "*.log\n"})
+
+
+def test_rollback_restores_only_changed_files(repo, git):
+    # Work in progress before the checkpoint
+    (repo / "edited.py").write_text("# uncommitted edit\n")
+    (repo / "staged.py").write_text("# staged edit\n")
+    git(repo, "add", "staged.py")
+    (repo / "notes.py").write_text("# untracked\n")
+    head = git(repo, "rev-parse", "HEAD").strip()
+
+    controller = SafetyController(str(repo))
+    checkpoint = controller.create_checkpoint("before improvement")
+    # The snapshot leaves the index and working tree alone
+    assert git(repo, "diff", "--cached", "--name-only").split() == ["staged.py"]
+    assert git(repo, "status", "--porcelain", "--", "notes.py").startswith("??")
+    untouched_mtime = (repo / "untouched.py").stat().st_mtime_ns
+
+    # The improvement
+    (repo / "edited.py").write_text("# improved\n")
+    (repo / "notes.py").write_text("# rewritten\n")
+    (repo / "deleted.py").unlink()
+    (repo / "pkg" / "sub").mkdir(parents=True)
+    (repo / "pkg" / "sub" / "new.py").write_text("# new\n")
+    (repo / "debug.log").write_text("ignored output")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-q", "-m", "improvement")
+
+    assert controller.rollback_to_checkpoint(checkpoint.id)
+    assert git(repo, "rev-parse", "HEAD").strip() == head
+    assert (repo / "edited.py").read_text() == "# uncommitted edit\n"
+    assert (repo / "notes.py").read_text() == "# untracked\n"
+    assert (repo / "deleted.py").read_text() == "# deleted.py\n"
+    assert not (repo / "pkg").exists()
+    assert (repo / "debug.log").exists()
+    assert git(repo, "diff", "--cached", "--name-only").split() == ["staged.py"]
+    assert git(repo, "status", "--porcelain", "--", "notes.py").startswith("??")
+    assert (repo / "untouched.py").stat().st_mtime_ns == untouched_mtime
+    assert sorted(controller.operation_history[-1]["restored_files"]) == [
+        "deleted.py", "edited.py", "notes.py", "pkg/sub/new.py"]
+
+
+def test_checkpoints_survive_restarts(repo, git):
+    checkpoint = SafetyController(str(repo)).create_checkpoint("persisted", {"improvement": 1})
+    (repo / "edited.py").write_text("# changed later\n")
+
+    restarted = SafetyController(str(repo))
+    assert [cp.to_dict() for cp in restarted.checkpoints] == [checkpoint.to_dict()]
+    assert git(repo, "rev-parse", REF_PREFIX + checkpoint.id).strip() == checkpoint.snapshot.commit
+    assert restarted.rollback_to_checkpoint(checkpoint.id)
+    assert (repo / "edited.py").read_text() == "# edited.py\n"
+    # Our own state is not part of snapshots
+    assert (repo / ".fresh" / "checkpoints.json").exists()
+
+
+def test_oldest_checkpoints_are_dropped(repo, git):
+    controller = SafetyController(str(repo))
+    controller.config["max_checkpoints"] = 2
+    ids = [controller.create_checkpoint(f"cp {i}").id for i in range(3)]
+    assert [cp.id for cp in controller.checkpoints] == ids[1:]
+    refs = git(repo, "for-each-ref", "--format=%(refname)", REF_PREFIX).split()
+    assert sorted(refs) == sorted(REF_PREFIX + cp_id for cp_id in ids[1:])
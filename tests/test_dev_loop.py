@@ -7,7 +7,7 @@ from __future__ import annotations
 import pytest
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 import asyncio
 
 from ai.loop.dev_loop import (
@@ -48,7 +48,7 @@ class TestDevLoop:
             )
         ]
         
-        with patch.object(loop.scanner, 'scan', return_value=test_tasks):
+        with patch.object(loop.scanner, 'scan_async', new_callable=AsyncMock, return_value=test_tasks):
             with patch.object(loop.mother_agent, 'run') as mock_run:
                 mock_run.return_value = AgentResult(
                     agent_name="test",
@@ -110,7 +110,7 @@ class TestDevLoop:
         loop.processed_tasks.append(task)
         
         # Mock scanner to return the same task
-        with patch.object(loop.scanner, 'scan', return_value=[task]):
+        with patch.object(loop.scanner, 'scan_async', new_callable=AsyncMock, return_value=[task]):
             with patch.object(loop.mother_agent, 'run') as mock_run:
                 results = await loop.run_cycle()
         
@@ -144,7 +144,7 @@ class TestDevLoop:
             for i in range(5)
         ]
         
-        with patch.object(loop.scanner, 'scan', return_value=tasks):
+        with patch.object(loop.scanner, 'scan_async', new_callable=AsyncMock, return_value=tasks):
             with patch.object(loop.mother_agent, 'run') as mock_run:
                 mock_run.return_value = AgentResult(
                     agent_name="test",
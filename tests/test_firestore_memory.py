@@ -153,6 +153,33 @@ class TestFirestoreMemoryStore:
             for result in results:
                 assert "agent" in result.keywords or "agent" in result.content.lower()
     
+    def test_write_many_commits_in_batches(self):
+        """Test bulk writes commit at most 500 documents per Firestore batch."""
+        with patch('ai.memory.firestore_store.FIRESTORE_AVAILABLE', False):
+            store = FirestoreMemoryStore(max_local_cache=2000)
+        mock_client = MagicMock()
+        store._firestore_client = mock_client
+        
+        items = store.write_many({"content": f"Bulk memory {i}", "tags": ["bulk"]} for i in range(1200))
+        
+        assert len(items) == 1200
+        assert len(store._items) == 1200
+        batch = mock_client.batch.return_value
+        assert mock_client.batch.call_count == 3
+        assert batch.commit.call_count == 3
+        assert batch.set.call_count == 1200
+        mock_client.collection.return_value.document.assert_any_call(items[-1].id)
+    
+    def test_write_many_trims_cache_once(self):
+        """Test bulk writes respect the local cache limit."""
+        with patch('ai.memory.firestore_store.FIRESTORE_AVAILABLE', False):
+            store = FirestoreMemoryStore(max_local_cache=3)
+            
+            store.write_many([{"content": f"Test item {i}"} for i in range(5)])
+            
+            assert len(store._items) == 3
+            assert len(store.query(limit=10)) == 3
+    
     @pytest.mark.skipif(not FIRESTORE_AVAILABLE, reason="Firestore dependencies not available")
     def test_get_memory_stats_without_firestore(self):
         """Test memory stats when Firestore is not connected."""
@@ -0,0 +1,110 @@
+"""
+Tests for server-side filtered, cursor-paginated Firestore memory reads
+
+Uses the in-process fake Firestore (tests/firestore_fake.py), which records
+every page it serves, so tests can assert how much data each operation
+actually reads.
+"""
+from __future__ import annotations
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from ai.memory.firestore_paging import (
+    ARRAY_CONTAINS_ANY_LIMIT,
+    array_contains_any_queries,
+    count_documents,
+    paginate,
+)
+from ai.memory.firestore_store import FirestoreMemoryStore
+from ai.monitor.firestore_tracker import TrackedFirestoreClient
+from firestore_fake import FakeFirestore
+
+
+def memory_doc(i, keywords, tags=(), importance=0.5):
+    return {
+        "id": f"m{i:04d}",
+        "content": f"Memory {i} about {' '.join(keywords)}",
+        "tags": list(tags),
+        "created_at": "2025-01-01T00:00:00+00:00",
+        "memory_type": "context",
+        "keywords": list(keywords),
+        "related_ids": [],
+        "importance_score": importance,
+    }
+
+
+@pytest.fixture
+def store():
+    with patch('ai.memory.firestore_store.FIRESTORE_AVAILABLE', False):
+        store = FirestoreMemoryStore()
+    docs = {}
+    for i in range(50):
+        keywords = ["deploy"] if i % 2 else ["websocket"]
+        docs[f"m{i:04d}"] = memory_doc(i, keywords, tags=["ops"] if i % 5 == 0 else [], importance=i / 100)
+    store._firestore_client = FakeFirestore(docs)
+    return store
+
+
+def test_paginate_reads_bounded_pages():
+    db = FakeFirestore({f"d{i:03d}": {"n": i} for i in range(25)})
+    docs = list(paginate(db.collection("c"), page_size=10))
+    assert [d.id for d in docs] == sorted(db.docs)
+    assert db.pages == [10, 10, 5]
+
+    db.pages.clear()
+    assert len(list(paginate(db.collection("c"), page_size=10, max_documents=12))) == 12
+    assert db.pages == [10, 2]
+
+
+def test_array_contains_any_is_chunked():
+    db = FakeFirestore()
+    values = [f"k{i}" for i in range(ARRAY_CONTAINS_ANY_LIMIT * 2 + 1)]
+    queries = array_contains_any_queries(db.collection("c"), "keywords", values + values[:3])
+    assert [len(q._filters[0][2]) for q in queries] == [ARRAY_CONTAINS_ANY_LIMIT, ARRAY_CONTAINS_ANY_LIMIT, 1]
+
+
+def test_search_firestore_filters_server_side(store):
+    results = store.search_firestore(["Deploy"], limit=5)
+
+    assert [r.id for r in results] == ["m0049", "m0047", "m0045", "m0043", "m0041"]
+    db = store._firestore_client
+    assert db.queries == [(("keywords", "array_contains_any", ["deploy"]),)]
+    assert sum(db.pages) == 5
+
+
+def test_search_firestore_merges_chunks_and_checks_tags(store):
+    keywords = ["deploy", "websocket"] + [f"unused{i}" for i in range(ARRAY_CONTAINS_ANY_LIMIT)]
+    results = store.search_firestore(keywords, limit=4, tags=["ops"])
+    assert [r.id for r in results] == ["m0045", "m0040", "m0035", "m0030"]
+    assert all("ops" in r.tags for r in results)
+
+
+def test_iter_firestore_streams_lazily(store):
+    stream = store.iter_firestore(page_size=10)
+    first = next(stream)
+    assert first.id == "m0049"
+    assert store._firestore_client.pages == [10]
+    stream.close()
+
+
+def test_tracked_reads_count_pages_and_early_exits():
+    db = FakeFirestore({f"d{i:03d}": {"n": i} for i in range(25)})
+    with patch('ai.monitor.firestore_tracker.get_cost_tracker', return_value=MagicMock()):
+        client = TrackedFirestoreClient(db)
+
+    assert count_documents(client.collection("c")) == 25
+    reads = client.get_usage()["reads"]
+    assert reads == 25
+
+    # A page is fetched whole; later pages are never requested
+    stream = paginate(client.collection("c"), page_size=10)
+    next(stream)
+    stream.close()
+    assert client.get_usage()["reads"] == reads + 10
+
+    # Abandoned raw streams still record what they delivered
+    stream = client.collection("c").stream()
+    next(stream)
+    stream.close()
+    assert client.get_usage()["reads"] == reads + 11
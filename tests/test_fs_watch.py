@@ -0,0 +1,76 @@
+"""Tests for the change watcher (ai/loop/fs_watch.py), polling backend."""
+from __future__ import annotations
+import threading
+import time
+
+from ai.loop.file_walker import IgnoreMatcher, select_files
+from ai.loop.fs_watch import ChangeWatcher
+
+
+def make_watcher(root, **kwargs):
+    options = dict(extensions=(".py",), matcher=IgnoreMatcher(["node_modules", "*.egg-info"]),
+                   debounce=0.05, poll_interval=0.01, use_watchdog=False)
+    options.update(kwargs)
+    return ChangeWatcher(root, **options)
+
+
+def test_reports_debounced_batch_of_changes(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("a = 1\n")
+    (tmp_path / "pkg" / "gone.py").write_text("b = 1\n")
+    (tmp_path / "node_modules").mkdir()
+
+    with make_watcher(tmp_path) as watcher:
+        # Existing files are not changes
+        assert watcher.wait_for_changes(timeout=0.05) == set()
+        (tmp_path / "pkg" / "a.py").write_text("a = 2  # edited\n")
+        (tmp_path / "pkg" / "gone.py").unlink()
+        (tmp_path / "new.py").write_text("c = 1\n")
+        (tmp_path / "notes.txt").write_text("not a source file\n")
+        (tmp_path / "node_modules" / "dep.py").write_text("ignored = 1\n")
+        assert watcher.wait_for_changes(timeout=2) == {"pkg/a.py", "pkg/gone.py", "new.py"}
+        # The batch was consumed
+        assert watcher.wait_for_changes(timeout=0.05) == set()
+
+
+def test_debounce_waits_for_writes_to_settle(tmp_path):
+    target = tmp_path / "mod.py"
+    target.write_text("")
+    watcher = make_watcher(tmp_path, debounce=0.3).start()
+
+    def keep_writing():
+        for i in range(4):
+            target.write_text("x = 1\n" * (i + 1))
+            time.sleep(0.1)
+
+    writer = threading.Thread(target=keep_writing)
+    started = time.monotonic()
+    writer.start()
+    try:
+        assert watcher.wait_for_changes(timeout=3) == {"mod.py"}
+        # Not before the last write plus the quiet period
+        assert time.monotonic() - started >= 0.6
+    finally:
+        writer.join()
+        watcher.stop()
+
+
+def test_stop_event_and_stop_end_the_wait(tmp_path):
+    watcher = make_watcher(tmp_path, poll_interval=10).start()
+    stop_event = threading.Event()
+    threading.Timer(0.1, stop_event.set).start()
+    assert watcher.wait_for_changes(stop_event=stop_event) == set()
+
+    threading.Timer(0.1, watcher.stop).start()
+    started = time.monotonic()
+    assert watcher.wait_for_changes() == set()
+    assert time.monotonic() - started < 2
+
+
+def test_select_files_applies_extensions_and_name_patterns(tmp_path):
+    for rel_path in ("a.py", "b.js", "node_modules/x.py", "src/c.py"):
+        (tmp_path / rel_path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / rel_path).write_text("")
+    selected = select_files(tmp_path, ["src/c.py", "a.py", "b.js", "node_modules/x.py", "deleted.py", "a.py"],
+                            (".py",), IgnoreMatcher(["node_modules"]))
+    assert [p.relative_to(tmp_path).as_posix() for p in selected] == ["a.py", "src/c.py"]
@@ -0,0 +1,141 @@
+"""
+Tests for cached health probes (ai/autonomous/health.py)
+
+Results are reused within a probe's ttl, then for as long as the
+repository state (HEAD, index, working tree) is unchanged, and across
+processes through the persisted cache.
+"""
+from __future__ import annotations
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from ai.autonomous.health import HealthProbe, HealthProbes, find_git_dir, read_head
+from ai.autonomous.safety import SafetyController
+
+
+@pytest.fixture
+def repo(git_repo):
+    return git_repo({"app.py": "x = 1\n"})
+
+
+def counting_probe(name, ttl, keyed=False):
+    runs = []
+
+    def check():
+        runs.append(1)
+        return len(runs)
+
+    return HealthProbe(name, check, ttl, keyed), runs
+
+
+def test_ttl_serves_cached_result(repo):
+    probes = HealthProbes(repo, persist=False)
+    probe, runs = counting_probe("disk", ttl=60)
+    probes.register(probe)
+    assert [probes.get("disk"), probes.get("disk")] == [1, 1]
+    assert len(runs) == 1
+    probes.invalidate("disk")
+    assert probes.get("disk") == 2
+
+
+def test_keyed_probe_reruns_only_when_the_repository_changes(repo, git):
+    probes = HealthProbes(repo, persist=False)
+    probe, runs = counting_probe("tests", ttl=0, keyed=True)
+    probes.register(probe)
+    probes.get("tests")
+    probes.get("tests")
+    assert len(runs) == 1
+
+    # Working tree edit
+    (repo / "app.py").write_text("x = 2  # changed\n")
+    probes.get("tests")
+    assert len(runs) == 2
+    # Staging it changes the index
+    git(repo, "add", "app.py")
+    probes.get("tests")
+    assert len(runs) == 3
+    # Committing moves HEAD
+    git(repo, "commit", "-q", "-m", "change")
+    probes.get("tests")
+    assert len(runs) == 4
+    # Ignored files (and our own cache directory) do not count
+    (repo / ".gitignore").write_text("*.log\n")
+    probes.get("tests")
+    (repo / "debug.log").write_text("noise")
+    (repo / ".fresh").mkdir()
+    (repo / ".fresh" / "cache.json").write_text("{}")
+    probes.get("tests")
+    assert len(runs) == 5
+
+
+def test_tree_state_does_not_fork_git(repo, git):
+    probes = HealthProbes(repo, persist=False)
+    with patch("subprocess.run", side_effect=AssertionError("forked")), \
+         patch("subprocess.Popen", side_effect=AssertionError("forked")):
+        state = probes.tree_state()
+    assert state == probes.tree_state()
+    head = git(repo, "rev-parse", "HEAD").strip()
+    assert read_head(find_git_dir(repo / "sub" / "dir")) == head
+
+
+def test_results_are_shared_across_processes(repo):
+    first = HealthProbes(repo)
+    probe, runs = counting_probe("clean", ttl=0, keyed=True)
+    first.register(probe)
+    first.get("clean")
+    assert (repo / ".fresh" / "health_probes.json").exists()
+
+    second = HealthProbes(repo)
+    second.register(probe)
+    assert second.get("clean") == 1
+    assert len(runs) == 1
+
+
+def test_collect_async_runs_stale_probes_concurrently(repo):
+    probes = HealthProbes(repo, persist=False)
+    for name in ("a", "b", "c"):
+        probes.register(HealthProbe(name, lambda name=name: name.upper(), ttl=60))
+    assert asyncio.run(probes.collect_async()) == {"a": "A", "b": "B", "c": "C"}
+    assert probes.collect(["c", "a"]) == {"c": "C", "a": "A"}
+    assert probes.stats == {"runs": 3, "hits": 2}
+
+
+def test_health_polls_do_not_fork_git_while_unchanged(repo, git):
+    (repo / ".gitignore").write_text(".fresh/\n")
+    git(repo, "add", ".gitignore")
+    git(repo, "commit", "-q", "-m", "ignore caches")
+    controller = SafetyController(str(repo))
+    health = controller.monitor_health()
+    assert health["repository_clean"] is True
+    assert set(health["probe_age"]) == {"repository_clean", "disk_space", "memory_usage"}
+
+    with patch("subprocess.run", side_effect=AssertionError("forked")):
+        controller.health.get("repository_clean")
+        # A new controller (e.g. the next `fresh autonomous status`) reuses it too
+        assert SafetyController(str(repo)).monitor_health()["repository_clean"] is True
+        # Validation reuses the cached test result while nothing changed
+        controller.health._results["tests"] = {"value": True, "checked_at": 0.0,
+                                               "key": controller.health.tree_state()}
+        assert controller._run_tests() is True
+
+    (repo / "app.py").write_text("x = 3\n")
+    controller.health.invalidate("repository_clean")
+    assert controller.monitor_health()["repository_clean"] is False
+
+
+def test_validation_sees_an_edit_made_right_after_a_poll(repo, git):
+    (repo / ".gitignore").write_text(".fresh/\n")
+    git(repo, "add", ".gitignore")
+    git(repo, "commit", "-q", "-m", "ignore caches")
+    controller = SafetyController(str(repo))
+    assert controller.monitor_health()["repository_clean"] is True
+
+    (repo / "app.py").write_text("x = 'edited within the ttl'\n")
+    # Polls may serve the cached result within the ttl, validation may not
+    assert controller.monitor_health()["repository_clean"] is True
+    assert controller._is_repository_clean() is False
+    with patch("subprocess.run", side_effect=AssertionError("forked")):
+        # Unchanged since: the keyed result is reused without forking git
+        assert controller._is_repository_clean() is False
@@ -131,6 +131,41 @@ class TestIntelligentMemoryStore:
         assert len(item3.related_ids) >= 1  # Should find item1 (shared "system", "architecture")
         assert len(item4.related_ids) == 0  # Should not find unrelated memories
         
+    def test_related_links_update_in_place(self):
+        """Relationships are linked on the stored objects without copies."""
+        store = IntelligentMemoryStore()
+        
+        first = store.write(content="Cache eviction policy", tags=[])
+        for i in range(7):
+            store.write(content=f"Cache note {i}", tags=[])
+        latest = store.write(content="Cache warmup", tags=[])
+        
+        # Earliest five items sharing a keyword are linked, both ways
+        assert latest.related_ids == [f"mem-{n:04d}" for n in range(1, 6)]
+        assert store.get_by_id(first.id) is first
+        assert latest.id in first.related_ids
+        assert store.get_by_id("mem-9999") is None
+        
+    def test_write_many_matches_sequential_writes(self):
+        """Batched ingest produces the same items and links as write()."""
+        entries = [
+            {"content": "Goal: ship memory index", "tags": ["goal"]},
+            {"content": "Task: build memory index", "tags": ["task"]},
+            {"content": "Memory index benchmark", "memory_type": MemoryType.KNOWLEDGE, "metadata": {"source": "bench"}},
+        ]
+        sequential = IntelligentMemoryStore()
+        expected = [sequential.write(**entry) for entry in entries]
+        
+        batched = IntelligentMemoryStore()
+        items = batched.write_many(entries)
+        
+        assert [i.id for i in items] == [i.id for i in expected]
+        assert [i.memory_type for i in items] == [i.memory_type for i in expected]
+        assert [i.related_ids for i in items] == [i.related_ids for i in expected]
+        assert items[2].metadata == {"source": "bench"}
+        assert [i.id for i in batched.query(limit=10, keywords=["index"])] == \
+            [i.id for i in sequential.query(limit=10, keywords=["index"])]
+        
     def test_semantic_search(self):
         """Test keyword-based semantic search."""
         store = IntelligentMemoryStore()
@@ -217,6 +252,60 @@ class TestIntelligentMemoryStore:
         assert "agent" in analytics["top_keywords"]
         
 
+class TestMemoryQueryEngine:
+    """Test posting-list query planning and top-k selection."""
+    
+    def test_query_combines_filters(self):
+        """Filters are any-of within a dimension and all-of across dimensions."""
+        store = IntelligentMemoryStore()
+        store.write(content="Goal: ship memory index", tags=["memory"])
+        store.write(content="Goal: ship dashboard", tags=["ui"])
+        store.write(content="Task: build memory index", tags=["memory"])
+        store.write(content="Task: index cleanup", tags=["ops"])
+        
+        results = store.query(limit=10, tags=["memory", "ops"], keywords=["INDEX"], memory_type=MemoryType.TASK)
+        assert sorted(r.content for r in results) == ["Task: build memory index", "Task: index cleanup"]
+        
+        assert store.query(limit=10, tags=["missing"]) == []
+        assert store.query(limit=10, keywords=["index"], memory_type=MemoryType.ERROR) == []
+        
+    def test_query_orders_by_importance_then_recency(self, mock_clock, fast_forward):
+        """Top-k selection matches a full sort by importance and recency."""
+        store = IntelligentMemoryStore()
+        older = store.write(content="Note about cache", tags=[])
+        fast_forward(1)
+        critical = store.write(content="Critical: cache corruption", tags=[])
+        fast_forward(1)
+        newer = store.write(content="Note about cache", tags=[])
+        
+        results = store.query(limit=3, keywords=["cache"])
+        assert [r.id for r in results] == [critical.id, newer.id, older.id]
+        assert [r.id for r in store.query(limit=1)] == [critical.id]
+        
+    def test_search_ranks_by_overlap(self):
+        """Items matching more query keywords rank higher at equal importance."""
+        store = IntelligentMemoryStore()
+        one = store.write(content="Note about alpha", tags=[])
+        both = store.write(content="Note about alpha beta", tags=[])
+        store.write(content="Note about gamma", tags=[])
+        
+        results = store.search_by_keywords(["alpha", "beta"], limit=10)
+        assert [r.id for r in results] == [both.id, one.id]
+        
+    def test_index_follows_optimization(self):
+        """Evicted items disappear from keyword and type postings."""
+        store = IntelligentMemoryStore()
+        for i in range(10):
+            store.write(content=f"Memory item {i}", tags=["bulk"])
+        store.write(content="Goal: keep this one around", tags=["bulk"])
+        
+        store.optimize_memory(max_items=1)
+        
+        assert [r.content for r in store.query(limit=10, tags=["bulk"])] == ["Goal: keep this one around"]
+        assert store.search_by_keywords(["memory"], limit=10) == []
+        assert store.search_by_type(MemoryType.CONTEXT, limit=10) == []
+        
+
 class TestEnhancedMemoryTools:
     """Test enhanced memory tools."""
     
@@ -0,0 +1,124 @@
+"""
+Tests for running memory analytics aggregates
+
+Aggregates maintained on write and eviction must agree with a full
+recomputation over the store's items.
+"""
+from __future__ import annotations
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+
+from ai.memory.analytics import MemoryAggregates
+from ai.memory.intelligent_store import IntelligentMemoryStore
+from ai.utils.clock import MockClock, reset_to_system_clock, set_clock
+
+
+@pytest.fixture
+def clock():
+    clock = MockClock(start_time=100_000.0)
+    set_clock(clock)
+    yield clock
+    reset_to_system_clock()
+
+
+def recompute(store):
+    items = store._items
+    keywords = Counter()
+    for item in items:
+        keywords.update(item.keywords)
+    return {
+        "total_memories": len(items),
+        "type_distribution": dict(Counter(item.memory_type for item in items)),
+        "average_importance": pytest.approx(sum(i.importance_score for i in items) / len(items)),
+        "top_keywords": dict(keywords.most_common(10)),
+    }
+
+
+def test_aggregates_track_writes_and_evictions(clock):
+    store = IntelligentMemoryStore()
+    topics = ["database", "deploy", "agent", "cache", "router"]
+    for i in range(60):
+        store.write(content=f"Task: fix {topics[i % 5]} issue {i} in {topics[i % 3]} module",
+                    tags=[topics[i % 2]])
+        clock.advance(30)
+
+    analytics = store.get_memory_analytics()
+    expected = recompute(store)
+    assert {k: analytics[k] for k in expected} == expected
+
+    store.optimize_memory(max_items=25)
+    analytics = store.get_memory_analytics()
+    assert analytics["total_memories"] == 25
+    assert analytics["type_distribution"] == recompute(store)["type_distribution"]
+    assert analytics["top_keywords"] == recompute(store)["top_keywords"]
+
+    store.optimize_memory(max_items=0)
+    assert store.get_memory_analytics() == {"total_memories": 0}
+
+
+def test_reindexing_an_item_is_not_double_counted():
+    store = IntelligentMemoryStore()
+    item = store.write(content="Goal: ship analytics")
+    store._upsert_item(item)
+    store._rebuild_indexes()
+    assert store.get_memory_analytics()["total_memories"] == 1
+
+
+def test_top_keywords_break_ties_by_first_seen():
+    aggregates = MemoryAggregates(top_k=2)
+
+    class Item:
+        def __init__(self, keywords):
+            self.keywords = keywords
+            self.memory_type = "context"
+            self.importance_score = 0.5
+            self.created_at = datetime.now(timezone.utc)
+
+    first, second = Item(["alpha", "beta"]), Item(["gamma", "gamma2"])
+    aggregates.add(first)
+    aggregates.add(second)
+    assert list(aggregates.top_keywords()) == ["alpha", "beta"]
+
+    aggregates.add(Item(["gamma"]))
+    assert aggregates.top_keywords() == {"gamma": 2, "alpha": 1}
+
+    aggregates.remove(first)
+    assert aggregates.top_keywords() == {"gamma": 2, "gamma2": 1}
+
+
+def test_recent_activity_slides_with_time(clock):
+    store = IntelligentMemoryStore()
+    store.write(content="Progress: old entry")
+    clock.advance(1800)
+    store.write(content="Progress: newer entry")
+    assert store.get_memory_analytics()["recent_activity"] == 2
+
+    clock.advance(1900)
+    assert store.get_memory_analytics()["recent_activity"] == 1
+    assert store._stats.activity(24 * 3600) == 2
+
+
+def test_activity_window_is_exact(clock):
+    clock.advance(30)  # windows start mid-bucket
+    aggregates = MemoryAggregates()
+
+    class Item:
+        keywords = []
+        memory_type = "context"
+        importance_score = 0.5
+
+        def __init__(self, created):
+            self.created_at = datetime.fromtimestamp(created, timezone.utc)
+
+    items = [Item(clock.now() - age) for age in range(0, 3650, 10)]
+    for item in items:
+        aggregates.add(item)
+    assert aggregates.activity(3600) == 360
+    assert aggregates.activity(95) == 10
+
+    aggregates.remove(items[-1])
+    aggregates.remove(items[0])
+    assert aggregates.activity(3600) == 359
+    assert aggregates.activity(24 * 3600) == 363
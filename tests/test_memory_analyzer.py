@@ -0,0 +1,114 @@
+"""
+Tests for the single-pass memory content analyzer
+
+The analyzer must reproduce the original IntelligentMemoryStore heuristics
+exactly; the reference implementation below is the pre-analyzer code.
+"""
+from __future__ import annotations
+import random
+import re
+from collections import Counter
+
+import pytest
+
+from ai.memory import analyzer as analyzer_module
+from ai.memory.analyzer import ContentAnalyzer, CueMatcher
+from ai.memory.intelligent_store import IntelligentMemoryStore
+
+STOP_WORDS = {
+    'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
+    'of', 'with', 'by', 'is', 'was', 'are', 'were', 'be', 'been', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'this', 'that', 'these', 'those', 'i', 'you', 'he', 'she', 'it', 'we', 'they',
+    'needs', 'after',
+}
+RULES = [
+    ("goal", ['goal', 'objective', 'mission', 'target', 'aim'], ['goal', 'objective', 'mission']),
+    ("task", ['task', 'todo', 'implement', 'create', 'build', 'fix'], ['task', 'todo', 'action']),
+    ("decision", ['adr', 'decision', 'architecture', 'design'], ['adr', 'decision', 'architecture']),
+    ("progress", ['completed', 'done', 'finished', 'progress', 'status'], ['done', 'completed', 'progress']),
+    ("error", ['error', 'failed', 'bug', 'issue', 'problem'], ['error', 'bug', 'failed']),
+    ("knowledge", ['learned', 'discovered', 'found', 'research'], ['knowledge', 'research', 'learning']),
+]
+SCORES = {"goal": 0.9, "decision": 0.8, "error": 0.7, "task": 0.6, "progress": 0.5, "knowledge": 0.6, "context": 0.4}
+
+
+def reference(content, tags):
+    words = re.findall(r'\b\w+\b', content.lower())
+    counts = Counter(w for w in words if len(w) > 2 and w not in STOP_WORDS)
+    keywords = [k for k, _ in counts.most_common(10)]
+
+    lowered, tags_lower = content.lower(), [t.lower() for t in tags]
+    memory_type = "context"
+    for name, content_cues, tag_cues in RULES:
+        if any(w in lowered for w in content_cues) or any(t in tags_lower for t in tag_cues):
+            memory_type = name
+            break
+
+    score = SCORES[memory_type]
+    if any(w in lowered for w in ['critical', 'important', 'urgent', 'blocker', 'milestone']):
+        score = max(score, 0.8)
+    if len(content) > 200:
+        score += 0.1
+    elif len(content) < 50:
+        score -= 0.1
+    score = min(1.0, max(0.0, score))
+
+    summary = None
+    if len(content) > 100:
+        sentences = re.split(r'[.!?]+', content)
+        summary = sentences[0].strip() if len(sentences[0]) <= 100 else content[:97] + "..."
+    return keywords, memory_type, score, summary
+
+
+TRICKY = [
+    ("Prefix handling in the parser", []),          # 'fix' inside a word
+    ("We must CLAIM the Designer role", []),        # 'aim', 'design' inside words
+    ("Statuses: all Done!", ["Misc"]),
+    ("plain note", ["TODO"]),                       # tag match is case-insensitive
+    ("Critical blocker: the the the database is down. Restart it now please, before anything else happens today " * 2, []),
+    ("Ünïcode wörds and émojis 🚀 with büg reports", ["learning"]),
+    ("", []),
+    ("a" * 150, []),
+]
+
+
+@pytest.mark.parametrize("content,tags", TRICKY)
+def test_matches_reference_on_tricky_inputs(content, tags):
+    result = ContentAnalyzer().analyze(content, tags)
+    assert tuple(result) == reference(content, tags)
+
+
+def test_matches_reference_on_random_corpus():
+    rng = random.Random(7)
+    cues = [w for _, c, t in RULES for w in c + t] + ["prefix", "claims", "urgently", "xtaskx", "the"]
+    vocabulary = cues + [f"word{i}" for i in range(200)]
+    analyzer = ContentAnalyzer()
+    for _ in range(500):
+        words = rng.choices(vocabulary, k=rng.randint(0, 40))
+        content = rng.choice(["", "Task: ", "NOTE "]) + " ".join(w.upper() if rng.random() < 0.2 else w for w in words)
+        tags = rng.sample(["goal", "TASK", "adr", "ui", "learning"], k=rng.randint(0, 2))
+        assert tuple(analyzer.analyze(content, tags)) == reference(content, tags)
+
+
+def test_results_survive_token_memo_reset(monkeypatch):
+    monkeypatch.setattr(analyzer_module, "_TOKEN_CACHE_SIZE", 3)
+    analyzer = ContentAnalyzer()
+    for content in ["Fix the critical build", "Research goal milestone", "Fix the critical build again"]:
+        assert tuple(analyzer.analyze(content, [])) == reference(content, [])
+
+
+def test_cue_matcher_reports_overlapping_prefixes():
+    matcher = CueMatcher({"short": ["do"], "long": ["done"], "other": ["one"]})
+    assert matcher.match("undone") == {"short", "long", "other"}
+    assert matcher.match("doe") == {"short"}
+    assert matcher.match("nothing") == set()
+
+
+def test_write_many_matches_single_writes():
+    entries = [{"content": content, "tags": tags} for content, tags in TRICKY]
+    single, batch = IntelligentMemoryStore(), IntelligentMemoryStore()
+    expected = [single.write(**entry) for entry in entries]
+    actual = batch.write_many(entries)
+    fields = ("keywords", "memory_type", "importance_score", "summary")
+    assert [[getattr(i, f) for f in fields] for i in actual] == [[getattr(i, f) for f in fields] for i in expected]
@@ -0,0 +1,238 @@
+"""
+Tests for watermark-based delta sync between memory replicas and Firestore
+
+Two FirestoreMemoryStore replicas share the in-process fake Firestore
+(tests/firestore_fake.py), which counts document reads and writes, so tests
+can check that a sync only moves changed documents.
+"""
+from __future__ import annotations
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+
+from ai.memory.delta_sync import PULL_OVERLAP_SECONDS, SYNC_FIELD, SyncState, remote_wins, to_epoch
+from ai.memory.firestore_store import FirestoreMemoryStore
+from ai.utils.clock import MockClock, reset_to_system_clock, set_clock
+from firestore_fake import FakeFirestore, firestore_module
+
+@pytest.fixture
+def clock():
+    clock = MockClock(start_time=1_000.0)
+    set_clock(clock)
+    yield clock
+    reset_to_system_clock()
+
+
+@pytest.fixture
+def db():
+    return FakeFirestore()
+
+
+def make_replica(db, tmp_path, name, **kwargs):
+    with patch('ai.memory.firestore_store.FIRESTORE_AVAILABLE', False):
+        store = FirestoreMemoryStore(max_local_cache=1000, **kwargs)
+    store._firestore_client = db
+    with patch('ai.memory.firestore_store.firestore', firestore_module):
+        store.enable_delta_sync(str(tmp_path / f"{name}.json"))
+    return store
+
+
+def test_sync_moves_only_changes(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a", sync_on_write=False)
+    b = make_replica(db, tmp_path, "b")
+    a.write_many({"content": f"Task: item {i}"} for i in range(200))
+
+    clock.advance(1)
+    assert a.force_sync()["pushed"] == 200
+    assert db.writes == 200
+
+    clock.advance(1)
+    result = b.force_sync()
+    assert result["applied"] == 200
+    assert len(b._items) == 200
+
+    # Nothing changed: the overlap window is re-read but nothing is re-applied
+    db.writes = 0
+    result = b.force_sync()
+    assert (result["pulled"], result["pushed"], db.writes) == (0, 0, 0)
+
+    # Once the window has passed, an idle pull reads nothing
+    clock.advance(PULL_OVERLAP_SECONDS + 1)
+    b.force_sync()
+    db.reads = 0
+    assert b.force_sync()["pulled"] == 0
+    assert db.reads == 1  # an empty query is billed as one read
+
+    clock.advance(1)
+    a.write(content="Decision: ship delta sync")
+    clock.advance(1)
+    a.force_sync()
+    db.reads = 0
+    result = b.force_sync()
+    assert result["applied"] == 1
+    assert db.reads == 1
+
+
+def test_sync_on_write_items_are_clean(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a")
+    a.write(content="Note: pushed immediately")
+    assert a._delta.state.dirty == {}
+    doc = next(iter(db.docs.values()))
+    assert doc["origin"] == a._delta.state.replica_id
+    assert doc["updated_at"] == 1_000.0
+    assert to_epoch(doc[SYNC_FIELD]) == 1_000.0
+
+
+def test_conflicts_resolve_to_newest_version(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a")
+    b = make_replica(db, tmp_path, "b", sync_on_write=False)
+    item = a.write(content="Goal: original wording")
+    clock.advance(1)
+    b.force_sync()
+
+    # b edits later than a's write, without pushing yet
+    clock.advance(5)
+    edited = b._index.get(item.id)
+    edited.content = "Goal: edited on b"
+    b._delta.mark_dirty(item.id)
+
+    clock.advance(1)
+    result = b.force_sync()
+    assert result["conflicts"] == 0 and result["pushed"] == 1
+    a.force_sync()
+    assert a._index.get(item.id).content == "Goal: edited on b"
+
+
+def test_clean_items_keep_their_version(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a")
+    b = make_replica(db, tmp_path, "b")
+    item = a.write(content="Goal: original wording")
+    clock.advance(1)
+    b.force_sync()
+
+    clock.advance(5)
+    b._index.get(item.id).content = "Goal: edited on b"
+    b._delta.mark_dirty(item.id)
+    b.force_sync()
+
+    # Re-serializing a's unchanged copy does not make it newer than b's edit
+    clock.advance(5)
+    data = a._memory_item_to_dict(a._index.get(item.id))
+    assert (data["updated_at"], data["origin"]) == (1_000.0, a._delta.state.replica_id)
+    a._sync_to_firestore(a._index.get(item.id))
+    clock.advance(1)
+    assert b.force_sync()["applied"] == 0
+    assert b._index.get(item.id).content == "Goal: edited on b"
+
+
+def test_concurrent_edits_converge(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a", sync_on_write=False)
+    b = make_replica(db, tmp_path, "b", sync_on_write=False)
+    item = a.write(content="Goal: original wording")
+    a.force_sync()
+    clock.advance(1)
+    b.force_sync()
+
+    clock.advance(1)
+    b._index.get(item.id).content = "Goal: older edit on b"
+    b._delta.mark_dirty(item.id)
+    clock.advance(1)
+    a._index.get(item.id).content = "Goal: newer edit on a"
+    a._delta.mark_dirty(item.id)
+
+    # b pushes first; a's newer local edit survives the conflict and wins
+    b.force_sync()
+    assert a.force_sync()["conflicts"] == 1
+    result = b.force_sync()
+    assert result["applied"] == 1 and result["pushed"] == 0
+    assert a._index.get(item.id).content == b._index.get(item.id).content == "Goal: newer edit on a"
+
+
+def test_snapshot_listener_replaces_polling(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a")
+    b = make_replica(db, tmp_path, "b")
+    assert b._delta.listen()
+
+    a.write(content="Task: delivered by listener")
+    db.reads = 0
+    result = b.force_sync()
+    assert result["applied"] == 1
+    assert db.reads == 0
+    assert b.search_by_keywords(["listener"])
+
+    b.close()
+    assert db.listeners == []
+
+
+def test_writes_stamped_below_the_cursor_are_pulled(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a", sync_on_write=False)
+    b = make_replica(db, tmp_path, "b")
+    clock.advance(PULL_OVERLAP_SECONDS * 2)
+    a.write(content="Note: moves the cursor forward")
+    a.force_sync()
+    b.force_sync()
+
+    # a's clock lags far behind: its edit is stamped below b's cursor
+    item = a.write(content="Task: written with a lagging clock")
+    a._delta.state.dirty[item.id] = 1.0
+    clock.advance(1)
+    a.force_sync()
+    assert db.docs[item.id]["updated_at"] < b._delta.state.cursor
+
+    # The commit time still sorts above the cursor
+    result = b.force_sync()
+    assert result["applied"] == 1
+    assert b._index.get(item.id).content == "Task: written with a lagging clock"
+
+
+def test_late_commits_inside_the_overlap_are_pulled_once(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a", sync_on_write=False)
+    b = make_replica(db, tmp_path, "b")
+    clock.advance(PULL_OVERLAP_SECONDS * 2)
+    a.write(content="Note: moves the cursor forward")
+    a.force_sync()
+    b.force_sync()
+    pulled_at = b._delta.state.cursor + PULL_OVERLAP_SECONDS
+
+    # Committed just before b's pull, but only visible after it
+    item = a.write(content="Task: committed before the pull")
+    data = a._memory_item_to_dict(item)
+    data[SYNC_FIELD] = datetime.fromtimestamp(pulled_at - 1, timezone.utc)
+    db.docs[item.id] = data
+
+    clock.advance(1)
+    assert b.force_sync()["applied"] == 1
+    # Re-read from the overlap window, but not applied again
+    result = b.force_sync()
+    assert (result["pulled"], result["applied"]) == (0, 0)
+    assert b._index.get(item.id).content == "Task: committed before the pull"
+
+
+def test_ties_break_on_replica_id():
+    assert remote_wins((10.0, "a"), (10.0, "b"))
+    assert not remote_wins((10.0, "b"), (10.0, "a"))
+    assert not remote_wins((11.0, "a"), (10.0, "z"))
+
+
+def test_state_persists_watermark_and_dirty_items(db, tmp_path, clock):
+    a = make_replica(db, tmp_path, "a", sync_on_write=False)
+    item = a.write(content="Progress: half done")
+    a.close()
+
+    state = SyncState(tmp_path / "a.json")
+    assert state.replica_id == a._delta.state.replica_id
+    assert item.id in state.dirty
+    assert state.cursor == a._delta.state.cursor
+
+
+def test_evicted_dirty_items_are_pushed_first(db, tmp_path, clock):
+    with patch('ai.memory.firestore_store.FIRESTORE_AVAILABLE', False):
+        store = FirestoreMemoryStore(max_local_cache=2, sync_on_write=False)
+    store._firestore_client = db
+    store.enable_delta_sync(str(tmp_path / "small.json"))
+    for i in range(4):
+        store.write(content=f"Note: memory {i}")
+    assert len(store._items) == 2
+    assert len(db.docs) == 2
+    assert set(store._delta.state.dirty) == {item.id for item in store._items}
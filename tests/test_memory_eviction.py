@@ -0,0 +1,94 @@
+"""
+Tests for memory cache eviction policies
+"""
+from __future__ import annotations
+import random
+from unittest.mock import patch
+
+import pytest
+
+from ai.memory.eviction import LFUPolicy, LRUPolicy, TTLPolicy, create_eviction_policy
+from ai.memory.firestore_store import FirestoreMemoryStore
+from ai.memory.intelligent_store import IntelligentMemoryStore
+
+
+def make_cache(max_local_cache: int, policy) -> FirestoreMemoryStore:
+    with patch('ai.memory.firestore_store.FIRESTORE_AVAILABLE', False):
+        return FirestoreMemoryStore(max_local_cache=max_local_cache, eviction_policy=policy)
+
+
+def test_importance_policy_matches_sorted_trim(mock_clock, fast_forward):
+    rng = random.Random(7)
+    words = ["goal", "critical", "task", "error", "note", "design", "done"]
+    store = IntelligentMemoryStore()
+    for i in range(300):
+        store.write(content=" ".join(rng.choices(words, k=3)) + f" item {i}")
+        if rng.random() < 0.5:
+            fast_forward(1)
+    # Reference: the stable sort the stores used before eviction policies
+    expected = sorted(store._items, key=lambda i: (i.importance_score, i.created_at.timestamp()), reverse=True)[:50]
+
+    assert store.optimize_memory(max_items=50) == 250
+    assert {item.id for item in store._items} == {item.id for item in expected}
+    # Survivors keep write order and stay fully indexed
+    assert [item.id for item in store._items] == sorted(item.id for item in store._items)
+    assert len(store.query(limit=100)) == 50
+    assert store.get_cache_stats()["evictions"] == 250
+
+
+def test_lru_cache_keeps_recently_used_items():
+    store = make_cache(3, "lru")
+    first = store.write(content="First memory about caching")
+    store.write(content="Second memory about caching")
+    store.write(content="Third memory about caching")
+
+    assert store.get_by_id(first.id) is first  # refresh first
+    store.write(content="Fourth memory about caching")
+
+    contents = {item.content for item in store._items}
+    assert "First memory about caching" in contents
+    assert "Second memory about caching" not in contents
+    assert store.get_by_id("mem-0002") is None
+    assert [r.id for r in store.search_by_keywords(["second"])] == []
+
+    stats = store.get_memory_stats()["cache"]
+    assert stats["policy"] == "lru"
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+
+
+def test_lfu_policy_evicts_least_frequently_used():
+    policy = LFUPolicy()
+    store = IntelligentMemoryStore(eviction_policy=policy)
+    items = [store.write(content=f"Frequency sample {i}") for i in range(3)]
+    for _ in range(2):
+        store.get_by_id(items[0].id)
+    store.get_by_id(items[2].id)
+
+    store.optimize_memory(max_items=2)
+
+    assert [item.id for item in store._items] == [items[0].id, items[2].id]
+
+
+def test_ttl_policy_expires_old_items(mock_clock, fast_forward):
+    store = make_cache(100, TTLPolicy(ttl_seconds=60))
+    old = store.write(content="Stale deployment note")
+    fast_forward(61)
+    fresh = store.write(content="Fresh deployment note")
+
+    assert store._items == [fresh]
+    assert store.get_by_id(old.id) is None
+    assert store.get_cache_stats()["expirations"] == 1
+
+
+def test_policy_heap_stays_bounded_under_repeated_access():
+    policy = LRUPolicy()
+    store = IntelligentMemoryStore(eviction_policy=policy)
+    item = store.write(content="Hot memory")
+    for _ in range(1000):
+        store.get_by_id(item.id)
+    assert len(policy._heap) < 100
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        create_eviction_policy("random")
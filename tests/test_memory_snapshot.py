@@ -0,0 +1,150 @@
+"""
+Tests for streaming, compressed memory snapshots
+
+Covers the snapshot format itself (chunks, checksums, incremental bases) and
+EnhancedFirestoreMemoryStore backup/restore against the in-process fake
+Firestore (tests/firestore_fake.py), which records batch commits.
+"""
+from __future__ import annotations
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from ai.memory.enhanced_firestore import EnhancedFirestoreMemoryStore
+from ai.memory.snapshot import (
+    SnapshotError,
+    iter_snapshot,
+    read_manifest,
+    verify_snapshot,
+    write_snapshot,
+)
+from firestore_fake import FakeFirestore
+
+
+def records(count, prefix="memory"):
+    return [{"id": f"id-{i}", "content": f"{prefix} {i}", "updated_at": i} for i in range(count)]
+
+
+def test_roundtrip_is_chunked_and_checksummed(tmp_path):
+    manifest = write_snapshot(tmp_path / "snap", records(25), compression="gzip", chunk_size=10)
+
+    assert [entry["count"] for entry in manifest["chunks"]] == [10, 10, 5]
+    assert all(len(entry["sha256"]) == 64 for entry in manifest["chunks"])
+    assert read_manifest(tmp_path / "snap")["total_memories"] == 25
+    assert list(iter_snapshot(tmp_path / "snap")) == records(25)
+
+
+def test_existing_snapshot_is_not_overwritten(tmp_path):
+    write_snapshot(tmp_path / "snap", records(1), compression="gzip")
+    with pytest.raises(SnapshotError):
+        write_snapshot(tmp_path / "snap", records(1), compression="gzip")
+
+
+def test_corrupt_chunk_is_rejected(tmp_path):
+    manifest = write_snapshot(tmp_path / "snap", records(5), compression="gzip")
+    chunk = tmp_path / "snap" / manifest["chunks"][0]["file"]
+    chunk.write_bytes(chunk.read_bytes()[:-4] + b"\0\0\0\0")
+
+    with pytest.raises(SnapshotError, match="Checksum"):
+        list(iter_snapshot(tmp_path / "snap"))
+    with pytest.raises(SnapshotError, match="Checksum"):
+        verify_snapshot(tmp_path / "snap")
+
+
+def test_incremental_snapshot_writes_only_changes(tmp_path):
+    write_snapshot(tmp_path / "full", records(10), compression="gzip")
+
+    current = records(10)
+    current[3]["content"] = "edited"
+    for record in current:
+        record["updated_at"] = 99  # volatile: must not count as a change
+    del current[7]
+    current.append({"id": "id-new", "content": "new memory"})
+
+    manifest = write_snapshot(tmp_path / "incr", current, base=tmp_path / "full", compression="gzip")
+    assert manifest["total_memories"] == 10
+    assert manifest["written_memories"] == 2
+    assert manifest["base"] == "../full"
+
+    restored = {record["id"]: record for record in iter_snapshot(tmp_path / "incr")}
+    assert set(restored) == {record["id"] for record in current}
+    assert restored["id-3"]["content"] == "edited"
+    assert restored["id-new"]["content"] == "new memory"
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    def factory():
+        db = FakeFirestore()
+
+        def setup(store):
+            store._db = db
+            store._collection = db.collection("intelligent_memory")
+            store._gcp_exceptions = SimpleNamespace(
+                ServiceUnavailable=ConnectionError,
+                DeadlineExceeded=TimeoutError,
+                InternalServerError=OSError,
+            )
+
+        with patch.object(EnhancedFirestoreMemoryStore, "_setup_firestore", setup):
+            store = EnhancedFirestoreMemoryStore(sync_state_path=str(tmp_path / "sync.json"))
+        return store, db
+    return factory
+
+
+def test_backup_and_restore_use_batched_writes(make_store, tmp_path):
+    source, _ = make_store()
+    source.write_many({"content": f"Task: item {i}"} for i in range(1200))
+    meta = source.backup_memories(str(tmp_path / "backup"), compression="gzip", chunk_size=500)
+    assert (meta["total_memories"], meta["chunks"]) == (1200, 3)
+
+    target, db = make_store()
+    result = target.restore_memories(str(tmp_path / "backup"))
+    assert (result["restored_count"], result["failed_count"]) == (1200, 0)
+    assert sorted(map(len, db.commits)) == [200, 500, 500]
+    assert {item.id for item in target._items} == {item.id for item in source._items}
+    assert target._delta.state.dirty == {}
+
+
+def test_restore_over_existing_memories_replaces_them(make_store, tmp_path):
+    store, db = make_store()
+    items = store.write_many({"content": f"Task: item {i}"} for i in range(10))
+    store.backup_memories(str(tmp_path / "backup"), compression="gzip")
+    store._index.get(items[0].id).content = "Task: edited since the backup"
+
+    result = store.restore_memories(str(tmp_path / "backup"))
+    assert result["restored_count"] == 10
+    assert len(store._items) == len({item.id for item in store._items}) == 10
+    assert store._index.get(items[0].id).content == "Task: item 0"
+    assert store._delta.state.dirty == {}
+
+
+def test_incremental_backup_restores_full_state(make_store, tmp_path):
+    store, _ = make_store()
+    store.write_many({"content": f"Note: item {i}"} for i in range(20))
+    store.backup_memories(str(tmp_path / "full"), compression="gzip")
+    store.write(content="Decision: added after the full backup")
+
+    meta = store.backup_memories(str(tmp_path / "incr"), base_path=str(tmp_path / "full"),
+                                 compression="gzip")
+    assert (meta["total_memories"], meta["written_memories"]) == (21, 1)
+
+    target, db = make_store()
+    result = target.restore_memories(str(tmp_path / "incr"))
+    assert result["restored_count"] == 21
+    assert len(db.docs) == 21
+
+
+def test_restore_reads_legacy_json_backups(make_store, tmp_path):
+    legacy = tmp_path / "backup.json"
+    legacy.write_text(json.dumps({
+        "metadata": {"total_memories": 1},
+        "memories": [{"id": "legacy-1", "content": "Goal: legacy backup", "tags": ["goal"]}],
+    }))
+
+    store, db = make_store()
+    result = store.restore_memories(str(legacy))
+    assert result["restored_count"] == 1
+    assert db.docs["legacy-1"]["content"] == "Goal: legacy backup"
@@ -1,11 +1,16 @@
 from __future__ import annotations
 import time
+from dataclasses import asdict
+from datetime import datetime, timezone
 from typing import List
+from unittest.mock import patch
 import pytest
 
 
 # We will rely on the in-memory store by default
-from ai.memory.store import InMemoryMemoryStore, MemoryItem
+from ai.memory.firestore_store import FirestoreMemoryStore
+from ai.memory.intelligent_store import EnhancedMemoryItem, IntelligentMemoryStore, MemoryType
+from ai.memory.store import InMemoryMemoryStore, MemoryItem, estimate_tokens, render_context, set_memory_store
 
 
 def test_inmemory_store_write_and_query_ordering(mock_clock, fast_forward):
@@ -32,3 +37,116 @@ def test_inmemory_store_returns_stable_ids():
     b = store.write(content="beta").id
     assert a != b
 
+
+def test_inmemory_store_write_many_matches_single_writes():
+    store = InMemoryMemoryStore()
+    items = store.write_many([
+        {"content": "alpha", "tags": ["init"]},
+        {"content": "beta"},
+    ])
+    assert [it.content for it in items] == ["alpha", "beta"]
+    assert items[1].tags == []
+    assert len({it.id for it in items}) == 2
+    assert {it.id for it in store.query(limit=10, tags=["init"])} == {items[0].id}
+
+
+def fresh_copy(value: str) -> str:
+    """An equal string that is a distinct object (not the interned one)."""
+    return "".join(list(value))
+
+
+def test_memory_items_have_no_instance_dict():
+    for item in (MemoryItem(id="mem-1", content="plain"), EnhancedMemoryItem(id="mem-2", content="rich")):
+        assert not hasattr(item, "__dict__")
+        with pytest.raises(AttributeError):
+            item.unexpected = True
+
+
+def test_tags_and_keywords_are_interned_across_items():
+    store = IntelligentMemoryStore()
+    first = store.write(content="Deploy the websocket gateway", tags=[fresh_copy("ops-team")])
+    second = store.write(content="Rollback plan for the websocket deploy", tags=[fresh_copy("ops-team")])
+    assert first.tags[0] is second.tags[0]
+
+    shared = set(first.keywords) & set(second.keywords)
+    assert {"deploy", "websocket"} <= shared
+    for keyword in shared:
+        assert first.keywords[first.keywords.index(keyword)] is second.keywords[second.keywords.index(keyword)]
+
+    plain = InMemoryMemoryStore()
+    a = plain.write(content="alpha", tags=[fresh_copy("init")])
+    b = plain.write(content="beta", tags=[fresh_copy("init")])
+    assert a.tags[0] is b.tags[0]
+
+
+def test_memory_items_round_trip_through_dicts():
+    created_at = datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    plain = MemoryItem(id="mem-1", content="plain", tags=["init"], created_at=created_at)
+    assert MemoryItem(**asdict(plain)) == plain
+
+    item = EnhancedMemoryItem(
+        id="mem-2", content="Decision: ship it", tags=["ops"], created_at=created_at,
+        memory_type=MemoryType.DECISION, keywords=["ship"], related_ids=["mem-1"],
+        importance_score=0.8, summary="ship it",
+    )
+    assert EnhancedMemoryItem(**asdict(item)) == item
+
+    # The store serializers keep the fields and intern what they read back
+    with patch('ai.memory.firestore_store.FIRESTORE_AVAILABLE', False):
+        store = FirestoreMemoryStore()
+    data = store._memory_item_to_dict(item)
+    restored = store._dict_to_memory_item(data)
+    assert restored == item
+    twin = store._dict_to_memory_item({**data, "tags": [fresh_copy("ops")], "keywords": [fresh_copy("ship")]})
+    assert twin.tags[0] is restored.tags[0]
+    assert twin.keywords[0] is restored.keywords[0]
+
+
+class CountingStore(InMemoryMemoryStore):
+    def __init__(self) -> None:
+        super().__init__()
+        self.queries = 0
+
+    def query(self, *, limit: int = 5, tags=None):
+        self.queries += 1
+        return super().query(limit=limit, tags=tags)
+
+
+def test_render_context_is_cached_until_write(mock_clock, fast_forward):
+    store = CountingStore()
+    set_memory_store(store)
+    store.write(content="first", tags=["init"])
+
+    assert "first" in render_context(limit=5, tags=["init"])
+    assert render_context(limit=5, tags=["init"]) == render_context(limit=5, tags=["init"])
+    assert store.queries == 1
+
+    fast_forward(0.01)
+    store.write(content="second", tags=["init"])
+    assert render_context(limit=5, tags=["init"]).splitlines()[0].endswith("second")
+    assert store.queries == 2
+
+
+def test_render_context_truncates_to_token_budget(mock_clock, fast_forward):
+    store = InMemoryMemoryStore()
+    set_memory_store(store)
+    for word in ("alpha", "beta", "gamma"):
+        store.write(content=word * 10)
+        fast_forward(0.01)
+
+    full = render_context(limit=3).splitlines()
+    first_line_tokens = estimate_tokens(full[0])
+    assert render_context(limit=3, max_tokens=first_line_tokens).splitlines() == full[:1]
+    assert render_context(limit=3, max_tokens=0) == ""
+    assert render_context(limit=3, max_tokens=10_000).splitlines() == full
+
+
+def test_intelligent_store_removals_invalidate_context():
+    store = IntelligentMemoryStore()
+    set_memory_store(store)
+    store.write(content="Goal: keep this critical milestone")
+    store.write(content="note")
+    assert "note" in render_context(limit=5)
+
+    store.optimize_memory(max_items=1)
+    assert "note" not in render_context(limit=5)
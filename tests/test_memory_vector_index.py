@@ -0,0 +1,75 @@
+"""
+Tests for the dense-vector memory index
+"""
+from __future__ import annotations
+
+import pytest
+
+from ai.memory.intelligent_store import IntelligentMemoryStore
+from ai.memory.vector_index import HashingEmbedder, VectorIndex
+from ai.memory.store import set_memory_store
+from ai.tools.enhanced_memory_tools import SemanticSearchMemory
+
+
+@pytest.fixture
+def store():
+    store = IntelligentMemoryStore()
+    store.enable_vector_index()
+    store.write_many([
+        {"content": "Deployed the payment service to the staging cluster"},
+        {"content": "Investigated flaky websocket reconnect tests"},
+        {"content": "Agents coordinate through the shared memory store"},
+    ])
+    return store
+
+
+def test_paraphrased_query_finds_memory(store):
+    # No exact keyword overlap with "Deployed ... payment service ... staging"
+    assert store.search_by_keywords(["deployment", "payments"]) == []
+    results = store.semantic_search("payments deployment to staging", limit=1)
+    assert [r.content for r in results] == ["Deployed the payment service to the staging cluster"]
+
+
+def test_hybrid_ranking_prefers_important_memories():
+    store = IntelligentMemoryStore()
+    store.enable_vector_index()
+    note = store.write(content="Notes about the release checklist for mobile")
+    goal = store.write(content="Goal: release checklist for mobile")
+    assert goal.importance_score > note.importance_score
+
+    ranked = store.semantic_search("mobile release checklist", limit=2, similarity_weight=0.1, importance_weight=0.9)
+    assert [r.id for r in ranked] == [goal.id, note.id]
+
+
+def test_vectors_follow_eviction(store):
+    store.optimize_memory(max_items=1)
+    assert len(store.vector_index) == 1
+    assert len(store.semantic_search("websocket payment memory", limit=10)) <= 1
+
+
+def test_vectors_persist_and_reload(store, tmp_path):
+    path = tmp_path / "vectors"
+    store._vector_path = path
+    assert store.save_vector_index()
+
+    reloaded = VectorIndex.load(path)
+    assert reloaded.ids == store.vector_index.ids
+    assert reloaded.search("websocket tests", 1)[0][0] == store.vector_index.search("websocket tests", 1)[0][0]
+
+    # A different embedder configuration invalidates the saved vectors
+    assert len(VectorIndex.load(path, HashingEmbedder(dim=64))) == 0
+
+
+def test_index_removal_keeps_rows_consistent():
+    index = VectorIndex(HashingEmbedder(dim=32), initial_capacity=1)
+    index.add([(f"id-{i}", f"memory number {i}") for i in range(5)])
+    assert index.remove("id-1")
+    assert not index.remove("id-1")
+    assert sorted(index.ids) == ["id-0", "id-2", "id-3", "id-4"]
+    assert index.search("memory number 4", 1)[0][0] == "id-4"
+
+
+def test_semantic_search_tool_uses_vectors(store):
+    set_memory_store(store)
+    output = SemanticSearchMemory(keywords=["websockets", "reconnecting"], limit=1).run()
+    assert "websocket reconnect" in output
@@ -0,0 +1,96 @@
+"""
+Tests for the write-behind memory sync queue
+
+Runs FirestoreMemoryStore against the in-process fake Firestore client
+(tests/firestore_fake.py) so the background queue, coalescing, backpressure
+and spool replay can be exercised without the emulator.
+"""
+from __future__ import annotations
+from unittest.mock import patch
+
+from ai.memory.firestore_store import FirestoreMemoryStore
+from ai.memory.write_behind import WriteBehindQueue
+from firestore_fake import FakeFirestore
+
+
+def make_store(db: FakeFirestore, tmp_path, **queue_kwargs) -> FirestoreMemoryStore:
+    with patch('ai.memory.firestore_store.FIRESTORE_AVAILABLE', False):
+        store = FirestoreMemoryStore(max_local_cache=1000)
+    store._firestore_client = db
+    store.enable_write_behind(spool_path=str(tmp_path / "spool.jsonl"), **queue_kwargs)
+    return store
+
+
+def test_writes_do_not_block_on_commit(tmp_path):
+    db = FakeFirestore()
+    db.gate.clear()  # Firestore "hangs" until released
+    store = make_store(db, tmp_path)
+    try:
+        items = [store.write(content=f"Queued memory {i}", tags=["wb"]) for i in range(3)]
+        assert db.docs == {}
+        assert db.direct_sets == []
+
+        db.gate.set()
+        assert store.flush(timeout=5)
+        assert set(db.docs) == {item.id for item in items}
+        assert db.docs[items[0].id]["content"] == "Queued memory 0"
+    finally:
+        store.close()
+    # Fully committed queues leave no spool behind
+    assert not (tmp_path / "spool.jsonl").exists()
+
+
+def test_queue_coalesces_and_batches(tmp_path):
+    db = FakeFirestore()
+    # Long accumulation window: only the explicit flush releases the batch
+    queue = WriteBehindQueue(lambda docs: db.commits.append([d for d, _ in docs]),
+                             spool_path=tmp_path / "spool.jsonl", batch_size=2, flush_interval=5.0)
+    try:
+        for version in range(3):
+            queue.submit("doc-a", {"v": version})
+        queue.submit("doc-b", {"v": 0})
+        queue.submit("doc-c", {"v": 0})
+        assert queue.flush(timeout=5)
+        assert sorted(sum(db.commits, [])) == ["doc-a", "doc-b", "doc-c"]
+        assert all(len(batch) <= 2 for batch in db.commits)
+        assert queue.get_stats()["coalesced"] == 2
+    finally:
+        queue.close()
+
+
+def test_full_queue_falls_back_to_direct_sync(tmp_path):
+    db = FakeFirestore()
+    db.gate.clear()
+    store = make_store(db, tmp_path, max_pending=1)
+    store._write_queue.submit_timeout = 0.05
+    try:
+        store.write(content="First queued memory")
+        # Let the worker pick up the first write so it is in flight
+        store._write_queue.flush(timeout=0.2)
+        store.write(content="Second queued memory")
+        overflow = store.write(content="Overflow memory")
+        assert overflow.id in db.direct_sets
+    finally:
+        db.gate.set()
+        store.close()
+
+
+def test_spool_replays_unsynced_writes(tmp_path):
+    spool = tmp_path / "spool.jsonl"
+    db = FakeFirestore()
+    db.fail_commits = True
+    store = make_store(db, tmp_path)
+    item = store.write(content="Must survive a crash", tags=["durable"])
+    assert not store.close(timeout=0.3)
+    assert spool.exists()
+
+    # A fresh process replays the spool once Firestore is reachable
+    db.fail_commits = False
+    queue = WriteBehindQueue(lambda docs: db.docs.update(dict(docs)), spool_path=spool)
+    try:
+        assert queue.get_stats()["replayed"] == 1
+        assert queue.flush(timeout=5)
+    finally:
+        queue.close()
+    assert db.docs[item.id]["content"] == "Must survive a crash"
+    assert db.docs[item.id]["created_at"] == item.created_at
@@ -10,6 +10,10 @@ import os
 from pathlib import Path
 from unittest.mock import Mock, patch
 import subprocess
+import asyncio
+import sys
+import time
+import warnings
 
 from ai.loop.repo_scanner import (
     RepoScanner, 
@@ -18,7 +22,8 @@ from ai.loop.repo_scanner import (
     scan_repository,
     find_todos,
     find_failing_tests,
-    parse_git_diff
+    parse_git_diff,
+    _start_process_pool
 )
 
 
@@ -238,6 +243,23 @@ def perfect_function():
         
         assert len(tasks) == 0
     
+    def test_find_syntax_errors(self, tmp_path):
+        """Test syntax error detection through the shared AST analysis cache."""
+        (tmp_path / "good.py").write_text("x = 1\n")
+        (tmp_path / "pkg").mkdir()
+        (tmp_path / "pkg" / "bad.py").write_text("x = 1\ndef broken(:\n    pass\n")
+    
+        scanner = RepoScanner(repo_path=tmp_path)
+        tasks = scanner.find_syntax_errors()
+    
+        assert [(t.type, t.file_path, t.line_number, t.priority) for t in tasks] == [
+            (TaskType.SYNTAX_ERROR, "pkg/bad.py", 2, 5)
+        ]
+        assert (tmp_path / ".fresh" / "ast_analysis.json").exists()
+    
+        (tmp_path / "pkg" / "bad.py").write_text("x = 1\n")
+        assert RepoScanner(repo_path=tmp_path).find_syntax_errors() == []
+    
     def test_scan_repository_function(self, tmp_path):
         """Test the module-level scan_repository function."""
         # Create test file
@@ -253,6 +275,303 @@ def perfect_function():
         assert all(isinstance(t, Task) for t in tasks)
 
 
+class TestScanCache:
+    """Test incremental rescans through the persistent scan cache."""
+    
+    def test_unchanged_files_are_not_reparsed(self, tmp_path):
+        (tmp_path / "a.py").write_text("# TODO: first\n")
+        (tmp_path / "b.py").write_text("x = 1\n")
+        
+        scanner = RepoScanner(repo_path=tmp_path)
+        first = scanner.find_todos()
+        assert scanner.cache.stats["misses"] == 2
+        
+        scanner.cache.reset_stats()
+        with patch.object(RepoScanner, "_parse_todos") as parse:
+            assert scanner.find_todos() == first
+        parse.assert_not_called()
+        assert scanner.cache.stats["stat_hits"] == 2
+    
+    def test_cache_persists_across_scanners(self, tmp_path):
+        (tmp_path / "a.py").write_text("# FIXME: persisted\n")
+        first = RepoScanner(repo_path=tmp_path).find_todos()
+        
+        scanner = RepoScanner(repo_path=tmp_path)
+        assert scanner.find_todos() == first
+        assert scanner.cache.stats == {"stat_hits": 1, "git_hits": 0, "hash_hits": 0, "misses": 0}
+        assert first[0].context == "# FIXME: persisted\n"
+    
+    def test_changed_touched_and_deleted_files(self, tmp_path):
+        a, b = tmp_path / "a.py", tmp_path / "b.py"
+        a.write_text("# TODO: old\n")
+        b.write_text("# TODO: stays\n")
+        scanner = RepoScanner(repo_path=tmp_path)
+        scanner.find_todos()
+        
+        a.write_text("# TODO: new text\n")
+        stat = b.stat()
+        os.utime(b, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))  # touched, same content
+        scanner.cache.reset_stats()
+        tasks = scanner.find_todos()
+        
+        assert sorted(t.description for t in tasks) == ["TODO: new text", "TODO: stays"]
+        assert scanner.cache.stats["misses"] == 1
+        assert scanner.cache.stats["hash_hits"] == 1
+        
+        a.unlink()
+        assert [t.description for t in scanner.find_todos()] == ["TODO: stays"]
+        assert "a.py" not in scanner.cache
+    
+    def test_git_blob_ids_skip_reading_touched_files(self, tmp_path):
+        if subprocess.run(["git", "--version"], capture_output=True).returncode != 0:
+            pytest.skip("git not available")
+        files = [tmp_path / f"m{i}.py" for i in range(3)]
+        for i, f in enumerate(files):
+            f.write_text(f"# TODO: item {i}\n")
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+        
+        scanner = RepoScanner(repo_path=tmp_path)
+        expected = scanner.find_todos()
+        for f in files:
+            stat = f.stat()
+            os.utime(f, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        
+        scanner.cache.reset_stats()
+        with patch("ai.loop.repo_scanner.GIT_LOOKUP_THRESHOLD", 0), \
+                patch("pathlib.Path.read_bytes", side_effect=AssertionError("file was read")):
+            assert scanner.find_todos() == expected
+        assert scanner.cache.stats["git_hits"] == 3
+    
+    def test_cache_can_be_disabled(self, tmp_path):
+        (tmp_path / "a.py").write_text("# TODO: uncached\n")
+        scanner = RepoScanner(repo_path=tmp_path, use_cache=False)
+        assert len(scanner.find_todos()) == 1
+        assert not (tmp_path / ".fresh").exists()
+
+
+class TestFileWalker:
+    """Test pruned enumeration and .gitignore handling."""
+    
+    def _tree(self, root, files):
+        for rel in files:
+            path = root / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("# TODO: x\n")
+    
+    def _found(self, scanner):
+        return sorted(p.relative_to(scanner.repo_path).as_posix() for p in scanner._find_source_files())
+    
+    def test_ignored_directories_are_never_listed(self, tmp_path):
+        self._tree(tmp_path, ["src/app.py", "node_modules/pkg/index.js", ".venv/lib/site.py", "src/rebuild.py"])
+        scanner = RepoScanner(repo_path=tmp_path, use_cache=False)
+        
+        listed = []
+        real_scandir = os.scandir
+        with patch("ai.loop.file_walker.os.scandir", side_effect=lambda d: listed.append(d) or real_scandir(d)):
+            found = self._found(scanner)
+        
+        # "build" is a name pattern, so rebuild.py is no longer caught by substring matching
+        assert found == ["src/app.py", "src/rebuild.py"]
+        assert not any("node_modules" in d or ".venv" in d for d in listed)
+    
+    def test_gitignore_rules(self, tmp_path):
+        self._tree(tmp_path, [
+            "keep.py", "gen/out.py", "logs/a.py", "docs/conf.py", "lib/generated_x.py",
+            "lib/generated_keep.py", "pkg/sub/local.py", "pkg/other.py", "deep/a/b/skip.py",
+        ])
+        (tmp_path / ".gitignore").write_text(
+            "# comment\n"
+            "gen/\n"
+            "/logs\n"
+            "generated_*.py\n"
+            "!generated_keep.py\n"
+            "deep/**/skip.py\n"
+        )
+        (tmp_path / "pkg" / ".gitignore").write_text("sub/\n")
+        
+        found = self._found(RepoScanner(repo_path=tmp_path, use_cache=False))
+        assert found == ["docs/conf.py", "keep.py", "lib/generated_keep.py", "pkg/other.py"]
+        
+        found = self._found(RepoScanner(repo_path=tmp_path, use_cache=False, use_gitignore=False))
+        assert len(found) == 9
+    
+    def test_files_are_yielded_lazily(self, tmp_path):
+        self._tree(tmp_path, ["a.py", "b/c.py"])
+        files = RepoScanner(repo_path=tmp_path, use_cache=False)._find_source_files()
+        assert next(files) == tmp_path / "a.py"
+    
+    def test_should_ignore_matches_relative_components(self, tmp_path):
+        scanner = RepoScanner(repo_path=tmp_path / "build" / "repo")
+        assert not scanner._should_ignore(tmp_path / "build" / "repo" / "app.py")
+        assert scanner._should_ignore(tmp_path / "build" / "repo" / "dist" / "app.py")
+        assert scanner._should_ignore(tmp_path / "build" / "repo" / "x.pyc")
+
+
+class TestParallelScan:
+    """Test the parallel TODO scan against the sequential one."""
+    
+    def _repo(self, root, count=40):
+        for i in range(count):
+            path = root / f"pkg{i % 4}" / f"mod{i}.py"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("".join(f"# TODO: item {i}.{n}\nx = {n}\n" for n in range(i % 3)) + "# FIXME: last\n")
+    
+    def _dump(self, tasks):
+        return [t.to_dict() for t in tasks]
+    
+    def test_parallel_matches_sequential_order(self, tmp_path):
+        self._repo(tmp_path)
+        expected = self._dump(RepoScanner(repo_path=tmp_path, use_cache=False).find_todos())
+        assert len(expected) == 79
+        
+        assert self._dump(RepoScanner(repo_path=tmp_path, use_cache=False, jobs=3).find_todos()) == expected
+        
+        scanner = RepoScanner(repo_path=tmp_path, jobs=3)
+        assert self._dump(scanner.find_todos()) == expected
+        assert scanner.cache.stats["misses"] == 40
+        
+        # Mixed cache hits, touched-but-unchanged and changed files
+        scanner.cache.reset_stats()
+        (tmp_path / "pkg1" / "mod5.py").write_text("# FIXME: changed\n")
+        os.utime(tmp_path / "pkg2" / "mod6.py", ns=(1, 1))
+        expected = self._dump(RepoScanner(repo_path=tmp_path, use_cache=False).find_todos())
+        assert self._dump(scanner.find_todos()) == expected
+        assert scanner.cache.stats == {"stat_hits": 38, "git_hits": 0, "hash_hits": 1, "misses": 1}
+    
+    def test_iter_todos_streams_and_skips_unreadable(self, tmp_path):
+        self._repo(tmp_path, count=6)
+        (tmp_path / "pkg0" / "mod0.py").chmod(0)
+        scanner = RepoScanner(repo_path=tmp_path, jobs=2)
+        
+        tasks = scanner.iter_todos()
+        first = next(tasks)
+        assert isinstance(first, Task)
+        rest = list(tasks)
+        if os.access(tmp_path / "pkg0" / "mod0.py", os.R_OK):
+            return  # Running as root; permissions are not enforced
+        assert all(t.file_path != "pkg0/mod0.py" for t in [first] + rest)
+        assert "pkg0/mod0.py" not in scanner.cache
+    
+    def test_falls_back_to_threads_without_processes(self, tmp_path):
+        self._repo(tmp_path, count=8)
+        expected = self._dump(RepoScanner(repo_path=tmp_path, use_cache=False).find_todos())
+        with patch("ai.loop.repo_scanner.ProcessPoolExecutor", side_effect=NotImplementedError):
+            actual = self._dump(RepoScanner(repo_path=tmp_path, use_cache=False).find_todos(jobs=4))
+        assert actual == expected
+    
+    def test_parse_workers_are_not_forked_from_scan_threads(self, tmp_path):
+        self._repo(tmp_path, count=8)
+        pool = _start_process_pool(2)
+        try:
+            assert pool._mp_context.get_start_method() in ("forkserver", "spawn")
+        finally:
+            pool.shutdown()
+        
+        expected = self._dump(RepoScanner(repo_path=tmp_path, use_cache=False).find_todos())
+        with warnings.catch_warnings():
+            # Python 3.12 warns when fork() is called with threads running
+            warnings.simplefilter("error", DeprecationWarning)
+            assert self._dump(RepoScanner(repo_path=tmp_path, use_cache=False, jobs=2).find_todos()) == expected
+    
+    def test_jobs_zero_uses_all_cpus(self, tmp_path):
+        with patch("ai.loop.repo_scanner.os.cpu_count", return_value=6):
+            assert RepoScanner(repo_path=tmp_path, jobs=0).jobs == 6
+
+
+class TestAsyncScan:
+    """Test concurrent external checkers in scan_async()."""
+    
+    def _scanner(self, tmp_path, commands, **kwargs):
+        (tmp_path / "app.py").write_text("# TODO: async\n")
+        scanner = RepoScanner(repo_path=tmp_path, use_cache=False, **kwargs)
+        scanner._checker_command = lambda name: commands[name]
+        return scanner
+    
+    def _python(self, code):
+        return [sys.executable, "-c", code]
+    
+    def test_checkers_run_concurrently(self, tmp_path):
+        scanner = self._scanner(tmp_path, {
+            "tests": self._python("import time,sys; time.sleep(1); print('FAILED tests/test_a.py::test_x'); sys.exit(1)"),
+            "types": self._python("import time,sys; time.sleep(1); print('app.py:3: error: bad'); sys.exit(1)"),
+            "git": self._python("import time; time.sleep(1); print('app.py')"),
+        })
+        
+        start = time.monotonic()
+        tasks = asyncio.run(scanner.scan_async())
+        elapsed = time.monotonic() - start
+        
+        assert elapsed < 2.5
+        assert {t.type for t in tasks} == {TaskType.TODO, TaskType.FAILING_TEST, TaskType.TYPE_ERROR, TaskType.UNCOMMITTED}
+        assert tasks[0].type == TaskType.TYPE_ERROR
+        assert scanner.checker_status == {"tests": "ok", "types": "ok", "git": "ok"}
+    
+    def test_timeouts_and_missing_checkers_give_partial_results(self, tmp_path):
+        scanner = self._scanner(tmp_path, {
+            "tests": ["definitely-not-a-real-command"],
+            "types": self._python("import time; time.sleep(30)"),
+            "git": self._python("print('app.py')"),
+        }, checker_timeouts={"types": 0.5})
+        
+        start = time.monotonic()
+        tasks = asyncio.run(scanner.scan_async())
+        
+        assert time.monotonic() - start < 5
+        assert sorted(t.type.value for t in tasks) == ["TODO", "UNCOMMITTED"]
+        assert scanner.checker_status == {"tests": "unavailable", "types": "timeout", "git": "ok"}
+    
+    def test_failing_steps_give_partial_results(self, tmp_path):
+        scanner = self._scanner(tmp_path, {"types": None, "git": self._python("print('app.py')")})
+        commands = scanner._checker_command
+        
+        def broken_command(name):
+            if name == "tests":
+                raise RuntimeError("test selection failed")
+            return commands(name)
+        
+        def unreadable():
+            raise PermissionError("denied")
+        
+        scanner._checker_command = broken_command
+        scanner.find_syntax_errors = unreadable
+        tasks = asyncio.run(scanner.scan_async())
+        assert sorted(t.type.value for t in tasks) == ["TODO", "UNCOMMITTED"]
+        assert scanner.checker_status == {"syntax": "error", "tests": "error", "types": "ok", "git": "ok"}
+        
+        scanner.find_failing_tests = unreadable
+        scanner.find_type_errors = lambda: []
+        scanner.parse_git_diff = lambda: []
+        assert [t.type for t in scanner.scan()] == [TaskType.TODO]
+        assert scanner.checker_status == {"syntax": "error", "tests": "error"}
+    
+    def test_cancellation_kills_checkers(self, tmp_path):
+        pid_file = tmp_path / "pid"
+        code = f"import os,time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+        scanner = self._scanner(tmp_path, {name: self._python(code) for name in ("tests", "types", "git")})
+        
+        async def cancel_scan():
+            scan = asyncio.create_task(scanner.scan_async())
+            for _ in range(100):
+                await asyncio.sleep(0.05)
+                if pid_file.exists() and pid_file.read_text():
+                    break
+            scan.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await scan
+        
+        asyncio.run(cancel_scan())
+        pid = int(pid_file.read_text())
+        for _ in range(50):
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.05)
+        else:
+            pytest.fail("checker process still running after cancellation")
+
+
 class TestTask:
     """Test the Task data structure."""
     
@@ -0,0 +1,185 @@
+"""
+Tests for the single-pass CodebaseMonitor rule engine
+
+The engine must report the same line-rule issues, metrics and file facts
+as the former per-category scans; the reference below is the pre-engine
+code (one read and one uncompiled re.search per rule, per category).
+Structural checks come from the AST analysis (ai/loop/ast_analysis.py).
+"""
+from __future__ import annotations
+import re
+from pathlib import Path
+
+import pytest
+
+from ai.autonomous.monitor import CodebaseMonitor
+from ai.autonomous.scan_engine import DEFAULT_RULES, RuleEngine, ScanRule
+from ai.loop.ast_analysis import analyze_source
+
+SOURCES = {
+    "app/main.py": (
+        "import hashlib, pickle, random, subprocess, time\n"
+        "def handler(request):\n"
+        "    digest = hashlib.md5(request).hexdigest()  # TODO: use sha256\n"
+        "    value = random.random()\n"
+        "    data = pickle.loads(request)\n"
+        "    subprocess.run(cmd, shell=True)\n"
+        "    for i in range(len(data)):\n"
+        "        items.append(data[i])\n"
+        "    time.sleep(5)\n"
+        "    print(digest)\n"
+        "    # TODO\n"
+        "    return eval(value)\t# tab\n"
+        + "x = '" + "a" * 130 + "'\n"
+    ),
+    "app/utils/helperModule.py": "def empty():\n    pass\n\n\n# plain comment\n",
+    "app/tests/test_main.py": "def test_it():\n    if True:\n        assert 1\n    else:\n        pass",
+    "web/index.js": "// TODO: not a python rule\nconsole.log('x');\n",
+    "node_modules/pkg/index.py": "eval('ignored')\n",
+    "build/gen.py": "exec('ignored')\n",
+    "empty.py": "",
+}
+
+
+def reference_issues(root: Path, files):
+    """Per-category scans as they were before the engine."""
+    issues = []
+    for category in ("security", "quality", "performance"):
+        rules = [r for r in DEFAULT_RULES if r.category == category]
+        for rel_path in files:
+            lines = (root / rel_path).read_text().split('\n')
+            for i, line in enumerate(lines, 1):
+                for rule in rules:
+                    if re.search(rule.pattern, line):
+                        issues.append((category, rule.severity, rel_path, i, rule.description,
+                                       {"pattern": rule.pattern, "code": line.strip()}))
+    for rel_path in files:
+        for i, line in enumerate((root / rel_path).read_text().split('\n'), 1):
+            match = re.search(r'#\s*TODO:?\s*(.+)', line)
+            if match:
+                text = match.group(1).strip()
+                issues.append(("todo", "low", rel_path, i, f"TODO: {text}", {"todo_text": text}))
+    return issues
+
+
+@pytest.fixture
+def codebase(tmp_path):
+    for rel_path, content in SOURCES.items():
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    return tmp_path
+
+
+class _NullStore:
+    def write(self, **kwargs):
+        pass
+
+
+@pytest.fixture
+def monitor(codebase):
+    monitor = CodebaseMonitor(str(codebase), memory_store=_NullStore())
+    monitor._get_test_coverage = lambda: 0.0
+    return monitor
+
+
+def test_issues_match_per_category_reference(monitor, codebase):
+    py_files = ["app/main.py", "app/tests/test_main.py", "app/utils/helperModule.py", "empty.py"]
+    expected = reference_issues(codebase, py_files)
+    issues = (monitor._rule_issues("security") + monitor._rule_issues("quality")
+              + monitor._rule_issues("performance") + monitor._scan_todo_items())
+    actual = [(i.type, i.severity, i.file, i.line, i.description, i.details) for i in issues]
+    assert actual == expected
+    assert {i[0] for i in actual} == {"security", "quality", "performance", "todo"}
+
+
+def test_structural_issues_come_from_the_ast(monitor, codebase):
+    branches = "".join(f"    if a == {i}:\n        a += 1\n" for i in range(12))
+    (codebase / "app" / "complex.py").write_text(
+        "def tangled(a, items):\n" + branches
+        + "    items.append(a)  # not in a loop\n"
+        + "    for x in items:\n        while x:\n            if x:\n                for y in x:\n"
+        + "                    if y:\n                        out = [].append(y)\n"
+    )
+    monitor.config["max_nesting_depth"] = 4
+    quality = [i for i in monitor._scan_quality_issues() if i.file == "app/complex.py"]
+    assert [(i.line, i.details) for i in quality] == [
+        (1, {"function": "tangled", "complexity": 18, "limit": 10}),
+        (1, {"function": "tangled", "nesting": 5, "limit": 4}),
+    ]
+    empty = [(i.file, i.line) for i in monitor._scan_quality_issues() if i.description == "Empty function definition"]
+    assert empty == [("app/utils/helperModule.py", 1)]
+    appends = [(i.file, i.line) for i in monitor._scan_performance_issues()
+               if i.description.startswith("List append")]
+    assert appends == [("app/complex.py", 32), ("app/main.py", 8)]
+
+
+def test_metrics_and_file_facts(monitor, codebase):
+    scan = monitor.scan_codebase()
+    files = [p for p in SOURCES if not p.startswith(("node_modules/", "build/"))]
+    lines = [line for p in files for line in (codebase / p).read_text().splitlines()]
+    assert scan.files_count == len(files)
+    assert scan.total_lines == len(lines)
+    assert scan.blank_lines == sum(1 for line in lines if not line.strip())
+    assert scan.comment_lines == sum(1 for line in lines if line.strip().startswith(("#", "//")))
+    assert scan.code_lines == scan.total_lines - scan.blank_lines - scan.comment_lines
+
+    py_files = [p for p in files if p.endswith(".py")]
+    functions = [f for p in py_files for f in analyze_source((codebase / p).read_text())["functions"]]
+    assert scan.python_files == len(py_files)
+    assert sorted(scan.analyses) == sorted(py_files)
+    assert scan.complexity_average == sum(f["complexity"] for f in functions) / len(functions)
+    assert (scan.test_files, scan.source_files) == (1, 3)
+    assert scan.directories == {"app", "utils", "tests", codebase.name}
+    assert (scan.snake_case_files, scan.camel_case_files) == (1, 1)
+
+
+def test_comprehensive_scan_reads_each_file_once(monitor, monkeypatch):
+    import builtins
+    opened = []
+    real_open = builtins.open
+
+    def counting_open(file, *args, **kwargs):
+        if Path(file).suffix in (".py", ".js"):
+            opened.append(Path(file).name)
+        return real_open(file, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, "open", counting_open)
+    results = monitor.comprehensive_scan()
+    assert "error" not in results
+    assert sorted(opened) == sorted(["main.py", "helperModule.py", "test_main.py", "index.js", "empty.py"])
+    assert any(p["type"] == "naming_inconsistency" for p in results["patterns"])
+    assert results["issues"][-1]["type"] == "todo"
+
+
+def test_registered_rule_reported_in_its_category(monitor):
+    monitor.register_rule(ScanRule("style", "low", r'console\.log', "Console logging", extensions=(".js",)))
+    issues = [i for i in monitor.comprehensive_scan()["issues"] if i["type"] == "style"]
+    assert [(i["file"], i["line"]) for i in issues] == [("web/index.js", 2)]
+
+
+def test_prefilter_does_not_hide_later_rules():
+    engine = RuleEngine([
+        ScanRule("a", "low", r'foo', "foo"),
+        ScanRule("b", "low", r'o+bar', "bar"),
+        ScanRule("c", "low", r'#\s*note:\s*(.+)', "note {text}", capture="text"),
+    ])
+    matches = list(engine.match_lines("x.py", ["foobar  # note: hi ", "nothing", "bar"]))
+    assert [(m.rule.category, m.line) for m in matches] == [("a", 1), ("b", 1), ("c", 1)]
+    assert matches[2].description == "note hi"
+    assert matches[2].details == {"text": "hi"}
+
+
+def test_invalid_rule_rejected_at_registration():
+    with pytest.raises(re.error):
+        RuleEngine().register(ScanRule("x", "low", r'(unclosed', "broken"))
+
+
+def test_incremental_scan_covers_only_changed_files(monitor):
+    full = monitor.comprehensive_scan()
+    results = monitor.comprehensive_scan(paths=["app/main.py", "build/gen.py", "deleted.py", "app/main.py"])
+    assert results["scope"] == ["app/main.py", "build/gen.py", "deleted.py"]
+    assert results["issues"] == [i for i in full["issues"] if i["file"] == "app/main.py"]
+    # Repository-wide results need the whole tree
+    assert (results["metrics"], results["patterns"]) == (None, [])
+    assert len(monitor.metrics_history) == 1
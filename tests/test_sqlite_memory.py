@@ -0,0 +1,100 @@
+"""
+Tests for SQLite Memory Store
+
+Checks that SqliteMemoryStore answers the IntelligentMemoryStore API with the
+same results as the in-memory implementation, and that memories persist
+across sessions.
+"""
+from __future__ import annotations
+import pytest
+
+from ai.memory.intelligent_store import IntelligentMemoryStore, MemoryType
+from ai.memory.sqlite_store import SqliteMemoryStore
+
+
+ENTRIES = [
+    {"content": "Goal: Implement persistent agent memory", "tags": ["goal", "memory"]},
+    {"content": "Task: Write SQLite memory store tests", "tags": ["task", "memory"]},
+    {"content": "Error: Memory store lost data after restart", "tags": ["error"]},
+    {"content": "Agent monitoring dashboard layout", "tags": ["ui"]},
+    {"content": "Critical: memory database corruption on crash", "tags": ["memory"]},
+    {"content": "Learned: WAL mode keeps readers unblocked", "tags": ["knowledge"]},
+    {"content": "Unrelated cooking recipe", "tags": ["food"]},
+]
+
+
+@pytest.fixture
+def stores(tmp_path, mock_clock, fast_forward):
+    reference = IntelligentMemoryStore()
+    store = SqliteMemoryStore(tmp_path / "memory.db")
+    for entry in ENTRIES:
+        reference.write(**entry)
+        store.write(**entry)
+        fast_forward(1)
+    yield reference, store
+    store.close()
+
+
+def ids(items):
+    return [item.id for item in items]
+
+
+class TestSqliteMemoryStore:
+    """Test SqliteMemoryStore parity and persistence."""
+
+    def test_queries_match_intelligent_store(self, stores):
+        reference, store = stores
+        for kwargs in (
+            {"limit": 10},
+            {"limit": 3, "tags": ["memory"]},
+            {"limit": 10, "keywords": ["Memory", "agent"]},
+            {"limit": 10, "tags": ["memory", "error"], "keywords": ["memory"], "memory_type": MemoryType.ERROR},
+        ):
+            assert ids(store.query(**kwargs)) == ids(reference.query(**kwargs))
+        assert ids(store.search_by_keywords(["memory", "store"], limit=10)) == \
+            ids(reference.search_by_keywords(["memory", "store"], limit=10))
+        assert ids(store.search_by_type(MemoryType.TASK)) == ids(reference.search_by_type(MemoryType.TASK))
+
+    def test_related_memories_match_intelligent_store(self, stores):
+        reference, store = stores
+        for item_id in ids(reference.query(limit=10)):
+            assert store.get_by_id(item_id).related_ids == reference.get_by_id(item_id).related_ids
+            assert ids(store.get_related_memories(item_id)) == ids(reference.get_related_memories(item_id))
+        assert store.get_by_id("mem-missing") is None
+
+    def test_analytics_and_optimization(self, stores):
+        reference, store = stores
+        assert store.get_memory_analytics() == reference.get_memory_analytics()
+        assert store.optimize_memory(max_items=3) == reference.optimize_memory(max_items=3)
+        assert store.count() == 3
+        assert ids(store.query(limit=10)) == ids(reference.query(limit=10))
+        assert store.search_by_keywords(["cooking"]) == []
+
+    def test_full_text_search(self, stores):
+        _, store = stores
+        if not store.fts_enabled:
+            pytest.skip("SQLite built without FTS5")
+        results = store.search_text("database corruption", limit=5)
+        assert results[0].content == "Critical: memory database corruption on crash"
+
+    def test_memories_persist_across_sessions(self, tmp_path):
+        path = tmp_path / "memory.db"
+        with SqliteMemoryStore(path) as store:
+            first = store.write_many([{"content": "Goal: remember me"}, {"content": "Task: and me"}])
+
+        with SqliteMemoryStore(path) as reopened:
+            assert reopened.get_by_id(first[0].id).content == "Goal: remember me"
+            assert reopened.search_by_type(MemoryType.GOAL)[0].id == first[0].id
+            # Ids keep counting after restart
+            assert reopened.write(content="Context: new session").id not in {i.id for i in first}
+
+    def test_concurrent_handles_assign_unique_ids(self, tmp_path):
+        path = tmp_path / "memory.db"
+        with SqliteMemoryStore(path) as a, SqliteMemoryStore(path) as b:
+            written = [a.write(content="Task: from a"), b.write(content="Task: from b")]
+            written += a.write_many([{"content": "Note: a batch"}, {"content": "Note: a batch too"}])
+            written.append(b.write(content="Note: b again"))
+
+            assert len({item.id for item in written}) == 5
+            assert a.count() == b.count() == 5
+            assert b.get_by_id(written[2].id).content == "Note: a batch"
@@ -0,0 +1,139 @@
+"""
+Tests for test-impact selection and incremental failing-test detection
+"""
+from __future__ import annotations
+import json
+import os
+import sys
+
+from ai.loop.repo_scanner import RepoScanner, TaskType
+from ai.loop.test_impact import TestImpactMap, parse_imports, parse_junit_report
+
+
+def write(root, files):
+    for rel, text in files.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+
+
+def bump(path):
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_parse_imports_resolves_relative_and_from_imports():
+    source = b"import os.path\nfrom . import util\nfrom ..core import Engine\nfrom x import *\n"
+    assert parse_imports("pkg/sub/mod.py", source) == [
+        "os.path", "pkg.core", "pkg.core.Engine", "pkg.sub", "pkg.sub.util", "x",
+    ]
+    assert parse_imports("pkg/__init__.py", b"from .api import run\n") == ["pkg.api", "pkg.api.run"]
+    assert parse_imports("broken.py", b"def (:\n") == []
+
+
+def test_affected_tests_follow_transitive_imports_and_deletions(tmp_path):
+    write(tmp_path, {
+        "pkg/__init__.py": "",
+        "pkg/core.py": "X = 1\n",
+        "pkg/service.py": "from pkg.core import X\n",
+        "pkg/extra.py": "Y = 2\n",
+        "tests/test_service.py": "from pkg import service\n",
+        "tests/test_extra.py": "import pkg.extra\n",
+        "tests/test_plain.py": "def test_ok(): pass\n",
+    })
+    impact = TestImpactMap(tmp_path)
+    assert impact.select() is None  # No baseline: full run
+    impact.save()
+
+    assert TestImpactMap(tmp_path).select() == []
+
+    bump(tmp_path / "pkg" / "core.py")
+    (tmp_path / "pkg" / "core.py").write_text("X = 3\n")
+    assert TestImpactMap(tmp_path).select() == ["tests/test_service.py"]
+
+    impact = TestImpactMap(tmp_path)
+    (tmp_path / "pkg" / "extra.py").unlink()
+    assert impact.select() == ["tests/test_extra.py", "tests/test_service.py"]
+
+    # Package __init__ runs for every import below it
+    impact.save()
+    (tmp_path / "pkg" / "__init__.py").write_text("Z = 0\n")
+    assert TestImpactMap(tmp_path).select() == ["tests/test_extra.py", "tests/test_service.py"]
+
+
+def test_conftest_change_requests_full_run(tmp_path):
+    write(tmp_path, {"conftest.py": "", "tests/test_a.py": "def test_a(): pass\n"})
+    impact = TestImpactMap(tmp_path)
+    impact.select()
+    impact.save()
+    bump(tmp_path / "conftest.py")
+    (tmp_path / "conftest.py").write_text("import os\n")
+    assert TestImpactMap(tmp_path).select() is None
+
+
+def test_lastfailed_seeds_baseline_and_is_always_rerun(tmp_path):
+    write(tmp_path, {"tests/test_a.py": "def test_a(): pass\n", "tests/test_b.py": "def test_b(): pass\n"})
+    cache = tmp_path / ".pytest_cache" / "v" / "cache"
+    cache.mkdir(parents=True)
+    (cache / "lastfailed").write_text(json.dumps({"tests/test_a.py::test_a": True, "tests/gone.py::t": True}))
+    bump(cache / "lastfailed")
+
+    assert TestImpactMap(tmp_path).select() == ["tests/test_a.py::test_a"]
+
+
+def test_junit_report_lines(tmp_path):
+    report = tmp_path / "report.xml"
+    report.write_text(
+        '<testsuites><testsuite>'
+        '<testcase classname="tests.test_a" name="test_x" file="tests/test_a.py" line="3">'
+        '<failure message="assert 1 == 2">def test_x():\n&gt;       assert 1 == 2\n'
+        'E       assert 1 == 2\n\ntests/test_a.py:5: AssertionError</failure></testcase>'
+        '<testcase classname="tests.test_a" name="test_y" file="tests/test_a.py" line="7"/>'
+        '</testsuite></testsuites>'
+    )
+    assert parse_junit_report(report) == [
+        {"file": "tests/test_a.py", "line": 5, "name": "test_x", "message": "assert 1 == 2"},
+    ]
+    assert parse_junit_report(tmp_path / "missing.xml") is None
+
+
+def test_incremental_scanner_runs_only_affected_tests(tmp_path):
+    write(tmp_path, {
+        "conftest.py": "",
+        "pkg/__init__.py": "",
+        "pkg/core.py": "def answer():\n    return 41\n",
+        "pkg/other.py": "def name():\n    return 'x'\n",
+        "tests/test_core.py": "from pkg.core import answer\n\n\ndef test_answer():\n    assert answer() == 42\n",
+        "tests/test_other.py": "from pkg.other import name\n\n\ndef test_name():\n    assert name() == 'x'\n",
+    })
+    scanner = RepoScanner(repo_path=tmp_path, use_cache=False, checker_timeouts={"tests": 120})
+    scanner.PYTEST_COMMAND = [sys.executable, "-m", "pytest", "-p", "no:randomly"]
+    commands = []
+    command = scanner._checker_command
+    scanner._checker_command = lambda name: commands.append(command(name)) or commands[-1]
+
+    tasks = scanner.find_failing_tests()
+    assert [(t.type, t.file_path, t.line_number) for t in tasks] == [
+        (TaskType.FAILING_TEST, "tests/test_core.py", 5)
+    ]
+    assert commands[-1][-1] == str(tmp_path.resolve())  # Full run
+
+    assert len(scanner.find_failing_tests()) == 1
+    assert commands[-1][-1:] == ["tests/test_core.py::test_answer"]
+
+    # Touched without a content change: nothing new to run
+    bump(tmp_path / "pkg" / "other.py")
+    assert len(scanner.find_failing_tests()) == 1
+    assert commands[-1][-1:] == ["tests/test_core.py::test_answer"]
+
+    (tmp_path / "pkg" / "other.py").write_text("def name():\n    return 'x'  # changed\n")
+    assert len(scanner.find_failing_tests()) == 1
+    assert commands[-1][-2:] == ["tests/test_other.py", "tests/test_core.py::test_answer"]
+
+    bump(tmp_path / "pkg" / "core.py")
+    (tmp_path / "pkg" / "core.py").write_text("def answer():\n    return 42\n")
+    assert scanner.find_failing_tests() == []
+    assert commands[-1][-1:] == ["tests/test_core.py"]
+
+    assert scanner.find_failing_tests() == []
+    assert commands[-1] is None  # Nothing to run
@@ -0,0 +1,137 @@
+"""
+Tests for the mypy daemon driver and structured mypy output parsing
+"""
+from __future__ import annotations
+import asyncio
+import json
+import sys
+from unittest.mock import Mock, patch
+
+from ai.loop.repo_scanner import RepoScanner, TaskType
+from ai.loop.type_checker import MypyDaemon, MypyDiagnostic, parse_mypy_output
+
+FAKE_DMYPY = """\
+import json, os, sys
+here = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(here, "calls.jsonl"), "a") as f:
+    f.write(json.dumps(sys.argv[1:]) + "\\n")
+with open(os.path.join(here, "reply.json")) as f:
+    reply = json.load(f)
+print(reply["stdout"])
+sys.exit(reply["code"])
+"""
+
+
+def test_parse_text_and_json_output():
+    stdout = "\n".join([
+        'app.py:5:10: error: Argument 1 to "add" has incompatible type "str"; expected "int"  [arg-type]',
+        'app.py:5:10: note: See https://mypy.rtfd.io for details',
+        'lib/util.py:12: error: Missing return statement',
+        'lib/util.py:13: warning: unused "type: ignore" comment',
+        json.dumps({"file": "x.py", "line": 3, "column": 4, "message": "Bad", "hint": "Try this",
+                    "code": "misc", "severity": "error"}),
+        "Found 3 errors in 3 files",
+    ])
+    assert parse_mypy_output(stdout) == [
+        MypyDiagnostic("app.py", 5, 10, "error",
+                       'Argument 1 to "add" has incompatible type "str"; expected "int"', "arg-type",
+                       ("See https://mypy.rtfd.io for details",)),
+        MypyDiagnostic("lib/util.py", 12, None, "error", "Missing return statement", None),
+        MypyDiagnostic("x.py", 3, 5, "error", "Bad", "misc", ("Try this",)),
+    ]
+
+
+class FakeDaemon:
+    def __init__(self, tmp_path):
+        self.dir = tmp_path / "bin"
+        self.dir.mkdir()
+        self.script = self.dir / "dmypy"
+        self.script.write_text(f"#!{sys.executable}\n" + FAKE_DMYPY)
+        self.script.chmod(0o755)
+        self.reply("", 0)
+
+    def reply(self, stdout, code):
+        (self.dir / "reply.json").write_text(json.dumps({"stdout": stdout, "code": code}))
+
+    @property
+    def calls(self):
+        path = self.dir / "calls.jsonl"
+        if not path.exists():
+            return []
+        return [json.loads(line) for line in path.read_text().splitlines()]
+
+    def subcommands(self):
+        return [next(arg for arg in call if arg in ("run", "recheck", "stop")) for call in self.calls]
+
+
+def make_scanner(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.py").write_text("x: int = 'a'\n")
+    fake = FakeDaemon(tmp_path)
+    scanner = RepoScanner(repo_path=repo, use_cache=False, type_daemon=True)
+    scanner._dmypy = MypyDaemon(repo, scanner._ignore, executable=str(fake.script))
+    return scanner, fake, repo
+
+
+def test_daemon_rechecks_only_changed_files(tmp_path):
+    scanner, fake, repo = make_scanner(tmp_path)
+    fake.reply("app.py:1:10: error: Incompatible types in assignment  [assignment]", 1)
+
+    tasks = scanner.find_type_errors()
+    assert [(t.type, t.file_path, t.line_number) for t in tasks] == [(TaskType.TYPE_ERROR, "app.py", 1)]
+    assert tasks[0].description == "Type error: Incompatible types in assignment [assignment]"
+    assert fake.calls[0][-2:] == ["--no-pretty", "."]
+
+    # Nothing changed: cached result, no subprocess
+    assert scanner.find_type_errors() == tasks
+    assert fake.subcommands() == ["run"]
+
+    (repo / "lib.py").write_text("y = 1\n")
+    (repo / "app.py").write_text("x: int = 1\n")
+    fake.reply("", 0)
+    assert scanner.find_type_errors() == []
+    assert fake.calls[-1][-5:] == ["recheck", "--update", "app.py", "--update", "lib.py"]
+
+    (repo / "lib.py").unlink()
+    scanner.find_type_errors()
+    assert fake.calls[-1][-3:] == ["recheck", "--remove", "lib.py"]
+
+    scanner.close()
+    assert fake.subcommands()[-1] == "stop"
+
+
+def test_failed_recheck_restarts_then_falls_back_to_cold_mypy(tmp_path):
+    scanner, fake, repo = make_scanner(tmp_path)
+    scanner.find_type_errors()
+    (repo / "app.py").write_text("x = 2\n")
+
+    fake.reply("Daemon has died", 2)
+    cold = Mock(returncode=1, stdout="app.py:1: error: From cold run")
+    real_run = __import__("subprocess").run
+
+    def run(command, **kwargs):
+        if command[0] == "mypy":
+            return cold
+        return real_run(command, **kwargs)
+
+    with patch("ai.loop.repo_scanner.subprocess.run", side_effect=run):
+        tasks = scanner.find_type_errors()
+
+    assert fake.subcommands() == ["run", "recheck", "run"]
+    assert scanner._dmypy.disabled
+    assert [t.description for t in tasks] == ["Type error: From cold run"]
+
+
+def test_async_scan_uses_daemon_and_cache(tmp_path):
+    scanner, fake, repo = make_scanner(tmp_path)
+    scanner.CHECKER_PARSERS = {"types": "_parse_mypy_output"}
+    scanner.find_todos = lambda: []
+    fake.reply("app.py:1: error: Bad", 1)
+
+    first = asyncio.run(scanner.scan_async())
+    second = asyncio.run(scanner.scan_async())
+
+    assert [t.description for t in first] == ["Type error: Bad"] == [t.description for t in second]
+    assert fake.subcommands() == ["run"]
+    assert scanner.checker_status == {"types": "ok"}